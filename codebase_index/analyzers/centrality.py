@@ -3,7 +3,9 @@ Centrality analyzer - identifies core vs helper components.
 
 Computes graph centrality metrics on the call graph to identify
 which functions/classes are central to the codebase (core) vs
-peripheral (helpers/utilities).
+peripheral (helpers/utilities). Degrees drive the classification;
+PageRank, betweenness and k-core numbers (see graph_metrics.py) are
+reported alongside.
 """
 
 from __future__ import annotations
@@ -11,6 +13,11 @@ from __future__ import annotations
 from collections import defaultdict
 from typing import Any
 
+from codebase_index.analyzers.graph_metrics import CSRGraph, compute_metrics
+
+# Number of components listed per category
+TOP_COMPONENTS = 15
+
 
 class CentralityAnalyzer:
     """
@@ -35,19 +42,25 @@ class CentralityAnalyzer:
         # Build metrics
         self._in_degree: dict[str, int] = defaultdict(int)
         self._out_degree: dict[str, int] = defaultdict(int)
-        self._callers: dict[str, set[str]] = defaultdict(set)
-        self._build_metrics()
+        self.keys: list[str] = list(self.call_graph)
+        self.graph, self._callers_graph = self._build_metrics()
 
-    def _build_metrics(self) -> None:
-        """Build centrality metrics from call graph."""
+    def _build_metrics(self) -> tuple[CSRGraph, CSRGraph]:
+        """
+        Build the call graph CSR (internal calls) and degree counts.
+
+        Returns:
+            Tuple of (call graph, reversed call graph), both over self.keys.
+        """
         # Build reverse lookup for function resolution
-        func_to_key: dict[str, list[str]] = defaultdict(list)
-        for key in self.call_graph:
+        func_to_ids: dict[str, list[int]] = defaultdict(list)
+        for key_id, key in enumerate(self.keys):
             if ":" in key:
                 _, func_name = key.rsplit(":", 1)
-                func_to_key[func_name].append(key)
+                func_to_ids[func_name].append(key_id)
 
-        for key, data in self.call_graph.items():
+        edges: list[tuple[int, int]] = []
+        for key_id, (key, data) in enumerate(self.call_graph.items()):
             calls = data.get("calls", [])
             self._out_degree[key] = len(calls)
 
@@ -56,14 +69,33 @@ class CentralityAnalyzer:
                 call_name = call.split(".")[-1] if "." in call else call
 
                 # Find matching keys
-                if call_name in func_to_key:
-                    for target_key in func_to_key[call_name]:
-                        self._in_degree[target_key] += 1
-                        self._callers[target_key].add(key)
+                if call_name in func_to_ids:
+                    for target_id in func_to_ids[call_name]:
+                        edges.append((key_id, target_id))
                 else:
                     # External call - track by name
                     self._in_degree[call] += 1
-                    self._callers[call].add(key)
+
+        # One CSR conversion; every call counts towards in-degree
+        graph = CSRGraph(len(self.keys), edges)
+        in_weight = [0.0] * len(self.keys)
+        for target_id, weight in zip(graph.indices, graph.weights):
+            in_weight[int(target_id)] += weight
+        for key, weight in zip(self.keys, in_weight):
+            if weight:
+                self._in_degree[key] = int(weight)
+
+        callers_graph = CSRGraph(
+            len(self.keys),
+            [(target, source) for source, target in edges],
+            use_numpy=graph.use_numpy,
+        )
+        return graph, callers_graph
+
+    def _callers_of(self, key_id: int, limit: int = 10) -> list[str]:
+        """First callers of a call graph key (by call graph order)."""
+        callers = self._callers_graph.neighbors(key_id)[:limit]
+        return [self.keys[int(caller)] for caller in callers]
 
     def analyze(self) -> dict[str, Any]:
         """
@@ -72,10 +104,16 @@ class CentralityAnalyzer:
         Returns:
             Centrality analysis results with classifications.
         """
+        # Graph metrics over the CSR call graph
+        metrics = compute_metrics(self.graph)
+        pagerank = metrics["pagerank"]
+        betweenness = metrics["betweenness"]
+        core_number = metrics["core_number"]
+
         # Calculate combined scores
         scores: dict[str, dict[str, Any]] = {}
 
-        for key in self.call_graph:
+        for key_id, key in enumerate(self.keys):
             in_deg = self._in_degree.get(key, 0)
             out_deg = self._out_degree.get(key, 0)
 
@@ -95,7 +133,10 @@ class CentralityAnalyzer:
                 "in_degree": in_deg,
                 "out_degree": out_deg,
                 "total_degree": in_deg + out_deg,
-                "callers": list(self._callers.get(key, set()))[:10],
+                "pagerank": round(pagerank[key_id], 6),
+                "betweenness": round(betweenness[key_id], 6),
+                "core_number": core_number[key_id],
+                "callers": self._callers_of(key_id),
             }
 
         # Compute statistics for relative thresholds
@@ -128,27 +169,31 @@ class CentralityAnalyzer:
             [s for s in scores.values() if self._is_core(s)],
             key=lambda x: x["in_degree"],
             reverse=True,
-        )[:15]
+        )[:TOP_COMPONENTS]
 
         hubs = sorted(
             [s for s in scores.values() if self._is_hub(s)],
             key=lambda x: x["out_degree"],
             reverse=True,
-        )[:15]
+        )[:TOP_COMPONENTS]
 
         utilities = sorted(
             [s for s in scores.values() if self._is_utility(s)],
             key=lambda x: x["in_degree"],
             reverse=True,
-        )[:15]
+        )[:TOP_COMPONENTS]
 
         isolated = [s for s in scores.values() if self._is_isolated(s)]
 
+        # Most central by PageRank (transitively called by important code)
+        central = sorted(scores.values(), key=lambda x: x["pagerank"], reverse=True)
+
         return {
             "core_components": core,
             "hub_components": hubs,
             "utility_components": utilities,
             "isolated_components": isolated[:10],
+            "central_components": central[:TOP_COMPONENTS],
             "classifications": classifications,
             "summary": {
                 "total_functions": len(scores),
@@ -160,6 +205,9 @@ class CentralityAnalyzer:
                 "avg_out_degree": self._avg_out,
                 "high_in_threshold": self._high_in_threshold,
                 "high_out_threshold": self._high_out_threshold,
+                "max_core_number": max(core_number, default=0),
+                "betweenness_samples": metrics["betweenness_samples"],
+                "graph_backend": "numpy" if self.graph.use_numpy else "python",
             },
         }
 
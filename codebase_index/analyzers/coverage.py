@@ -31,6 +31,8 @@ class TestCoverageMapper:
         self.root = root
         self.test_files: set[str] = set()
         self.source_to_test: dict[str, str] = {}
+        # Test file name -> first test path with that name, built per mapping
+        self._tests_by_name: dict[str, str] = {}
 
     def collect_test_files(self, exclude: list[str]) -> None:
         """
@@ -71,6 +73,10 @@ class TestCoverageMapper:
 
         testable_sources: list[str] = []
 
+        self._tests_by_name = {}
+        for test_path in sorted(self.test_files):
+            self._tests_by_name.setdefault(Path(test_path).name, test_path)
+
         for source_file in source_files:
             path = source_file.get("path", "")
             language = source_file.get("language", "")
@@ -117,18 +123,12 @@ class TestCoverageMapper:
         """
         path = Path(source_path)
         name = path.stem  # e.g., "agent_service"
+        base_name = name.split("_")[0]
 
-        # Check for pattern matches
-        for test_path in self.test_files:
-            test_name = Path(test_path).name
-
-            # Direct name match
-            if test_name == f"test_{name}.py" or test_name == f"{name}_test.py":
-                return test_path
-
-            # Partial match (e.g., test_agent.py for agent_service.py)
-            base_name = name.split("_")[0]
-            if test_name == f"test_{base_name}.py":
+        # Direct name match, then partial (e.g., test_agent.py for agent_service.py)
+        for test_name in (f"test_{name}.py", f"{name}_test.py", f"test_{base_name}.py"):
+            test_path = self._tests_by_name.get(test_name)
+            if test_path:
                 return test_path
 
         return None
@@ -137,3 +137,4 @@ class TestCoverageMapper:
         """Clear collected test files."""
         self.test_files.clear()
         self.source_to_test.clear()
+        self._tests_by_name.clear()
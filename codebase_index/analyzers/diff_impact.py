@@ -0,0 +1,405 @@
+"""
+Diff-scoped impact analysis for codebase_index.
+
+Maps the changed line ranges of a unified diff to the symbols whose
+spans they touch, then runs one batched impact computation (see
+ImpactAnalyzer.analyze_symbols) for the whole changeset. A one-line edit
+in a large module only flags the function it lands in.
+
+Symbol spans come from each file's functions, classes and methods. Each
+file gets an interval index: spans sorted by start line with a running
+maximum of end lines, so a stabbing query is a bisect plus a short
+backwards scan.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import re
+import subprocess
+from typing import TYPE_CHECKING
+
+from codebase_index.analyzers.impact import ImpactAnalyzer
+from codebase_index.analyzers.test_mapper import is_test_path
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# "@@ -12,3 +12,4 @@" (counts default to 1 when omitted)
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+def parse_unified_diff(diff_text: str) -> dict[str, dict[str, Any]]:
+    """
+    Changed line ranges per file from a unified diff.
+
+    Ranges are in new-file line numbers. A pure deletion is recorded as
+    the two lines around the gap, so the enclosing symbol is still flagged.
+
+    Args:
+        diff_text: Output of ``git diff`` or ``diff -u`` (any context size).
+
+    Returns:
+        Path -> {"status": "modified" | "added" | "deleted" | "renamed",
+        "ranges": [(start, end), ...], "old_path": str (renames only)}.
+    """
+    files: dict[str, dict[str, Any]] = {}
+    current: dict[str, Any] | None = None
+    old_path = ""
+    old_left = new_left = 0
+    new_line = 0
+    # Current block of consecutive -/+ lines
+    added_from: int | None = None
+    deleted = False
+
+    def close_block() -> None:
+        nonlocal added_from, deleted
+        if current is not None:
+            if added_from is not None:
+                current["ranges"].append((added_from, new_line - 1))
+            elif deleted:
+                current["ranges"].append((max(new_line - 1, 1), max(new_line, 1)))
+        added_from = None
+        deleted = False
+
+    for line in diff_text.splitlines():
+        # Inside a hunk, every line is content until its counts run out
+        if old_left > 0 or new_left > 0:
+            marker = line[:1]
+            if marker == "+":
+                if added_from is None:
+                    added_from = new_line
+                new_line += 1
+                new_left -= 1
+            elif marker == "-":
+                deleted = True
+                old_left -= 1
+            elif marker == "\\":
+                continue
+            else:
+                close_block()
+                new_line += 1
+                old_left -= 1
+                new_left -= 1
+            if old_left <= 0 and new_left <= 0:
+                close_block()
+            continue
+
+        if line.startswith("diff "):
+            current = None
+        elif line.startswith("--- "):
+            old_path = _diff_path(line[4:])
+        elif line.startswith("+++ "):
+            new_path = _diff_path(line[4:])
+            if not new_path:
+                current = files.setdefault(old_path, {"status": "deleted", "ranges": []})
+            elif not old_path:
+                current = files.setdefault(new_path, {"status": "added", "ranges": []})
+            elif old_path != new_path:
+                current = files.setdefault(
+                    new_path, {"status": "renamed", "ranges": [], "old_path": old_path}
+                )
+            else:
+                current = files.setdefault(new_path, {"status": "modified", "ranges": []})
+        else:
+            match = _HUNK_HEADER.match(line)
+            if match and current is not None:
+                old_left = int(match.group(2) or 1)
+                new_left = int(match.group(4) or 1)
+                new_line = int(match.group(3))
+                # A zero-length side starts *after* the given line
+                if new_left == 0:
+                    new_line += 1
+
+    return files
+
+
+def _diff_path(header: str) -> str:
+    """Path from a "---"/"+++" header ("" for /dev/null)."""
+    path = header.split("\t")[0].strip()
+    if path == "/dev/null":
+        return ""
+    if path.startswith('"') and path.endswith('"'):
+        path = path[1:-1]
+    if path[:2] in ("a/", "b/"):
+        path = path[2:]
+    return path
+
+
+def git_diff(root: Path, ref: str) -> str:
+    """
+    Unified diff of the working tree against a git ref.
+
+    Paths are relative to ``root`` (``--relative``), matching index paths
+    when the index was scanned from a subdirectory of the repository.
+
+    Args:
+        root: Scanned project root.
+        ref: Any git revision ("main", "HEAD~3", "origin/main...HEAD").
+
+    Returns:
+        Diff text.
+
+    Raises:
+        RuntimeError: If git fails or is not available.
+    """
+    try:
+        return subprocess.check_output(
+            ["git", "diff", "--no-color", "--no-ext-diff", "--relative", "-U0", ref, "--"],
+            cwd=root,
+            stderr=subprocess.PIPE,
+            timeout=60,
+        ).decode("utf-8", errors="replace")
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(e.stderr.decode("utf-8", errors="replace").strip()) from e
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise RuntimeError(f"git diff failed: {e}") from e
+
+
+class SymbolIntervals:
+    """Interval index over one file's symbol spans."""
+
+    def __init__(self, spans: list[tuple[int, int, dict[str, Any]]]) -> None:
+        """
+        Build the index.
+
+        Args:
+            spans: (start line, end line, symbol) triples, in any order.
+        """
+        spans = sorted(spans, key=lambda span: (span[0], -span[1]))
+        self.starts = [span[0] for span in spans]
+        self.spans = spans
+        # max_end[i] = largest end line among spans[0..i]
+        self.max_end: list[int] = []
+        running = 0
+        for _, end, _ in spans:
+            running = max(running, end)
+            self.max_end.append(running)
+
+    def overlapping(self, start: int, end: int) -> list[tuple[int, int, dict[str, Any]]]:
+        """Spans intersecting lines start..end (inclusive), in start order."""
+        found = []
+        position = bisect.bisect_right(self.starts, end) - 1
+        while position >= 0 and self.max_end[position] >= start:
+            span = self.spans[position]
+            if span[1] >= start:
+                found.append(span)
+            position -= 1
+        found.reverse()
+        return found
+
+
+def build_intervals(analyzer: ImpactAnalyzer, file_info: dict[str, Any]) -> SymbolIntervals:
+    """
+    Interval index for one indexed file.
+
+    Methods without a recorded end line end where the next method starts
+    (or where their class ends).
+
+    Args:
+        analyzer: ImpactAnalyzer providing the symbol records.
+        file_info: File info dict from the index.
+
+    Returns:
+        SymbolIntervals over the file's functions, classes and methods.
+    """
+    path = file_info.get("path", "")
+    exports = file_info.get("exports", {})
+    by_name = {sym["name"]: sym for sym in analyzer.extract_symbols(path, exports)}
+    spans: list[tuple[int, int, dict[str, Any]]] = []
+
+    for func in exports.get("functions", []):
+        start = func.get("line") or 0
+        end = func.get("end_line") or start
+        spans.append((start, end, by_name[func.get("name")]))
+
+    for cls in exports.get("classes", []):
+        class_name = cls.get("name")
+        class_start = cls.get("line") or 0
+        class_end = cls.get("end_line") or class_start
+        symbol = dict(by_name[class_name])
+        methods = sorted(cls.get("methods", []), key=lambda m: m.get("line") or 0)
+        method_spans = []
+        for position, method in enumerate(methods):
+            start = method.get("line") or class_start
+            end = method.get("end_line")
+            if end is None:
+                following = methods[position + 1].get("line") if position + 1 < len(methods) else None
+                end = following - 1 if following else class_end
+            method_spans.append((start, max(start, end)))
+            spans.append((start, max(start, end), by_name[f"{class_name}.{method.get('name')}"]))
+        # The class itself only changes through lines outside its methods
+        symbol["_methods"] = method_spans
+        spans.append((class_start, class_end, symbol))
+
+    return SymbolIntervals(spans)
+
+
+def _outside_methods(start: int, end: int, methods: list[tuple[int, int]]) -> bool:
+    """Whether lines start..end include a line not covered by any method span."""
+    cursor = start
+    for method_start, method_end in methods:
+        if method_start > cursor:
+            break
+        cursor = max(cursor, method_end + 1)
+        if cursor > end:
+            return False
+    return cursor <= end
+
+
+class DiffImpactAnalyzer:
+    """Impact of a diff, scoped to the symbols its changed lines touch."""
+
+    def __init__(self, index_data: dict[str, Any]) -> None:
+        """
+        Initialize the analyzer.
+
+        Args:
+            index_data: The loaded index data.
+        """
+        self.impact = ImpactAnalyzer(index_data)
+        self._intervals: dict[str, SymbolIntervals] = {}
+
+    def intervals_for(self, path: str) -> SymbolIntervals | None:
+        """Interval index for an indexed file (built on first use)."""
+        if path not in self._intervals:
+            file_info = self.impact.files_by_path.get(path)
+            if file_info is None:
+                return None
+            self._intervals[path] = build_intervals(self.impact, file_info)
+        return self._intervals[path]
+
+    def changed_symbols(self, path: str, ranges: list[tuple[int, int]]) -> tuple[list[dict[str, Any]], bool]:
+        """
+        Symbols touched by changed line ranges in one file.
+
+        Args:
+            path: Indexed file path.
+            ranges: Changed (start, end) line ranges.
+
+        Returns:
+            (symbols, module_level): the touched symbols, and whether any
+            changed line falls outside every symbol (imports, constants).
+        """
+        intervals = self.intervals_for(path)
+        if intervals is None:
+            return [], True
+
+        touched: dict[str, dict[str, Any]] = {}
+        module_level = False
+        for start, end in ranges:
+            spans = intervals.overlapping(start, end)
+            covered = start
+            for span_start, span_end, symbol in spans:
+                if span_start > covered:
+                    module_level = True
+                covered = max(covered, span_end + 1)
+                methods = symbol.get("_methods")
+                if methods is not None and not _outside_methods(
+                    max(start, span_start), min(end, span_end), methods
+                ):
+                    continue
+                touched[symbol["qualified"]] = {k: v for k, v in symbol.items() if k != "_methods"}
+            if covered <= end:
+                module_level = True
+
+        return list(touched.values()), module_level
+
+    def analyze_diff(self, diff_text: str) -> dict[str, Any]:
+        """
+        Impact of a unified diff.
+
+        Args:
+            diff_text: Unified diff (e.g. from git_diff()).
+
+        Returns:
+            Dictionary with:
+            - files: Changed files found in the index, with their status,
+              changed ranges and touched symbols
+            - not_found: Changed files that are not in the index
+            - symbols, direct_callers, transitive_callers, affected_tests,
+              affected_endpoints: as in ImpactAnalyzer.analyze_files()
+            - summary: Human-readable summary
+        """
+        changes = parse_unified_diff(diff_text)
+        changed: dict[str, list[dict[str, Any]]] = {}
+        module_paths: list[str] = []
+        files: list[dict[str, Any]] = []
+        not_found: list[str] = []
+
+        for path, change in changes.items():
+            file_info = self.impact.files_by_path.get(path)
+            if file_info is None and change.get("old_path"):
+                file_info = self.impact.files_by_path.get(change["old_path"])
+            if file_info is None:
+                not_found.append(path)
+                continue
+
+            indexed_path = file_info.get("path", path)
+            if change["status"] in ("added", "deleted"):
+                symbols = self.impact.extract_symbols(indexed_path, file_info.get("exports", {}))
+                module_level = True
+            else:
+                symbols, module_level = self.changed_symbols(indexed_path, change["ranges"])
+
+            changed[indexed_path] = symbols
+            if module_level:
+                module_paths.append(indexed_path)
+            files.append({
+                "file": indexed_path,
+                "status": change["status"],
+                "ranges": [list(r) for r in change["ranges"]],
+                "symbols": [sym["name"] for sym in symbols],
+                "module_level": module_level,
+            })
+
+        result: dict[str, Any] = {"files": files, "not_found": not_found}
+        result.update(self.impact.analyze_symbols(changed, module_paths))
+
+        # Changed test functions are affected tests themselves
+        seen_tests = {test["file"] for test in result["affected_tests"]}
+        for path, symbols in changed.items():
+            if symbols and is_test_path(path) and path not in seen_tests:
+                seen_tests.add(path)
+                result["affected_tests"].append({
+                    "file": path,
+                    "function": symbols[0]["qualified"],
+                    "reason": "changed",
+                })
+
+        result["summary"] = self._build_summary(result)
+        return result
+
+    def analyze_ref(self, root: Path, ref: str) -> dict[str, Any]:
+        """
+        Impact of the working tree's changes against a git ref.
+
+        Args:
+            root: Scanned project root (inside a git repository).
+            ref: Git revision to diff against.
+
+        Returns:
+            Same as analyze_diff(), plus "ref".
+        """
+        result = {"ref": ref}
+        result.update(self.analyze_diff(git_diff(root, ref)))
+        return result
+
+    @staticmethod
+    def _build_summary(result: dict[str, Any]) -> str:
+        """Build a human-readable summary."""
+        parts = [
+            f"{len(result['files'])} changed file(s) touch {len(result['symbols'])} symbol(s)",
+            f"Impact: {len(result['direct_callers'])} direct caller(s), "
+            f"{len(result['transitive_callers'])} transitive",
+            f"{len(result['affected_tests'])} test(s) affected",
+        ]
+        if result["affected_endpoints"]:
+            parts.append(f"{len(result['affected_endpoints'])} endpoint(s) affected")
+        if result["not_found"]:
+            parts.append(f"{len(result['not_found'])} file(s) not in index")
+        return "; ".join(parts)
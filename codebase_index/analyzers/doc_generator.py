@@ -9,19 +9,39 @@ Generates rich documentation for symbols by combining:
 - Code snippet
 
 Output is formatted as Markdown.
+
+generate_all() documents every symbol into a directory in one pass: the
+caller and test lookups are built once, each source file is read once,
+and pages whose inputs match the previous run's manifest are not rewritten.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
+import re
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from codebase_index.trigram_index import SymbolLookup
+from codebase_index.utils import SourceFile
+
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Manifest of the last --doc-all run (symbol key -> input hash, output file)
+MANIFEST_NAME = ".doc-manifest.json"
+
+# Bump when the markdown layout changes so every page is regenerated
+DOC_FORMAT_VERSION = 1
+
+# Characters replaced in page file names
+_UNSAFE_NAME_CHARS = re.compile(r"[^\w.-]")
+
 
 class DocumentationGenerator:
     """
@@ -43,6 +63,14 @@ class DocumentationGenerator:
         self.root = root
         self.symbol_index = index_data.get("symbol_index", {})
         self.call_graph = index_data.get("call_graph", {})
+        # Lowercase last call segment -> caller keys, built on first use
+        self._callers_by_name: dict[str, list[str]] | None = None
+        # "file:Class" -> calls made by the class's methods, built on first use
+        self._calls_by_class: dict[str, list[str]] | None = None
+        # Trigram lookup over symbol_index, built on first use
+        self._symbol_lookup: SymbolLookup | None = None
+        # TestMapper (and its inverted test index), built on first use
+        self._test_mapper: Any = None
 
     def generate_for_symbol(self, symbol_name: str) -> dict[str, Any]:
         """
@@ -87,7 +115,7 @@ class DocumentationGenerator:
         }
 
     def _find_symbols(self, name: str) -> list[dict[str, Any]]:
-        """Find symbols matching the given name."""
+        """Find symbols matching the given name, best match first."""
         matches = []
         name_lower = name.lower()
 
@@ -97,201 +125,277 @@ class DocumentationGenerator:
         else:
             class_name, method_name = None, None
 
-        # Search functions
-        for func in self.symbol_index.get("functions", []):
-            func_name = func.get("name", "")
-            if name_lower == func_name.lower() or name_lower in func_name.lower():
-                matches.append({**func, "type": "function"})
-
-        # Search classes
-        for cls in self.symbol_index.get("classes", []):
-            cls_name = cls.get("name", "")
-            if name_lower == cls_name.lower() or name_lower in cls_name.lower():
-                matches.append({**cls, "type": "class"})
-
-        # Search methods
-        for method in self.symbol_index.get("methods", []):
-            meth_name = method.get("name", "")
-            meth_class = method.get("class", "")
-            full_name = f"{meth_class}.{meth_name}"
-
-            # Match by full name or partial
-            if class_name and method_name:
+        for kind, symbol, _ in self.symbol_lookup.search(name, fuzzy=False):
+            if kind == "method" and class_name and method_name:
                 # Exact Class.method search
-                if (class_name.lower() == meth_class.lower() and
-                    method_name.lower() == meth_name.lower()):
-                    matches.append({**method, "type": "method"})
-            elif name_lower in full_name.lower() or name_lower == meth_name.lower():
-                matches.append({**method, "type": "method"})
+                full_name = f"{symbol.get('class', '')}.{symbol.get('name', '')}"
+                if full_name.lower() != name_lower:
+                    continue
+            elif kind != "method" and class_name:
+                # Functions and classes never contain a "."
+                continue
+            matches.append({**symbol, "type": kind})
 
         return matches
 
     def _generate_symbol_doc(self, symbol: dict[str, Any]) -> dict[str, Any]:
         """Generate documentation for a single symbol."""
+        doc = self._symbol_inputs(symbol)
+        code_snippet = self._get_code_snippet(doc["file"], symbol)
+        doc["markdown"] = self._format_markdown(**_markdown_args(doc, symbol, code_snippet))
+        return doc
+
+    def generate_all(self, output_dir: Path) -> dict[str, Any]:
+        """
+        Write a markdown page for every public symbol.
+
+        Pages go to ``<output_dir>/<source path>/<Symbol>.md``
+        with an index.md listing them. A manifest of input hashes (symbol
+        record, callers, calls, tests and code snippet) lets the next run
+        skip writing pages whose inputs are unchanged; pages of symbols
+        that no longer exist are removed.
+
+        Args:
+            output_dir: Directory to write into (created if missing).
+
+        Returns:
+            Dictionary with output_dir, symbols, written, skipped and removed.
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        manifest_path = output_dir / MANIFEST_NAME
+        previous = _load_manifest(manifest_path)
+
+        # Source file -> its symbols, so each file is read once
+        by_file: dict[str, list[tuple[str, dict[str, Any], dict[str, Any]]]] = {}
+        keys: set[str] = set()
+        for symbol in self._iter_public_symbols():
+            doc = self._symbol_inputs(symbol)
+            key = f"{doc['file']}:{doc['name']}"
+            if key not in keys:
+                keys.add(key)
+                by_file.setdefault(doc["file"], []).append((key, symbol, doc))
+
+        entries: dict[str, dict[str, str]] = {}
+        written = skipped = 0
+        for file_path, items in by_file.items():
+            source = None
+            if self.root and file_path:
+                try:
+                    source = SourceFile(self.root / file_path)
+                except OSError as e:
+                    logger.debug("Error reading %s: %s", file_path, e)
+            try:
+                for key, symbol, doc in items:
+                    snippet = self._get_code_snippet(file_path, symbol, source=source) if source else ""
+                    args = _markdown_args(doc, symbol, snippet)
+                    page = _page_path(file_path, doc["name"])
+                    entries[key] = {"hash": _input_hash(args), "path": page}
+                    if previous.get(key) == entries[key] and (output_dir / page).is_file():
+                        skipped += 1
+                        continue
+                    _write_page(output_dir / page, args)
+                    written += 1
+            finally:
+                if source:
+                    source.close()
+
+        # Pages whose symbol disappeared (or moved) since the last run
+        removed = 0
+        live_pages = {entry["path"] for entry in entries.values()}
+        for entry in previous.values():
+            page = entry.get("path", "")
+            if page and page not in live_pages and (output_dir / page).is_file():
+                (output_dir / page).unlink()
+                removed += 1
+
+        _write_doc_index(output_dir, entries)
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump({"version": DOC_FORMAT_VERSION, "symbols": entries}, f)
+
+        return {
+            "output_dir": str(output_dir),
+            "symbols": len(entries),
+            "written": written,
+            "skipped": skipped,
+            "removed": removed,
+        }
+
+    def _iter_public_symbols(self) -> Iterator[dict[str, Any]]:
+        """Functions, classes and methods whose names don't start with "_"."""
+        for func in self.symbol_index.get("functions", []):
+            if not func.get("name", "_").startswith("_"):
+                yield {**func, "type": "function"}
+        for cls in self.symbol_index.get("classes", []):
+            if not cls.get("name", "_").startswith("_"):
+                yield {**cls, "type": "class"}
+        for method in self.symbol_index.get("methods", []):
+            if not method.get("name", "_").startswith("_") and not method.get("class", "_").startswith("_"):
+                yield {**method, "type": "method"}
+
+    def _symbol_inputs(self, symbol: dict[str, Any]) -> dict[str, Any]:
+        """Everything a symbol's page shows except the code snippet."""
         sym_type = symbol.get("type", "unknown")
         name = symbol.get("name", "")
         file_path = symbol.get("file", "")
-        line = symbol.get("line", 0)
 
         # Build full name for methods
         if sym_type == "method":
-            class_name = symbol.get("class", "")
-            full_name = f"{class_name}.{name}"
+            full_name = f"{symbol.get('class', '')}.{name}"
         else:
             full_name = name
 
-        # Gather information
-        summary = symbol.get("summary", "")
-        docstring = symbol.get("docstring", "")
-        signature = symbol.get("signature", {})
-
-        # Get call graph info
-        callers = self._get_callers(full_name, file_path)
-        calls = self._get_calls(full_name, file_path)
-
-        # Get tests
-        tests = self._get_tests(full_name)
-
-        # Get code snippet
-        code_snippet = self._get_code_snippet(file_path, line)
-
-        # Build markdown
-        markdown = self._format_markdown(
-            full_name=full_name,
-            sym_type=sym_type,
-            file_path=file_path,
-            line=line,
-            summary=summary,
-            docstring=docstring,
-            signature=signature,
-            callers=callers,
-            calls=calls,
-            tests=tests,
-            code_snippet=code_snippet,
-        )
-
         return {
             "name": full_name,
             "type": sym_type,
             "file": file_path,
-            "line": line,
-            "summary": summary,
-            "docstring": docstring,
-            "callers": callers,
-            "calls": calls,
-            "tests": tests,
-            "markdown": markdown,
+            "line": symbol.get("line", 0),
+            "summary": symbol.get("summary", ""),
+            "docstring": symbol.get("docstring", ""),
+            "callers": self._get_callers(full_name, file_path),
+            "calls": self._get_calls(full_name, file_path),
+            "tests": self._get_tests(full_name),
         }
 
+    @property
+    def symbol_lookup(self) -> SymbolLookup:
+        """Trigram lookup over the symbol index."""
+        if self._symbol_lookup is None:
+            self._symbol_lookup = SymbolLookup(self.symbol_index)
+        return self._symbol_lookup
+
+    @property
+    def callers_by_name(self) -> dict[str, list[str]]:
+        """Callers per lowercase last call segment ("self.db.Query" -> "query")."""
+        if self._callers_by_name is None:
+            self._callers_by_name = {}
+            for func_key, func_data in self.call_graph.items():
+                for base in {call.rsplit(".", 1)[-1].lower() for call in func_data.get("calls", [])}:
+                    self._callers_by_name.setdefault(base, []).append(func_key)
+        return self._callers_by_name
+
     def _get_callers(self, name: str, file_path: str) -> list[dict[str, Any]]:
-        """Get functions that call this symbol."""
+        """Get functions that call this symbol (calls whose last segment matches)."""
         callers = []
 
         # Extract base name for matching (e.g., "Class.method" -> "method", "func" -> "func")
-        base_name = name.split(".")[-1].lower() if "." in name else name.lower()
-
-        for func_key, func_data in self.call_graph.items():
-            calls_list = func_data.get("calls", [])
-
-            # Check if this function calls our symbol
-            for call in calls_list:
-                call_lower = call.lower()
-                call_base = call.split(".")[-1].lower() if "." in call else call_lower
-
-                # Match: exact match, or call ends with our name, or base names match
-                is_match = (
-                    call_lower == name.lower() or
-                    call_lower == base_name or
-                    call_base == base_name or
-                    call_lower.endswith("." + base_name)
-                )
-
-                if is_match:
-                    # Parse func_key (format: "file:name" or "file:Class.method")
-                    if ":" in func_key:
-                        caller_file, caller_name = func_key.split(":", 1)
-                    else:
-                        caller_file, caller_name = "", func_key
-
-                    callers.append({
-                        "name": caller_name,
-                        "file": caller_file,
-                        "line": func_data.get("line", 0),
-                    })
-                    break
-
-        return callers[:20]  # Limit results
+        base_name = name.split(".")[-1].lower()
+
+        for func_key in self.callers_by_name.get(base_name, [])[:20]:
+            # Parse func_key (format: "file:name" or "file:Class.method")
+            if ":" in func_key:
+                caller_file, caller_name = func_key.split(":", 1)
+            else:
+                caller_file, caller_name = "", func_key
+
+            callers.append({
+                "name": caller_name,
+                "file": caller_file,
+                "line": self.call_graph[func_key].get("line", 0),
+            })
+
+        return callers
+
+    @property
+    def calls_by_class(self) -> dict[str, list[str]]:
+        """Calls per "file:Class", merged over its methods in call graph order."""
+        if self._calls_by_class is None:
+            merged: dict[str, dict[str, None]] = {}
+            for func_key, func_data in self.call_graph.items():
+                file_path, colon, qualname = func_key.rpartition(":")
+                class_name, dot, _method = qualname.rpartition(".")
+                if colon and dot:
+                    calls = merged.setdefault(f"{file_path}:{class_name}", {})
+                    calls.update(dict.fromkeys(func_data.get("calls", [])))
+            self._calls_by_class = {key: list(calls) for key, calls in merged.items()}
+        return self._calls_by_class
 
     def _get_calls(self, name: str, file_path: str) -> list[str]:
-        """Get functions that this symbol calls."""
-        # Find the symbol in call graph
-        for func_key, func_data in self.call_graph.items():
-            if name in func_key:
-                return func_data.get("calls", [])[:20]
-
-        return []
+        """Get functions that this symbol calls (for a class, what its methods call)."""
+        key = f"{file_path}:{name}"
+        func_data = self.call_graph.get(key)
+        calls: list[str] = (
+            func_data.get("calls", []) if func_data is not None else self.calls_by_class.get(key, [])
+        )
+        return calls[:20]
 
     def _get_tests(self, name: str) -> list[dict[str, Any]]:
         """Get tests for this symbol."""
         from codebase_index.analyzers.test_mapper import TestMapper
 
         try:
-            mapper = TestMapper(self.index_data)
-            result = mapper.find_tests_for(name)
+            if self._test_mapper is None:
+                self._test_mapper = TestMapper(self.index_data)
+            result = self._test_mapper.find_tests_for(name)
             return result.get("tests", [])[:10]
         except Exception as e:
             logger.debug("Error getting tests: %s", e)
             return []
 
-    def _get_code_snippet(self, file_path: str, line: int, context: int = 30) -> str:
-        """Get code snippet from source file."""
-        if not self.root or not file_path:
-            return ""
+    def _get_code_snippet(
+        self,
+        file_path: str,
+        symbol: dict[str, Any],
+        context: int = 30,
+        source: SourceFile | None = None,
+    ) -> str:
+        """
+        Get code snippet from source file (at most ``context`` lines).
 
-        full_path = self.root / file_path
-        if not full_path.exists():
-            return ""
+        ``source`` reuses an already opened file (batch generation).
+        """
+        if source is None:
+            if not self.root or not file_path:
+                return ""
+            full_path = self.root / file_path
+            if not full_path.exists():
+                return ""
+            try:
+                with SourceFile(full_path) as opened:
+                    return self._get_code_snippet(file_path, symbol, context, opened)
+            except OSError as e:
+                logger.debug("Error reading %s: %s", full_path, e)
+                return ""
 
-        try:
-            with open(full_path, "r", encoding="utf-8", errors="replace") as f:
-                lines = f.readlines()
+        line = symbol.get("line", 0)
 
-            if line < 1 or line > len(lines):
-                return ""
+        # Recorded span: slice the body directly
+        body = source.symbol_text(symbol)
+        if body is not None:
+            return "".join(body.splitlines(keepends=True)[:context]).rstrip()
+        lines = source.lines()
 
-            # Get lines around the symbol
-            start = line - 1
-            end = min(start + context, len(lines))
+        if line < 1 or line > len(lines):
+            return ""
 
-            # Find end of function/class
-            code_lines = lines[start:end]
-            if not code_lines:
-                return ""
+        # Get lines around the symbol
+        start = line - 1
+        end = min(start + context, len(lines))
 
-            first_line = code_lines[0]
-            base_indent = len(first_line) - len(first_line.lstrip())
-            result_lines = [first_line]
+        # Find end of function/class
+        code_lines = lines[start:end]
+        if not code_lines:
+            return ""
 
-            for ln in code_lines[1:]:
-                stripped = ln.strip()
-                if not stripped:
-                    result_lines.append(ln)
-                    continue
+        first_line = code_lines[0]
+        base_indent = len(first_line) - len(first_line.lstrip())
+        result_lines = [first_line]
 
-                current_indent = len(ln) - len(ln.lstrip())
-                if current_indent <= base_indent and stripped:
-                    if stripped.startswith(("def ", "class ", "async def ", "@")):
-                        break
+        for ln in code_lines[1:]:
+            stripped = ln.strip()
+            if not stripped:
                 result_lines.append(ln)
+                continue
 
-            return "".join(result_lines).rstrip()
+            current_indent = len(ln) - len(ln.lstrip())
+            if current_indent <= base_indent and stripped:
+                if stripped.startswith(("def ", "class ", "async def ", "@")):
+                    break
+            result_lines.append(ln)
 
-        except (OSError, IOError) as e:
-            logger.debug("Error reading %s: %s", full_path, e)
-            return ""
+        return "".join(result_lines).rstrip()
 
+    @staticmethod
     def _format_markdown(
-        self,
         full_name: str,
         sym_type: str,
         file_path: str,
@@ -408,6 +512,72 @@ class DocumentationGenerator:
         return "\n".join(lines)
 
 
+def _markdown_args(doc: dict[str, Any], symbol: dict[str, Any], code_snippet: str) -> dict[str, Any]:
+    """Keyword arguments for DocumentationGenerator._format_markdown()."""
+    return {
+        "full_name": doc["name"],
+        "sym_type": doc["type"],
+        "file_path": doc["file"],
+        "line": doc["line"],
+        "summary": doc["summary"],
+        "docstring": doc["docstring"],
+        "signature": symbol.get("signature", {}),
+        "callers": doc["callers"],
+        "calls": doc["calls"],
+        "tests": doc["tests"],
+        "code_snippet": code_snippet,
+    }
+
+
+def _input_hash(args: dict[str, Any]) -> str:
+    """Hash of everything a page is rendered from (its _markdown_args())."""
+    payload = json.dumps([DOC_FORMAT_VERSION, args], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def _page_path(file_path: str, name: str) -> str:
+    """Relative page path for a symbol: "<source file>/<name>.md"."""
+    return f"{file_path}/{_UNSAFE_NAME_CHARS.sub('_', name)}.md"
+
+
+def _load_manifest(manifest_path: Path) -> dict[str, dict[str, str]]:
+    """Symbol entries of the previous run ({} if missing or from another format)."""
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != DOC_FORMAT_VERSION:
+        return {}
+    symbols: dict[str, dict[str, str]] = manifest.get("symbols", {})
+    return symbols
+
+
+def _write_page(path: Path, args: dict[str, Any]) -> None:
+    """Render a page from its _markdown_args() and write it."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(DocumentationGenerator._format_markdown(**args))
+
+
+def _write_doc_index(output_dir: Path, entries: dict[str, dict[str, str]]) -> None:
+    """Write index.md linking every page, grouped by source file."""
+    by_file: dict[str, list[tuple[str, str]]] = {}
+    for key, entry in entries.items():
+        file_path, name = key.split(":", 1)
+        by_file.setdefault(file_path, []).append((name, entry["path"]))
+
+    lines = ["# API Reference", "", f"{len(entries)} symbols in {len(by_file)} files.", ""]
+    for file_path in sorted(by_file):
+        lines.append(f"## `{file_path}`")
+        lines.append("")
+        for name, page in sorted(by_file[file_path]):
+            lines.append(f"- [`{name}`]({page})")
+        lines.append("")
+    with open(output_dir / "index.md", "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+
 def generate_doc_for_symbol(
     index_data: dict[str, Any],
     symbol_name: str,
@@ -426,3 +596,23 @@ def generate_doc_for_symbol(
     """
     generator = DocumentationGenerator(index_data, root=root)
     return generator.generate_for_symbol(symbol_name)
+
+
+def generate_all_docs(
+    index_data: dict[str, Any],
+    output_dir: Path,
+    root: Path | None = None,
+) -> dict[str, Any]:
+    """
+    Convenience function to document every public symbol into a directory.
+
+    Args:
+        index_data: The codebase index.
+        output_dir: Directory for the markdown pages.
+        root: Root directory for reading source files.
+
+    Returns:
+        Run statistics (see DocumentationGenerator.generate_all).
+    """
+    generator = DocumentationGenerator(index_data, root=root)
+    return generator.generate_all(output_dir)
@@ -0,0 +1,357 @@
+"""
+Embedding backends for codebase_index semantic search.
+
+Every backend turns a list of texts into a float32 matrix with one row
+per text. The heavy dependencies are imported only when a backend is
+created, so choosing a light backend never pays for PyTorch.
+
+Backends:
+  - sentence-transformers: PyTorch models (pip install codebase-index[semantic])
+  - onnx: exported models on ONNX Runtime, CPU only (pip install codebase-index[onnx])
+  - hashing: deterministic hashing-trick encoder, numpy only (tests/offline)
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import logging
+import zlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from codebase_index.analyzers.lexical import tokenize
+
+if TYPE_CHECKING:
+    from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# numpy is required by every backend
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+    np = None  # type: ignore
+
+DEFAULT_BACKEND = "sentence-transformers"
+
+# Output dimension of the hashing-trick encoder
+DEFAULT_HASHING_DIM = 384
+
+# Modules each backend needs, and how to install them
+BACKEND_REQUIREMENTS: dict[str, tuple[list[str], str]] = {
+    "sentence-transformers": (
+        ["sentence_transformers"],
+        "pip install codebase-index[semantic]",
+    ),
+    "onnx": (
+        ["onnxruntime", "tokenizers"],
+        "pip install codebase-index[onnx]",
+    ),
+    "hashing": ([], "pip install numpy"),
+}
+
+
+def backend_available(backend: str) -> bool:
+    """
+    Check whether a backend's dependencies are installed (without importing them).
+
+    Args:
+        backend: Backend name (key of BACKENDS).
+
+    Returns:
+        True if the backend can be created.
+    """
+    if not HAS_NUMPY or backend not in BACKEND_REQUIREMENTS:
+        return False
+    modules, _ = BACKEND_REQUIREMENTS[backend]
+    return all(importlib.util.find_spec(module) is not None for module in modules)
+
+
+def install_hint(backend: str) -> str:
+    """Install command for a backend's dependencies."""
+    return BACKEND_REQUIREMENTS.get(backend, ([], "pip install codebase-index[semantic]"))[1]
+
+
+class EmbeddingBackend(ABC):
+    """
+    Base class for embedding backends.
+
+    Subclasses load their model in __init__ and implement encode().
+    """
+
+    name = ""
+
+    def __init__(
+        self,
+        model_name: str,
+        max_tokens: int = 512,
+        cache_dir: Path | None = None,
+    ) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            model_name: Model identifier (HuggingFace name or local path).
+            max_tokens: Maximum input length in tokens.
+            cache_dir: Directory to cache downloaded models.
+        """
+        self.model_name = model_name
+        self.max_tokens = max_tokens
+        self.cache_dir = cache_dir
+
+    @abstractmethod
+    def encode(
+        self,
+        texts: list[str],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+    ) -> Any:
+        """
+        Encode texts into embeddings.
+
+        Args:
+            texts: Texts to encode.
+            batch_size: Texts per forward pass.
+            show_progress_bar: Show a progress bar (if the backend supports it).
+
+        Returns:
+            numpy array of shape (len(texts), dim).
+        """
+        ...
+
+    def to_cpu(self) -> None:  # noqa: B027
+        """
+        Move the model to CPU (used as a fallback after GPU errors).
+
+        Deliberately a no-op here: only backends that can run on a GPU
+        override it.
+        """
+
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    """PyTorch models through sentence-transformers."""
+
+    name = "sentence-transformers"
+
+    def __init__(
+        self,
+        model_name: str,
+        max_tokens: int = 512,
+        cache_dir: Path | None = None,
+    ) -> None:
+        super().__init__(model_name, max_tokens, cache_dir)
+        from sentence_transformers import SentenceTransformer  # type: ignore[import-not-found]
+
+        self.model = SentenceTransformer(
+            model_name,
+            cache_folder=str(cache_dir) if cache_dir else None,
+        )
+        # Set max_seq_length to avoid position embedding overflow
+        # (RoBERTa-based models like UniXcoder have position offset issues)
+        self.model.max_seq_length = max_tokens
+
+    def encode(
+        self,
+        texts: list[str],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+    ) -> Any:
+        return self.model.encode(
+            texts,
+            batch_size=batch_size,
+            show_progress_bar=show_progress_bar,
+            convert_to_numpy=True,
+        )
+
+    def to_cpu(self) -> None:
+        self.model = self.model.to("cpu")
+
+
+class OnnxBackend(EmbeddingBackend):
+    """
+    Exported transformer models on ONNX Runtime (CPU).
+
+    Expects a directory (or HuggingFace repo) with ``tokenizer.json`` and an
+    ONNX graph whose first output is the token embeddings; sentence
+    embeddings are mean-pooled over the attention mask, matching
+    sentence-transformers' default pooling.
+    """
+
+    name = "onnx"
+
+    def __init__(
+        self,
+        model_name: str,
+        max_tokens: int = 512,
+        cache_dir: Path | None = None,
+        onnx_file: str = "model.onnx",
+    ) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            model_name: Local model directory or HuggingFace repo id.
+            max_tokens: Maximum input length in tokens.
+            cache_dir: Directory to cache downloaded models.
+            onnx_file: Path of the ONNX graph inside the model directory.
+        """
+        super().__init__(model_name, max_tokens, cache_dir)
+        import onnxruntime as ort  # type: ignore[import-not-found]
+        from tokenizers import Tokenizer  # type: ignore[import-not-found]
+
+        model_dir = self._resolve_model_dir(onnx_file)
+
+        self.tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_tokens)
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(model_dir / onnx_file),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self.input_names = {node.name for node in self.session.get_inputs()}
+
+    def _resolve_model_dir(self, onnx_file: str) -> Path:
+        """Find the model locally, or download only the files we need."""
+        local = Path(self.model_name)
+        if (local / onnx_file).exists():
+            return local
+
+        if importlib.util.find_spec("huggingface_hub") is None:
+            raise ImportError(
+                f"ONNX model '{self.model_name}' is not a local directory and "
+                "huggingface_hub is not installed to download it. "
+                "Install with: pip install codebase-index[onnx]"
+            )
+        from huggingface_hub import snapshot_download  # type: ignore[import-not-found]
+
+        logger.info("Downloading ONNX model: %s", self.model_name)
+        return Path(snapshot_download(
+            repo_id=self.model_name,
+            cache_dir=str(self.cache_dir) if self.cache_dir else None,
+            allow_patterns=[onnx_file, "tokenizer.json"],
+        ))
+
+    def encode(
+        self,
+        texts: list[str],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+    ) -> Any:
+        batches = []
+        for start in range(0, len(texts), max(1, batch_size)):
+            encodings = self.tokenizer.encode_batch(texts[start:start + batch_size])
+            input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+            attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+            feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+            if "token_type_ids" in self.input_names:
+                feeds["token_type_ids"] = np.zeros_like(input_ids)
+            feeds = {name: value for name, value in feeds.items() if name in self.input_names}
+
+            token_embeddings = self.session.run(None, feeds)[0]
+
+            # Mean pooling over real (non-padding) tokens
+            mask = attention_mask[..., None].astype(np.float32)
+            summed = (token_embeddings * mask).sum(axis=1)
+            counts = np.clip(mask.sum(axis=1), 1e-9, None)
+            batches.append((summed / counts).astype(np.float32))
+
+        if not batches:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack(batches)
+
+
+class HashingBackend(EmbeddingBackend):
+    """
+    Deterministic hashing-trick encoder.
+
+    Terms (identifier-split, as in lexical search) and adjacent term pairs
+    are hashed into a fixed number of signed buckets. No model download,
+    no randomness: the same text always gives the same vector, which makes
+    it suitable for tests and offline or air-gapped environments.
+    """
+
+    name = "hashing"
+
+    def __init__(
+        self,
+        model_name: str = "hashing",
+        max_tokens: int = 512,
+        cache_dir: Path | None = None,
+        dim: int = DEFAULT_HASHING_DIM,
+    ) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            model_name: Identifier stored with the embeddings.
+            max_tokens: Maximum terms used per text.
+            cache_dir: Unused (nothing to download).
+            dim: Output dimension.
+        """
+        super().__init__(model_name, max_tokens, cache_dir)
+        self.dim = dim
+
+    def encode(
+        self,
+        texts: list[str],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+    ) -> Any:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            terms = tokenize(text)[:self.max_tokens]
+            features = terms + [f"{a} {b}" for a, b in zip(terms, terms[1:])]
+            for feature in features:
+                digest = zlib.crc32(feature.encode("utf-8"))
+                # High bit picks the sign so collisions tend to cancel out
+                sign = 1.0 if digest & 0x80000000 else -1.0
+                matrix[row, digest % self.dim] += sign
+        return matrix
+
+
+BACKENDS: dict[str, type[EmbeddingBackend]] = {
+    "sentence-transformers": SentenceTransformerBackend,
+    "onnx": OnnxBackend,
+    "hashing": HashingBackend,
+}
+
+
+def create_backend(
+    backend: str,
+    model_name: str,
+    max_tokens: int = 512,
+    cache_dir: Path | None = None,
+    options: dict[str, Any] | None = None,
+) -> EmbeddingBackend:
+    """
+    Create an embedding backend by name.
+
+    Args:
+        backend: Backend name (key of BACKENDS).
+        model_name: Model identifier passed to the backend.
+        max_tokens: Maximum input length in tokens.
+        cache_dir: Directory to cache downloaded models.
+        options: Extra backend-specific keyword arguments (e.g. onnx_file, dim).
+
+    Returns:
+        Ready-to-use backend instance.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown embedding backend '{backend}'. "
+            f"Available: {', '.join(BACKENDS)}"
+        )
+    if not backend_available(backend):
+        raise ImportError(
+            f"Embedding backend '{backend}' is not installed. "
+            f"Install with: {install_hint(backend)}"
+        )
+    return BACKENDS[backend](model_name, max_tokens, cache_dir, **(options or {}))
@@ -1,14 +1,23 @@
 """
 Execution flow analyzer - traces code paths from entry points.
 
-Analyzes the call graph to build execution flow trees showing
+Analyzes the call graph to build an execution flow graph showing
 how code flows from entry points (main, CLI handlers, routes)
 through the system.
+
+Every function's calls are resolved once and stored in a shared node
+table; flows reference nodes by id instead of repeating shared
+subtrees. The nested-tree view of a single entry point is available
+through trace_flow() (``--flow ENTRY`` on the CLI).
 """
 
 from __future__ import annotations
 
-from typing import Any
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
 
 
 # Entry point detection patterns
@@ -69,6 +78,13 @@ class ExecutionFlowAnalyzer:
                     self._func_to_key[func_name] = []
                 self._func_to_key[func_name].append(key)
 
+        # Memoized resolved callees per call graph key
+        self._children: dict[str, list[str]] = {}
+        # Keys on a call cycle, and memoized (depth, calls) of the
+        # trace_flow() tree per (key, remaining depth) for keys off cycles
+        self._cyclic: set[str] = set()
+        self._extent: dict[tuple[str, int], tuple[int, int]] = {}
+
     def analyze(self, max_depth: int = 6) -> dict[str, Any]:
         """
         Analyze execution flow from all detected entry points.
@@ -77,18 +93,28 @@ class ExecutionFlowAnalyzer:
             max_depth: Maximum depth to trace calls.
 
         Returns:
-            Execution flow analysis results.
+            Execution flow analysis results:
+            - entry_points: Entry points with at least one traced call
+            - flows: [{entry_point, root, depth, total_calls}], where root is
+              a node id; depth and total_calls are those of the trace_flow()
+              tree (longest traced call path, number of traced calls)
+            - nodes: Shared node table [{key, name, file, line, calls}], where
+              calls holds node ids; "truncated" marks nodes whose callees lie
+              beyond max_depth of every entry point
+            - summary: Aggregate counts
         """
         entry_points = self.find_entry_points()
-        flows = []
+        flows: list[dict[str, Any]] = []
+        self._cyclic = self._cyclic_keys(ep["key"] for ep in entry_points)
 
         for ep in entry_points:
-            flow = self.trace_flow(ep["key"], max_depth=max_depth)
+            reached = self._reach(ep["key"], max_depth)
+            depth, total_calls = self._tree_extent(ep["key"], max_depth, set())
             flows.append({
                 "entry_point": ep,
-                "flow": flow,
-                "depth": self._get_max_depth(flow),
-                "total_calls": self._count_calls(flow),
+                "reached": reached,
+                "depth": depth,
+                "total_calls": total_calls,
             })
 
         # Sort by total calls (most connected first)
@@ -98,16 +124,193 @@ class ExecutionFlowAnalyzer:
         useful_flows = [f for f in flows if f["total_calls"] > 0]
         useful_entry_points = [f["entry_point"] for f in useful_flows]
 
+        # Shared node table: every reached function appears once
+        node_ids: dict[str, int] = {}
+        for flow in useful_flows:
+            for key in flow["reached"]:
+                if key not in node_ids:
+                    node_ids[key] = len(node_ids)
+
+        nodes = []
+        for key in node_ids:
+            node = self._node(key)
+            children = dict.fromkeys(self._resolved_children(key))
+            node["calls"] = [node_ids[child] for child in children if child in node_ids]
+            if len(node["calls"]) < len(children):
+                node["truncated"] = True
+            nodes.append(node)
+
         return {
             "entry_points": useful_entry_points,
-            "flows": useful_flows,
+            "flows": [
+                {
+                    "entry_point": f["entry_point"],
+                    "root": node_ids[f["entry_point"]["key"]],
+                    "depth": f["depth"],
+                    "total_calls": f["total_calls"],
+                }
+                for f in useful_flows
+            ],
+            "nodes": nodes,
             "summary": {
                 "total_entry_points": len(entry_points),
                 "max_depth": max(f["depth"] for f in flows) if flows else 0,
-                "total_unique_functions": len(self._get_all_functions(flows)),
+                "total_unique_functions": len(set().union(*(f["reached"] for f in flows))),
+                "total_edges": sum(len(node["calls"]) for node in nodes),
             },
         }
 
+    def _reach(self, start_key: str, max_depth: int) -> dict[str, int]:
+        """
+        Functions reachable from start_key within max_depth calls.
+
+        Returns:
+            Mapping of call graph key -> call distance, in BFS order.
+        """
+        distances = {start_key: 0}
+        queue = deque([start_key])
+        while queue:
+            key = queue.popleft()
+            distance = distances[key] + 1
+            if distance >= max_depth:
+                continue
+            for child in self._resolved_children(key):
+                if child not in distances:
+                    distances[child] = distance
+                    queue.append(child)
+        return distances
+
+    def _tree_extent(self, key: str, max_depth: int, path: set[str]) -> tuple[int, int]:
+        """
+        Depth and call count of the tree trace_flow() would build, without building it.
+
+        A key that is not on a call cycle cannot reach any key on the path
+        above it, so its extent depends only on the remaining depth and is
+        memoized; keys on a cycle are walked path by path, as trace_flow()
+        does.
+
+        Args:
+            key: Call graph key of the (non-truncated) tree node.
+            max_depth: Depth left at this node, as passed to trace_flow().
+            path: Keys on the call path above this node.
+
+        Returns:
+            Tuple of (longest path below the node, number of entries below it),
+            counting truncated entries like _get_max_depth()/_count_calls().
+        """
+        memoize = key not in self._cyclic
+        if memoize and (key, max_depth) in self._extent:
+            return self._extent[(key, max_depth)]
+
+        depth = calls = 0
+        path.add(key)
+        for child in self._resolved_children(key):
+            calls += 1
+            if max_depth <= 1 or child in path:
+                depth = max(depth, 1)
+                continue
+            child_depth, child_calls = self._tree_extent(child, max_depth - 1, path)
+            depth = max(depth, child_depth + 1)
+            calls += child_calls
+        path.discard(key)
+
+        if memoize:
+            self._extent[(key, max_depth)] = (depth, calls)
+        return depth, calls
+
+    def _cyclic_keys(self, start_keys: Iterable[str]) -> set[str]:
+        """Keys reachable from start_keys that lie on a call cycle (Tarjan's SCCs)."""
+        index: dict[str, int] = {}
+        low: dict[str, int] = {}
+        stack: list[str] = []
+        on_stack: set[str] = set()
+        cyclic: set[str] = set()
+
+        for start in start_keys:
+            if start in index:
+                continue
+            index[start] = low[start] = len(index)
+            stack.append(start)
+            on_stack.add(start)
+            work = [(start, iter(self._resolved_children(start)))]
+            while work:
+                key, children = work[-1]
+                for child in children:
+                    if child not in index:
+                        index[child] = low[child] = len(index)
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(self._resolved_children(child))))
+                        break
+                    if child in on_stack:
+                        low[key] = min(low[key], index[child])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[key])
+                    if low[key] == index[key]:
+                        component = []
+                        while True:
+                            node = stack.pop()
+                            on_stack.discard(node)
+                            component.append(node)
+                            if node == key:
+                                break
+                        if len(component) > 1 or key in self._resolved_children(key):
+                            cyclic.update(component)
+        return cyclic
+
+    def _resolved_children(self, key: str) -> list[str]:
+        """Internal callees of a function (first resolution per call), memoized."""
+        children = self._children.get(key)
+        if children is None:
+            file_path = key.rsplit(":", 1)[0] if ":" in key else ""
+            children = []
+            for call in self.call_graph.get(key, {}).get("calls", []):
+                # Skip standard library / built-in calls
+                if self._is_stdlib_call(call):
+                    continue
+                # Take the first match (could be several in different files)
+                call_keys = self._resolve_call(call, file_path)
+                if call_keys:
+                    children.append(call_keys[0])
+            self._children[key] = children
+        return children
+
+    def _node(self, key: str) -> dict[str, Any]:
+        """Node info for a call graph key."""
+        if ":" in key:
+            file_path, func_name = key.rsplit(":", 1)
+        else:
+            file_path, func_name = "", key
+        return {
+            "name": func_name,
+            "file": file_path,
+            "line": self.call_graph.get(key, {}).get("line", 0),
+            "key": key,
+        }
+
+    def find_flow_key(self, entry: str) -> str | None:
+        """
+        Resolve a user-supplied entry point to a call graph key.
+
+        Args:
+            entry: Call graph key ("file.py:func"), function name, or a
+                key suffix (e.g. "cli.py:main").
+
+        Returns:
+            The call graph key, or None if nothing matches.
+        """
+        if entry in self.call_graph:
+            return entry
+        if entry in self._func_to_key:
+            return self._func_to_key[entry][0]
+        for key in self.call_graph:
+            if key.endswith(entry):
+                return str(key)
+        return None
+
     def find_entry_points(self) -> list[dict[str, Any]]:
         """
         Find entry point functions in the codebase.
@@ -192,12 +395,16 @@ class ExecutionFlowAnalyzer:
         visited: set[str] | None = None,
     ) -> dict[str, Any]:
         """
-        Trace execution flow from a starting function.
+        Trace execution flow from a starting function as a nested tree.
+
+        Shared callees are expanded again under every caller, so the tree
+        can grow exponentially with depth; analyze() uses the shared node
+        table instead. Intended for inspecting a single entry point.
 
         Args:
             start_key: The call graph key to start from (file:function).
             max_depth: Maximum depth to trace.
-            visited: Set of already visited keys (for cycle detection).
+            visited: Keys on the current call path (for cycle detection).
 
         Returns:
             Flow tree structure.
@@ -208,42 +415,15 @@ class ExecutionFlowAnalyzer:
         if start_key in visited or max_depth <= 0:
             return {"truncated": True, "reason": "cycle" if start_key in visited else "max_depth"}
 
-        visited = visited | {start_key}
-
-        # Get call data
-        call_data = self.call_graph.get(start_key, {})
-        calls = call_data.get("calls", [])
-
-        # Parse the key
-        if ":" in start_key:
-            file_path, func_name = start_key.rsplit(":", 1)
-        else:
-            file_path, func_name = "", start_key
-
-        # Build flow node
-        node = {
-            "name": func_name,
-            "file": file_path,
-            "line": call_data.get("line", 0),
-            "key": start_key,
-            "calls": [],
-        }
-
-        # Trace each call - only include internal (resolved) calls
-        for call in calls:
-            # Skip standard library / built-in calls
-            if self._is_stdlib_call(call):
-                continue
+        node = self._node(start_key)
 
-            # Find the full key for this call
-            call_keys = self._resolve_call(call, file_path)
-
-            if call_keys:
-                # Trace the first matching call (could be multiple in different files)
-                for call_key in call_keys[:1]:  # Take first match
-                    child_flow = self.trace_flow(call_key, max_depth - 1, visited)
-                    node["calls"].append(child_flow)
-            # Skip external/unresolved calls - don't add them to the tree
+        # Only internal (resolved) calls; the path set is shared, not copied
+        visited.add(start_key)
+        node["calls"] = [
+            self.trace_flow(child, max_depth - 1, visited)
+            for child in self._resolved_children(start_key)
+        ]
+        visited.discard(start_key)
 
         return node
 
@@ -296,21 +476,28 @@ class ExecutionFlowAnalyzer:
             count += self._count_calls(child)
         return count
 
-    def _get_all_functions(self, flows: list[dict[str, Any]]) -> set[str]:
-        """Get all unique function keys from flows."""
-        functions = set()
-
-        def collect(flow: dict[str, Any]) -> None:
-            key = flow.get("key", "")
-            if key and not flow.get("external"):
-                functions.add(key)
-            for child in flow.get("calls", []):
-                collect(child)
+    def flow_tree(self, entry: str, max_depth: int = 6) -> dict[str, Any] | None:
+        """
+        Nested flow tree for a single entry point.
 
-        for f in flows:
-            collect(f.get("flow", {}))
+        Args:
+            entry: Entry point (see find_flow_key()).
+            max_depth: Maximum depth to trace.
 
-        return functions
+        Returns:
+            {entry_point, flow, depth, total_calls}, or None if the entry
+            point is not in the call graph.
+        """
+        key = self.find_flow_key(entry)
+        if key is None:
+            return None
+        flow = self.trace_flow(key, max_depth=max_depth)
+        return {
+            "entry_point": key,
+            "flow": flow,
+            "depth": self._get_max_depth(flow),
+            "total_calls": self._count_calls(flow),
+        }
 
     def format_flow_tree(self, flow: dict[str, Any], indent: int = 0) -> str:
         """
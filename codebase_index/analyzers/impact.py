@@ -1,11 +1,15 @@
 """
 Impact radius analyzer for codebase_index.
 
-Analyzes the impact radius of changes to a file by finding:
-- Functions/classes defined in the file
-- Callers of those functions
+Analyzes the impact radius of changes to one or more files by finding:
+- Functions/classes defined in the files
+- Callers of those functions (direct and transitive)
 - Affected tests
 - Affected endpoints/routes
+
+Transitive callers come from precomputed reachability bitsets (see
+analyzers/reachability.py), so analyzing many files costs about as much
+as analyzing one.
 """
 
 from __future__ import annotations
@@ -13,6 +17,10 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
+from codebase_index.analyzers.module_index import ModuleIndex
+from codebase_index.analyzers.reachability import CallerReachability
+from codebase_index.analyzers.test_mapper import is_test_path
+
 if TYPE_CHECKING:
     from typing import Any
 
@@ -33,6 +41,9 @@ class ImpactAnalyzer:
         self._files_by_path: dict[str, dict[str, Any]] | None = None
         self._call_graph: dict[str, Any] | None = None
         self._reverse_call_graph: dict[str, list[str]] | None = None
+        self._reachability: CallerReachability | None = None
+        self._test_mask: int | None = None
+        self._module_index: ModuleIndex | None = None
 
     @property
     def files_by_path(self) -> dict[str, dict[str, Any]]:
@@ -64,6 +75,30 @@ class ImpactAnalyzer:
                     self._reverse_call_graph[call].append(func_key)
         return self._reverse_call_graph
 
+    @property
+    def reachability(self) -> CallerReachability:
+        """Get the precomputed caller reachability (built on first use)."""
+        if self._reachability is None:
+            self._reachability = CallerReachability(self.call_graph)
+        return self._reachability
+
+    @property
+    def test_mask(self) -> int:
+        """Bitset of call graph components containing test functions."""
+        if self._test_mask is None:
+            self._test_mask = self.reachability.mask_of(
+                key for key in self.call_graph
+                if is_test_path(key.split(":")[0] if ":" in key else "")
+            )
+        return self._test_mask
+
+    @property
+    def module_index(self) -> ModuleIndex:
+        """Module resolution index over the indexed files (built on first use)."""
+        if self._module_index is None:
+            self._module_index = ModuleIndex(self.index_data.get("files", []))
+        return self._module_index
+
     def analyze_file(self, file_path: str) -> dict[str, Any]:
         """
         Analyze the impact radius of changes to a file.
@@ -99,36 +134,112 @@ class ImpactAnalyzer:
 
         actual_path = file_info.get("path", file_path)
         result["file"] = actual_path
+        result.update(self._analyze([file_info]))
+        result["summary"] = self._build_summary(result)
 
-        # Get symbols defined in this file
-        exports = file_info.get("exports", {})
-        symbols = self._extract_symbols(actual_path, exports)
-        result["symbols"] = symbols
+        return result
 
-        # Find direct callers
-        direct_callers = self._find_direct_callers(actual_path, symbols)
-        result["direct_callers"] = direct_callers
+    def analyze_files(self, file_paths: list[str]) -> dict[str, Any]:
+        """
+        Analyze the combined impact radius of changes to several files.
 
-        # Find transitive callers (up to 2 levels deep)
-        transitive_callers = self._find_transitive_callers(direct_callers, depth=2)
-        result["transitive_callers"] = transitive_callers
+        Transitive callers, tests and endpoints are resolved once for the
+        union of all files rather than once per file.
 
-        # Find affected tests
-        all_callers = direct_callers + transitive_callers
-        affected_tests = self._find_affected_tests(all_callers, actual_path)
-        result["affected_tests"] = affected_tests
+        Args:
+            file_paths: Paths of the changed files.
 
-        # Find affected endpoints
-        affected_endpoints = self._find_affected_endpoints(
-            actual_path, symbols, all_callers
-        )
-        result["affected_endpoints"] = affected_endpoints
+        Returns:
+            Dictionary with the same keys as analyze_file(), except that
+            "file" is replaced by "files" (paths found in the index) and
+            "not_found" (paths that are not).
+        """
+        file_infos = []
+        not_found = []
+        seen_paths = set()
+        for file_path in file_paths:
+            file_info = self._find_file(file_path)
+            if not file_info:
+                not_found.append(file_path)
+                continue
+            actual_path = file_info.get("path", file_path)
+            if actual_path not in seen_paths:
+                seen_paths.add(actual_path)
+                file_infos.append(file_info)
 
-        # Build summary
+        result: dict[str, Any] = {
+            "files": [info.get("path", "") for info in file_infos],
+            "not_found": not_found,
+        }
+        result.update(self._analyze(file_infos))
         result["summary"] = self._build_summary(result)
+        if not_found:
+            result["summary"] += f"; {len(not_found)} file(s) not found in index"
 
         return result
 
+    def _analyze(self, file_infos: list[dict[str, Any]]) -> dict[str, Any]:
+        """Symbols, callers, tests and endpoints for a set of indexed files."""
+        changed = {
+            info.get("path", ""): self.extract_symbols(info.get("path", ""), info.get("exports", {}))
+            for info in file_infos
+        }
+        return self.analyze_symbols(changed, list(changed))
+
+    def analyze_symbols(
+        self,
+        changed: dict[str, list[dict[str, Any]]],
+        module_paths: list[str],
+    ) -> dict[str, Any]:
+        """
+        Callers, tests and endpoints for a set of changed symbols.
+
+        Args:
+            changed: File path -> changed symbols in that file (as returned
+                by extract_symbols()).
+            module_paths: Files changed as a whole (or at module level), so
+                that importers and every endpoint they define are affected.
+
+        Returns:
+            Dictionary with symbols, direct_callers, transitive_callers,
+            affected_tests and affected_endpoints.
+        """
+        symbols: list[dict[str, Any]] = []
+        direct_callers: list[dict[str, Any]] = []
+        seen_callers: set[str] = set()
+        whole_files = set(module_paths)
+        changed_keys = {sym["qualified"] for file_symbols in changed.values() for sym in file_symbols}
+
+        for path, file_symbols in changed.items():
+            symbols.extend(file_symbols)
+
+            for caller in self._find_direct_callers(file_symbols):
+                # Skip self-references: the changed symbols themselves, or
+                # anything in a file that changed as a whole
+                if caller["function"] in changed_keys:
+                    continue
+                if caller["file"] == path and path in whole_files:
+                    continue
+                if caller["function"] not in seen_callers:
+                    seen_callers.add(caller["function"])
+                    direct_callers.append(caller)
+
+        transitive_callers = self._find_transitive_callers(direct_callers)
+
+        # Tests and endpoints reached through any caller
+        caller_mask = self.reachability.callers_mask(seen_callers)
+
+        all_callers = direct_callers + transitive_callers
+        return {
+            "symbols": symbols,
+            "direct_callers": direct_callers,
+            "transitive_callers": transitive_callers,
+            "affected_tests": self._find_affected_tests(all_callers, module_paths, caller_mask),
+            "affected_endpoints": self._find_affected_endpoints(
+                module_paths, all_callers, changed_keys
+            ),
+        }
+
     def _find_file(self, file_path: str) -> dict[str, Any] | None:
         """Find file in index by exact or partial path match."""
         # Exact match
@@ -146,7 +257,7 @@ class ImpactAnalyzer:
 
         return None
 
-    def _extract_symbols(
+    def extract_symbols(
         self, file_path: str, exports: dict[str, Any]
     ) -> list[dict[str, Any]]:
         """Extract function and class symbols from exports."""
@@ -177,12 +288,9 @@ class ImpactAnalyzer:
 
         return symbols
 
-    def _find_direct_callers(
-        self, file_path: str, symbols: list[dict[str, Any]]
-    ) -> list[dict[str, Any]]:
-        """Find functions that directly call symbols in this file."""
+    def _find_direct_callers(self, symbols: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Find functions that directly call the given symbols."""
         callers = []
-        seen = set()
 
         # Get symbol names to match
         symbol_names = set()
@@ -193,104 +301,76 @@ class ImpactAnalyzer:
             if len(parts) > 1:
                 symbol_names.add(parts[-1])  # Just the method name
 
-        # Search call graph for callers
-        for func_key, func_data in self.call_graph.items():
-            calls = func_data.get("calls", [])
-
-            for call in calls:
-                # Check if call matches any symbol
-                matched = False
-                if call in symbol_names:
-                    matched = True
-                else:
-                    # Check if call ends with a symbol method
-                    for sym_name in symbol_names:
-                        if call.endswith(f".{sym_name}") or call == sym_name:
-                            matched = True
-                            break
-
-                if matched and func_key not in seen:
-                    seen.add(func_key)
-                    caller_file = func_key.split(":")[0] if ":" in func_key else ""
-                    # Skip self-references
-                    if caller_file != file_path:
-                        callers.append({
-                            "function": func_key,
-                            "file": caller_file,
-                            "calls": call,
-                        })
+        # Calls equal to a name or ending with ".name", via the name index
+        for func_key, call in self.reachability.direct_calls(symbol_names):
+            callers.append({
+                "function": func_key,
+                "file": func_key.split(":")[0] if ":" in func_key else "",
+                "calls": call,
+            })
 
         return callers
 
     def _find_transitive_callers(
-        self, direct_callers: list[dict[str, Any]], depth: int = 2
+        self, direct_callers: list[dict[str, Any]]
     ) -> list[dict[str, Any]]:
-        """Find functions that transitively depend on the file."""
-        transitive = []
-        seen = {c["function"] for c in direct_callers}
-        current_level = [c["function"] for c in direct_callers]
-
-        for _ in range(depth):
-            next_level = []
-            for func_key in current_level:
-                # Extract function name from qualified path
-                func_name = func_key.split(":")[-1] if ":" in func_key else func_key
-
-                # Find callers of this function
-                for caller, calls in self.call_graph.items():
-                    if caller in seen:
-                        continue
-                    call_list = calls.get("calls", [])
-                    if func_name in call_list or any(
-                        c.endswith(f".{func_name}") for c in call_list
-                    ):
-                        seen.add(caller)
-                        next_level.append(caller)
-                        caller_file = caller.split(":")[0] if ":" in caller else ""
-                        transitive.append({
-                            "function": caller,
-                            "file": caller_file,
-                            "depth": _ + 1,
-                        })
-
-            current_level = next_level
-            if not current_level:
-                break
+        """
+        Find functions that transitively depend on the direct callers.
 
+        "depth" counts calls from the nearest direct caller (1 = calls a
+        direct caller).
+        """
+        transitive = []
+        depths = self.reachability.caller_depths(c["function"] for c in direct_callers)
+        for caller, depth in depths.items():
+            transitive.append({
+                "function": caller,
+                "file": caller.split(":")[0] if ":" in caller else "",
+                "depth": depth,
+            })
         return transitive
 
     def _find_affected_tests(
-        self, callers: list[dict[str, Any]], file_path: str
+        self,
+        callers: list[dict[str, Any]],
+        file_paths: list[str],
+        caller_mask: int = 0,
     ) -> list[dict[str, Any]]:
         """Find tests that could be affected by changes."""
         affected = []
         seen = set()
 
-        def is_test_path(path: str) -> bool:
-            return (
-                path.startswith("test_")
-                or "/test_" in path
-                or "/tests/" in path
-                or path.endswith("_test.py")
-                or path.endswith(".test.ts")
-                or path.endswith(".test.js")
-                or path.endswith(".spec.ts")
-                or path.endswith(".spec.js")
-                or "/__tests__/" in path
-            )
-
-        # Check if any caller is in a test file
-        for caller in callers:
-            caller_file = caller.get("file", "")
-            if is_test_path(caller_file) and caller_file not in seen:
-                seen.add(caller_file)
+        # Check if any caller is in a test file (skipped when the bitsets
+        # show no test function among the callers)
+        if caller_mask & self.test_mask:
+            for caller in callers:
+                caller_file = caller.get("file", "")
+                if is_test_path(caller_file) and caller_file not in seen:
+                    seen.add(caller_file)
+                    affected.append({
+                        "file": caller_file,
+                        "function": caller.get("function"),
+                        "reason": "calls symbol",
+                    })
+
+        # Test files importing a changed Python file, via the module index
+        module_index = self.module_index
+        importers: set[str] = set()
+        for file_path in file_paths:
+            importers.update(module_index.importers_of(file_path))
+        for path in sorted(importers):
+            if is_test_path(path) and path not in seen:
+                seen.add(path)
                 affected.append({
-                    "file": caller_file,
-                    "function": caller.get("function"),
-                    "reason": "calls symbol",
+                    "file": path,
+                    "reason": "imports from file",
                 })
 
-        # Also check for test files that import from this file
+        # Other languages: match import strings against the changed paths
+        file_paths = [p for p in file_paths if p not in module_index.paths]
+        if not file_paths:
+            return affected
+
         for path, file_info in self.files_by_path.items():
             if not is_test_path(path) or path in seen:
                 continue
@@ -308,44 +388,54 @@ class ImpactAnalyzer:
             for imp in imports:
                 # Handle string imports
                 if isinstance(imp, str):
-                    # Check if import references the target file
-                    target_module = file_path.replace("/", ".").replace(".py", "")
-                    if file_path in imp or target_module in imp:
-                        seen.add(path)
-                        affected.append({
-                            "file": path,
-                            "reason": "imports from file",
-                        })
-                        break
+                    module = imp
                 # Handle dict imports
                 elif isinstance(imp, dict):
                     module = imp.get("module", "")
-                    if file_path in module or module.endswith(
-                        file_path.replace("/", ".").replace(".py", "")
-                    ):
-                        seen.add(path)
-                        affected.append({
-                            "file": path,
-                            "reason": "imports from file",
-                        })
-                        break
+                else:
+                    continue
+
+                # Check if import references a target file
+                if any(
+                    self._imports_file(module, file_path, exact=isinstance(imp, dict))
+                    for file_path in file_paths
+                ):
+                    seen.add(path)
+                    affected.append({
+                        "file": path,
+                        "reason": "imports from file",
+                    })
+                    break
 
         return affected
 
+    @staticmethod
+    def _imports_file(module: str, file_path: str, exact: bool) -> bool:
+        """Whether an import (module name or string) refers to file_path."""
+        target_module = file_path.replace("/", ".").replace(".py", "")
+        if file_path in module:
+            return True
+        if exact:
+            return module.endswith(target_module)
+        return target_module in module
+
     def _find_affected_endpoints(
         self,
-        file_path: str,
-        symbols: list[dict[str, Any]],
+        file_paths: list[str],
         callers: list[dict[str, Any]],
+        changed_keys: set[str] | None = None,
     ) -> list[dict[str, Any]]:
         """Find API endpoints that could be affected."""
         affected = []
         seen = set()
+        changed_files = set(file_paths)
+        changed_keys = changed_keys or set()
+        caller_files = {c.get("file") for c in callers}
 
         # Get all endpoints from the index
-        endpoints = self.index_data.get("endpoints", [])
+        endpoints = self.index_data.get("api_endpoints", [])
 
-        # Check if any endpoint is in the same file
+        # Check if any endpoint is in a changed file
         for endpoint in endpoints:
             endpoint_file = endpoint.get("file", "")
             endpoint_key = f"{endpoint.get('method', '')} {endpoint.get('path', '')}"
@@ -353,8 +443,8 @@ class ImpactAnalyzer:
             if endpoint_key in seen:
                 continue
 
-            # Direct: endpoint in the same file
-            if endpoint_file == file_path:
+            # Direct: endpoint in a changed file
+            if endpoint_file in changed_files:
                 seen.add(endpoint_key)
                 affected.append({
                     **endpoint,
@@ -362,10 +452,17 @@ class ImpactAnalyzer:
                 })
                 continue
 
-            # Indirect: endpoint's handler calls symbols from this file
-            handler = endpoint.get("handler", "")
-            caller_files = {c.get("file") for c in callers}
+            # Direct: the handler itself changed
+            handler = endpoint.get("function") or endpoint.get("handler")
+            if handler and f"{endpoint_file}:{handler}" in changed_keys:
+                seen.add(endpoint_key)
+                affected.append({
+                    **endpoint,
+                    "reason": "handler changed",
+                })
+                continue
 
+            # Indirect: endpoint's handler file calls symbols from the files
             if endpoint_file in caller_files:
                 seen.add(endpoint_key)
                 affected.append({
@@ -385,7 +482,10 @@ class ImpactAnalyzer:
         num_tests = len(result["affected_tests"])
         num_endpoints = len(result["affected_endpoints"])
 
-        parts.append(f"File defines {num_symbols} symbol(s)")
+        if "files" in result:
+            parts.append(f"{len(result['files'])} file(s) define {num_symbols} symbol(s)")
+        else:
+            parts.append(f"File defines {num_symbols} symbol(s)")
 
         if num_direct > 0 or num_transitive > 0:
             parts.append(
@@ -0,0 +1,240 @@
+"""
+Lexical (keyword) search for codebase_index.
+
+BM25 inverted index over code symbols. Identifiers are split on
+camelCase and snake_case so "getUserById" matches "user" and "user_id".
+Used alongside embeddings for hybrid search, and on its own when
+exact identifiers matter more than concepts.
+
+Pure Python - no optional dependencies.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from typing import Any
+
+# BM25 tuning parameters (standard defaults)
+DEFAULT_K1 = 1.2
+DEFAULT_B = 0.75
+
+# Symbol names are repeated so name hits outrank docstring mentions
+NAME_WEIGHT = 3
+
+# Identifier-ish runs of characters in free text or code
+IDENTIFIER_PATTERN = re.compile(r"[A-Za-z0-9_]+")
+
+# Splits one identifier into camelCase / PascalCase / ACRONYM / digit parts
+CAMEL_PATTERN = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into lowercase search terms.
+
+    Identifiers are broken on snake_case and camelCase boundaries. The
+    whole identifier is kept as an extra term so exact names still match.
+
+    Args:
+        text: Free text, a docstring, or an identifier.
+
+    Returns:
+        List of terms (duplicates preserved for term frequency).
+    """
+    terms: list[str] = []
+    for identifier in IDENTIFIER_PATTERN.findall(text):
+        parts = [
+            part.lower()
+            for chunk in identifier.split("_") if chunk
+            for part in CAMEL_PATTERN.findall(chunk)
+        ]
+        terms.extend(part for part in parts if len(part) > 1 or part.isdigit())
+
+        whole = identifier.strip("_").lower()
+        if len(parts) > 1 and whole:
+            terms.append(whole)
+    return terms
+
+
+def symbol_terms(symbol: dict[str, Any]) -> list[str]:
+    """
+    Build the term list for one symbol from the semantic symbol table.
+
+    Uses the name (boosted), semantic tags, signature, summary and docstring.
+
+    Args:
+        symbol: Symbol entry as stored in index["semantic"]["symbols"].
+
+    Returns:
+        List of terms for the BM25 document.
+    """
+    terms = tokenize(symbol.get("name", "")) * NAME_WEIGHT
+
+    for tag in symbol.get("tags", []):
+        terms.extend(tokenize(tag))
+
+    for field in ("signature", "summary", "docstring"):
+        value = symbol.get(field, "")
+        if value:
+            terms.extend(tokenize(value))
+
+    return terms
+
+
+class BM25Index:
+    """
+    BM25 inverted index over a list of documents.
+
+    Documents are identified by their row position, which matches the
+    row of the embedding matrix for the same symbol.
+    """
+
+    def __init__(self, k1: float = DEFAULT_K1, b: float = DEFAULT_B) -> None:
+        """
+        Initialize an empty index.
+
+        Args:
+            k1: Term frequency saturation.
+            b: Document length normalization.
+        """
+        self.k1 = k1
+        self.b = b
+        self.postings: dict[str, list[list[int]]] = {}
+        self.doc_lengths: list[int] = []
+        self.avg_length = 0.0
+
+    @property
+    def doc_count(self) -> int:
+        """Number of documents in the index."""
+        return len(self.doc_lengths)
+
+    @classmethod
+    def from_symbols(cls, symbols: Iterable[dict[str, Any]]) -> BM25Index:
+        """
+        Build an index from semantic symbol entries.
+
+        Args:
+            symbols: Symbol entries, in embedding row order.
+
+        Returns:
+            Populated BM25Index.
+        """
+        index = cls()
+        index.build(symbol_terms(symbol) for symbol in symbols)
+        return index
+
+    def build(self, documents: Iterable[list[str]]) -> None:
+        """
+        Index a sequence of tokenized documents.
+
+        Args:
+            documents: Term lists, one per document.
+        """
+        postings: dict[str, list[list[int]]] = {}
+        doc_lengths: list[int] = []
+
+        for doc_id, terms in enumerate(documents):
+            doc_lengths.append(len(terms))
+            counts: dict[str, int] = {}
+            for term in terms:
+                counts[term] = counts.get(term, 0) + 1
+            for term, tf in counts.items():
+                postings.setdefault(term, []).append([doc_id, tf])
+
+        self.postings = postings
+        self.doc_lengths = doc_lengths
+        self.avg_length = sum(doc_lengths) / len(doc_lengths) if doc_lengths else 0.0
+
+    def query_terms(self, query: str) -> list[str]:
+        """Unique terms of a query, in order of first appearance."""
+        return list(dict.fromkeys(tokenize(query)))
+
+    def covers(self, terms: list[str]) -> bool:
+        """Whether every term appears in the index vocabulary."""
+        return bool(terms) and all(term in self.postings for term in terms)
+
+    def score(self, terms: list[str]) -> dict[int, float]:
+        """
+        Compute BM25 scores for all documents matching any term.
+
+        Args:
+            terms: Query terms (see query_terms()).
+
+        Returns:
+            Mapping of document id to BM25 score. Non-matching documents
+            are omitted (their score is 0).
+        """
+        scores: dict[int, float] = {}
+        n = self.doc_count
+        if n == 0:
+            return scores
+
+        avg_length = self.avg_length or 1.0
+        for term in terms:
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+
+            df = len(posting)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for doc_id, tf in posting:
+                length_norm = 1 - self.b + self.b * self.doc_lengths[doc_id] / avg_length
+                gain = idf * tf * (self.k1 + 1) / (tf + self.k1 * length_norm)
+                scores[doc_id] = scores.get(doc_id, 0.0) + gain
+
+        return scores
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 10,
+        allowed: set[int] | None = None,
+    ) -> list[tuple[int, float]]:
+        """
+        Rank documents for a query.
+
+        Args:
+            query: Search query.
+            top_k: Number of results.
+            allowed: If given, only these document ids are ranked.
+
+        Returns:
+            (doc_id, score) pairs, best first.
+        """
+        scores = self.score(self.query_terms(query))
+        if allowed is not None:
+            scores = {doc_id: s for doc_id, s in scores.items() if doc_id in allowed}
+        return heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize for storage in the index JSON."""
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "doc_lengths": self.doc_lengths,
+            "postings": self.postings,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> BM25Index:
+        """
+        Restore an index saved with to_dict().
+
+        Args:
+            data: Serialized index.
+
+        Returns:
+            BM25Index.
+        """
+        index = cls(k1=data.get("k1", DEFAULT_K1), b=data.get("b", DEFAULT_B))
+        index.postings = data.get("postings", {})
+        index.doc_lengths = data.get("doc_lengths", [])
+        if index.doc_lengths:
+            index.avg_length = sum(index.doc_lengths) / len(index.doc_lengths)
+        return index
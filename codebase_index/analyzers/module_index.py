@@ -0,0 +1,200 @@
+"""
+Module resolution index for codebase_index.
+
+Maps every Python file to the dotted module names it can be imported
+as, and every import statement to the files it resolves to. Orphan
+detection, impact analysis and import graph queries build one per file
+list and keep it while they query it, so "is this file imported?" is a
+set lookup. It reflects the files as they were when it was built.
+
+A file gets one name per plausible import root:
+- the project root ("src/app/db.py" -> "src.app.db")
+- its top-level package's parent, found by walking up __init__.py files
+  ("src/app/db.py" with src/app/__init__.py -> "app.db")
+- the directory after a source-root folder such as src/ or lib/
+
+Imports that match no name are also tried as a sibling of the importing
+file, the way a script's own directory is on sys.path.
+
+Imports come from the parser's ``imports["modules"]`` list (relative
+imports keep their leading dots). Indexes written before that list
+existed fall back to ``imports["internal"]``.
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import PurePosixPath
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Directory names that are commonly put on sys.path (src/ layouts)
+SOURCE_ROOTS = {"src", "lib", "python"}
+
+
+def _dotted(parts: tuple[str, ...] | list[str]) -> str:
+    return ".".join(parts)
+
+
+class ModuleIndex:
+    """Dotted module names per file and resolved imports per file."""
+
+    def __init__(self, files: list[dict[str, Any]]) -> None:
+        """
+        Build the index.
+
+        Args:
+            files: File info dicts from the scan (non-Python files are ignored).
+        """
+        self.paths: set[str] = set()
+        self._raw_imports: dict[str, list[str]] = {}
+
+        for file_info in files:
+            path = file_info.get("path", "")
+            if file_info.get("language") != "python" or not path.endswith((".py", ".pyi")):
+                continue
+            self.paths.add(path)
+            imports = file_info.get("exports", {}).get("imports", {})
+            if isinstance(imports, dict):
+                modules = imports.get("modules")
+                if modules is None:
+                    modules = imports.get("internal", [])
+                self._raw_imports[path] = [m for m in modules if isinstance(m, str) and m]
+
+        self.package_dirs: set[str] = {
+            str(PurePosixPath(path).parent) for path in self.paths
+            if PurePosixPath(path).name == "__init__.py"
+        }
+
+        # Dotted name -> files, and file -> its names (primary name first)
+        self.modules: dict[str, list[str]] = {}
+        self.file_modules: dict[str, list[str]] = {}
+        for path in sorted(self.paths):
+            names = self._names_for(path)
+            self.file_modules[path] = names
+            for name in names:
+                self.modules.setdefault(name, []).append(path)
+
+        self._imports: dict[str, set[str]] | None = None
+        self._importers: dict[str, set[str]] | None = None
+
+    def _module_parts(self, path: str) -> list[str]:
+        """Path components of a file as a module (package for __init__.py)."""
+        pure = PurePosixPath(path)
+        parts = list(pure.with_suffix("").parts)
+        if pure.name.startswith("__init__."):
+            parts.pop()
+        return parts
+
+    def _names_for(self, path: str) -> list[str]:
+        """Dotted names a file can be imported as, most specific root first."""
+        parts = self._module_parts(path)
+        if not parts:
+            return []
+
+        # The file's package chain: walk up while directories are packages
+        dir_parts = list(PurePosixPath(path).parent.parts)
+        if dir_parts == ["."]:
+            dir_parts = []
+        root = len(dir_parts)
+        while root > 0 and "/".join(dir_parts[:root]) in self.package_dirs:
+            root -= 1
+
+        names = [_dotted(parts[root:])]
+        names.append(_dotted(parts))
+        for position, part in enumerate(dir_parts):
+            if part in SOURCE_ROOTS:
+                names.append(_dotted(parts[position + 1:]))
+
+        return [name for name in dict.fromkeys(names) if name]
+
+    def module_name(self, path: str) -> str | None:
+        """Primary dotted module name of a file (relative to its package root)."""
+        names = self.file_modules.get(path)
+        return names[0] if names else None
+
+    def resolve(self, module: str, from_path: str = "") -> list[str]:
+        """
+        Files an import can refer to.
+
+        Args:
+            module: Imported module, e.g. "app.db" or ".db" (relative).
+            from_path: File containing the import (needed for relative
+                imports and sibling imports).
+
+        Returns:
+            Matching file paths (empty for external modules).
+        """
+        level = len(module) - len(module.lstrip("."))
+        if level:
+            base = list(PurePosixPath(from_path).parent.parts)
+            if base == ["."]:
+                base = []
+            if level - 1 > len(base):
+                return []
+            base = base[:len(base) - (level - 1)]
+            rest = module[level:]
+            target = base + (rest.split(".") if rest else [])
+            candidates = ["/".join(target) + ".py", "/".join(target + ["__init__.py"])]
+            return [c for c in candidates if c in self.paths]
+
+        found = self.modules.get(module)
+        if found:
+            return found
+
+        # Sibling module of a script
+        parent = PurePosixPath(from_path).parent
+        sibling = str(parent / module.replace(".", "/")) + ".py"
+        if sibling.startswith("./"):
+            sibling = sibling[2:]
+        return [sibling] if sibling in self.paths else []
+
+    def _build_graph(self) -> tuple[dict[str, set[str]], dict[str, set[str]]]:
+        """Resolve every import once (file -> imported files and reverse)."""
+        imports: dict[str, set[str]] = {}
+        importers: dict[str, set[str]] = {}
+        for path, modules in self._raw_imports.items():
+            targets: set[str] = set()
+            for module in modules:
+                targets.update(self.resolve(module, path))
+                # "import a.b.c" also runs a/__init__.py and a/b/__init__.py
+                if not module.startswith("."):
+                    position = module.rfind(".")
+                    while position > 0:
+                        targets.update(self.resolve(module[:position], path))
+                        position = module.rfind(".", 0, position)
+            targets.discard(path)
+            imports[path] = targets
+            for target in targets:
+                importers.setdefault(target, set()).add(path)
+        logger.debug(
+            "Module index: %d files, %d import edges",
+            len(self.paths), sum(len(t) for t in imports.values()),
+        )
+        return imports, importers
+
+    def imports_of(self, path: str) -> set[str]:
+        """Project files imported by a file."""
+        if self._imports is None:
+            self._imports, self._importers = self._build_graph()
+        return self._imports.get(path, set())
+
+    def importers_of(self, path: str) -> set[str]:
+        """Project files that import a file."""
+        if self._importers is None:
+            self._imports, self._importers = self._build_graph()
+        return self._importers.get(path, set())
+
+    def is_imported(self, path: str) -> bool:
+        """Whether any other project file imports this file."""
+        return bool(self.importers_of(path))
+
+    def import_graph(self) -> dict[str, list[str]]:
+        """File -> sorted imported project files, for every Python file."""
+        if self._imports is None:
+            self._imports, self._importers = self._build_graph()
+        return {path: sorted(self._imports.get(path, ())) for path in sorted(self.paths)}
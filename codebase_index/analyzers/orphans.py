@@ -2,6 +2,7 @@
 Orphaned file scanner for codebase_index.
 
 Detects Python files that are never imported anywhere (dead code).
+Imports are resolved to files through ModuleIndex (module_index.py).
 """
 
 from __future__ import annotations
@@ -11,6 +12,8 @@ import re
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from codebase_index.analyzers.module_index import ModuleIndex
+
 if TYPE_CHECKING:
     from typing import Any
 
@@ -52,9 +55,7 @@ class OrphanedFileScanner:
     ]
 
     def __init__(self) -> None:
-        self.all_files: set[str] = set()
-        self.all_imports: dict[str, list[str]] = {}
-        self.imported_modules: set[str] = set()
+        self.module_index: ModuleIndex | None = None
 
     def scan(
         self,
@@ -81,37 +82,12 @@ class OrphanedFileScanner:
             "orphaned_lines": 0,
         }
 
-        # Step 1: Collect all Python files and their module names
-        python_files: list[dict[str, Any]] = []
-        for file_info in files:
-            if file_info.get("language") != "python":
-                continue
-
-            path = file_info["path"]
-            python_files.append(file_info)
-            result["total_python_files"] += 1
-
-            # Extract module name from path
-            module_name = self._path_to_module(path)
-            if module_name:
-                if module_name not in self.all_imports:
-                    self.all_imports[module_name] = []
-                self.all_imports[module_name].append(path)
-
-        # Step 2: Collect all imports from all files
-        for file_info in python_files:
-            exports = file_info.get("exports", {})
-            imports = exports.get("imports", {})
-
-            # Internal imports point to other project files
-            for imp in imports.get("internal", []):
-                module = imp.split(".")[0] if imp else None
-                if module:
-                    self.imported_modules.add(module.lower())
+        # Step 1: Collect all Python files
+        python_files = [f for f in files if f.get("language") == "python"]
+        result["total_python_files"] = len(python_files)
 
-                # Also add full import path
-                if imp:
-                    self.imported_modules.add(imp.lower().replace(".", "/"))
+        # Step 2: Resolve every import to the files it refers to
+        self.module_index = ModuleIndex(files)
 
         # Step 3: Find orphaned files
         for file_info in python_files:
@@ -128,7 +104,7 @@ class OrphanedFileScanner:
                 continue
 
             # Check if this file is imported anywhere
-            module_name = self._path_to_module(path)
+            module_name = self.module_index.module_name(path) or self._path_to_module(path)
             if not self._is_imported(path, module_name):
                 result["orphaned_files"].append({
                     "path": path,
@@ -175,29 +151,14 @@ class OrphanedFileScanner:
 
     def _is_imported(self, path: str, module_name: str | None) -> bool:
         """Check if a file/module is imported anywhere."""
-        if not module_name:
+        if not module_name or self.module_index is None:
             return True  # Can't determine, assume used
 
-        module_lower = module_name.lower()
-
-        # Direct module name match
-        if module_lower in self.imported_modules:
-            return True
+        if path not in self.module_index.paths:
+            return True  # Not a resolvable module file, assume used
 
-        # Check path-based imports
-        path_as_module = path.replace("/", ".").replace("\\", ".").lower()
-        path_as_module = re.sub(r"\.py$", "", path_as_module)
-
-        for imported in self.imported_modules:
-            if module_lower in imported or imported in path_as_module:
-                return True
-            if imported.replace(".", "/") in path.lower():
-                return True
-
-        return False
+        return self.module_index.is_imported(path)
 
     def clear(self) -> None:
         """Clear collected data."""
-        self.all_files.clear()
-        self.all_imports.clear()
-        self.imported_modules.clear()
+        self.module_index = None
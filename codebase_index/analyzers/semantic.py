@@ -4,62 +4,126 @@ Semantic search for codebase_index.
 Uses code-specific embeddings to find code by concept/description,
 not just keyword matching. Embeds actual code bodies for better results.
 
-Requires: pip install codebase-index[semantic]
-  - sentence-transformers
-  - numpy
+Requires numpy plus the dependencies of the model's embedding backend
+(see embedding_backends.py):
+  - sentence-transformers: pip install codebase-index[semantic]
+  - onnx: pip install codebase-index[onnx]
+  - hashing: numpy only
 """
 
 from __future__ import annotations
 
+import fnmatch
+import hashlib
+import json
 import logging
+import os
 import re
+from itertools import islice
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
     from typing import Any
 
+from codebase_index.analyzers.embedding_backends import (
+    DEFAULT_BACKEND,
+    HAS_NUMPY,
+    EmbeddingBackend,
+    backend_available,
+    create_backend,
+    install_hint,
+    np,
+)
+from codebase_index.analyzers.lexical import BM25Index
+from codebase_index.utils import SourceFile
+
 logger = logging.getLogger(__name__)
 
-# Check for optional dependencies
-try:
-    import numpy as np
-    from sentence_transformers import SentenceTransformer
-    HAS_SEMANTIC = True
-except ImportError:
-    HAS_SEMANTIC = False
-    np = None  # type: ignore
-    SentenceTransformer = None  # type: ignore
+# Default (PyTorch) backend availability, kept for callers that check it
+HAS_SEMANTIC = backend_available(DEFAULT_BACKEND)
+
+# MODELS keys that describe the model rather than backend options
+MODEL_INFO_KEYS = {"name", "max_tokens", "description", "backend"}
 
 
 # Available models - code-specific models work better for code search
-MODELS = {
+MODELS: dict[str, dict[str, Any]] = {
     # Code-specific models (recommended)
     "unixcoder": {
         "name": "microsoft/unixcoder-base",
         "max_tokens": 512,
+        "backend": "sentence-transformers",
         "description": "Code-specific model, good for code search",
     },
     "codebert": {
         "name": "microsoft/codebert-base",
         "max_tokens": 512,
+        "backend": "sentence-transformers",
         "description": "Code-specific model trained on code+comments",
     },
     "codet5": {
         "name": "Salesforce/codet5-base",
         "max_tokens": 512,
+        "backend": "sentence-transformers",
         "description": "Code understanding model",
     },
     # General-purpose (faster but less code-aware)
     "minilm": {
         "name": "all-MiniLM-L6-v2",
         "max_tokens": 256,
+        "backend": "sentence-transformers",
         "description": "Fast general-purpose model",
     },
+    # CPU-optimized: same MiniLM weights on ONNX Runtime, no PyTorch
+    "minilm-onnx": {
+        "name": "sentence-transformers/all-MiniLM-L6-v2",
+        "max_tokens": 256,
+        "backend": "onnx",
+        "onnx_file": "onnx/model.onnx",
+        "description": "MiniLM on ONNX Runtime (small install, fast cold start)",
+    },
+    # Dependency-free, deterministic (tests, offline/air-gapped CI)
+    "hashing": {
+        "name": "hashing-trick-384",
+        "max_tokens": 512,
+        "backend": "hashing",
+        "dim": 384,
+        "description": "Hashing-trick encoder, numpy only, keyword-level quality",
+    },
 }
 
 DEFAULT_MODEL = "unixcoder"
 
+# Number of queries encoded and scored together in batch search mode.
+# Each batch is one encode() call and one matrix-matrix multiply.
+DEFAULT_QUERY_BATCH_SIZE = 256
+
+# Symbols encoded per shard in streaming builds (shards end on file boundaries)
+DEFAULT_SHARD_SIZE = 512
+
+# Manifest file inside an embedding checkpoint directory
+CHECKPOINT_MANIFEST = "manifest.json"
+
+# Files a checkpoint writes (the only ones it ever deletes)
+CHECKPOINT_FILE_PATTERNS = (CHECKPOINT_MANIFEST, "manifest.tmp", "shard-*.npy", "shard-*.jsonl")
+
+# Search modes: fused lexical+vector (default), embeddings only, BM25 only
+SEARCH_MODES = ("hybrid", "vector", "lexical")
+DEFAULT_SEARCH_MODE = "hybrid"
+
+# Weight of cosine similarity in hybrid scores; the rest is normalized BM25
+HYBRID_ALPHA = 0.7
+
+# In hybrid mode, when every query term is a known identifier term and the
+# BM25 matches cover at most this fraction of symbols, only those rows are
+# scored against the query embedding instead of the full matrix.
+PREFILTER_MAX_FRACTION = 0.25
+
+# Symbol attributes that search results can be filtered on
+FILTER_FIELDS = ("path", "language", "type", "category")
+
 # Semantic patterns for inferring code purpose from content
 # Format: (regex_pattern, semantic_tag)
 SEMANTIC_PATTERNS = [
@@ -127,23 +191,21 @@ class SemanticSearcher:
         self,
         model_key: str = DEFAULT_MODEL,
         cache_dir: Path | None = None,
+        backend: str | None = None,
     ) -> None:
         """
         Initialize semantic searcher.
 
         Args:
-            model_key: Model key from MODELS dict, or a HuggingFace model name.
+            model_key: Model key from MODELS dict, or a HuggingFace model name
+                       (or local model directory for the onnx backend).
             cache_dir: Directory to cache the model.
+            backend: Embedding backend; defaults to the model's backend in MODELS,
+                     or sentence-transformers for other model names.
         """
-        if not HAS_SEMANTIC:
-            raise ImportError(
-                "Semantic search requires sentence-transformers. "
-                "Install with: pip install codebase-index[semantic]"
-            )
-
         # Resolve model name
-        if model_key in MODELS:
-            model_info = MODELS[model_key]
+        model_info = MODELS.get(model_key, {})
+        if model_info:
             self.model_name = model_info["name"]
             self.max_tokens = model_info["max_tokens"]
         else:
@@ -151,27 +213,46 @@ class SemanticSearcher:
             self.model_name = model_key
             self.max_tokens = 512
 
+        self.backend_name = backend or model_info.get("backend", DEFAULT_BACKEND)
+        self.backend_options = {
+            key: value for key, value in model_info.items() if key not in MODEL_INFO_KEYS
+        }
+
+        if not backend_available(self.backend_name):
+            raise ImportError(
+                f"Semantic search with the {self.backend_name} backend is not available. "
+                f"Install with: {install_hint(self.backend_name)}"
+            )
+
         self.model_key = model_key
         self.cache_dir = cache_dir
-        self._model: Any = None
+        self._model: EmbeddingBackend | None = None
         self._embeddings: Any = None
+        self._normalized: Any = None
         self._symbols: list[dict[str, Any]] = []
+        self._lexical: BM25Index | None = None
+        self._facets: dict[str, dict[str, list[int]]] | None = None
+        self._filter_cache: dict[tuple[tuple[str, str], ...], Any] = {}
+        # Rows gathered for the last filter used by search_batch()
+        self._row_matrix_cache: dict[str, Any] = {}
 
     @property
-    def model(self) -> Any:
-        """Lazy-load the embedding model."""
+    def model(self) -> EmbeddingBackend:
+        """Lazy-load the embedding backend and its model."""
         if self._model is None:
-            logger.info("Loading embedding model: %s", self.model_name)
-            self._model = SentenceTransformer(
+            logger.info(
+                "Loading embedding model: %s (%s backend)", self.model_name, self.backend_name
+            )
+            self._model = create_backend(
+                self.backend_name,
                 self.model_name,
-                cache_folder=str(self.cache_dir) if self.cache_dir else None,
+                max_tokens=self.max_tokens,
+                cache_dir=self.cache_dir,
+                options=self.backend_options,
             )
-            # Set max_seq_length to avoid position embedding overflow
-            # (RoBERTa-based models like UniXcoder have position offset issues)
-            self._model.max_seq_length = self.max_tokens
         return self._model
 
-    def _encode_with_fallback(self, texts: list[str]) -> Any:
+    def _encode_with_fallback(self, texts: list[str], show_progress_bar: bool = True) -> Any:
         """
         Encode texts with CUDA fallback to CPU on error.
 
@@ -179,11 +260,7 @@ class SemanticSearcher:
         This method catches those errors and retries on CPU.
         """
         try:
-            return self.model.encode(
-                texts,
-                show_progress_bar=True,
-                convert_to_numpy=True,
-            )
+            return self.model.encode(texts, show_progress_bar=show_progress_bar)
         except (RuntimeError, Exception) as e:
             error_msg = str(e).lower()
             # Check for CUDA-related errors
@@ -194,12 +271,8 @@ class SemanticSearcher:
                 )
                 # Force CPU by moving model
                 try:
-                    self._model = self._model.to("cpu")
-                    return self.model.encode(
-                        texts,
-                        show_progress_bar=True,
-                        convert_to_numpy=True,
-                    )
+                    self.model.to_cpu()
+                    return self.model.encode(texts, show_progress_bar=show_progress_bar)
                 except Exception as cpu_error:
                     logger.error("CPU fallback also failed: %s", cpu_error)
                     raise
@@ -211,92 +284,172 @@ class SemanticSearcher:
         self,
         index_data: dict[str, Any],
         root: Path | None = None,
+        checkpoint_dir: Path | None = None,
+        shard_size: int = DEFAULT_SHARD_SIZE,
     ) -> dict[str, Any]:
         """
         Build embeddings for all symbols in the index.
 
+        Symbols are extracted lazily, one source file at a time, and encoded
+        in shards of about ``shard_size`` symbols. With ``checkpoint_dir``,
+        every finished shard is written to disk with a manifest, so an
+        interrupted build resumes after the last completed shard.
+
         Args:
             index_data: The codebase index data.
             root: Root directory to read source files from.
+            checkpoint_dir: Directory for resumable shard checkpoints.
+            shard_size: Approximate number of symbols encoded per shard.
 
         Returns:
             Dictionary with embeddings that can be stored in the index.
         """
-        self._symbols = []
-        texts = []
-
-        # Build file content cache for code extraction
-        file_contents: dict[str, list[str]] = {}
-        if root:
-            for file_info in index_data.get("files", []):
-                file_path = root / file_info.get("path", "")
-                if file_path.exists():
-                    try:
-                        with open(file_path, "r", encoding="utf-8", errors="replace") as f:
-                            file_contents[file_info["path"]] = f.readlines()
-                    except (OSError, IOError):
-                        pass
-
-        # Extract symbols from files
-        for file_info in index_data.get("files", []):
-            file_path = file_info.get("path", "")
-            exports = file_info.get("exports", {})
-            source_lines = file_contents.get(file_path, [])
-
-            # File-level summary (if available)
-            if file_info.get("summary"):
-                file_symbol = self._create_file_symbol_info(file_info, source_lines)
-                self._symbols.append(file_symbol)
-                texts.append(file_symbol["text"])
-
-            # Functions
-            for func in exports.get("functions", []):
-                symbol_info = self._create_symbol_info(
-                    func, file_path, "function", source_lines
-                )
-                self._symbols.append(symbol_info)
-                texts.append(symbol_info["text"])
-
-            # Classes and methods
-            for cls in exports.get("classes", []):
-                symbol_info = self._create_symbol_info(
-                    cls, file_path, "class", source_lines
+        symbol_parts: list[list[dict[str, Any]]] = []
+        embedding_parts: list[Any] = []
+        done_files: set[str] = set()
+
+        checkpoint = None
+        if checkpoint_dir is not None:
+            checkpoint = EmbeddingCheckpoint(
+                checkpoint_dir, self._build_fingerprint(index_data)
+            )
+            symbol_parts, embedding_parts, done_files = checkpoint.resume()
+            if done_files:
+                logger.info(
+                    "Resuming embedding build: %d shards (%d files) already done",
+                    len(symbol_parts), len(done_files)
                 )
-                self._symbols.append(symbol_info)
-                texts.append(symbol_info["text"])
-
-                # Class methods
-                for method in cls.get("methods", []):
-                    method_info = self._create_symbol_info(
-                        method, file_path, "method", source_lines,
-                        class_name=cls.get("name")
-                    )
-                    self._symbols.append(method_info)
-                    texts.append(method_info["text"])
 
-        if not texts:
+        pending_symbols: list[dict[str, Any]] = []
+        pending_files: list[str] = []
+
+        def flush() -> None:
+            texts = [symbol["text"] for symbol in pending_symbols]
+            embeddings = self._encode_with_fallback(texts, show_progress_bar=False)
+            if checkpoint is not None:
+                checkpoint.add_shard(pending_symbols, embeddings, pending_files)
+            symbol_parts.append(list(pending_symbols))
+            embedding_parts.append(embeddings)
+            logger.info(
+                "Encoded shard %d (%d symbols)", len(embedding_parts), len(pending_symbols)
+            )
+            pending_symbols.clear()
+            pending_files.clear()
+
+        # Shards end on file boundaries so the manifest can list whole files
+        for file_path, file_symbols in self._iter_file_symbols(index_data, root, done_files):
+            pending_symbols.extend(file_symbols)
+            pending_files.append(file_path)
+            if len(pending_symbols) >= shard_size:
+                flush()
+        if pending_symbols:
+            flush()
+
+        self._symbols = [symbol for part in symbol_parts for symbol in part]
+
+        if not self._symbols:
+            if checkpoint is not None:
+                checkpoint.clear()
             return {
                 "embeddings": [],
                 "symbols": [],
                 "model": self.model_name,
                 "model_key": self.model_key,
+                "backend": self.backend_name,
             }
 
-        # Generate embeddings
-        logger.info("Generating embeddings for %d symbols...", len(texts))
-        embeddings = self._encode_with_fallback(texts)
+        embeddings = np.vstack(embedding_parts)
 
         # Store as list for JSON serialization
         self._embeddings = embeddings
+        self._normalized = self._normalize_rows(np.asarray(embeddings, dtype=np.float32))
+        self._lexical = BM25Index.from_symbols(self._symbols)
+
+        if checkpoint is not None:
+            checkpoint.clear()
 
         return {
             "embeddings": embeddings.tolist(),
             "symbols": self._symbols,
+            "lexical": self._lexical.to_dict(),
             "model": self.model_name,
             "model_key": self.model_key,
+            "backend": self.backend_name,
             "count": len(self._symbols),
         }
 
+    def _iter_file_symbols(
+        self,
+        index_data: dict[str, Any],
+        root: Path | None,
+        skip_files: set[str],
+    ) -> Iterator[tuple[str, list[dict[str, Any]]]]:
+        """
+        Yield (file path, symbol infos) one file at a time.
+
+        Only the current file's source is held in memory.
+        """
+        for file_info in index_data.get("files", []):
+            file_path = file_info.get("path", "")
+            if file_path in skip_files:
+                continue
+
+            exports = file_info.get("exports", {})
+            if not (file_info.get("summary") or exports.get("functions") or exports.get("classes")):
+                continue
+
+            source: SourceFile | None = None
+            if root:
+                try:
+                    source = SourceFile(root / file_path)
+                except OSError:
+                    pass
+
+            file_symbols: list[dict[str, Any]] = []
+
+            # File-level summary (if available)
+            if file_info.get("summary"):
+                file_symbols.append(self._create_file_symbol_info(
+                    file_info, source.head(30) if source else []
+                ))
+
+            # Functions
+            for func in exports.get("functions", []):
+                file_symbols.append(self._create_symbol_info(
+                    func, file_path, "function", source
+                ))
+
+            # Classes and methods
+            for cls in exports.get("classes", []):
+                file_symbols.append(self._create_symbol_info(
+                    cls, file_path, "class", source
+                ))
+
+                # Class methods
+                for method in cls.get("methods", []):
+                    file_symbols.append(self._create_symbol_info(
+                        method, file_path, "method", source,
+                        class_name=cls.get("name")
+                    ))
+
+            if source:
+                source.close()
+
+            # File attributes used by search filters
+            for symbol_info in file_symbols:
+                symbol_info["language"] = file_info.get("language", "")
+                symbol_info["category"] = file_info.get("category", "")
+
+            yield file_path, file_symbols
+
+    def _build_fingerprint(self, index_data: dict[str, Any]) -> str:
+        """Identify a build by model and file contents, for checkpoint reuse."""
+        digest = hashlib.sha256(f"{self.backend_name}:{self.model_name}".encode())
+        for file_info in index_data.get("files", []):
+            entry = f"{file_info.get('path', '')}:{file_info.get('hash', '')}\n"
+            digest.update(entry.encode("utf-8"))
+        return digest.hexdigest()
+
     def _create_file_symbol_info(
         self,
         file_info: dict[str, Any],
@@ -341,7 +494,7 @@ class SemanticSearcher:
         symbol: dict[str, Any],
         file_path: str,
         symbol_type: str,
-        source_lines: list[str],
+        source: SourceFile | None,
         class_name: str | None = None,
     ) -> dict[str, Any]:
         """Create symbol info with code body for embedding."""
@@ -353,8 +506,14 @@ class SemanticSearcher:
         else:
             full_name = name
 
-        # Extract actual code body
-        code_body = self._extract_code_body(source_lines, line)
+        # Extract actual code body: a slice of the recorded byte range, or
+        # the indentation heuristic for indexes without spans
+        code_body = ""
+        if source is not None:
+            body = source.symbol_text(symbol, limit=self.max_tokens * 4)
+            if body is None:
+                body = self._extract_code_body(source.lines(), line)
+            code_body = body.strip()
 
         # Build text for embedding: name + tags + summary + docstring + code body
         text_parts = [full_name]
@@ -376,6 +535,7 @@ class SemanticSearcher:
 
         # Add signature info for context
         signature = symbol.get("signature", {})
+        signature_parts = []
         if signature:
             params = signature.get("params", [])
             param_str = ", ".join(
@@ -383,11 +543,12 @@ class SemanticSearcher:
                 for p in params if p.get("name")
             )
             if param_str:
-                text_parts.append(f"({param_str})")
+                signature_parts.append(f"({param_str})")
 
             return_type = signature.get("return_type", "")
             if return_type:
-                text_parts.append(f"-> {return_type}")
+                signature_parts.append(f"-> {return_type}")
+        text_parts.extend(signature_parts)
 
         # Add actual code body (the key improvement)
         if code_body:
@@ -410,6 +571,8 @@ class SemanticSearcher:
             "summary": summary,  # LLM-generated summary for conceptual matching
             "docstring": docstring[:200] if docstring else "",
             "code_preview": code_body[:200] if code_body else "",
+            "tags": semantic_tags,
+            "signature": " ".join(signature_parts),
         }
 
     def _infer_semantic_tags(
@@ -538,19 +701,26 @@ class SemanticSearcher:
         Args:
             embedding_data: Embedding data from index.
         """
-        if not HAS_SEMANTIC:
+        if not HAS_NUMPY:
             raise ImportError(
-                "Semantic search requires sentence-transformers. "
+                "Semantic search requires numpy. "
                 "Install with: pip install codebase-index[semantic]"
             )
 
         self._symbols = embedding_data.get("symbols", [])
+        self._lexical = load_lexical_index(embedding_data)
+        self._facets = None
+        self._filter_cache = {}
+        self._row_matrix_cache = {}
         embeddings_list = embedding_data.get("embeddings", [])
 
         if embeddings_list:
-            self._embeddings = np.array(embeddings_list)
+            self._embeddings = np.array(embeddings_list, dtype=np.float32)
+            # Normalize once so every query is a single dot product
+            self._normalized = self._normalize_rows(self._embeddings)
         else:
             self._embeddings = None
+            self._normalized = None
 
         # Check model compatibility
         stored_model = embedding_data.get("model", "")
@@ -566,6 +736,8 @@ class SemanticSearcher:
         query: str,
         top_k: int = 10,
         min_score: float = 0.3,
+        mode: str = DEFAULT_SEARCH_MODE,
+        filters: dict[str, str] | None = None,
     ) -> dict[str, Any]:
         """
         Search for code matching the query.
@@ -575,71 +747,683 @@ class SemanticSearcher:
                    (e.g., "retry logic with backoff" or "def retry")
             top_k: Number of results to return.
             min_score: Minimum similarity score (0-1).
+            mode: "hybrid" (BM25 + embeddings), "vector" or "lexical".
+            filters: Restrict to symbols matching all of these attributes
+                     (keys from FILTER_FIELDS, e.g. {"path": "src/api"}).
 
         Returns:
             Dictionary with search results.
         """
-        if self._embeddings is None or len(self._symbols) == 0:
-            return {
-                "query": query,
-                "results": [],
-                "error": "No embeddings loaded. Run with --build-embeddings first.",
-            }
+        rows = self._filter_rows(filters)
+
+        if mode == "lexical" and self._lexical is not None:
+            allowed = set(rows.tolist()) if rows is not None else None
+            ranked = rank_lexical(self._lexical, query, top_k, allowed=allowed)
+            return self._build_response(query, ranked, min_score, mode, rows)
+
+        if self._normalized is None or len(self._symbols) == 0:
+            return self._no_embeddings_result(query)
 
         # Generate query embedding
-        query_embedding = self.model.encode([query], convert_to_numpy=True)[0]
+        query_embedding = self.model.encode([query])[0]
 
-        # Compute cosine similarities
-        similarities = self._cosine_similarity(query_embedding, self._embeddings)
+        if mode == "hybrid" and self._lexical is not None:
+            return self._hybrid_search(
+                self._lexical, query, top_k, min_score, query_embedding=query_embedding, rows=rows
+            )
 
-        # Get top results
-        top_indices = np.argsort(similarities)[::-1][:top_k]
+        # Cosine similarities, only over the filtered rows
+        similarities = self._score_rows(query_embedding, rows)
 
-        results = []
-        for idx in top_indices:
-            score = float(similarities[idx])
-            if score < min_score:
-                break
+        return self._format_results(query, similarities, top_k, min_score, "vector", rows)
 
-            symbol = self._symbols[idx]
-            # Prefer summary > docstring > code_preview for snippet
-            snippet = (
-                symbol.get("summary")
-                or symbol.get("docstring", "")[:100]
-                or symbol.get("code_preview", "")
-            )
-            results.append({
-                "symbol": symbol["name"],
-                "type": symbol["type"],
-                "file": symbol["file"],
-                "line": symbol["line"],
-                "score": round(score, 3),
-                "snippet": snippet,
-            })
+    def search_batch(
+        self,
+        queries: Iterable[str],
+        top_k: int = 10,
+        min_score: float = 0.3,
+        batch_size: int = DEFAULT_QUERY_BATCH_SIZE,
+        mode: str = DEFAULT_SEARCH_MODE,
+        filters: dict[str, str] | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Search for many queries with a single model load.
+
+        Queries are consumed lazily in batches of ``batch_size``. Each batch
+        is encoded with one encode() call and scored against all symbols with
+        one matrix-matrix multiply, so results stream back while later
+        queries are still being read.
 
+        Args:
+            queries: Iterable of query strings (e.g., lines of a file or stdin).
+            top_k: Number of results to return per query.
+            min_score: Minimum similarity score (0-1).
+            batch_size: Number of queries encoded and scored together.
+            mode: "hybrid" (BM25 + embeddings), "vector" or "lexical".
+            filters: Restrict to symbols matching all of these attributes.
+
+        Yields:
+            One result dictionary per query, in input order (same shape as search()).
+        """
+        rows = self._filter_rows(filters)
+        query_iter = iter(queries)
+        while True:
+            batch = list(islice(query_iter, max(1, batch_size)))
+            if not batch:
+                return
+
+            if mode == "lexical" and self._lexical is not None:
+                for query in batch:
+                    yield self.search(
+                        query, top_k=top_k, min_score=min_score, mode=mode, filters=filters
+                    )
+                continue
+
+            if self._normalized is None or len(self._symbols) == 0:
+                for query in batch:
+                    yield self._no_embeddings_result(query)
+                continue
+
+            query_embeddings = self.model.encode(batch, batch_size=len(batch))
+            query_norm = self._normalize_rows(np.asarray(query_embeddings, dtype=np.float32))
+
+            # (num_rows x dim) @ (dim x num_queries) -> one column per query
+            scores = self._row_matrix(filters, rows) @ query_norm.T
+
+            for col, query in enumerate(batch):
+                if mode == "hybrid" and self._lexical is not None:
+                    yield self._hybrid_search(
+                        self._lexical, query, top_k, min_score, similarities=scores[:, col], rows=rows
+                    )
+                else:
+                    yield self._format_results(
+                        query, scores[:, col], top_k, min_score, "vector", rows
+                    )
+
+    def _hybrid_search(
+        self,
+        lexical: BM25Index,
+        query: str,
+        top_k: int,
+        min_score: float,
+        query_embedding: Any = None,
+        similarities: Any = None,
+        rows: Any = None,
+    ) -> dict[str, Any]:
+        """
+        Fuse BM25 and cosine scores for one query.
+
+        ``lexical`` is the loaded BM25 index (self._lexical). Either ``query_embedding`` or precomputed ``similarities`` (aligned
+        with ``rows``, or with all symbols when ``rows`` is None) must be
+        given. With an embedding, keyword-heavy queries are prefiltered
+        through the inverted index so only matching rows are multiplied.
+        """
+        terms = lexical.query_terms(query)
+        lexical_scores = lexical.score(terms)
+        filtered_rows = rows
+
+        if rows is not None:
+            allowed = set(rows.tolist())
+            lexical_scores = {
+                row: score for row, score in lexical_scores.items() if row in allowed
+            }
+
+        if similarities is None:
+            searchable = len(rows) if rows is not None else len(self._symbols)
+            if self._should_prefilter(lexical, terms, lexical_scores, top_k, searchable):
+                rows = np.fromiter(lexical_scores, dtype=np.int64, count=len(lexical_scores))
+                rows.sort()
+            similarities = self._score_rows(query_embedding, rows)
+
+        fused = HYBRID_ALPHA * np.asarray(similarities, dtype=np.float32)
+        if lexical_scores:
+            doc_ids = np.fromiter(lexical_scores.keys(), dtype=np.int64, count=len(lexical_scores))
+            bm25 = np.fromiter(lexical_scores.values(), dtype=np.float32, count=len(lexical_scores))
+            positions = doc_ids if rows is None else np.searchsorted(rows, doc_ids)
+            fused[positions] += (1 - HYBRID_ALPHA) * bm25 / bm25.max()
+
+        response = self._format_results(query, fused, top_k, min_score, "hybrid", rows)
+        # Report the filter size, not the BM25 candidate set
+        if filtered_rows is not None:
+            response["filtered_symbols"] = len(filtered_rows)
+        else:
+            response.pop("filtered_symbols", None)
+        return response
+
+    @staticmethod
+    def _should_prefilter(
+        lexical: BM25Index,
+        terms: list[str],
+        lexical_scores: dict[int, float],
+        top_k: int,
+        searchable: int,
+    ) -> bool:
+        """Whether BM25 matches are a small enough candidate set to skip the full scan."""
+        return (
+            lexical.covers(terms)
+            and top_k <= len(lexical_scores) <= PREFILTER_MAX_FRACTION * searchable
+        )
+
+    def _filter_rows(self, filters: dict[str, str] | None) -> Any:
+        """
+        Sorted row ids matching the filters, or None when unfiltered.
+
+        Posting lists are built once per searcher; the intersection for a
+        given filter combination is cached so repeated queries reuse it.
+        """
+        if not filters:
+            return None
+
+        key = tuple(sorted(filters.items()))
+        if key not in self._filter_cache:
+            if self._facets is None:
+                self._facets = build_facets(self._symbols)
+            row_ids = filter_rows(self._facets, filters)
+            self._filter_cache[key] = np.asarray(row_ids, dtype=np.int64)
+        return self._filter_cache[key]
+
+    def _row_matrix(self, filters: dict[str, str] | None, rows: Any) -> Any:
+        """Normalized embedding rows for a filter (all rows when unfiltered)."""
+        if not filters:
+            return self._normalized
+
+        # Keyed like _filter_cache: the rows are a function of the filters
+        key = tuple(sorted(filters.items()))
+        if self._row_matrix_cache.get("key") != key:
+            # Gather once per filter so batches multiply a contiguous matrix
+            self._row_matrix_cache = {"key": key, "matrix": self._normalized[rows]}
+        return self._row_matrix_cache["matrix"]
+
+    def _score_rows(self, query_embedding: Any, rows: Any) -> Any:
+        """Cosine similarity of one query against the given rows."""
+        query_norm = query_embedding / (np.linalg.norm(query_embedding) + 1e-9)
+        if rows is None:
+            return self._normalized @ query_norm
+        return self._normalized[rows] @ query_norm
+
+    def _no_embeddings_result(self, query: str) -> dict[str, Any]:
+        """Result returned when searching before embeddings are available."""
         return {
             "query": query,
-            "results": results,
+            "results": [],
+            "error": "No embeddings loaded. Run with --build-embeddings first.",
+        }
+
+    def _format_results(
+        self,
+        query: str,
+        similarities: Any,
+        top_k: int,
+        min_score: float,
+        mode: str = "vector",
+        rows: Any = None,
+    ) -> dict[str, Any]:
+        """
+        Select the top-k symbols for one query and format them.
+
+        ``rows`` maps positions in ``similarities`` to symbol rows when only
+        a subset of symbols was scored.
+        """
+        ranked = []
+        for idx in self._top_k_indices(similarities, top_k):
+            row = int(rows[idx]) if rows is not None else int(idx)
+            ranked.append((row, float(similarities[idx])))
+        return self._build_response(query, ranked, min_score, mode, rows)
+
+    def _build_response(
+        self,
+        query: str,
+        ranked: list[tuple[int, float]],
+        min_score: float,
+        mode: str,
+        rows: Any = None,
+    ) -> dict[str, Any]:
+        """Format ranked (row, score) pairs as a search response."""
+        response = {
+            "query": query,
+            "results": format_search_results(self._symbols, ranked, min_score),
             "total_symbols": len(self._symbols),
             "model": self.model_name,
+            "mode": mode,
         }
+        if rows is not None:
+            response["filtered_symbols"] = len(rows)
+        return response
+
+    @staticmethod
+    def _top_k_indices(scores: Any, top_k: int) -> Any:
+        """Indices of the top_k highest scores, best first (partial sort)."""
+        count = len(scores)
+        if top_k <= 0 or count == 0:
+            return []
+        if top_k >= count:
+            return np.argsort(scores)[::-1]
+        candidates = np.argpartition(scores, count - top_k)[count - top_k:]
+        return candidates[np.argsort(scores[candidates])[::-1]]
+
+    @staticmethod
+    def _normalize_rows(matrix: Any) -> Any:
+        """L2-normalize each row of a 2D array."""
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-9
+        return matrix / norms
 
     def _cosine_similarity(self, query: Any, embeddings: Any) -> Any:
         """Compute cosine similarity between query and all embeddings."""
         # Normalize
         query_norm = query / (np.linalg.norm(query) + 1e-9)
-        norms = np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-9
-        embeddings_norm = embeddings / norms
+        if embeddings is self._embeddings and self._normalized is not None:
+            embeddings_norm = self._normalized
+        else:
+            embeddings_norm = self._normalize_rows(embeddings)
 
         # Dot product gives cosine similarity for normalized vectors
         return np.dot(embeddings_norm, query_norm)
 
 
+class EmbeddingCheckpoint:
+    """
+    On-disk shards of a partially built embedding matrix.
+
+    Layout: ``shard-NNNNN.npy`` (embeddings), ``shard-NNNNN.jsonl``
+    (symbols) and ``manifest.json`` listing completed shards and the files
+    they cover. The manifest is replaced atomically after each shard, so
+    a crash mid-shard only loses that shard.
+
+    Only those files are ever deleted. A non-empty directory without a
+    manifest is refused rather than reused, and the directory itself is
+    removed after a build only if the checkpoint created it.
+    """
+
+    def __init__(self, directory: Path, fingerprint: str) -> None:
+        """
+        Initialize checkpoint storage.
+
+        Args:
+            directory: Checkpoint directory (created if missing).
+            fingerprint: Build fingerprint; a different one discards old shards.
+        """
+        self.directory = Path(directory)
+        self.fingerprint = fingerprint
+        self.shards: list[dict[str, Any]] = []
+        # Whether the directory was created for the checkpoint (recorded in
+        # the manifest so a resumed build still knows)
+        self.created = False
+
+    @property
+    def manifest_path(self) -> Path:
+        """Path of the manifest file."""
+        return self.directory / CHECKPOINT_MANIFEST
+
+    def resume(self) -> tuple[list[list[dict[str, Any]]], list[Any], set[str]]:
+        """
+        Load completed shards from a previous, interrupted build.
+
+        Returns:
+            Tuple of (symbol lists, embedding arrays, files already done).
+            Empty when there is nothing compatible to resume.
+
+        Raises:
+            ValueError: If the directory holds other files but no checkpoint.
+        """
+        manifest: dict[str, Any] = {}
+        if not self.manifest_path.exists():
+            self._claim_directory()
+            return [], [], set()
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Ignoring unreadable embedding checkpoint: %s", e)
+
+        self.created = bool(manifest.get("created"))
+        if manifest.get("fingerprint") != self.fingerprint:
+            if manifest:
+                logger.info("Embedding checkpoint is for a different build, starting over")
+            self._remove_files()
+            return [], [], set()
+
+        symbol_parts: list[list[dict[str, Any]]] = []
+        embedding_parts: list[Any] = []
+        done_files: set[str] = set()
+
+        for shard in manifest.get("shards", []):
+            try:
+                embeddings = np.load(self.directory / f"{shard['name']}.npy", allow_pickle=False)
+                with open(self.directory / f"{shard['name']}.jsonl", encoding="utf-8") as f:
+                    symbols = [json.loads(line) for line in f if line.strip()]
+            except (OSError, ValueError) as e:
+                # Keep the shards before the damaged one
+                logger.warning("Embedding checkpoint shard %s unreadable: %s", shard.get("name"), e)
+                break
+            if len(symbols) != len(embeddings):
+                break
+
+            symbol_parts.append(symbols)
+            embedding_parts.append(embeddings)
+            done_files.update(shard.get("files", []))
+            self.shards.append(shard)
+
+        return symbol_parts, embedding_parts, done_files
+
+    def add_shard(
+        self,
+        symbols: list[dict[str, Any]],
+        embeddings: Any,
+        files: list[str],
+    ) -> None:
+        """
+        Persist one completed shard and update the manifest.
+
+        Args:
+            symbols: Symbol infos in the shard.
+            embeddings: Embedding rows for those symbols.
+            files: Files whose symbols are all in this shard.
+        """
+        name = f"shard-{len(self.shards):05d}"
+        np.save(self.directory / f"{name}.npy", np.asarray(embeddings), allow_pickle=False)
+        with open(self.directory / f"{name}.jsonl", "w", encoding="utf-8") as f:
+            for symbol in symbols:
+                f.write(json.dumps(symbol) + "\n")
+
+        self.shards.append({"name": name, "count": len(symbols), "files": list(files)})
+        self._write_manifest()
+
+    def clear(self) -> None:
+        """Remove the checkpoint files after a completed build."""
+        self._remove_files()
+        if self.created:
+            try:
+                self.directory.rmdir()
+            except OSError:
+                # Not empty (something else was put there) or already gone
+                pass
+
+    def _claim_directory(self) -> None:
+        """Create the directory, or check an existing one holds nothing else."""
+        if self.directory.is_dir():
+            if any(not self._owned(path.name) for path in self.directory.iterdir()):
+                raise ValueError(
+                    f"Embedding checkpoint directory {self.directory} is not empty and "
+                    "holds no checkpoint; choose an empty or new directory"
+                )
+            self._remove_files()
+            return
+        self.directory.mkdir(parents=True)
+        self.created = True
+
+    @staticmethod
+    def _owned(name: str) -> bool:
+        """Check whether a file name is one a checkpoint writes."""
+        return any(fnmatch.fnmatchcase(name, pattern) for pattern in CHECKPOINT_FILE_PATTERNS)
+
+    def _remove_files(self) -> None:
+        """Delete the checkpoint's own files, leaving anything else alone."""
+        self.shards = []
+        if not self.directory.is_dir():
+            return
+        for path in self.directory.iterdir():
+            if self._owned(path.name) and path.is_file():
+                try:
+                    path.unlink()
+                except OSError as e:
+                    logger.debug("Could not remove checkpoint file %s: %s", path, e)
+
+    def _write_manifest(self) -> None:
+        """Atomically replace the manifest."""
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"fingerprint": self.fingerprint, "created": self.created, "shards": self.shards}, f
+            )
+        os.replace(tmp_path, self.manifest_path)
+
+
+def load_lexical_index(embedding_data: dict[str, Any]) -> BM25Index:
+    """
+    Load the BM25 index stored with the embeddings.
+
+    Older indexes (or ones whose row count no longer matches the symbol
+    table) get the index rebuilt from the symbols, which needs no model.
+
+    Args:
+        embedding_data: Embedding data from index["semantic"].
+
+    Returns:
+        BM25Index aligned with the symbol rows.
+    """
+    symbols = embedding_data.get("symbols", [])
+    stored = embedding_data.get("lexical")
+    if stored:
+        index = BM25Index.from_dict(stored)
+        if index.doc_count == len(symbols):
+            return index
+    return BM25Index.from_symbols(symbols)
+
+
+def rank_lexical(
+    lexical: BM25Index,
+    query: str,
+    top_k: int,
+    allowed: set[int] | None = None,
+) -> list[tuple[int, float]]:
+    """
+    Rank symbols by BM25 alone.
+
+    Scores are divided by the best score so they share the 0-1 scale of
+    similarity thresholds.
+
+    Args:
+        lexical: BM25 index over the symbol table.
+        query: Search query.
+        top_k: Number of results.
+        allowed: Only rank these rows (from filter_rows()).
+
+    Returns:
+        (row, score) pairs, best first.
+    """
+    ranked = lexical.search(query, top_k=top_k, allowed=allowed)
+    if not ranked:
+        return []
+    best = ranked[0][1] or 1.0
+    return [(row, score / best) for row, score in ranked]
+
+
+def build_facets(symbols: list[dict[str, Any]]) -> dict[str, dict[str, list[int]]]:
+    """
+    Build posting lists of symbol rows for each filterable attribute.
+
+    The "path" facet holds every ancestor directory of a symbol's file
+    (and the file itself), so a directory filter is one dictionary lookup.
+
+    Args:
+        symbols: Symbol table (rows of the embedding matrix).
+
+    Returns:
+        Mapping of field -> value -> sorted row ids.
+    """
+    facets: dict[str, dict[str, list[int]]] = {field: {} for field in FILTER_FIELDS}
+
+    for row, symbol in enumerate(symbols):
+        for field in ("language", "type", "category"):
+            value = symbol.get(field)
+            if value:
+                facets[field].setdefault(value, []).append(row)
+
+        parts = symbol.get("file", "").split("/")
+        for depth in range(1, len(parts) + 1):
+            facets["path"].setdefault("/".join(parts[:depth]), []).append(row)
+
+    return facets
+
+
+def filter_rows(
+    facets: dict[str, dict[str, list[int]]],
+    filters: dict[str, str],
+) -> list[int]:
+    """
+    Intersect posting lists for a set of filters.
+
+    Args:
+        facets: Posting lists from build_facets().
+        filters: Field -> required value. Paths may use "./" or a trailing "/".
+
+    Returns:
+        Sorted row ids matching every filter (empty if none match).
+    """
+    result: set[int] | None = None
+
+    # Smallest posting list first keeps the intersection cheap
+    postings = []
+    for field, value in filters.items():
+        if field == "path":
+            value = value.strip().removeprefix("./").rstrip("/")
+        postings.append(facets.get(field, {}).get(value, []))
+
+    for posting in sorted(postings, key=len):
+        result = set(posting) if result is None else result.intersection(posting)
+        if not result:
+            return []
+
+    return sorted(result) if result else []
+
+
+def attach_file_attributes(
+    embedding_data: dict[str, Any],
+    index_data: dict[str, Any],
+) -> None:
+    """
+    Fill in language/category on symbols from indexes built before filters.
+
+    Args:
+        embedding_data: Embedding data from index["semantic"] (updated in place).
+        index_data: The codebase index (source of file attributes).
+    """
+    symbols = embedding_data.get("symbols", [])
+    if not symbols or all("language" in symbol for symbol in symbols):
+        return
+
+    file_attrs = {
+        f.get("path", ""): (f.get("language", ""), f.get("category", ""))
+        for f in index_data.get("files", [])
+    }
+    for symbol in symbols:
+        if "language" not in symbol:
+            language, category = file_attrs.get(symbol.get("file", ""), ("", ""))
+            symbol["language"] = language
+            symbol["category"] = category
+
+
+def format_search_results(
+    symbols: list[dict[str, Any]],
+    ranked: list[tuple[int, float]],
+    min_score: float,
+) -> list[dict[str, Any]]:
+    """
+    Format ranked symbol rows as search results.
+
+    Args:
+        symbols: Symbol table (rows of the embedding matrix).
+        ranked: (row, score) pairs, best first.
+        min_score: Results below this score are dropped.
+
+    Returns:
+        List of result dictionaries.
+    """
+    results = []
+    for row, score in ranked:
+        if score < min_score:
+            break
+
+        symbol = symbols[row]
+        # Prefer summary > docstring > code_preview for snippet
+        snippet = (
+            symbol.get("summary")
+            or symbol.get("docstring", "")[:100]
+            or symbol.get("code_preview", "")
+        )
+        results.append({
+            "symbol": symbol["name"],
+            "type": symbol["type"],
+            "file": symbol["file"],
+            "line": symbol["line"],
+            "score": round(score, 3),
+            "snippet": snippet,
+        })
+    return results
+
+
+def lexical_search(
+    index_data: dict[str, Any],
+    query: str,
+    top_k: int = 10,
+    min_score: float = 0.3,
+    filters: dict[str, str] | None = None,
+) -> dict[str, Any]:
+    """
+    Keyword search over the symbol table using BM25.
+
+    Does not load an embedding model and does not require the semantic
+    extras, so it is fast for exact identifiers.
+
+    Args:
+        index_data: Index with embeddings (symbols are reused).
+        query: Search query.
+        top_k: Number of results.
+        min_score: Minimum normalized BM25 score (0.0-1.0).
+        filters: Restrict to symbols matching all of these attributes.
+
+    Returns:
+        Search results.
+    """
+    embedding_data = index_data.get("semantic", {})
+
+    if not embedding_data:
+        return {
+            "query": query,
+            "results": [],
+            "error": "No embeddings in index. Run with --build-embeddings first.",
+        }
+
+    symbols = embedding_data.get("symbols", [])
+    lexical = load_lexical_index(embedding_data)
+
+    allowed = None
+    if filters:
+        attach_file_attributes(embedding_data, index_data)
+        allowed = set(filter_rows(build_facets(symbols), filters))
+
+    return _lexical_response(symbols, lexical, query, top_k, min_score, allowed)
+
+
+def _lexical_response(
+    symbols: list[dict[str, Any]],
+    lexical: BM25Index,
+    query: str,
+    top_k: int,
+    min_score: float,
+    allowed: set[int] | None,
+) -> dict[str, Any]:
+    """Rank one query with BM25 and format the response."""
+    ranked = rank_lexical(lexical, query, top_k, allowed=allowed)
+
+    response = {
+        "query": query,
+        "results": format_search_results(symbols, ranked, min_score),
+        "total_symbols": len(symbols),
+        "mode": "lexical",
+    }
+    if allowed is not None:
+        response["filtered_symbols"] = len(allowed)
+    return response
+
+
 def build_embeddings(
     index_data: dict[str, Any],
     root: Path | None = None,
     model: str = DEFAULT_MODEL,
     changed_files: set[str] | None = None,
+    checkpoint_dir: Path | None = None,
+    backend: str | None = None,
 ) -> dict[str, Any]:
     """
     Build embeddings for symbols in the index.
@@ -650,17 +1434,24 @@ def build_embeddings(
         model: Model key or HuggingFace model name.
         changed_files: If provided, only rebuild embeddings for symbols in these files.
                        Existing embeddings for unchanged files are preserved.
+        checkpoint_dir: If provided, completed shards are saved here and an
+                        interrupted build resumes from them.
+        backend: Embedding backend override (default: the model's backend).
 
     Returns:
         Updated index with embeddings.
     """
     if changed_files is not None:
         # Incremental update mode
-        return _incremental_build_embeddings(index_data, root, model, changed_files)
+        return _incremental_build_embeddings(
+            index_data, root, model, changed_files, checkpoint_dir, backend
+        )
 
     # Full rebuild
-    searcher = SemanticSearcher(model_key=model)
-    embedding_data = searcher.build_embeddings(index_data, root=root)
+    searcher = SemanticSearcher(model_key=model, backend=backend)
+    embedding_data = searcher.build_embeddings(
+        index_data, root=root, checkpoint_dir=checkpoint_dir
+    )
 
     # Add to index
     index_data["semantic"] = embedding_data
@@ -673,6 +1464,8 @@ def _incremental_build_embeddings(
     root: Path | None,
     model: str,
     changed_files: set[str],
+    checkpoint_dir: Path | None = None,
+    backend: str | None = None,
 ) -> dict[str, Any]:
     """
     Incrementally update embeddings for changed files only.
@@ -682,23 +1475,28 @@ def _incremental_build_embeddings(
         root: Root directory for reading source files.
         model: Model key or HuggingFace model name.
         changed_files: Set of file paths that changed (added, updated, or deleted).
+        checkpoint_dir: Optional checkpoint directory for resumable builds.
+        backend: Embedding backend override (default: the model's backend).
 
     Returns:
         Updated index with embeddings.
     """
+    searcher = SemanticSearcher(model_key=model, backend=backend)
     existing_semantic = index_data.get("semantic", {})
     existing_symbols = existing_semantic.get("symbols", [])
     existing_embeddings = existing_semantic.get("embeddings", [])
 
     # Check model compatibility
     stored_model_key = existing_semantic.get("model_key", DEFAULT_MODEL)
-    if stored_model_key != model:
+    stored_backend = existing_semantic.get("backend", DEFAULT_BACKEND)
+    if stored_model_key != model or stored_backend != searcher.backend_name:
         logger.warning(
-            "Model changed from %s to %s. Doing full rebuild.",
-            stored_model_key, model
+            "Model changed from %s (%s) to %s (%s). Doing full rebuild.",
+            stored_model_key, stored_backend, model, searcher.backend_name
+        )
+        embedding_data = searcher.build_embeddings(
+            index_data, root=root, checkpoint_dir=checkpoint_dir
         )
-        searcher = SemanticSearcher(model_key=model)
-        embedding_data = searcher.build_embeddings(index_data, root=root)
         index_data["semantic"] = embedding_data
         return index_data
 
@@ -718,7 +1516,6 @@ def _incremental_build_embeddings(
     )
 
     # Build embeddings only for symbols in changed files
-    searcher = SemanticSearcher(model_key=model)
 
     # Create a filtered index with only changed files
     changed_files_data = {
@@ -729,7 +1526,9 @@ def _incremental_build_embeddings(
     }
 
     if changed_files_data["files"]:
-        new_embedding_data = searcher.build_embeddings(changed_files_data, root=root)
+        new_embedding_data = searcher.build_embeddings(
+            changed_files_data, root=root, checkpoint_dir=checkpoint_dir
+        )
         new_symbols = new_embedding_data.get("symbols", [])
         new_embeddings = new_embedding_data.get("embeddings", [])
     else:
@@ -740,11 +1539,14 @@ def _incremental_build_embeddings(
     all_symbols = unchanged_symbols + new_symbols
     all_embeddings = unchanged_embeddings + new_embeddings
 
+    # Row ids changed, so the inverted index is rebuilt (no model needed)
     embedding_data = {
         "embeddings": all_embeddings,
         "symbols": all_symbols,
+        "lexical": BM25Index.from_symbols(all_symbols).to_dict(),
         "model": searcher.model_name,
         "model_key": model,
+        "backend": searcher.backend_name,
         "count": len(all_symbols),
     }
 
@@ -764,6 +1566,8 @@ def semantic_search(
     top_k: int = 10,
     model: str | None = None,
     min_score: float = 0.3,
+    mode: str = DEFAULT_SEARCH_MODE,
+    filters: dict[str, str] | None = None,
 ) -> dict[str, Any]:
     """
     Convenience function for semantic search.
@@ -774,10 +1578,18 @@ def semantic_search(
         top_k: Number of results.
         model: Model to use (should match what was used for embeddings).
         min_score: Minimum similarity score threshold (0.0-1.0). Lower = more results.
+        mode: "hybrid" (BM25 + embeddings), "vector" or "lexical".
+        filters: Restrict to symbols matching all of these attributes
+                 (keys from FILTER_FIELDS: path, language, type, category).
 
     Returns:
         Search results.
     """
+    if mode == "lexical":
+        return lexical_search(
+            index_data, query, top_k=top_k, min_score=min_score, filters=filters
+        )
+
     embedding_data = index_data.get("semantic", {})
 
     if not embedding_data:
@@ -787,18 +1599,106 @@ def semantic_search(
             "error": "No embeddings in index. Run with --build-embeddings first.",
         }
 
-    # Use stored model if not specified
+    # Use stored model (and its backend) if not specified
     model_key = model or embedding_data.get("model_key", DEFAULT_MODEL)
+    backend = None if model else embedding_data.get("backend")
 
-    searcher = SemanticSearcher(model_key=model_key)
+    if filters:
+        attach_file_attributes(embedding_data, index_data)
+
+    searcher = SemanticSearcher(model_key=model_key, backend=backend)
+    searcher.load_embeddings(embedding_data)
+
+    return searcher.search(
+        query, top_k=top_k, min_score=min_score, mode=mode, filters=filters
+    )
+
+
+def semantic_search_batch(
+    index_data: dict[str, Any],
+    queries: Iterable[str],
+    top_k: int = 10,
+    model: str | None = None,
+    min_score: float = 0.3,
+    batch_size: int = DEFAULT_QUERY_BATCH_SIZE,
+    mode: str = DEFAULT_SEARCH_MODE,
+    filters: dict[str, str] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Convenience function for batch semantic search.
+
+    Loads the model and embedding matrix once, then scores all queries
+    in batches. Results are yielded one per query, in input order.
+
+    Args:
+        index_data: Index with embeddings.
+        queries: Iterable of search queries.
+        top_k: Number of results per query.
+        model: Model to use (should match what was used for embeddings).
+        min_score: Minimum similarity score threshold (0.0-1.0).
+        batch_size: Number of queries encoded and scored together.
+        mode: "hybrid" (BM25 + embeddings), "vector" or "lexical".
+        filters: Restrict to symbols matching all of these attributes.
+
+    Yields:
+        Search results for each query.
+    """
+    embedding_data = index_data.get("semantic", {})
+
+    if not embedding_data:
+        for query in queries:
+            yield {
+                "query": query,
+                "results": [],
+                "error": "No embeddings in index. Run with --build-embeddings first.",
+            }
+        return
+
+    if filters:
+        attach_file_attributes(embedding_data, index_data)
+
+    if mode == "lexical":
+        # Load the index and resolve filters once for all queries
+        symbols = embedding_data.get("symbols", [])
+        lexical = load_lexical_index(embedding_data)
+        allowed = set(filter_rows(build_facets(symbols), filters)) if filters else None
+        for query in queries:
+            yield _lexical_response(symbols, lexical, query, top_k, min_score, allowed)
+        return
+
+    # Use stored model (and its backend) if not specified
+    model_key = model or embedding_data.get("model_key", DEFAULT_MODEL)
+    backend = None if model else embedding_data.get("backend")
+
+    searcher = SemanticSearcher(model_key=model_key, backend=backend)
     searcher.load_embeddings(embedding_data)
 
-    return searcher.search(query, top_k=top_k, min_score=min_score)
+    yield from searcher.search_batch(
+        queries, top_k=top_k, min_score=min_score, batch_size=batch_size,
+        mode=mode, filters=filters,
+    )
+
+
+def check_semantic_available(model: str | None = None, backend: str | None = None) -> bool:
+    """
+    Check if semantic search dependencies are available.
+
+    Args:
+        model: Model key to check (default: DEFAULT_MODEL).
+        backend: Backend to check instead of the model's own backend.
+
+    Returns:
+        True if embeddings can be built and searched with this model.
+    """
+    return backend_available(model_backend(model, backend))
 
 
-def check_semantic_available() -> bool:
-    """Check if semantic search dependencies are available."""
-    return HAS_SEMANTIC
+def model_backend(model: str | None = None, backend: str | None = None) -> str:
+    """Backend used for a model key (explicit backend wins)."""
+    if backend:
+        return backend
+    name: str = MODELS.get(model or DEFAULT_MODEL, {}).get("backend", DEFAULT_BACKEND)
+    return name
 
 
 def list_models() -> dict[str, Any]:
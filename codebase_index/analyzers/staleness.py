@@ -13,6 +13,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from codebase_index.manifest import MANIFEST_VERSION, compare_manifest
+
 if TYPE_CHECKING:
     from typing import Any
 
@@ -53,6 +55,9 @@ class StalenessChecker:
         """
         Check if the index is stale.
 
+        Uses the index's file manifest when present (one stat pass, no
+        subprocesses); older indexes fall back to git and mtimes.
+
         Returns:
             Dictionary with staleness information:
             - is_stale: bool
@@ -60,6 +65,7 @@ class StalenessChecker:
             - changed_files: list of changed file paths
             - new_files: list of new file paths
             - deleted_files: list of deleted file paths
+            - method: "manifest", "git" or "mtime"
             - summary: human-readable summary
         """
         result: dict[str, Any] = {
@@ -70,6 +76,7 @@ class StalenessChecker:
             "new_files": [],
             "deleted_files": [],
             "total_changes": 0,
+            "method": None,
             "summary": "",
         }
 
@@ -96,6 +103,18 @@ class StalenessChecker:
         age = now - generated_at
         result["index_age_hours"] = round(age.total_seconds() / 3600, 1)
 
+        manifest = self.index_data.get("manifest") or {}
+        if manifest.get("version") == MANIFEST_VERSION:
+            diff = compare_manifest(self.root, manifest)
+            result["method"] = "manifest"
+            result["changed_files"] = diff["changed"]
+            result["new_files"] = diff["new"]
+            result["deleted_files"] = diff["deleted"]
+            result["changed_dirs"] = diff["changed_dirs"]
+            result["files_checked"] = diff["files_checked"]
+            result["rehashed"] = diff["rehashed"]
+            return self._finish(result)
+
         # Get indexed file paths
         indexed_files = set()
         for file_info in self.index_data.get("files", []):
@@ -105,15 +124,21 @@ class StalenessChecker:
         git_changes = self._get_git_changes_since(generated_at)
 
         if git_changes:
+            result["method"] = "git"
             result["changed_files"] = git_changes.get("modified", [])
             result["new_files"] = git_changes.get("added", [])
             result["deleted_files"] = git_changes.get("deleted", [])
         else:
+            result["method"] = "mtime"
             # Fallback: check file modification times
             result["changed_files"] = self._get_modified_files_since(
                 generated_at, indexed_files
             )
 
+        return self._finish(result)
+
+    def _finish(self, result: dict[str, Any]) -> dict[str, Any]:
+        """Filter index files out of the change lists and fill in totals and summary."""
         # Filter out the index file itself from changes
         result["changed_files"] = self._filter_index_files(result["changed_files"])
         result["new_files"] = self._filter_index_files(result["new_files"])
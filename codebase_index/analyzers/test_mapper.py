@@ -3,6 +3,10 @@ Test mapper for codebase_index.
 
 Maps symbols (functions, classes) to their tests by analyzing
 imports, call graphs, and naming conventions.
+
+Test files are read once into an inverted index (imported name, called
+name and test-name tokens -> tests), so a query is a few dictionary
+lookups and mapping every symbol is a single pass.
 """
 
 from __future__ import annotations
@@ -11,11 +15,201 @@ import logging
 import re
 from typing import TYPE_CHECKING
 
+from codebase_index.analyzers.reachability import call_suffixes
+
 if TYPE_CHECKING:
     from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Word boundaries inside identifiers: snake_case, camelCase, ACRONYMCase, digits
+_NAME_TOKEN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+
+def is_test_path(path: str) -> bool:
+    """Whether a path looks like a test file (pytest, Jest and Go-style names)."""
+    return (
+        path.startswith("test_")
+        or path.startswith("tests/")
+        or "/test_" in path
+        or "/tests/" in path
+        or path.endswith("_test.py")
+        or path.endswith(".test.ts")
+        or path.endswith(".test.js")
+        or path.endswith(".spec.ts")
+        or path.endswith(".spec.js")
+        or "/__tests__/" in path
+    )
+
+
+def name_tokens(name: str) -> list[str]:
+    """
+    Lowercase word tokens of an identifier.
+
+    "test_create_agent" and "testCreateAgent" -> ["test", "create", "agent"]
+    """
+    return [token.lower() for token in _NAME_TOKEN.findall(name)]
+
+
+def _token_runs(tokens: list[str]) -> set[str]:
+    """Every contiguous run of tokens, joined with "_"."""
+    return {
+        "_".join(tokens[start:end])
+        for start in range(len(tokens))
+        for end in range(start + 1, len(tokens) + 1)
+    }
+
+
+class TestIndex:
+    """Inverted index from imported, called and test-named symbols to tests."""
+
+    def __init__(self, files: list[dict[str, Any]], call_graph: dict[str, Any]) -> None:
+        """
+        Build the index from the test files of a scan.
+
+        Args:
+            files: The index's "files" section.
+            call_graph: The index's "call_graph" section.
+        """
+        self.test_files: list[dict[str, Any]] = [
+            f for f in files if is_test_path(f.get("path", ""))
+        ]
+        self._order: dict[str, int] = {
+            f.get("path", ""): position for position, f in enumerate(self.test_files)
+        }
+
+        # Imported name or module segment -> test files
+        self.by_import: dict[str, set[str]] = {}
+        # Test-name token run -> [(test file, test function)]
+        self.by_name: dict[str, list[tuple[str, str]]] = {}
+        # Exact test class name -> [(test file, class)] for "Test<Class>"
+        self.by_class: dict[str, list[tuple[str, str]]] = {}
+        # Call name or dotted suffix -> test functions making that call
+        self.by_call: dict[str, set[str]] = {}
+
+        for file_info in self.test_files:
+            path = file_info.get("path", "")
+            exports = file_info.get("exports", {})
+            self._index_imports(path, exports.get("imports", []))
+            self._index_test_names(path, exports)
+
+        for func_key, func_data in call_graph.items():
+            if not is_test_path(func_key.split(":")[0] if ":" in func_key else ""):
+                continue
+            for call in func_data.get("calls", []):
+                for name in call_suffixes(call):
+                    self.by_call.setdefault(name, set()).add(func_key)
+
+        logger.debug(
+            "Test index: %d test files, %d imported names, %d called names",
+            len(self.test_files), len(self.by_import), len(self.by_call),
+        )
+
+    def _index_imports(self, path: str, imports: dict[str, Any] | list[Any]) -> None:
+        """Record imported names and every segment of imported module paths."""
+        names: list[str] = []
+        modules: list[str] = []
+        if isinstance(imports, dict):
+            names.extend(imports.get("names", []))
+            for key in ("internal", "external", "modules"):
+                modules.extend(imports.get(key, []))
+        else:
+            for imp in imports:
+                if isinstance(imp, str):
+                    modules.append(imp)
+                elif isinstance(imp, dict):
+                    names.extend(n for n in (imp.get("name"), imp.get("alias")) if n)
+                    modules.append(imp.get("module", ""))
+
+        keys = set(names)
+        for module in modules:
+            if not module:
+                continue
+            keys.add(module)
+            keys.update(re.split(r"[./]+", module))
+        keys.discard("")
+        for key in keys:
+            self.by_import.setdefault(key, set()).add(path)
+
+    def _index_test_names(self, path: str, exports: dict[str, Any]) -> None:
+        """Record the name tokens of test functions, test classes and their methods."""
+        def add(name: str, display: str) -> None:
+            tokens = name_tokens(name)
+            if not tokens or tokens[0] != "test":
+                return
+            for run in _token_runs(tokens[1:]):
+                self.by_name.setdefault(run, []).append((path, display))
+
+        for func in exports.get("functions", []):
+            add(func.get("name", ""), func.get("name", ""))
+
+        for cls in exports.get("classes", []):
+            cls_name = cls.get("name", "")
+            add(cls_name, cls_name)
+            if not cls_name.startswith("Test"):
+                continue
+            self.by_class.setdefault(cls_name[4:], []).append((path, cls_name))
+            for method in cls.get("methods", []):
+                method_name = method.get("name", "")
+                add(method_name, f"{cls_name}.{method_name}")
+
+    def lookup(self, symbol: str) -> dict[str, Any]:
+        """
+        Tests referencing one symbol.
+
+        Args:
+            symbol: "function", "Class" or "Class.method".
+
+        Returns:
+            Dictionary with tests (per test file: imports_symbol,
+            calls_symbol, test_functions), test_files, importers and
+            callers (test functions calling the symbol).
+        """
+        parts = symbol.split(".")
+        if len(parts) == 2:
+            class_name, method_name = parts
+        else:
+            class_name = None
+            method_name = symbol
+
+        importers: set[str] = set()
+        for key in (symbol, class_name, method_name):
+            if key:
+                importers |= self.by_import.get(key, set())
+
+        callers = self.by_call.get(method_name, set())
+        calling_files = {key.split(":")[0] for key in callers}
+
+        test_functions: dict[str, list[str]] = {}
+        matched = list(self.by_name.get("_".join(name_tokens(method_name)), []))
+        if class_name:
+            matched.extend(self.by_class.get(class_name, []))
+        for path, display in matched:
+            names = test_functions.setdefault(path, [])
+            if display not in names:
+                names.append(display)
+
+        test_files = sorted(
+            importers | calling_files | set(test_functions),
+            key=lambda p: self._order.get(p, len(self._order)),
+        )
+        tests = [
+            {
+                "file": path,
+                "imports_symbol": path in importers,
+                "calls_symbol": path in calling_files,
+                "test_functions": test_functions.get(path, []),
+            }
+            for path in test_files
+        ]
+        last = parts[-1]
+        return {
+            "tests": tests,
+            "test_files": test_files,
+            "importers": [path for path in test_files if path in importers],
+            "callers": sorted(self.by_call.get(symbol, set()) | self.by_call.get(last, set())),
+        }
+
 
 class TestMapper:
     """Map symbols to their tests."""
@@ -28,38 +222,21 @@ class TestMapper:
             index_data: The loaded index data.
         """
         self.index_data = index_data
-        self._test_files: list[dict[str, Any]] | None = None
-        self._call_graph: dict[str, Any] | None = None
+        self._index: TestIndex | None = None
 
     @property
-    def test_files(self) -> list[dict[str, Any]]:
-        """Get all test files from the index."""
-        if self._test_files is None:
-            self._test_files = []
-            for file_info in self.index_data.get("files", []):
-                path = file_info.get("path", "")
-                # Common test file patterns
-                if (
-                    path.startswith("test_")
-                    or path.startswith("tests/")
-                    or "/test_" in path
-                    or "/tests/" in path
-                    or path.endswith("_test.py")
-                    or path.endswith(".test.ts")
-                    or path.endswith(".test.js")
-                    or path.endswith(".spec.ts")
-                    or path.endswith(".spec.js")
-                    or "/__tests__/" in path
-                ):
-                    self._test_files.append(file_info)
-        return self._test_files
+    def index(self) -> TestIndex:
+        """Inverted test index for the loaded data."""
+        if self._index is None:
+            self._index = TestIndex(
+                self.index_data.get("files", []), self.index_data.get("call_graph", {})
+            )
+        return self._index
 
     @property
-    def call_graph(self) -> dict[str, Any]:
-        """Get the call graph from the index."""
-        if self._call_graph is None:
-            self._call_graph = self.index_data.get("call_graph", {})
-        return self._call_graph
+    def test_files(self) -> list[dict[str, Any]]:
+        """Get all test files from the index."""
+        return self.index.test_files
 
     def find_tests_for(self, symbol: str) -> dict[str, Any]:
         """
@@ -74,234 +251,68 @@ class TestMapper:
             - symbol: The queried symbol
             - tests: List of matching test info
             - test_files: List of test files that reference the symbol
-            - coverage_estimate: Rough estimate of test coverage
+            - importers: Test files importing the symbol
+            - callers: Test functions calling the symbol
+            - summary: Human-readable summary
         """
-        result: dict[str, Any] = {
-            "symbol": symbol,
-            "tests": [],
-            "test_files": [],
-            "importers": [],
-            "callers": [],
-            "summary": "",
-        }
-
-        # Parse the symbol
-        parts = symbol.split(".")
-        if len(parts) == 2:
-            class_name, method_name = parts
-        else:
-            class_name = None
-            method_name = symbol
-
-        # Find test files that import or reference this symbol
-        for test_file in self.test_files:
-            file_path = test_file.get("path", "")
-            exports = test_file.get("exports", {})
-
-            # Check imports
-            imports = exports.get("imports", [])
-            imports_symbol = self._imports_symbol(imports, symbol, class_name, method_name)
-
-            # Check function calls in the call graph
-            calls_symbol = self._calls_symbol(file_path, symbol, class_name, method_name)
-
-            # Check test function names for naming convention matches
-            test_functions = self._find_matching_test_functions(
-                exports, class_name, method_name
-            )
-
-            if imports_symbol or calls_symbol or test_functions:
-                test_info = {
-                    "file": file_path,
-                    "imports_symbol": imports_symbol,
-                    "calls_symbol": calls_symbol,
-                    "test_functions": test_functions,
-                }
-                result["test_files"].append(file_path)
-                result["tests"].append(test_info)
-
-                if imports_symbol:
-                    result["importers"].append(file_path)
-
-        # Find callers from call graph
-        result["callers"] = self._find_callers_in_tests(symbol)
-
-        # Build summary
+        result: dict[str, Any] = {"symbol": symbol}
+        result.update(self.index.lookup(symbol))
         result["summary"] = self._build_summary(result)
-
         return result
 
-    def _imports_symbol(
-        self,
-        imports: dict[str, Any] | list[Any],
-        symbol: str,
-        class_name: str | None,
-        method_name: str,
-    ) -> bool:
-        """Check if the imports contain the symbol."""
-        # Handle dict format: {"internal": [...], "external": [...], "names": [...]}
-        if isinstance(imports, dict):
-            # First check the 'names' list for direct symbol matches
-            imported_names = imports.get("names", [])
-            if symbol in imported_names:
-                return True
-            if class_name and class_name in imported_names:
-                return True
-            if method_name in imported_names:
-                return True
-
-            all_imports = []
-            for key in ["internal", "external"]:
-                all_imports.extend(imports.get(key, []))
-            imports = all_imports
-
-        for imp in imports:
-            # Handle string imports (module names)
-            if isinstance(imp, str):
-                # Check if symbol or class name is in the import path
-                if symbol in imp or (class_name and class_name in imp):
-                    return True
-                if method_name in imp:
-                    return True
-                continue
+    def find_all_tests(self) -> dict[str, Any]:
+        """
+        Map every symbol defined outside test files to its tests.
 
-            # Handle dict imports (structured format)
-            if isinstance(imp, dict):
-                # Direct import
-                if imp.get("name") == symbol:
-                    return True
-                if imp.get("name") == class_name:
-                    return True
-                if imp.get("name") == method_name:
-                    return True
-
-                # Check alias
-                if imp.get("alias") == symbol:
-                    return True
-                if imp.get("alias") == class_name:
-                    return True
-
-                # Check module path
-                module = imp.get("module", "")
-                if symbol in module or (class_name and class_name in module):
-                    return True
-
-        return False
-
-    def _calls_symbol(
-        self,
-        file_path: str,
-        symbol: str,
-        class_name: str | None,
-        method_name: str,
-    ) -> bool:
-        """Check if the file calls the symbol based on call graph."""
-        for func_key, func_data in self.call_graph.items():
-            if not func_key.startswith(file_path + ":"):
+        Returns:
+            Dictionary with:
+            - symbols: symbol -> {test_files, test_functions, callers}
+              for each symbol with at least one test
+            - untested: symbols with no test
+            - summary: counts
+        """
+        symbols: list[str] = []
+        for file_info in self.index_data.get("files", []):
+            if is_test_path(file_info.get("path", "")):
                 continue
-
-            calls = func_data.get("calls", [])
-            for call in calls:
-                if call == symbol:
-                    return True
-                if call == method_name:
-                    return True
-                if class_name and call.endswith(f".{method_name}"):
-                    return True
-                # Handle self.method() patterns
-                if call.endswith(f".{method_name}"):
-                    return True
-
-        return False
-
-    def _find_matching_test_functions(
-        self,
-        exports: dict[str, Any],
-        class_name: str | None,
-        method_name: str,
-    ) -> list[str]:
-        """Find test functions that match naming conventions."""
-        matches = []
-
-        # Build patterns to match
-        patterns = []
-
-        # test_<method_name>
-        patterns.append(re.compile(rf"^test_.*{re.escape(method_name)}.*$", re.IGNORECASE))
-
-        # test<MethodName> (camelCase)
-        camel_method = method_name[0].upper() + method_name[1:] if method_name else ""
-        if camel_method:
-            patterns.append(re.compile(rf"^test.*{re.escape(camel_method)}.*$"))
-
-        # For class methods: test_<class>_<method>
-        if class_name:
-            patterns.append(
-                re.compile(
-                    rf"^test_.*{re.escape(class_name)}.*{re.escape(method_name)}.*$",
-                    re.IGNORECASE,
-                )
-            )
-            # TestClassName
-            patterns.append(re.compile(rf"^Test{re.escape(class_name)}$"))
-
-        # Check functions
-        for func in exports.get("functions", []):
-            func_name = func.get("name", "")
-            for pattern in patterns:
-                if pattern.match(func_name):
-                    matches.append(func_name)
-                    break
-
-        # Check classes (test classes)
-        for cls in exports.get("classes", []):
-            cls_name = cls.get("name", "")
-            for pattern in patterns:
-                if pattern.match(cls_name):
-                    matches.append(cls_name)
-                    break
-
-            # Check methods within test classes
-            if cls_name.startswith("Test"):
+            exports = file_info.get("exports", {})
+            for func in exports.get("functions", []):
+                symbols.append(func.get("name", ""))
+            for cls in exports.get("classes", []):
+                cls_name = cls.get("name", "")
+                symbols.append(cls_name)
                 for method in cls.get("methods", []):
-                    method_name_in_cls = method.get("name", "")
-                    for pattern in patterns:
-                        if pattern.match(method_name_in_cls):
-                            matches.append(f"{cls_name}.{method_name_in_cls}")
-                            break
-
-        return matches
-
-    def _find_callers_in_tests(self, symbol: str) -> list[str]:
-        """Find test functions that call the symbol."""
-        callers = []
-
-        for func_key, func_data in self.call_graph.items():
-            # Check if this is a test file
-            file_path = func_key.split(":")[0] if ":" in func_key else ""
-            is_test = (
-                file_path.startswith("test_")
-                or "/test_" in file_path
-                or "/tests/" in file_path
-                or file_path.endswith("_test.py")
-            )
-
-            if not is_test:
+                    symbols.append(f"{cls_name}.{method.get('name', '')}")
+
+        mapped: dict[str, Any] = {}
+        untested: list[str] = []
+        for symbol in dict.fromkeys(s for s in symbols if s):
+            found = self.index.lookup(symbol)
+            if not found["tests"]:
+                untested.append(symbol)
                 continue
-
-            calls = func_data.get("calls", [])
-            if symbol in calls:
-                callers.append(func_key)
-            else:
-                # Check partial matches
-                parts = symbol.split(".")
-                method = parts[-1] if parts else symbol
-                for call in calls:
-                    if call.endswith(f".{method}") or call == method:
-                        callers.append(func_key)
-                        break
-
-        return callers
+            mapped[symbol] = {
+                "test_files": found["test_files"],
+                "test_functions": [
+                    f"{test['file']}:{name}"
+                    for test in found["tests"]
+                    for name in test["test_functions"]
+                ],
+                "callers": found["callers"],
+            }
+
+        total = len(mapped) + len(untested)
+        return {
+            "symbols": mapped,
+            "untested": untested,
+            "summary": {
+                "total_symbols": total,
+                "tested_symbols": len(mapped),
+                "untested_symbols": len(untested),
+                "test_files": len(self.test_files),
+                "tested_percentage": round(len(mapped) / total * 100, 1) if total else 0.0,
+            },
+        }
 
     def _build_summary(self, result: dict[str, Any]) -> str:
         """Build a human-readable summary."""
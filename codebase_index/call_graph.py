@@ -2,35 +2,42 @@
 Call graph query functions for codebase_index.
 
 Provides functions to query the call graph for impact analysis.
+Lookups go through a trigram index instead of substring-testing every
+key; pass the same CallGraphLookup to run several queries on one index.
 """
 
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from codebase_index.trigram_index import CallGraphLookup
+
 if TYPE_CHECKING:
     from typing import Any
 
 
-def cg_query_function(call_graph: dict[str, Any], func_name: str) -> dict[str, Any]:
+def cg_query_function(
+    call_graph: dict[str, Any],
+    func_name: str,
+    lookup: CallGraphLookup | None = None,
+) -> dict[str, Any]:
     """
     Query what a specific function calls (fuzzy match).
 
     Args:
         call_graph: The call graph dictionary.
         func_name: Function name to search for.
+        lookup: Trigram lookup built from call_graph (built here if None).
 
     Returns:
-        Dictionary with query info and matching results.
+        Dictionary with query info and matching results, best match first
+        (exact function name, then prefix, then other substrings).
     """
-    results: dict[str, Any] = {}
-    func_lower = func_name.lower()
-
-    for key, info in call_graph.items():
-        # Match on function name (last part of key)
-        key_func = key.split(":")[-1].lower()
-        if func_lower in key_func or func_lower in key.lower():
-            results[key] = info
+    if lookup is None:
+        lookup = CallGraphLookup(call_graph)
+    results: dict[str, Any] = {
+        key: call_graph[key] for key, _ in lookup.find_functions(func_name)
+    }
 
     return {
         "query": func_name,
@@ -40,23 +47,27 @@ def cg_query_function(call_graph: dict[str, Any], func_name: str) -> dict[str, A
     }
 
 
-def cg_query_file(call_graph: dict[str, Any], file_path: str) -> dict[str, Any]:
+def cg_query_file(
+    call_graph: dict[str, Any],
+    file_path: str,
+    lookup: CallGraphLookup | None = None,
+) -> dict[str, Any]:
     """
     Query all functions in a specific file.
 
     Args:
         call_graph: The call graph dictionary.
         file_path: File path to search for.
+        lookup: Trigram lookup built from call_graph (built here if None).
 
     Returns:
         Dictionary with query info and matching results.
     """
-    results: dict[str, Any] = {}
-    file_lower = file_path.lower()
-
-    for key, info in call_graph.items():
-        if file_lower in info.get("file", "").lower():
-            results[key] = info
+    if lookup is None:
+        lookup = CallGraphLookup(call_graph)
+    results: dict[str, Any] = {
+        key: call_graph[key] for key in lookup.find_in_files(file_path)
+    }
 
     return {
         "query": file_path,
@@ -66,27 +77,29 @@ def cg_query_file(call_graph: dict[str, Any], file_path: str) -> dict[str, Any]:
     }
 
 
-def cg_query_callers(call_graph: dict[str, Any], func_name: str) -> dict[str, Any]:
+def cg_query_callers(
+    call_graph: dict[str, Any],
+    func_name: str,
+    lookup: CallGraphLookup | None = None,
+) -> dict[str, Any]:
     """
     Query what functions call a specific function (inverse lookup).
 
     Args:
         call_graph: The call graph dictionary.
         func_name: Function name to find callers of.
+        lookup: Trigram lookup built from call_graph (built here if None).
 
     Returns:
         Dictionary with query info and matching results.
     """
     results: dict[str, Any] = {}
-    func_lower = func_name.lower()
-
-    for key, info in call_graph.items():
-        calls = info.get("calls", [])
-        matching_calls: list[str] = []
+    if lookup is None:
+        lookup = CallGraphLookup(call_graph)
 
-        for call in calls:
-            if func_lower in call.lower():
-                matching_calls.append(call)
+    for key, matched in lookup.find_callers(func_name).items():
+        info = call_graph[key]
+        matching_calls = [call for call in info.get("calls", []) if call in matched]
 
         if matching_calls:
             results[key] = {
@@ -9,6 +9,7 @@ from __future__ import annotations
 import argparse
 import json
 import logging
+import os
 import sys
 import warnings
 from pathlib import Path
@@ -23,13 +24,30 @@ from codebase_index.config import (
     get_config_template,
     load_config,
 )
-from codebase_index.scanner import CodebaseScanner
+from codebase_index.compact_format import (
+    COMPRESSIONS,
+    OUTPUT_FORMATS,
+    dump_index,
+    load_index_file,
+)
+from codebase_index.lazy_index import LazyIndex, wrap_lazy
+from codebase_index.model import compact_index, json_default
+from codebase_index.pipeline import DEFAULT_IO_THREADS, format_stats
+from codebase_index.scanner import CodebaseScanner, index_sections
+from codebase_index.sharding import ShardedIndex, build_shards, is_sharded_index
 from codebase_index.call_graph import cg_query_callers
 from codebase_index.analyzers.staleness import StalenessChecker
 from codebase_index.analyzers.test_mapper import TestMapper
 from codebase_index.analyzers.impact import ImpactAnalyzer
+from codebase_index.trigram_index import (
+    SUBSTRING_MIN_SCORE,
+    CallGraphLookup,
+    SymbolLookup,
+    TrigramCache,
+)
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -44,6 +62,7 @@ INDEX_SCHEMA = {
         "git_branch": "Current git branch (if git repo)",
         "git_commit": "Current git commit hash",
         "version": "codebase-index version",
+        "sections": "[computed sections] - only present for --sections scans",
     },
     "summary": {
         "_description": "Aggregate statistics",
@@ -57,9 +76,9 @@ INDEX_SCHEMA = {
     },
     "symbol_index": {
         "_description": "All code symbols indexed",
-        "functions": "[{name, file, line, signature, docstring, async}]",
+        "functions": "[{name, file, line, end_line, start_byte, end_byte, signature, docstring, async}]",
         "classes": "[{name, file, line, bases, docstring, method_count}]",
-        "methods": "[{name, class, file, line, signature, docstring, async}]",
+        "methods": "[{name, class, file, line, end_line, start_byte, end_byte, signature, docstring, async}]",
     },
     "call_graph": {
         "_description": "Function call relationships",
@@ -70,13 +89,26 @@ INDEX_SCHEMA = {
         "_description": "List of all scanned files",
         "_format": "[{path, size, language, hash, exports}]",
     },
+    "skipped_files": {
+        "_description": "Files indexed as metadata only (not parsed)",
+        "_format": "[{path, reason, size_bytes, lines}]",
+        "reason": "size | long_lines (minified) | generated (config large_files)",
+    },
+    "execution_flow": {
+        "_description": "Call flows from entry points over a shared node table",
+        "entry_points": "[{name, file, line, key, reason}]",
+        "flows": "[{entry_point, root, depth, total_calls}] - root is a node id",
+        "nodes": "[{key, name, file, line, calls: [node ids]}]",
+    },
     "centrality": {
         "_description": "Symbol importance analysis",
         "core_components": "High in-degree (many callers) - critical code",
         "hub_components": "High out-degree (calls many) - orchestrators",
         "utility_components": "Balanced - helper functions",
         "isolated_components": "Low connectivity - possibly dead code",
+        "central_components": "Highest PageRank - transitively relied on",
         "classifications": "{symbol: classification}",
+        "_metrics": "Each component: in/out degree, pagerank, betweenness, core_number",
     },
     "semantic": {
         "_description": "Embeddings for semantic search",
@@ -103,6 +135,12 @@ INDEX_SCHEMA = {
         "test_files": "[paths to test files]",
         "source_to_test": "{source_file: [test_files]}",
     },
+    "manifest": {
+        "_description": "Per-file stat manifest used by --check",
+        "files": "{path: [size, mtime_ns, hash]}",
+        "exclude": "[exclude patterns replayed by the check]",
+        "gitignore": "true if .gitignore'd files were skipped (replayed too)",
+    },
 }
 
 
@@ -175,12 +213,17 @@ def _truncate(value, max_len: int = 50) -> str:
     return s
 
 
-def find_symbol_by_name(data: dict, name: str) -> dict:
+def find_symbol_by_name(data: dict, name: str, cache: TrigramCache | None = None) -> dict:
     """Find a symbol by name across functions, classes, and methods.
 
+    Matches are ranked (exact name first, then prefix, then other
+    substrings). If nothing contains the name, close spellings are
+    returned instead and the result is marked "fuzzy".
+
     Args:
         data: The index data
         name: Symbol name to find (can be partial)
+        cache: Trigram cache of the index file data was loaded from
 
     Returns:
         Dict with matching symbols and their details
@@ -188,47 +231,42 @@ def find_symbol_by_name(data: dict, name: str) -> dict:
     results = []
     symbol_index = data.get("symbol_index", {})
     call_graph = data.get("call_graph", {})
+    methods_by_class: dict[str, list[str]] | None = None
 
-    name_lower = name.lower()
+    matches = SymbolLookup(symbol_index, cache).search(name)
 
-    # Search functions
-    for func in symbol_index.get("functions", []):
-        if name_lower in func.get("name", "").lower():
-            func_copy = dict(func)
-            func_copy["_type"] = "function"
+    for kind, symbol, score in matches:
+        symbol_copy = dict(symbol)
+        symbol_copy["_type"] = kind
+        symbol_copy["_score"] = round(score, 3)
+
+        if kind == "function":
             # Add call graph info
-            key = f"{func['file']}:{func['name']}"
+            key = f"{symbol['file']}:{symbol['name']}"
             if key in call_graph:
-                func_copy["calls"] = call_graph[key].get("calls", [])
-            results.append(func_copy)
-
-    # Search classes
-    for cls in symbol_index.get("classes", []):
-        if name_lower in cls.get("name", "").lower():
-            cls_copy = dict(cls)
-            cls_copy["_type"] = "class"
+                symbol_copy["calls"] = call_graph[key].get("calls", [])
+        elif kind == "class":
             # Find methods for this class
-            methods = [m for m in symbol_index.get("methods", [])
-                      if m.get("class") == cls["name"]]
-            cls_copy["methods"] = [m["name"] for m in methods]
-            results.append(cls_copy)
-
-    # Search methods
-    for method in symbol_index.get("methods", []):
-        full_name = f"{method.get('class', '')}.{method.get('name', '')}"
-        if name_lower in full_name.lower() or name_lower in method.get("name", "").lower():
-            method_copy = dict(method)
-            method_copy["_type"] = "method"
+            if methods_by_class is None:
+                methods_by_class = {}
+                for m in symbol_index.get("methods", []):
+                    methods_by_class.setdefault(m.get("class", ""), []).append(m["name"])
+            symbol_copy["methods"] = methods_by_class.get(symbol["name"], [])
+        else:
             # Add call graph info
-            key = f"{method['file']}:{method.get('class', '')}.{method['name']}"
+            key = f"{symbol['file']}:{symbol.get('class', '')}.{symbol['name']}"
             if key in call_graph:
-                method_copy["calls"] = call_graph[key].get("calls", [])
-            results.append(method_copy)
+                symbol_copy["calls"] = call_graph[key].get("calls", [])
+
+        results.append(symbol_copy)
 
     if not results:
         return {"query": name, "count": 0, "results": [], "hint": "Try a partial name or check --keys symbol_index"}
 
-    return {"query": name, "count": len(results), "results": results}
+    response = {"query": name, "count": len(results), "results": results}
+    if matches[0][2] < SUBSTRING_MIN_SCORE:
+        response["fuzzy"] = True
+    return response
 
 
 def get_data_at_path(data: dict, path: str, limit: int | None = None) -> dict:
@@ -290,6 +328,14 @@ QUICK START
   codebase-index .                    # Scan current directory
   codebase-index ./src -o index.json  # Scan src, output to file
   codebase-index . --summary          # Quick overview only
+  codebase-index . --sections call_graph centrality -o cg.json
+                                      # Compute only these sections (+ prerequisites)
+  codebase-index . --lazy -o index.json
+                                      # Defer flow/centrality/duplicates/coverage to first use
+  codebase-index . --format compact --compress gzip -o index.cidx
+                                      # Smallest index; --load reads it as usual
+  codebase-index . --gitignore -o index.json
+                                      # Also skip what .gitignore ignores
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 WORKFLOW
@@ -304,9 +350,13 @@ ANALYSIS QUERIES
   --check            Check if index is stale (files changed since scan)
   --update           Incrementally update the index
   --callers SYMBOL   What calls SYMBOL? (inverse call graph)
-  --impact FILE      Blast radius: callers, tests, endpoints affected
+  --impact FILE...   Blast radius: callers, tests, endpoints affected
+  --impact-diff REF  Blast radius of the changed lines since a git ref
   --tests SYMBOL     Find tests for a function/class
+  --tests-all        Map every symbol to its tests (and list untested ones)
   --doc SYMBOL       Full documentation for a symbol
+  --doc-all DIR      Doc pages for every public symbol (skips unchanged ones)
+  --flow ENTRY       Nested execution flow tree for one entry point
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 INDEX NAVIGATION (for LLMs traversing large indexes)
@@ -328,7 +378,45 @@ Examples:
 SEMANTIC SEARCH
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
   --build-embeddings   Build semantic index (requires sentence-transformers)
+  --embeddings-checkpoint DIR
+                       Resume an interrupted embedding build from DIR
   --search QUERY       Search code by description
+  --search-batch FILE  Search many queries (one per line, '-' = stdin), JSONL output
+  --search-mode MODE   hybrid (default), vector, or lexical (BM25, no model load)
+  --search-path DIR    Only search symbols under DIR (also --search-language,
+                       --search-type, --search-category)
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+SHARDED INDEXES (monorepos)
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+  --shards [GLOB ...]  One index shard per package root (default: config shards.roots),
+                       written to the -o directory; unchanged shards are reused
+  --workers N          Parallel shard scans (default: CPU count)
+
+Examples:
+  codebase-index . --shards "packages/*" -o .index/        # Build or refresh shards
+  codebase-index --load .index/ --callers authenticate     # Loads only shards involved
+  codebase-index --load .index/ --check                    # Per-shard staleness
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+DISTRIBUTED SCANS (CI runners)
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+  --partition I/N      Scan slice I of N (1-based, split by path hash) into a partial index
+  --merge PARTIAL...   Combine all N partials and run the global analyzers once
+
+Examples:
+  codebase-index . --partition 2/4 -o part2.json            # On runner 2 of 4
+  codebase-index . --merge part*.json -o index.json         # Same output as one full scan
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+PIPELINED SCANS (large or network-mounted trees)
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+  --pipeline           Overlap walking, reading (--io-threads) and parsing
+                       (--workers processes); prints per-stage utilization
+  --io-threads N       Threads statting and reading files (default: 8)
+
+Examples:
+  codebase-index . --pipeline --io-threads 32 -o index.json # NFS: more reads in flight
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 DISCLAIMER
@@ -349,6 +437,18 @@ findings against actual source code.
         "-o", "--output",
         help="Output file (default: stdout)",
     )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="json",
+        help="Index format: json (default) or compact (path/symbol id tables, "
+             "derived sections rebuilt on load; --load reads both)",
+    )
+    parser.add_argument(
+        "--compress",
+        choices=COMPRESSIONS,
+        help="Compress the written index (zstd requires: pip install zstandard)",
+    )
     parser.add_argument(
         "--load",
         metavar="FILE",
@@ -359,6 +459,26 @@ findings against actual source code.
         action="store_true",
         help="Skip file hash generation",
     )
+    parser.add_argument(
+        "--git-status",
+        action="store_true",
+        help="Run git status for an exact meta.git.dirty (default: approximate from the git index mtime)",
+    )
+    parser.add_argument(
+        "--sections",
+        nargs="+",
+        metavar="SECTION",
+        help="Only compute these index sections and their prerequisites "
+             f"(choices: {', '.join(index_sections())}). Query commands that scan "
+             "default to the sections they read",
+    )
+    parser.add_argument(
+        "--lazy",
+        action="store_true",
+        help="Leave execution_flow, centrality, potential_duplicates and test_coverage "
+             "out of the scan; they are computed on first use after --load and cached "
+             "in <index>.lazy.json",
+    )
     parser.add_argument(
         "--summary",
         action="store_true",
@@ -381,6 +501,11 @@ findings against actual source code.
         metavar="EXT",
         help="File extensions to exclude (e.g., .md .txt .log)",
     )
+    parser.add_argument(
+        "--gitignore",
+        action="store_true",
+        help="Also skip files ignored by .gitignore files and .git/info/exclude",
+    )
 
     # Configuration options
     config_group = parser.add_argument_group("Configuration")
@@ -438,16 +563,41 @@ findings against actual source code.
         metavar="SYMBOL",
         help="Find tests for a function/class (e.g., 'AgentFactory.create')",
     )
+    analysis_group.add_argument(
+        "--tests-all",
+        action="store_true",
+        help="Map every symbol to its tests in one pass (symbol -> tests, plus untested symbols)",
+    )
     analysis_group.add_argument(
         "--impact",
         metavar="FILE",
-        help="Show impact radius: callers, affected tests, affected endpoints",
+        nargs="+",
+        help="Show impact radius: callers, affected tests, affected endpoints. "
+        "Several files are analyzed together as one change",
+    )
+    analysis_group.add_argument(
+        "--impact-diff",
+        metavar="REF",
+        help="Impact of the working tree's changes against a git ref, scoped to the "
+        "symbols whose lines changed. Use '-' to read a unified diff from stdin",
     )
     analysis_group.add_argument(
         "--doc",
         metavar="SYMBOL",
         help="Generate full documentation for a symbol (signature, callers, tests, code)",
     )
+    analysis_group.add_argument(
+        "--doc-all",
+        metavar="DIR",
+        help="Write documentation pages for every public symbol into DIR "
+        "(skips symbols unchanged since the last run)",
+    )
+    analysis_group.add_argument(
+        "--flow",
+        metavar="ENTRY",
+        help="Show the nested execution flow tree for one entry point "
+        "(function name or file.py:function)",
+    )
 
     # Advanced features
     advanced_group = parser.add_argument_group("Advanced Features")
@@ -456,21 +606,78 @@ findings against actual source code.
         action="store_true",
         help="Incrementally update loaded index (only re-scan changed files)",
     )
+    advanced_group.add_argument(
+        "--partition",
+        metavar="I/N",
+        help="Scan only slice I of N (1-based) and output a partial index for --merge",
+    )
+    advanced_group.add_argument(
+        "--merge",
+        nargs="+",
+        metavar="PARTIAL",
+        help="Merge the partial indexes of every --partition into a full index "
+             "(run from the same checkout and options)",
+    )
+    advanced_group.add_argument(
+        "--shards",
+        nargs="*",
+        metavar="GLOB",
+        help="Write a sharded index (one shard per package root matching GLOB, "
+             "default: config shards.roots) to the -o directory",
+    )
+    advanced_group.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        metavar="N",
+        help="Worker processes for sharded scans and --pipeline parsing (default: CPU count)",
+    )
+    advanced_group.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Scan in a staged pipeline: walker thread, --io-threads readers and --workers "
+             "parse processes joined by bounded queues; prints per-stage utilization to stderr",
+    )
+    advanced_group.add_argument(
+        "--io-threads",
+        type=int,
+        default=DEFAULT_IO_THREADS,
+        metavar="N",
+        help=f"Threads statting and reading files in --pipeline scans (default: {DEFAULT_IO_THREADS})",
+    )
     advanced_group.add_argument(
         "--search",
         metavar="QUERY",
         help="Semantic search: find code by description (requires --build-embeddings first)",
     )
+    advanced_group.add_argument(
+        "--search-batch",
+        metavar="FILE",
+        help="Batch semantic search: read queries (one per line) from FILE or '-' for stdin, "
+             "stream results as JSONL (loads the model once)",
+    )
     advanced_group.add_argument(
         "--build-embeddings",
         action="store_true",
         help="Build embeddings for semantic search (requires sentence-transformers)",
     )
+    advanced_group.add_argument(
+        "--embeddings-checkpoint",
+        metavar="DIR",
+        help="Checkpoint directory for resumable embedding builds; must be new, empty "
+             "or a previous checkpoint (default: <output or loaded index>.embeddings-ckpt)",
+    )
     advanced_group.add_argument(
         "--embedding-model",
         metavar="MODEL",
         default="unixcoder",
-        help="Embedding model: unixcoder (default), codebert, codet5, minilm, or HuggingFace name",
+        help="Embedding model: unixcoder (default), codebert, codet5, minilm, minilm-onnx, "
+             "hashing, or HuggingFace name",
+    )
+    advanced_group.add_argument(
+        "--embedding-backend",
+        choices=["sentence-transformers", "onnx", "hashing"],
+        help="Override the model's embedding backend (e.g. onnx with a local exported model dir)",
     )
     advanced_group.add_argument(
         "--search-threshold",
@@ -479,6 +686,33 @@ findings against actual source code.
         default=0.3,
         help="Minimum similarity score for semantic search (0.0-1.0, default: 0.3). Lower = more results.",
     )
+    advanced_group.add_argument(
+        "--search-mode",
+        choices=["hybrid", "vector", "lexical"],
+        default="hybrid",
+        help="Search scoring: hybrid (BM25 + embeddings, default), vector (embeddings only), "
+             "or lexical (BM25 over names/docstrings/signatures/tags, no model load)",
+    )
+    advanced_group.add_argument(
+        "--search-path",
+        metavar="DIR",
+        help="Only search symbols in files under DIR (or a single file path)",
+    )
+    advanced_group.add_argument(
+        "--search-language",
+        metavar="LANG",
+        help="Only search symbols in files of this language (e.g., python, typescript)",
+    )
+    advanced_group.add_argument(
+        "--search-type",
+        choices=["function", "method", "class", "file"],
+        help="Only search symbols of this type",
+    )
+    advanced_group.add_argument(
+        "--search-category",
+        metavar="CATEGORY",
+        help="Only search symbols in files of this category (e.g., routes, models, tests)",
+    )
 
     # Index navigation options (for LLMs)
     nav_group = parser.add_argument_group(
@@ -500,7 +734,8 @@ findings against actual source code.
     nav_group.add_argument(
         "--get",
         metavar="SYMBOL",
-        help="Get full details for a symbol by name (searches functions, classes, methods)",
+        help="Get full details for a symbol by name (searches functions, classes, methods; "
+        "ranked substring match, fuzzy fallback for typos)",
     )
     nav_group.add_argument(
         "--path",
@@ -767,13 +1002,20 @@ def main() -> None:
         and not args.callers
         and not args.check
         and not args.tests
+        and not args.tests_all
         and not args.impact
+        and not args.impact_diff
         and not args.doc
+        and not args.doc_all
+        and not args.flow
         and not args.search
+        and not args.search_batch
         and not args.schema
         and args.keys is None
         and not args.get
         and not args.json_path
+        and not args.partition
+        and not args.merge
     )
 
     if is_basic_scan:
@@ -787,7 +1029,7 @@ def main() -> None:
 
     # Handle --init-docs: initialize documentation maintenance system
     if args.init_docs:
-        result = init_docs(
+        docs_result = init_docs(
             force=args.init_docs_force,
             skip_hooks=args.init_docs_skip_hooks,
             skip_workflow=args.init_docs_skip_workflow,
@@ -795,19 +1037,19 @@ def main() -> None:
 
         print("Initializing documentation maintenance system...\n")
 
-        if result["created"]:
+        if docs_result["created"]:
             print("Created:")
-            for path in result["created"]:
+            for path in docs_result["created"]:
                 print(f"  + {path}")
 
-        if result["skipped"]:
+        if docs_result["skipped"]:
             print("\nSkipped (already exist):")
-            for path in result["skipped"]:
+            for path in docs_result["skipped"]:
                 print(f"  - {path}")
 
-        if result["errors"]:
+        if docs_result["errors"]:
             print("\nErrors:")
-            for error in result["errors"]:
+            for error in docs_result["errors"]:
                 print(f"  ! {error}")
 
         print("\nNext steps:")
@@ -849,9 +1091,42 @@ def main() -> None:
     # Track changed files for incremental embedding updates
     changed_files: set[str] | None = None
 
+    # Handle --partition: scan one slice for a distributed scan
+    if args.partition and not args.load:
+        partial = scan_partition(args, config)
+        output = json.dumps(partial, default=json_default)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(output)
+            if args.verbose:
+                print(f"Partial index written to: {args.output}", file=sys.stderr)
+        else:
+            print(output)
+        return
+
+    # Handle --shards: build or refresh a sharded index directory
+    if args.shards is not None and not args.load:
+        shard_stats = scan_sharded(args, config)
+        print(json.dumps(shard_stats, indent=2, default=json_default))
+        return
+
+    # Sharded index: load only the shards the query touches
+    if args.load and is_sharded_index(Path(args.load)):
+        sharded = ShardedIndex(Path(args.load))
+        if args.check:
+            print(json.dumps(sharded.check(Path(args.path).resolve()), indent=2, default=json_default))
+            return
+        if args.update:
+            print("Error: --update does not apply to sharded indexes; "
+                  "re-run the --shards scan (unchanged shards are reused)", file=sys.stderr)
+            sys.exit(1)
+        result = sharded.load(select_shards(sharded, args))
+        compact_index(result)
     # Load existing index or scan
-    if args.load:
-        result = load_index(args.load, args.verbose)
+    elif args.load:
+        result = wrap_lazy(load_index(args.load, args.verbose, compact=True), Path(args.load))
+    elif args.merge:
+        result = merge_partitions(args, config)
     else:
         result = scan_codebase(args, config)
 
@@ -906,6 +1181,7 @@ def main() -> None:
             exclude=exclude,
             exclude_extensions=exclude_extensions,
             config=config,
+            gitignore=use_gitignore(args, config),
         )
 
         changes = update_result["changes"]
@@ -932,7 +1208,7 @@ def main() -> None:
         index_file = Path(args.load).resolve()
         checker = StalenessChecker(root, result, index_file=index_file)
         staleness = checker.check()
-        print(json.dumps(staleness, indent=2, default=str))
+        print(json.dumps(staleness, indent=2, default=json_default))
         return
 
     # Handle --schema: show index structure template
@@ -944,33 +1220,69 @@ def main() -> None:
     # Handle --keys: list keys at a path
     if args.keys is not None:
         keys_result = get_keys_at_path(result, args.keys, limit=args.limit)
-        print(json.dumps(keys_result, indent=2, default=str))
+        print(json.dumps(keys_result, indent=2, default=json_default))
         return
 
     # Handle --get: find symbol by name
     if args.get:
-        symbol_result = find_symbol_by_name(result, args.get)
-        print(json.dumps(symbol_result, indent=2, default=str))
+        symbol_result = find_symbol_by_name(result, args.get, trigram_cache(args))
+        print(json.dumps(symbol_result, indent=2, default=json_default))
         return
 
     # Handle --path: extract data at path
     if args.json_path:
         path_result = get_data_at_path(result, args.json_path, limit=args.limit)
-        print(json.dumps(path_result, indent=2, default=str))
+        print(json.dumps(path_result, indent=2, default=json_default))
         return
 
     # Handle --tests: find tests for a symbol
     if args.tests:
         mapper = TestMapper(result)
         tests_result = mapper.find_tests_for(args.tests)
-        print(json.dumps(tests_result, indent=2, default=str))
+        print(json.dumps(tests_result, indent=2, default=json_default))
+        return
+
+    # Handle --tests-all: full symbol -> tests map
+    if args.tests_all:
+        mapper = TestMapper(result)
+        print(json.dumps(mapper.find_all_tests(), indent=2, default=json_default))
         return
 
     # Handle --impact: analyze impact radius of a file
     if args.impact:
         analyzer = ImpactAnalyzer(result)
-        impact_result = analyzer.analyze_file(args.impact)
-        print(json.dumps(impact_result, indent=2, default=str))
+        if len(args.impact) == 1:
+            impact_result = analyzer.analyze_file(args.impact[0])
+        else:
+            impact_result = analyzer.analyze_files(args.impact)
+        print(json.dumps(impact_result, indent=2, default=json_default))
+        return
+
+    # Handle --impact-diff: impact of a git diff, scoped to changed symbols
+    if args.impact_diff:
+        from codebase_index.analyzers.diff_impact import DiffImpactAnalyzer
+
+        diff_analyzer = DiffImpactAnalyzer(result)
+        if args.impact_diff == "-":
+            impact_result = diff_analyzer.analyze_diff(sys.stdin.read())
+        else:
+            try:
+                impact_result = diff_analyzer.analyze_ref(Path(args.path).resolve(), args.impact_diff)
+            except RuntimeError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                sys.exit(1)
+        print(json.dumps(impact_result, indent=2, default=json_default))
+        return
+
+    # Handle --flow: nested execution flow tree for one entry point
+    if args.flow:
+        from codebase_index.analyzers.execution_flow import ExecutionFlowAnalyzer
+
+        flow_result = ExecutionFlowAnalyzer(result).flow_tree(args.flow)
+        if flow_result is None:
+            print(f"Error: '{args.flow}' not found in call graph", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(flow_result, indent=2, default=json_default))
         return
 
     # Handle --doc: generate full documentation for a symbol
@@ -984,36 +1296,50 @@ def main() -> None:
         print(doc_result.get("markdown", ""))
         return
 
+    # Handle --doc-all: documentation pages for every public symbol
+    if args.doc_all:
+        from codebase_index.analyzers.doc_generator import generate_all_docs
+
+        root = Path(args.path).resolve()
+        doc_stats = generate_all_docs(result, Path(args.doc_all), root=root)
+        print(json.dumps(doc_stats, indent=2, default=json_default))
+        return
+
     # Handle --build-embeddings: generate embeddings for semantic search
     if args.build_embeddings:
         from codebase_index.analyzers.semantic import (
             build_embeddings,
-            check_semantic_available,
+            model_backend,
             MODELS,
             DEFAULT_MODEL,
         )
 
-        if not check_semantic_available():
-            print(
-                "Error: Semantic search requires sentence-transformers.\n"
-                "Install with: pip install codebase-index[semantic]",
-                file=sys.stderr,
-            )
-            sys.exit(1)
-
         root = Path(args.path).resolve()
         model = getattr(args, 'embedding_model', None) or DEFAULT_MODEL
+        backend = model_backend(model, args.embedding_backend)
+        exit_if_semantic_unavailable(model, backend)
 
         if args.verbose:
             model_info = MODELS.get(model, {})
             model_name = model_info.get("name", model) if model_info else model
             if changed_files is not None:
-                print(f"Building embeddings (incremental) with model: {model_name}", file=sys.stderr)
+                print(f"Building embeddings (incremental) with model: {model_name} ({backend})", file=sys.stderr)
                 print(f"  Changed files: {len(changed_files)}", file=sys.stderr)
             else:
-                print(f"Building embeddings (full) with model: {model_name}", file=sys.stderr)
+                print(f"Building embeddings (full) with model: {model_name} ({backend})", file=sys.stderr)
 
-        result = build_embeddings(result, root=root, model=model, changed_files=changed_files)
+        checkpoint_dir = embeddings_checkpoint_dir(args)
+        if args.verbose and checkpoint_dir:
+            print(f"  Checkpoint: {checkpoint_dir}", file=sys.stderr)
+
+        try:
+            result = build_embeddings(
+                result, root=root, model=model, changed_files=changed_files,
+                checkpoint_dir=checkpoint_dir, backend=args.embedding_backend,
+            )
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
 
         if args.verbose:
             semantic = result.get("semantic", {})
@@ -1024,22 +1350,38 @@ def main() -> None:
 
     # Handle --search: semantic search
     if args.search:
-        from codebase_index.analyzers.semantic import (
-            semantic_search,
-            check_semantic_available,
+        from codebase_index.analyzers.semantic import semantic_search
+
+        if args.search_mode != "lexical":
+            semantic = result.get("semantic", {})
+            exit_if_semantic_unavailable(
+                semantic.get("model_key"), semantic.get("backend"), lexical_hint=True
+            )
+
+        threshold = getattr(args, 'search_threshold', 0.3)
+        search_result = semantic_search(
+            result, args.search, min_score=threshold, mode=args.search_mode,
+            filters=search_filters(args),
         )
+        print(json.dumps(search_result, indent=2, default=json_default))
+        return
+
+    # Handle --search-batch: many queries, one model load, JSONL output
+    if args.search_batch:
+        from codebase_index.analyzers.semantic import semantic_search_batch
 
-        if not check_semantic_available():
-            print(
-                "Error: Semantic search requires sentence-transformers.\n"
-                "Install with: pip install codebase-index[semantic]",
-                file=sys.stderr,
+        if args.search_mode != "lexical":
+            semantic = result.get("semantic", {})
+            exit_if_semantic_unavailable(
+                semantic.get("model_key"), semantic.get("backend"), lexical_hint=True
             )
-            sys.exit(1)
 
         threshold = getattr(args, 'search_threshold', 0.3)
-        search_result = semantic_search(result, args.search, min_score=threshold)
-        print(json.dumps(search_result, indent=2, default=str))
+        for search_result in semantic_search_batch(
+            result, iter_queries(args.search_batch), min_score=threshold,
+            mode=args.search_mode, filters=search_filters(args),
+        ):
+            print(json.dumps(search_result, default=json_default), flush=True)
         return
 
     # Handle call graph queries
@@ -1049,37 +1391,322 @@ def main() -> None:
 
     # Summary only mode
     if args.summary:
+        if isinstance(result, LazyIndex):
+            result.materialize()
         result = {
             "meta": result["meta"],
             "summary": result["summary"],
         }
 
     # Output
-    output = json.dumps(result, indent=2, default=str)
+    try:
+        serialized = dump_index(result, args.output, args.format, args.compress)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
 
     if args.output:
-        with open(args.output, "w", encoding="utf-8") as f:
-            f.write(output)
         if args.verbose:
             print(f"Output written to: {args.output}", file=sys.stderr)
+    elif isinstance(serialized, bytes):
+        sys.stdout.buffer.write(serialized)
     else:
-        print(output)
+        print(serialized)
 
 
-def load_index(load_path: str, verbose: bool) -> dict[str, Any]:
-    """Load an existing index file."""
+def load_index(load_path: str, verbose: bool, compact: bool = False) -> dict[str, Any]:
+    """
+    Load an existing index file (plain or compact, optionally compressed).
+
+    Args:
+        load_path: Path to the index file.
+        verbose: Print progress to stderr.
+        compact: Intern strings and convert symbols and call graph entries
+            to slotted records (see codebase_index.model) to cut memory use.
+
+    Returns:
+        Index dictionary.
+    """
     path = Path(load_path)
     if not path.exists():
         print(f"Error: Index file '{path}' does not exist", file=sys.stderr)
         sys.exit(1)
     if verbose:
         print(f"Loading index from: {path}", file=sys.stderr)
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    try:
+        index_data = load_index_file(path)
+    except (RuntimeError, ValueError) as e:
+        print(f"Error: Could not load index '{path}': {e}", file=sys.stderr)
+        sys.exit(1)
+    if compact:
+        compact_index(index_data)
+    return index_data
+
+
+def exit_if_semantic_unavailable(
+    model: str | None,
+    backend: str | None,
+    lexical_hint: bool = False,
+) -> None:
+    """
+    Exit with an install hint if the embedding backend is not installed.
+
+    Args:
+        model: Model key (default model if None).
+        backend: Backend override (model's backend if None).
+        lexical_hint: Mention --search-mode lexical as an alternative.
+    """
+    from codebase_index.analyzers.embedding_backends import install_hint
+    from codebase_index.analyzers.semantic import check_semantic_available, model_backend
+
+    if check_semantic_available(model, backend):
+        return
+
+    backend = model_backend(model, backend)
+    message = (
+        f"Error: Semantic search with the {backend} backend is not installed.\n"
+        f"Install with: {install_hint(backend)}"
+    )
+    if lexical_hint:
+        message += "\n(or use --search-mode lexical)"
+    print(message, file=sys.stderr)
+    sys.exit(1)
+
+
+def embeddings_checkpoint_dir(args: argparse.Namespace) -> Path | None:
+    """
+    Resolve where --build-embeddings keeps its resumable shards.
+
+    Defaults to a directory next to the output file (or the loaded index),
+    so re-running the same command after a crash resumes the build.
+
+    Args:
+        args: Parsed command line arguments.
+
+    Returns:
+        Checkpoint directory, or None if there is nowhere sensible to put it.
+    """
+    if args.embeddings_checkpoint:
+        return Path(args.embeddings_checkpoint)
+    target = args.output or args.load
+    if target:
+        return Path(f"{target}.embeddings-ckpt")
+    return None
+
+
+def trigram_cache(args: argparse.Namespace) -> TrigramCache | None:
+    """
+    Sidecar cache for the trigram lookups of a --load'ed index file.
+
+    Args:
+        args: Parsed command line arguments.
+
+    Returns:
+        The cache, or None if the queried data is not exactly the file's
+        (scanned, merged, sharded or --update'd indexes).
+    """
+    if not args.load or args.update:
+        return None
+    path = Path(args.load)
+    if not path.is_file():
+        return None
+    return TrigramCache(path)
+
+
+def search_filters(args: argparse.Namespace) -> dict[str, str] | None:
+    """
+    Collect --search-* filter flags into a filters dict.
+
+    Args:
+        args: Parsed command line arguments.
+
+    Returns:
+        Field -> value mapping, or None if no filters were given.
+    """
+    filters = {
+        "path": args.search_path,
+        "language": args.search_language,
+        "type": args.search_type,
+        "category": args.search_category,
+    }
+    filters = {field: value for field, value in filters.items() if value}
+    return filters or None
+
+
+def iter_queries(source: str) -> Iterator[str]:
+    """
+    Yield non-empty queries, one per line, from a file or stdin.
+
+    Lines are read lazily so batch search can start scoring (and
+    streaming results) before the whole input has arrived.
+
+    Args:
+        source: Path to a query file, or '-' for stdin.
+    """
+    if source == "-":
+        for line in sys.stdin:
+            query = line.strip()
+            if query:
+                yield query
+        return
+
+    path = Path(source)
+    if not path.exists():
+        print(f"Error: Query file '{path}' does not exist", file=sys.stderr)
+        sys.exit(1)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            query = line.strip()
+            if query:
+                yield query
+
+
+def select_shards(sharded: ShardedIndex, args: argparse.Namespace) -> set[str] | None:
+    """
+    Shards a query needs, from the global symbol table.
+
+    Returns:
+        Shard names, or None to load every shard (unknown names, or
+        queries over the whole index).
+    """
+    symbol = args.callers or args.tests or args.get or args.doc
+    if symbol:
+        return sharded.shards_for_symbol(symbol)
+    if args.impact:
+        return sharded.shards_for_paths(args.impact) or None
+    return None
+
+
+def scan_sharded(args: argparse.Namespace, config: dict[str, Any]) -> dict[str, Any]:
+    """Build or refresh a sharded index in the -o directory."""
+    if not args.output:
+        print("Error: --shards requires -o to specify the index directory", file=sys.stderr)
+        sys.exit(1)
+    patterns = args.shards or config.get("shards", {}).get("roots") or []
+    if not patterns:
+        print("Error: --shards needs package root globs (or shards.roots in the config)", file=sys.stderr)
+        sys.exit(1)
+
+    root, exclude, exclude_extensions = scan_options(args, config)
+    try:
+        return build_shards(
+            root,
+            patterns,
+            Path(args.output),
+            exclude=exclude,
+            exclude_extensions=exclude_extensions,
+            include_hash=not args.no_hash,
+            config=config,
+            workers=max(1, args.workers),
+            gitignore=use_gitignore(args, config),
+        )
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def query_sections(args: argparse.Namespace) -> list[str] | None:
+    """
+    Index sections a query command reads, for scans run just to answer it.
+
+    Files, symbols and the other parse-time sections are always produced,
+    so queries only add what they read on top (mostly the call graph).
+
+    Returns:
+        Section names, or None when the whole index is needed (plain scans,
+        --summary, --keys/--path navigation, --build-embeddings output).
+    """
+    if args.summary or args.build_embeddings or args.keys is not None or args.json_path:
+        return None
+    if args.impact or args.impact_diff:
+        return ["call_graph", "api_endpoints"]
+    if args.callers or args.get or args.tests or args.tests_all or args.flow or args.doc or args.doc_all:
+        return ["call_graph"]
+    if args.search or args.search_batch:
+        return []
+    return None
+
+
+def create_scanner(args: argparse.Namespace, config: dict[str, Any]) -> CodebaseScanner:
+    """Build a scanner from CLI args and config."""
+    root, exclude, exclude_extensions = scan_options(args, config)
+    try:
+        return CodebaseScanner(
+            root=root,
+            exclude=exclude,
+            exclude_extensions=exclude_extensions,
+            include_hash=not args.no_hash,
+            config=config,
+            git_status=args.git_status,
+            sections=args.sections if args.sections is not None else query_sections(args),
+            lazy=args.lazy,
+            pipeline_workers=max(1, args.workers) if args.pipeline else 0,
+            io_threads=max(1, args.io_threads),
+            gitignore=use_gitignore(args, config),
+        )
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
 
 
 def scan_codebase(args: argparse.Namespace, config: dict[str, Any]) -> dict[str, Any]:
     """Scan the codebase and return the result."""
+    scanner = create_scanner(args, config)
+
+    # Suppress SyntaxWarnings from scanned files (e.g., invalid escape sequences)
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=SyntaxWarning)
+        result = scanner.scan()
+    report_pipeline(scanner)
+    return result
+
+
+def scan_partition(args: argparse.Namespace, config: dict[str, Any]) -> dict[str, Any]:
+    """Scan the --partition I/N slice and return the partial index."""
+    index, sep, count = args.partition.partition("/")
+    if not sep or not index.isdigit() or not count.isdigit():
+        print(f"Error: --partition expects I/N (e.g. 2/4), got '{args.partition}'", file=sys.stderr)
+        sys.exit(1)
+
+    scanner = create_scanner(args, config)
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=SyntaxWarning)
+        try:
+            partial = scanner.scan_partition(int(index) - 1, int(count))
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+    report_pipeline(scanner)
+    return partial
+
+
+def report_pipeline(scanner: CodebaseScanner) -> None:
+    """Print the per-stage utilization of a --pipeline scan to stderr."""
+    if scanner.pipeline_stats:
+        print(format_stats(scanner.pipeline_stats), file=sys.stderr)
+
+
+def merge_partitions(args: argparse.Namespace, config: dict[str, Any]) -> dict[str, Any]:
+    """Merge --merge partial indexes into a full index."""
+    partials = [load_index(path, args.verbose) for path in args.merge]
+    scanner = create_scanner(args, config)
+    try:
+        return scanner.merge_partials(partials)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def use_gitignore(args: argparse.Namespace, config: dict[str, Any]) -> bool:
+    """Whether .gitignore'd files are skipped (--gitignore or exclude.gitignore)."""
+    return args.gitignore or bool(config.get("exclude", {}).get("gitignore"))
+
+
+def scan_options(
+    args: argparse.Namespace,
+    config: dict[str, Any],
+) -> tuple[Path, list[str], set[str]]:
+    """Resolve the scan root and exclusions from CLI args and config."""
     root = Path(args.path).resolve()
     if not root.exists():
         print(f"Error: Path '{root}' does not exist", file=sys.stderr)
@@ -1130,18 +1757,7 @@ def scan_codebase(args: argparse.Namespace, config: dict[str, Any]) -> dict[str,
         if args.exclude_ext:
             print(f"CLI excluded extensions: {args.exclude_ext}", file=sys.stderr)
 
-    scanner = CodebaseScanner(
-        root=root,
-        exclude=exclude,
-        exclude_extensions=exclude_extensions,
-        include_hash=not args.no_hash,
-        config=config,
-    )
-
-    # Suppress SyntaxWarnings from scanned files (e.g., invalid escape sequences)
-    with warnings.catch_warnings():
-        warnings.filterwarnings("ignore", category=SyntaxWarning)
-        return scanner.scan()
+    return root, exclude, exclude_extensions
 
 
 def handle_cg_query(args: argparse.Namespace, result: dict[str, Any]) -> None:
@@ -1152,7 +1768,8 @@ def handle_cg_query(args: argparse.Namespace, result: dict[str, Any]) -> None:
         sys.exit(1)
 
     if args.callers:
-        query_result = cg_query_callers(call_graph, args.callers)
+        lookup = CallGraphLookup(call_graph, trigram_cache(args))
+        query_result = cg_query_callers(call_graph, args.callers, lookup)
         print(json.dumps(query_result, indent=2))
 
 
@@ -0,0 +1,380 @@
+"""
+Compact on-disk index format for codebase_index.
+
+The plain JSON index repeats every file path in files, symbol_index,
+call_graph keys and values, centrality, execution_flow and the manifest,
+and stores each signature twice (files[].exports and symbol_index). The
+compact format:
+
+- writes a path table and a symbol table ("path:Qualified.name" keys as
+  [path_id, name] pairs) once and refers to them by integer id (fields
+  holding ids are marked with an "@" suffix, e.g. "file@": 12);
+- drops symbol_index, call_graph and potential_duplicates, which are
+  rebuilt from files[].exports on load (only when that reproduces them
+  exactly, so hand-edited or older indexes round-trip unchanged);
+- optionally compresses the result with gzip or zstd.
+
+load_index_file reads plain, compact and compressed indexes alike.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+from collections.abc import Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from codebase_index.model import json_default
+from codebase_index.scanner import CodebaseScanner
+
+if TYPE_CHECKING:
+    from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Optional zstd compression
+try:
+    import zstandard  # type: ignore[import-not-found]
+
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+# Format marker and version of the compact layout
+COMPACT_FORMAT = "codebase-index-compact"
+COMPACT_FORMAT_VERSION = 1
+
+# Output formats and compressions accepted by --format / --compress
+OUTPUT_FORMATS = ("json", "compact")
+COMPRESSIONS = ("gzip", "zstd")
+
+# Leading bytes identifying compressed files
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Sections rebuilt from files[].exports on load
+DERIVED_SECTIONS = ("symbol_index", "call_graph", "potential_duplicates")
+
+# Fields whose value (or list items) are file paths
+PATH_FIELDS = frozenset({
+    "file", "path", "used_in", "covered", "uncovered", "test_files",
+    "entry_points", "orphaned_files",
+})
+
+# Fields whose value (or list items) are "path:Qualified.name" symbol keys
+SYMBOL_FIELDS = frozenset({"key", "callers", "callees", "caller", "callee"})
+
+_ID_FIELDS = PATH_FIELDS | SYMBOL_FIELDS
+
+# Appended to a field name whose value was replaced by table ids
+ID_SUFFIX = "@"
+
+# Dicts keyed by paths or symbol keys: (section, field, table)
+KEYED_MAPS = (
+    ("manifest", "files", "paths"),
+    ("centrality", "classifications", "symbols"),
+)
+
+
+class _Tables:
+    """Path and symbol tables built while encoding."""
+
+    def __init__(self, paths: list[str]) -> None:
+        self.paths = paths
+        self.path_ids = {path: i for i, path in enumerate(paths)}
+        self.symbols: list[list[Any]] = []
+        self.symbol_ids: dict[str, int] = {}
+        # Number of fields replaced by ids (tells which sections need decoding)
+        self.replaced = 0
+
+    def path_id(self, value: str) -> int | None:
+        return self.path_ids.get(value)
+
+    def symbol_id(self, value: str) -> int | None:
+        symbol_id = self.symbol_ids.get(value)
+        if symbol_id is None:
+            colon = value.find(":")
+            path_id = self.path_ids.get(value[:colon]) if colon > 0 else None
+            if path_id is None:
+                return None
+            symbol_id = self.symbol_ids[value] = len(self.symbols)
+            self.symbols.append([path_id, value[colon + 1:]])
+        return symbol_id
+
+
+def _encode_field(value: Any, lookup: Any, tables: _Tables) -> Any | None:
+    """
+    Replace a string, or the strings of a list, with table ids.
+
+    Returns None when the value has nothing to replace or already holds
+    integers (which would be mistaken for ids on load).
+    """
+    if isinstance(value, str):
+        table_id = lookup(value)
+        if table_id is not None:
+            tables.replaced += 1
+        return table_id
+    if not isinstance(value, (list, tuple)) or any(type(item) is int for item in value):
+        return None
+    encoded = []
+    replaced = False
+    for item in value:
+        table_id = lookup(item) if isinstance(item, str) else None
+        if table_id is None:
+            encoded.append(_encode(item, tables))
+        else:
+            encoded.append(table_id)
+            replaced = True
+    if replaced:
+        tables.replaced += 1
+        return encoded
+    return None
+
+
+def _encode(value: Any, tables: _Tables) -> Any:
+    """Encode a JSON tree, replacing paths and symbol keys with ids."""
+    if isinstance(value, Mapping):
+        encoded = {}
+        for key, item in value.items():
+            if key in PATH_FIELDS or key in SYMBOL_FIELDS:
+                lookup = tables.path_id if key in PATH_FIELDS else tables.symbol_id
+                ids = _encode_field(item, lookup, tables)
+                if ids is not None:
+                    encoded[key + ID_SUFFIX] = ids
+                    continue
+            elif isinstance(key, str) and key.endswith(ID_SUFFIX) and key[:-1] in _ID_FIELDS:
+                raise ValueError(f"Index key {key!r} collides with the compact id marker")
+            encoded[key] = _encode(item, tables)
+        return encoded
+    if isinstance(value, (list, tuple)):
+        return [_encode(item, tables) for item in value]
+    return value
+
+
+class _Decoder:
+    """Resolves ids back to path and symbol strings."""
+
+    def __init__(self, paths: list[str], symbols: list[list[Any]]) -> None:
+        self.paths = paths
+        self.symbols = [f"{paths[path_id]}:{name}" for path_id, name in symbols]
+
+    def _field(self, value: Any, table: list[str]) -> Any:
+        if type(value) is int:
+            return table[value]
+        return [table[item] if type(item) is int else self.decode(item) for item in value]
+
+    def decode(self, value: Any) -> Any:
+        """Decode a JSON tree in place (dicts with id fields are rebuilt)."""
+        if isinstance(value, dict):
+            has_ids = False
+            for key, item in value.items():
+                if key[-1:] == ID_SUFFIX and key[:-1] in _ID_FIELDS:
+                    has_ids = True
+                elif isinstance(item, (dict, list)):
+                    self.decode(item)
+            if has_ids:
+                items = list(value.items())
+                value.clear()
+                for key, item in items:
+                    if key[-1:] == ID_SUFFIX and key[:-1] in _ID_FIELDS:
+                        key = key[:-1]
+                        item = self._field(item, self.paths if key in PATH_FIELDS else self.symbols)
+                    value[key] = item
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, (dict, list)):
+                    self.decode(item)
+        return value
+
+
+def _canonical(value: Any) -> str:
+    """Stable text form used to check a derived section reproduces the original."""
+    return json.dumps(value, default=json_default)
+
+
+def encode_compact(index_data: dict[str, Any]) -> dict[str, Any]:
+    """
+    Convert an index to the compact layout.
+
+    Args:
+        index_data: Index dictionary (plain or compact-model records).
+
+    Returns:
+        Compact document (JSON-serializable).
+    """
+    files = index_data.get("files", [])
+    paths = [f["path"] for f in files if isinstance(f, dict) and isinstance(f.get("path"), str)]
+    # When every file entry starts with a unique path, the path table doubles
+    # as the files' path column and the entries can omit it
+    positional = (
+        len(paths) == len(files)
+        and len(set(paths)) == len(paths)
+        and all(next(iter(f), None) == "path" for f in files)
+    )
+    if not positional:
+        paths = list(dict.fromkeys(path for path in paths if path))
+    tables = _Tables(paths)
+
+    derived = CodebaseScanner.derive_symbol_sections(files)
+    dropped = [
+        name for name in DERIVED_SECTIONS
+        if name in index_data and _canonical(derived[name]) == _canonical(index_data[name])
+    ]
+
+    body: dict[str, Any] = {}
+    id_sections = []
+    for key, value in index_data.items():
+        if key in dropped:
+            # Keep the key (as null) so decoding restores the section order
+            body[key] = None
+            continue
+        if key == "files" and positional:
+            value = [{k: v for k, v in f.items() if k != "path"} for f in files]
+        before = tables.replaced
+        body[key] = _encode(value, tables)
+        if tables.replaced > before:
+            id_sections.append(key)
+
+    keyed_maps = []
+    for section, field, table in KEYED_MAPS:
+        mapping = (body.get(section) or {}).get(field)
+        if not isinstance(mapping, dict):
+            continue
+        lookup = tables.path_id if table == "paths" else tables.symbol_id
+        ids = [lookup(key) for key in mapping]
+        if None in ids:
+            continue
+        body[section][field] = {str(table_id): value for table_id, value in zip(ids, mapping.values())}
+        keyed_maps.append([section, field, table])
+
+    return {
+        "format": COMPACT_FORMAT,
+        "version": COMPACT_FORMAT_VERSION,
+        "paths": tables.paths,
+        "symbols": tables.symbols,
+        "derived": dropped,
+        "positional_paths": positional,
+        "id_sections": id_sections,
+        "keyed_maps": keyed_maps,
+        "index": body,
+    }
+
+
+def is_compact(document: Any) -> bool:
+    """Check whether a parsed JSON document is a compact index."""
+    return isinstance(document, dict) and document.get("format") == COMPACT_FORMAT
+
+
+def decode_compact(document: dict[str, Any]) -> dict[str, Any]:
+    """
+    Rebuild a plain index from a compact document.
+
+    Args:
+        document: Parsed compact document.
+
+    Returns:
+        Index dictionary, identical to the one that was encoded.
+
+    Raises:
+        ValueError: If the document was written by an unknown format version.
+    """
+    version = document.get("version")
+    if version != COMPACT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported compact index version: {version}")
+
+    decoder = _Decoder(document["paths"], document["symbols"])
+    index_data: dict[str, Any] = document["index"]
+
+    for section, field, table in document.get("keyed_maps", []):
+        values = decoder.paths if table == "paths" else decoder.symbols
+        mapping = index_data[section][field]
+        index_data[section][field] = {values[int(key)]: value for key, value in mapping.items()}
+
+    if document.get("positional_paths"):
+        index_data["files"] = [
+            {"path": path, **file_info}
+            for path, file_info in zip(decoder.paths, index_data["files"])
+        ]
+    for section in document.get("id_sections", []):
+        decoder.decode(index_data[section])
+
+    derived_names = document.get("derived", [])
+    if derived_names:
+        derived = CodebaseScanner.derive_symbol_sections(index_data.get("files", []))
+        for name in derived_names:
+            index_data[name] = derived[name]
+
+    return index_data
+
+
+def dump_index(
+    index_data: dict[str, Any],
+    path: str | Path | None,
+    output_format: str = "json",
+    compress: str | None = None,
+    indent: int | None = 2,
+) -> bytes | str:
+    """
+    Serialize an index in the requested format.
+
+    Args:
+        index_data: Index dictionary.
+        path: Output file, or None to return the serialized data only.
+        output_format: "json" or "compact".
+        compress: None, "gzip" or "zstd".
+        indent: JSON indent for the plain format (compact is never indented).
+
+    Returns:
+        The serialized index (bytes when compressed, else str).
+
+    Raises:
+        RuntimeError: If zstd compression is requested but not installed.
+    """
+    if output_format == "compact":
+        text = json.dumps(encode_compact(index_data), separators=(",", ":"))
+    else:
+        text = json.dumps(index_data, indent=indent, default=json_default)
+
+    data: bytes | str = text
+    if compress == "gzip":
+        data = gzip.compress(text.encode("utf-8"), compresslevel=6)
+    elif compress == "zstd":
+        if not HAS_ZSTD:
+            raise RuntimeError("zstd compression requires: pip install zstandard")
+        data = zstandard.ZstdCompressor(level=10).compress(text.encode("utf-8"))
+
+    if path is not None:
+        if isinstance(data, bytes):
+            Path(path).write_bytes(data)
+        else:
+            Path(path).write_text(data, encoding="utf-8")
+    return data
+
+
+def load_index_file(path: str | Path) -> dict[str, Any]:
+    """
+    Read an index in any supported format (plain/compact, raw/gzip/zstd).
+
+    Args:
+        path: Index file.
+
+    Returns:
+        Index dictionary.
+
+    Raises:
+        RuntimeError: If the file is zstd-compressed but zstandard is missing.
+    """
+    raw = Path(path).read_bytes()
+    if raw.startswith(_GZIP_MAGIC):
+        raw = gzip.decompress(raw)
+    elif raw.startswith(_ZSTD_MAGIC):
+        if not HAS_ZSTD:
+            raise RuntimeError(f"{path} is zstd-compressed; install zstandard to read it")
+        raw = zstandard.ZstdDecompressor().decompress(raw)
+
+    document: dict[str, Any] = json.loads(raw)
+    if is_compact(document):
+        return decode_compact(document)
+    return document
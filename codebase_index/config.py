@@ -266,11 +266,26 @@ DEFAULT_CONFIG: dict[str, Any] = {
         "max_class_methods": 20,
     },
 
+    # Huge, minified and generated files are indexed as metadata only
+    # (path, size, lines, hash; not parsed) and listed in skipped_files
+    "large_files": {
+        "max_size_bytes": 5_000_000,  # 0 = no size limit
+        "max_line_length": 10_000,    # longest line (bytes) of hand-written code; 0 = off
+        "generated_markers": [],      # e.g., ["@generated", "DO NOT EDIT"]
+    },
+
+    # Package roots scanned as separate index shards by --shards
+    # (globs relative to the project root, e.g. ["packages/*", "services/*"])
+    "shards": {
+        "roots": [],
+    },
+
     # Exclusion patterns (applied in addition to CLI exclusions)
     "exclude": {
         "directories": [],  # e.g., [".archive", "docs", "vendor"]
         "extensions": [],   # e.g., [".md", ".txt", ".log"]
         "patterns": [],     # e.g., ["*.generated.*", "*.min.js"]
+        "gitignore": False,  # also skip files ignored by .gitignore
     },
 }
 
@@ -543,6 +558,32 @@ complexity:
   max_function_lines: 50
   max_class_methods: 20
 
+# =============================================================================
+# LARGE AND GENERATED FILES
+# =============================================================================
+# Files over max_size_bytes, with a line longer than max_line_length (minified
+# bundles, data dumps) or containing a marker near the top are indexed as
+# metadata only (size, lines, hash) without parsing, and listed in
+# skipped_files with the reason.
+# =============================================================================
+large_files:
+  max_size_bytes: 5000000
+  max_line_length: 10000
+  generated_markers:
+    # - "@generated"
+    # - "DO NOT EDIT"
+
+# =============================================================================
+# SHARDS (monorepos)
+# =============================================================================
+# Package roots scanned as separate index shards by --shards -o DIR.
+# Globs are relative to the project root; one shard per matching directory.
+# =============================================================================
+shards:
+  roots:
+    # - "packages/*"
+    # - "services/*"
+
 # =============================================================================
 # EXCLUSIONS
 # =============================================================================
@@ -567,4 +608,8 @@ exclude:
   patterns:
     # - "*.generated.*"
     # - "*.min.js"
+
+  # Also skip files ignored by .gitignore files and .git/info/exclude
+  # (same as --gitignore)
+  gitignore: false
 '''
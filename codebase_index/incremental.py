@@ -8,12 +8,14 @@ rather than doing a full re-scan of the entire codebase.
 from __future__ import annotations
 
 import copy
-import hashlib
 import logging
 import time
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from codebase_index.utils import compile_exclude, count_lines, get_file_hash
+from codebase_index.walker import walk_tree
+
 if TYPE_CHECKING:
     from typing import Any
 
@@ -34,6 +36,7 @@ class IncrementalUpdater:
         index_data: dict[str, Any],
         exclude: list[str],
         exclude_extensions: set[str] | None = None,
+        gitignore: bool = False,
     ) -> None:
         """
         Initialize the incremental updater.
@@ -43,11 +46,13 @@ class IncrementalUpdater:
             index_data: The existing index data to update.
             exclude: Patterns to exclude from scanning.
             exclude_extensions: File extensions to exclude.
+            gitignore: Also skip files ignored by .gitignore.
         """
         self.root = root
         self.index_data = index_data
         self.exclude = exclude
         self.exclude_extensions = exclude_extensions or set()
+        self.gitignore = gitignore
 
         # Build lookup of existing files by path
         self._existing_files: dict[str, dict[str, Any]] = {}
@@ -83,8 +88,7 @@ class IncrementalUpdater:
         seen_paths = set()
 
         # Check each current file
-        for file_path in current_files:
-            rel_path = str(file_path.relative_to(self.root))
+        for rel_path, file_path in current_files:
             seen_paths.add(rel_path)
 
             existing = self._existing_files.get(rel_path)
@@ -118,8 +122,8 @@ class IncrementalUpdater:
             "index": updated_index,
         }
 
-    def _get_current_files(self) -> list[Path]:
-        """Get list of current files in codebase (respecting exclusions and supported parsers)."""
+    def _get_current_files(self) -> list[tuple[str, Path]]:
+        """Get (relative path, path) of current files (respecting exclusions and supported parsers)."""
         from codebase_index.parsers.base import ParserRegistry
 
         # Get supported extensions from ParserRegistry
@@ -127,16 +131,14 @@ class IncrementalUpdater:
 
         files = []
 
-        for file_path in self.root.rglob("*"):
-            if not file_path.is_file():
-                continue
-
-            # Check exclusions
-            rel_path = str(file_path.relative_to(self.root))
-
-            # Check directory exclusions
-            if any(excl in rel_path for excl in self.exclude):
+        rules = compile_exclude(tuple(self.exclude))
+        for rel_path, entry in walk_tree(self.root, rules, self.gitignore):
+            try:
+                if not entry.is_file():
+                    continue
+            except OSError:
                 continue
+            file_path = Path(entry.path)
 
             # Check extension exclusions
             suffix = file_path.suffix.lower()
@@ -151,15 +153,14 @@ class IncrementalUpdater:
                 if rel_path not in self._existing_files:
                     continue
 
-            files.append(file_path)
+            files.append((rel_path, file_path))
 
         return files
 
     def _compute_hash(self, file_path: Path) -> str:
-        """Compute SHA-256 hash of file contents."""
+        """Compute SHA-256 hash of file contents (same format as a full scan)."""
         try:
-            with open(file_path, "rb") as f:
-                return hashlib.sha256(f.read()).hexdigest()[:16]
+            return get_file_hash(file_path)
         except (OSError, IOError) as e:
             logger.warning("Could not hash %s: %s", file_path, e)
             return ""
@@ -180,14 +181,20 @@ class IncrementalUpdater:
             Updated index data.
         """
         # Keys that contain per-file data and need to be rebuilt during update
-        REBUILD_KEYS = {"files", "api_endpoints", "schemas", "router_prefixes"}
+        REBUILD_KEYS = {"files", "skipped_files", "api_endpoints", "schemas", "router_prefixes", "manifest"}
 
         # Start by copying all analysis data from existing index
         # This preserves semantic embeddings, summaries, and other analysis results
         updated = {}
-        for key, value in self.index_data.items():
+        # Sections a --lazy index defers stay deferred (recomputed on demand
+        # against the updated index instead of being computed just to copy)
+        lazy_sections = self.index_data.get("meta", {}).get("lazy", {}).get("sections", [])
+        for key, value in dict.items(self.index_data):
             if key in REBUILD_KEYS:
                 continue  # Will be rebuilt below
+            if key in lazy_sections:
+                updated[key] = type(value)()
+                continue
             # Deep copy mutable structures to avoid modifying original
             if isinstance(value, dict):
                 updated[key] = copy.deepcopy(value)
@@ -198,6 +205,7 @@ class IncrementalUpdater:
 
         # Initialize the keys that need rebuilding
         updated["files"] = []
+        updated["skipped_files"] = []
         updated["api_endpoints"] = []
         updated["schemas"] = []
         updated["router_prefixes"] = {}
@@ -224,6 +232,9 @@ class IncrementalUpdater:
         unchanged_files = {
             f.get("path") for f in updated["files"]
         }
+        for entry in self.index_data.get("skipped_files", []):
+            if entry.get("path") in unchanged_files:
+                updated["skipped_files"].append(entry)
         for endpoint in self.index_data.get("api_endpoints", []):
             if endpoint.get("file") in unchanged_files:
                 updated["api_endpoints"].append(endpoint)
@@ -251,6 +262,17 @@ class IncrementalUpdater:
             for key in keys_to_remove:
                 del updated["call_graph"][key]
 
+        # Re-stat the surviving file set so --check compares against this update
+        from codebase_index.manifest import build_manifest, stat_files
+        updated["manifest"] = build_manifest(
+            stat_files(self.root, updated["files"]), self.exclude, self.exclude_extensions, self.gitignore
+        )
+
+        if lazy_sections:
+            # Coverage is mapped against the tests present now
+            scanner.test_mapper.collect_test_files(scanner.exclude)
+            updated["meta"]["lazy"]["test_files"] = sorted(scanner.test_mapper.test_files)
+
         # Update metadata
         from datetime import datetime, timezone
         updated["meta"]["generated_at"] = datetime.now(timezone.utc).isoformat()
@@ -265,6 +287,7 @@ class IncrementalUpdater:
         updated["summary"]["total_files"] = len(updated["files"])
         updated["summary"]["api_endpoints_count"] = len(updated["api_endpoints"])
         updated["summary"]["schemas_count"] = len(updated["schemas"])
+        updated["summary"]["skipped_files_count"] = len(updated["skipped_files"])
 
         return updated
 
@@ -305,9 +328,17 @@ class IncrementalUpdater:
                     "exports": {},
                 }
 
+                # Huge, minified and generated files are kept as metadata only
+                skip_reason = scanner._skip_reason(file_path, stat.st_size)
+                if skip_reason:
+                    file_info["skipped"] = skip_reason
+                    entry = scanner.skipped_entry(file_info)
+                    entry["lines"] = count_lines(file_path)
+                    updated["skipped_files"].append(entry)
+
                 # Try to parse the file
                 parser, _ = ParserRegistry.get_parser(file_path, scanner.config)
-                if parser:
+                if parser and not skip_reason:
                     try:
                         exports = parser.scan(file_path)
                         file_info["exports"] = exports
@@ -386,6 +417,7 @@ def incremental_update(
     exclude: list[str],
     exclude_extensions: set[str] | None = None,
     config: dict[str, Any] | None = None,
+    gitignore: bool = False,
 ) -> dict[str, Any]:
     """
     Convenience function to perform incremental update.
@@ -396,6 +428,7 @@ def incremental_update(
         exclude: Patterns to exclude.
         exclude_extensions: File extensions to exclude.
         config: Configuration dictionary.
+        gitignore: Also skip files ignored by .gitignore.
 
     Returns:
         Update result with changes and new index.
@@ -409,6 +442,7 @@ def incremental_update(
         exclude_extensions=exclude_extensions or set(),
         include_hash=True,
         config=config or {},
+        gitignore=gitignore,
     )
 
     # Create updater and run
@@ -417,6 +451,7 @@ def incremental_update(
         index_data=index_data,
         exclude=exclude,
         exclude_extensions=exclude_extensions,
+        gitignore=gitignore,
     )
 
     return updater.update(scanner)
@@ -0,0 +1,184 @@
+"""
+Lazily computed index sections for codebase_index.
+
+Indexes scanned with --lazy leave the expensive, rarely read analyses
+(scanner.LAZY_SECTIONS) out of the file and list them in meta.lazy.
+LazyIndex computes such a section the first time it is read and caches
+the result in a sidecar file next to the index, keyed by the index's
+content hash, so later queries load it instead of recomputing.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from codebase_index.model import json_default
+from codebase_index.scanner import LAZY_SECTIONS, CodebaseScanner
+
+if TYPE_CHECKING:
+    from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Sidecar file name suffix (appended to the index file name)
+SIDECAR_SUFFIX = ".lazy.json"
+
+
+def index_content_hash(path: Path) -> str:
+    """Hash of an index file's bytes (identifies the index a cache belongs to)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def compute_section(index_data: dict[str, Any], name: str) -> Any:
+    """
+    Compute one lazy section from the rest of the index.
+
+    Args:
+        index_data: Index dictionary (files, symbol_index and call_graph present).
+        name: One of scanner.LAZY_SECTIONS.
+
+    Returns:
+        The section, as a full scan would have produced it.
+
+    Raises:
+        ValueError: If name is not a lazy section.
+    """
+    from codebase_index.analyzers import (
+        CentralityAnalyzer,
+        ExecutionFlowAnalyzer,
+        TestCoverageMapper,
+    )
+
+    if name == "execution_flow":
+        return ExecutionFlowAnalyzer(index_data).analyze()
+    if name == "centrality":
+        return CentralityAnalyzer(index_data).analyze()
+    if name == "potential_duplicates":
+        return CodebaseScanner.derive_symbol_sections(index_data.get("files", []))["potential_duplicates"]
+    if name == "test_coverage":
+        meta = index_data.get("meta", {})
+        mapper = TestCoverageMapper(Path(meta.get("root", ".")))
+        mapper.test_files = set(meta.get("lazy", {}).get("test_files", []))
+        return mapper.map_source_to_test(index_data.get("files", []))
+    raise ValueError(f"Not a lazy section: {name}")
+
+
+class LazyIndex(dict):
+    """
+    Index dictionary that computes its deferred sections on first access.
+
+    Deferred sections keep their (empty) placeholder key, so key order and
+    ``in`` checks are unchanged. Reading one with ``[]`` or ``get`` computes
+    it; ``items()``/``values()`` (whole-index views, including JSON export)
+    compute all of them first.
+    """
+
+    def __init__(self, index_data: dict[str, Any], index_file: Path | None = None) -> None:
+        """
+        Wrap a loaded index.
+
+        Args:
+            index_data: Loaded index with meta.lazy.
+            index_file: File the index was loaded from (enables the sidecar cache).
+        """
+        super().__init__(index_data)
+        lazy = index_data.get("meta", {}).get("lazy", {})
+        self._pending = [name for name in lazy.get("sections", []) if name in LAZY_SECTIONS]
+        self._sidecar = Path(f"{index_file}{SIDECAR_SUFFIX}") if index_file else None
+        self._index_hash = index_content_hash(index_file) if index_file else None
+        self._cached: dict[str, Any] | None = None
+
+    @property
+    def pending(self) -> list[str]:
+        """Deferred sections not computed yet."""
+        return list(self._pending)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._pending:
+            self._resolve(key)
+        return super().__getitem__(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._pending:
+            self._resolve(key)
+        return super().get(key, default)
+
+    def items(self) -> Any:
+        self.materialize()
+        return super().items()
+
+    def values(self) -> Any:
+        self.materialize()
+        return super().values()
+
+    def materialize(self) -> None:
+        """Compute every deferred section and fill in their summary counts."""
+        if not self._pending:
+            return
+        for name in list(self._pending):
+            self._resolve(name)
+        if "sections" not in self.get("meta", {}):
+            CodebaseScanner.finalize_summary(self)
+
+    def _resolve(self, name: str) -> None:
+        """Load a deferred section from the sidecar, or compute and cache it."""
+        self._pending.remove(name)
+        cached = self._load_sidecar()
+        if name in cached:
+            super().__setitem__(name, cached[name])
+            return
+        logger.debug("Computing lazy section %s", name)
+        value = compute_section(self, name)
+        super().__setitem__(name, value)
+        cached[name] = value
+        self._save_sidecar(cached)
+
+    def _load_sidecar(self) -> dict[str, Any]:
+        """Sections cached for this exact index (empty if none or stale)."""
+        if self._cached is not None:
+            return self._cached
+        self._cached = {}
+        if self._sidecar and self._sidecar.is_file():
+            try:
+                with open(self._sidecar, encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.debug("Ignoring unreadable sidecar %s: %s", self._sidecar, e)
+            else:
+                if data.get("index_hash") == self._index_hash:
+                    self._cached = data.get("sections", {})
+        return self._cached
+
+    def _save_sidecar(self, sections: dict[str, Any]) -> None:
+        """Write the cache; failures only cost a recompute next time."""
+        if not self._sidecar:
+            return
+        try:
+            with open(self._sidecar, "w", encoding="utf-8") as f:
+                json.dump({"index_hash": self._index_hash, "sections": sections}, f, default=json_default)
+        except OSError as e:
+            logger.debug("Could not write sidecar %s: %s", self._sidecar, e)
+
+
+def wrap_lazy(index_data: dict[str, Any], index_file: Path | None = None) -> dict[str, Any]:
+    """
+    Wrap an index in LazyIndex if it has deferred sections.
+
+    Args:
+        index_data: Loaded index.
+        index_file: File it was loaded from.
+
+    Returns:
+        A LazyIndex, or index_data unchanged when nothing is deferred.
+    """
+    if index_data.get("meta", {}).get("lazy", {}).get("sections"):
+        return LazyIndex(index_data, index_file)
+    return index_data
@@ -0,0 +1,185 @@
+"""
+File manifest for codebase_index.
+
+Records (size, mtime_ns, hash) for every indexed file, so staleness can
+be decided with one stat pass over the tree instead of re-reading files
+or asking git.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from codebase_index.parsers.base import ParserRegistry
+from codebase_index.parsers.docker import DockerParser
+from codebase_index.utils import compile_exclude, get_file_hash
+from codebase_index.walker import walk_tree
+
+if TYPE_CHECKING:
+    from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Bump when the manifest layout changes; older manifests are ignored
+MANIFEST_VERSION = 1
+
+# Suffixes that may hold docker-compose files (matched by name, not extension)
+_DOCKER_SUFFIXES = (".yaml", ".yml")
+
+
+def _parent(path: str) -> str:
+    """Return the parent directory of a relative path ("" for root)."""
+    sep = path.rfind(os.sep)
+    return path[:sep] if sep >= 0 else ""
+
+
+def build_manifest(
+    files: dict[str, list[Any]],
+    exclude: list[str],
+    exclude_extensions: set[str] | None = None,
+    gitignore: bool = False,
+) -> dict[str, Any]:
+    """
+    Build the manifest section of an index.
+
+    Args:
+        files: Mapping of relative path to [size, mtime_ns, hash].
+        exclude: Exclude patterns the scan used (replayed by the checker).
+        exclude_extensions: File extensions the scan skipped.
+        gitignore: Whether the scan skipped .gitignore'd files (replayed too).
+
+    Returns:
+        Manifest dictionary.
+    """
+    return {
+        "version": MANIFEST_VERSION,
+        "exclude": list(exclude),
+        "exclude_extensions": sorted(exclude_extensions or ()),
+        "gitignore": gitignore,
+        "files": {path: files[path] for path in sorted(files)},
+    }
+
+
+def stat_files(root: Path, file_infos: list[dict[str, Any]]) -> dict[str, list[Any]]:
+    """
+    Stat indexed files to build manifest entries after the fact.
+
+    Args:
+        root: Codebase root.
+        file_infos: File info dictionaries from the index.
+
+    Returns:
+        Mapping of relative path to [size, mtime_ns, hash].
+    """
+    entries: dict[str, list[Any]] = {}
+    for file_info in file_infos:
+        path = file_info.get("path", "")
+        try:
+            st = os.stat(root / path)
+        except OSError:
+            continue
+        entries[path] = [st.st_size, st.st_mtime_ns, file_info.get("hash", "")]
+    return entries
+
+
+def is_indexable(name: str, exclude_extensions: set[str] | frozenset[str] = frozenset()) -> bool:
+    """
+    Check whether a file name would be picked up by the scanner.
+
+    Args:
+        name: File name (not path).
+        exclude_extensions: Extensions excluded from the scan.
+
+    Returns:
+        True if a parser exists for the file and it is not excluded.
+    """
+    dot = name.rfind(".")
+    suffix = name[dot:].lower() if dot > 0 else ""
+    if suffix in exclude_extensions:
+        return False
+    if suffix in _DOCKER_SUFFIXES and DockerParser.get_for_file(Path(name))[0]:
+        return True
+    return suffix in ParserRegistry._extension_map
+
+
+def compare_manifest(root: Path, manifest: dict[str, Any]) -> dict[str, Any]:
+    """
+    Compare a manifest against the working tree in one scandir pass.
+
+    Files whose size and mtime_ns match are trusted without reading them.
+    Files whose mtime moved but size did not are re-hashed, so a touch or
+    checkout that leaves content intact is not reported as a change.
+
+    Args:
+        root: Codebase root.
+        manifest: Manifest section of an index.
+
+    Returns:
+        Dictionary with changed, new and deleted paths, changed directories,
+        and counters for files checked and re-hashed.
+    """
+    files: dict[str, list[Any]] = manifest.get("files", {})
+    rules = compile_exclude(tuple(manifest.get("exclude", [])))
+    exclude_extensions = frozenset(manifest.get("exclude_extensions", []))
+
+    changed: list[str] = []
+    new: list[str] = []
+    seen: set[str] = set()
+    checked = 0
+    rehashed = 0
+
+    for rel_path, entry in walk_tree(root, rules, manifest.get("gitignore", False)):
+        try:
+            if not entry.is_file():
+                continue
+        except OSError:
+            continue
+
+        recorded = files.get(rel_path)
+        if recorded is None:
+            if is_indexable(entry.name, exclude_extensions):
+                new.append(rel_path)
+            continue
+
+        seen.add(rel_path)
+        checked += 1
+        try:
+            st = entry.stat()
+        except OSError:
+            continue
+        size, mtime_ns, file_hash = recorded
+        if st.st_size != size:
+            changed.append(rel_path)
+        elif st.st_mtime_ns != mtime_ns:
+            if not file_hash:
+                changed.append(rel_path)
+                continue
+            rehashed += 1
+            try:
+                if get_file_hash(Path(entry.path)) != file_hash:
+                    changed.append(rel_path)
+            except OSError:
+                changed.append(rel_path)
+
+    deleted = [path for path in files if path not in seen] if len(seen) < len(files) else []
+
+    changed_dirs: set[str] = set()
+    for path in (*changed, *new, *deleted):
+        parent = _parent(path)
+        while parent not in changed_dirs:
+            changed_dirs.add(parent)
+            if not parent:
+                break
+            parent = _parent(parent)
+
+    return {
+        "changed": sorted(changed),
+        "new": sorted(new),
+        "deleted": sorted(deleted),
+        "changed_dirs": sorted(changed_dirs),
+        "files_checked": checked,
+        "rehashed": rehashed,
+    }
@@ -0,0 +1,264 @@
+"""
+Compact in-memory index model for codebase_index.
+
+A loaded index JSON repeats the same strings (file paths, names, call
+targets, type names) once per occurrence and stores every symbol and
+call-graph entry as a full dict. This module shrinks a loaded index in
+place:
+
+- every short string is interned in a StringPool, so each distinct path
+  or name exists once;
+- symbol_index entries become slotted FunctionRecord, ClassRecord and
+  MethodRecord objects, and call_graph values become slotted CallEntry
+  objects with tuple call lists.
+
+Records are read-only Mappings (``.get``, ``[]``, ``in``, iteration), so
+analyzers written against dicts keep working; ``json_default`` turns them
+back into dicts for JSON export.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Strings longer than this (docstrings, code) are rarely repeated; skip them
+INTERN_MAX_LENGTH = 200
+
+
+class StringPool:
+    """
+    Intern table: one shared instance per distinct string.
+
+    A shared reference costs a pointer per use, the same as an integer id
+    into a table, without a decode step on every read.
+    """
+
+    __slots__ = ("_strings",)
+
+    def __init__(self) -> None:
+        self._strings: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def intern(self, text: str) -> str:
+        """Return the pooled instance of a string (adding it if new)."""
+        return self._strings.setdefault(text, text)
+
+    def intern_tree(self, value: Any) -> Any:
+        """
+        Intern every short string (and dict key) in a JSON tree in place.
+
+        Args:
+            value: Parsed JSON value.
+
+        Returns:
+            The value with strings replaced by pooled instances.
+        """
+        if isinstance(value, str):
+            return self._strings.setdefault(value, value) if len(value) <= INTERN_MAX_LENGTH else value
+        if isinstance(value, list):
+            for position, item in enumerate(value):
+                if not isinstance(item, (int, float, bool)) and item is not None:
+                    value[position] = self.intern_tree(item)
+            return value
+        if isinstance(value, dict):
+            items = [(self.intern_tree(k), self.intern_tree(v)) for k, v in value.items()]
+            value.clear()
+            value.update(items)
+            return value
+        return value
+
+
+class _Record(Mapping):
+    """Slotted, read-only Mapping over a fixed set of fields plus extras."""
+
+    __slots__ = ("_extra",)
+    FIELDS: tuple[str, ...] = ()
+    # Fields whose string values repeat across records (paths, names)
+    SHARED: tuple[str, ...] = ()
+    # FIELDS as a set, filled in per subclass by __init_subclass__
+    _field_set: frozenset[str] = frozenset()
+
+    def __init__(self, data: Mapping[str, Any], pool: StringPool | None = None) -> None:
+        get = data.get
+        set_field = object.__setattr__
+        for key in self.FIELDS:
+            set_field(self, key, get(key, _MISSING))
+        if pool is not None:
+            intern = pool._strings.setdefault
+            for key in self.SHARED:
+                value = get(key)
+                if type(value) is str:
+                    set_field(self, key, intern(value, value))
+        extra = None
+        if not self._field_set.issuperset(data):
+            extra = {key: value for key, value in data.items() if key not in self._field_set}
+            if pool is not None:
+                pool.intern_tree(extra)
+        self._extra = extra
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._field_set = frozenset(cls.FIELDS)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.FIELDS:
+            value = getattr(self, key)
+            if value is not _MISSING:
+                return value
+        elif self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self.FIELDS:
+            if getattr(self, key) is not _MISSING:
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (type(self), (dict(self),))
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[str, Any]:
+        # Copies are for editing; hand out a plain dict
+        import copy
+
+        return copy.deepcopy(dict(self), memo)
+
+    def copy(self) -> dict[str, Any]:
+        """Shallow copy as a plain (mutable) dict."""
+        return dict(self)
+
+
+class _Missing:
+    """Marker for a record field absent from the source dict."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+_MISSING = _Missing()
+
+
+# Field order follows the scanner's dict order so exported JSON is unchanged
+
+
+class FunctionRecord(_Record):
+    """One symbol_index.functions entry."""
+
+    FIELDS = (
+        "name", "file", "line", "end_line", "start_byte", "end_byte",
+        "async", "signature", "docstring",
+    )
+    SHARED = ("name", "file", "signature")
+    __slots__ = FIELDS
+
+
+class ClassRecord(_Record):
+    """One symbol_index.classes entry."""
+
+    FIELDS = (
+        "name", "file", "line", "end_line", "start_byte", "end_byte",
+        "bases", "docstring", "method_count",
+    )
+    SHARED = ("name", "file")
+    __slots__ = FIELDS
+
+
+class MethodRecord(_Record):
+    """One symbol_index.methods entry."""
+
+    FIELDS = (
+        "name", "class", "file", "line", "end_line", "start_byte", "end_byte",
+        "async", "signature", "docstring",
+    )
+    SHARED = ("name", "class", "file", "signature")
+    __slots__ = FIELDS
+
+
+class CallEntry(_Record):
+    """One call_graph value: location and called names."""
+
+    FIELDS = ("file", "line", "calls", "class")
+    SHARED = ("file", "class")
+    __slots__ = FIELDS
+
+
+# Record type per symbol_index section
+SYMBOL_RECORDS: dict[str, type[_Record]] = {
+    "functions": FunctionRecord,
+    "classes": ClassRecord,
+    "methods": MethodRecord,
+}
+
+
+def compact_index(index_data: dict[str, Any], pool: StringPool | None = None) -> StringPool:
+    """
+    Shrink a loaded index in place.
+
+    Args:
+        index_data: Parsed index JSON.
+        pool: String pool to intern into (a new one if None).
+
+    Returns:
+        The string pool used.
+    """
+    pool = pool if pool is not None else StringPool()
+    intern = pool._strings.setdefault
+
+    symbol_index = index_data.get("symbol_index")
+    if isinstance(symbol_index, dict):
+        for kind, record_type in SYMBOL_RECORDS.items():
+            symbols = symbol_index.get(kind)
+            if isinstance(symbols, list):
+                symbol_index[kind] = [
+                    record_type(s, pool) if isinstance(s, dict) else s for s in symbols
+                ]
+
+    call_graph = index_data.get("call_graph")
+    if isinstance(call_graph, dict):
+        compacted = {}
+        for key, info in call_graph.items():
+            if isinstance(info, dict):
+                calls = info.get("calls")
+                if isinstance(calls, list):
+                    info["calls"] = tuple([intern(c, c) if type(c) is str else c for c in calls])
+                info = CallEntry(info, pool)
+            compacted[intern(key, key)] = info
+        index_data["call_graph"] = compacted
+
+    # Everything else (files, imports, exports, ...) just gets its strings shared
+    for key, value in index_data.items():
+        if key not in ("symbol_index", "call_graph"):
+            pool.intern_tree(value)
+    if isinstance(symbol_index, dict):
+        for kind, symbols in symbol_index.items():
+            if kind not in SYMBOL_RECORDS:
+                pool.intern_tree(symbols)
+
+    return pool
+
+
+def json_default(value: Any) -> Any:
+    """``json.dump`` default: export compact records as dicts, tuples as lists."""
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
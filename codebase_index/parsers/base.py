@@ -193,6 +193,10 @@ class BaseParser(ABC):
     # Subclasses can set this to provide a regex fallback
     supports_fallback: bool = False
 
+    # Subclasses whose scan() accepts the file's bytes (data=...) set this,
+    # so callers that already read the file (the scan pipeline) skip a re-read
+    accepts_data: bool = False
+
     def __init__(self) -> None:
         """Initialize the parser with empty config."""
         self.config: dict[str, Any] = {}
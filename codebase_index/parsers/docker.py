@@ -13,7 +13,8 @@ from codebase_index.config import HAS_YAML, yaml
 from codebase_index.parsers.base import BaseParser, ParserRegistry
 
 if TYPE_CHECKING:
-    from typing import Any
+    from collections.abc import Callable
+    from typing import Any, ClassVar
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +29,9 @@ class DockerParser(BaseParser):
 
     supports_fallback = True
 
+    # Filename matcher, assigned below the class
+    get_for_file: ClassVar[Callable[[Path], tuple[DockerParser | None, str | None]]]
+
     def scan(self, filepath: Path) -> dict[str, Any]:
         """
         Scan a docker-compose file.
@@ -15,6 +15,7 @@ from typing import TYPE_CHECKING
 
 from codebase_index.config import STDLIB_MODULES, DEFAULT_CONFIG
 from codebase_index.parsers.base import BaseParser, ParserRegistry
+from codebase_index.utils import line_offsets, line_span
 
 if TYPE_CHECKING:
     from typing import Any
@@ -50,6 +51,7 @@ class PythonParser(BaseParser):
     """
 
     supports_fallback = True
+    accepts_data = True
 
     def __init__(self) -> None:
         """Initialize the Python parser with default config."""
@@ -59,6 +61,9 @@ class PythonParser(BaseParser):
         self.route_patterns: list[dict[str, Any]] = DEFAULT_ROUTE_PATTERNS.copy()
         self.model_patterns: list[dict[str, Any]] = DEFAULT_MODEL_PATTERNS.copy()
         self.schema_patterns: list[dict[str, Any]] = DEFAULT_SCHEMA_PATTERNS.copy()
+        # Raw bytes and line offsets of the file being scanned (for symbol spans)
+        self._data: bytes = b""
+        self._offsets: list[int] = [0]
 
     def configure(self, config: dict[str, Any]) -> None:
         """
@@ -96,19 +101,22 @@ class PythonParser(BaseParser):
             len(self.schema_patterns),
         )
 
-    def scan(self, filepath: Path) -> dict[str, Any]:
+    def scan(self, filepath: Path, data: bytes | None = None) -> dict[str, Any]:
         """
         Scan a Python file and extract structure using AST.
 
         Args:
             filepath: Path to the Python file.
+            data: File contents, if already read (read from filepath if None).
 
         Returns:
             Dictionary with classes, functions, imports, routes, models, schemas.
         """
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                source = f.read()
+            if data is None:
+                with open(filepath, "rb") as f:
+                    data = f.read()
+            source = data.decode("utf-8")
             tree = ast.parse(source, filename=str(filepath))
         except SyntaxError as e:
             logger.debug("Syntax error in %s: %s, falling back to regex", filepath, e)
@@ -120,7 +128,8 @@ class PythonParser(BaseParser):
         result: dict[str, Any] = {
             "classes": [],
             "functions": [],
-            "imports": {"internal": [], "external": [], "names": []},  # names = imported symbols
+            # names = imported symbols; modules = full import paths for module resolution
+            "imports": {"internal": [], "external": [], "names": [], "modules": []},
             "routes": [],           # Generic routes (config-driven)
             "models": [],           # ORM models (config-driven)
             "schemas": [],          # Validation schemas (config-driven)
@@ -134,6 +143,9 @@ class PythonParser(BaseParser):
             "type_aliases": [],     # Type alias definitions
         }
 
+        self._data = data
+        self._offsets = line_offsets(data)
+
         # Process module-level assignments (constants, type aliases)
         self._process_module_assignments(tree, result)
 
@@ -147,14 +159,21 @@ class PythonParser(BaseParser):
             elif isinstance(node, ast.Import):
                 for alias in node.names:
                     self._categorize_import(alias.name, result["imports"])
+                    self._add_module(alias.name, result["imports"])
             elif isinstance(node, ast.ImportFrom):
                 if node.module:
                     self._categorize_import(node.module, result["imports"])
+                # Full module path; relative imports keep their leading dots
+                base = "." * node.level + (node.module or "")
+                self._add_module(base, result["imports"])
                 # Also store the imported names (e.g., 'AgentFactory' from 'from x import AgentFactory')
                 for alias in node.names:
                     name = alias.name
                     if name != "*":
                         self._add_imported_name(name, result["imports"])
+                        # The name may be a submodule ("from pkg import module")
+                        separator = "" if base.endswith(".") else "."
+                        self._add_module(f"{base}{separator}{name}", result["imports"])
 
         return result
 
@@ -163,7 +182,7 @@ class PythonParser(BaseParser):
         class_info: dict[str, Any] = {
             "name": node.name,
             "line": node.lineno,
-            "end_line": getattr(node, 'end_lineno', None),
+            **self._span(node),
             "bases": [self._get_name(b) for b in node.bases],
             "decorators": [self._get_decorator_name(d) for d in node.decorator_list],
             "docstring": ast.get_docstring(node),
@@ -244,6 +263,7 @@ class PythonParser(BaseParser):
                 method_info: dict[str, Any] = {
                     "name": item.name,
                     "line": item.lineno,
+                    **self._span(item),
                     "async": isinstance(item, ast.AsyncFunctionDef),
                     "signature": self._extract_signature(item),
                     "docstring": ast.get_docstring(item),
@@ -256,6 +276,18 @@ class PythonParser(BaseParser):
 
         result["classes"].append(class_info)
 
+    def _span(self, node: ast.stmt) -> dict[str, Any]:
+        """
+        End line and byte range of a definition.
+
+        The range covers whole lines from the def/class line to the last
+        line of the body, so consumers can slice the body straight out of
+        the file.
+        """
+        end_line = node.end_lineno or node.lineno
+        start_byte, end_byte = line_span(self._data, self._offsets, node.lineno, end_line)
+        return {"end_line": end_line, "start_byte": start_byte, "end_byte": end_byte}
+
     def _process_function(
         self,
         node: ast.FunctionDef | ast.AsyncFunctionDef,
@@ -268,7 +300,7 @@ class PythonParser(BaseParser):
         func_info: dict[str, Any] = {
             "name": node.name,
             "line": node.lineno,
-            "end_line": getattr(node, 'end_lineno', None),
+            **self._span(node),
             "async": isinstance(node, ast.AsyncFunctionDef),
             "decorators": [self._get_decorator_name(d) for d in node.decorator_list],
             "signature": self._extract_signature(node),
@@ -791,6 +823,15 @@ class PythonParser(BaseParser):
         if name not in imports["names"]:
             imports["names"].append(name)
 
+    def _add_module(self, module: str, imports: dict[str, list[str]]) -> None:
+        """Record a full imported module path (stdlib modules are skipped)."""
+        if not module or module.split(".")[0] in STDLIB_MODULES:
+            return
+        if "modules" not in imports:
+            imports["modules"] = []
+        if module not in imports["modules"]:
+            imports["modules"].append(module)
+
     def _categorize_import(self, module: str, imports: dict[str, list[str]]) -> None:
         """Categorize import as internal or external."""
         root_module = module.split(".")[0]
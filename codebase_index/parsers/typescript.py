@@ -2,22 +2,186 @@
 TypeScript/React regex-based parser for codebase_index.
 
 Supports configurable internal import aliases via config.
+
+Declarations get an end line and byte range found by bracket matching
+(strings, template literals, regex literals and comments are skipped),
+so their bodies can be sliced out of the file without re-parsing.
 """
 
 from __future__ import annotations
 
+import bisect
+import io
 import logging
 import re
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from codebase_index.parsers.base import BaseParser, ParserRegistry
+from codebase_index.utils import line_offsets, line_span
 
 if TYPE_CHECKING:
     from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Result keys whose entries are declarations with a body
+SPAN_KEYS = ("components", "hooks", "functions", "types", "interfaces")
+
+# A line ending in one of these continues the statement on the next line
+_CONTINUES_AFTER = set("=,(+-*/%&|?:.<>{[!")
+# A line starting with one of these continues the previous statement
+_CONTINUES_BEFORE = set(".?:&|+-*/%=)>]}")
+
+# First character of the next token
+_SIGNIFICANT = re.compile(r"\S")
+
+# A "/" after one of these characters (or at the start) begins a regex literal
+_REGEX_AFTER = set("(,=:[!&|?{};+-*%<>~^")
+# ... as it does after one of these keywords
+_REGEX_AFTER_WORDS = {
+    "return", "typeof", "case", "do", "else", "in", "of", "new", "delete",
+    "void", "throw", "instanceof", "yield", "await",
+}
+
+# A top-level declaration; no declaration body extends past the next one
+_TOP_LEVEL = re.compile(r"(?:export|import)\b")
+
+
+def _skip_string(source: str, start: int) -> int:
+    """Index just past the string or template literal starting at ``start``."""
+    quote = source[start]
+    position = start + 1
+    while position < len(source):
+        char = source[position]
+        if char == "\\":
+            position += 2
+            continue
+        if char == quote:
+            return position + 1
+        if char == "\n" and quote != "`":
+            return position
+        position += 1
+    return len(source)
+
+
+def _starts_regex(source: str, start: int, last: str) -> bool:
+    """Whether the "/" at ``start`` begins a regex literal rather than a division."""
+    if not last or last in _REGEX_AFTER:
+        return True
+    if not (last.isalnum() or last in "_$"):
+        return False
+    # The word before the "/": a keyword, or an operand (division)
+    end = start
+    while end > 0 and source[end - 1].isspace():
+        end -= 1
+    begin = end
+    while begin > 0 and (source[begin - 1].isalnum() or source[begin - 1] in "_$"):
+        begin -= 1
+    return source[begin:end] in _REGEX_AFTER_WORDS
+
+
+def _skip_regex(source: str, start: int) -> int:
+    """
+    Index just past the regex literal starting at ``start`` (and its flags).
+
+    Returns ``start + 1`` if the line ends before the closing "/", i.e. the
+    "/" was a division after all.
+    """
+    position = start + 1
+    in_class = False
+    while position < len(source):
+        char = source[position]
+        if char == "\\":
+            position += 2
+            continue
+        if char == "\n":
+            return start + 1
+        if char == "[":
+            in_class = True
+        elif char == "]":
+            in_class = False
+        elif char == "/" and not in_class:
+            position += 1
+            while position < len(source) and (source[position].isalnum() or source[position] == "_"):
+                position += 1
+            return position
+        position += 1
+    return start + 1
+
+
+def _next_significant(source: str, start: int) -> str:
+    """First non-whitespace character at or after ``start``, skipping comments ("" at EOF)."""
+    position = start
+    while True:
+        match = _SIGNIFICANT.search(source, position)
+        if not match:
+            return ""
+        if source.startswith("//", match.start()):
+            position = source.find("\n", match.start())
+        elif source.startswith("/*", match.start()):
+            position = source.find("*/", match.start() + 2)
+            position = position if position < 0 else position + 2
+        else:
+            return match.group()
+        if position < 0:
+            return ""
+
+
+def _declaration_end(source: str, start: int) -> int:
+    """
+    Index where the declaration starting at ``start`` ends.
+
+    It ends at a ";" outside brackets, or at a line break outside brackets
+    when neither that line's last character nor the next line's first one
+    continues the statement.
+    """
+    depth = 0
+    last = ""
+    position = start
+    length = len(source)
+    while position < length:
+        char = source[position]
+        if char in "\"'`":
+            position = _skip_string(source, position)
+            last = char
+            continue
+        if char == "/" and source.startswith("//", position):
+            newline = source.find("\n", position)
+            position = length if newline < 0 else newline
+            continue
+        if char == "/" and source.startswith("/*", position):
+            close = source.find("*/", position + 2)
+            position = length if close < 0 else close + 2
+            continue
+        if char == "/" and _starts_regex(source, position, last):
+            skipped = _skip_regex(source, position)
+            if skipped > position + 1:
+                position = skipped
+                last = "/"
+                continue
+
+        if char in "({[":
+            depth += 1
+        elif char in ")}]":
+            depth -= 1
+            if depth < 0:
+                return position
+        elif depth == 0:
+            if char == ";":
+                return position + 1
+            if (
+                char == "\n"
+                and last
+                and last not in _CONTINUES_AFTER
+                and _next_significant(source, position) not in _CONTINUES_BEFORE
+            ):
+                return position
+        if not char.isspace():
+            last = char
+        position += 1
+    return length
+
 
 @ParserRegistry.register("typescript", [".ts", ".tsx", ".js", ".jsx"])
 class TypeScriptParser(BaseParser):
@@ -28,6 +192,8 @@ class TypeScriptParser(BaseParser):
     Supports configurable internal import aliases.
     """
 
+    accepts_data = True
+
     def __init__(self) -> None:
         """Initialize with default config."""
         super().__init__()
@@ -56,12 +222,13 @@ class TypeScriptParser(BaseParser):
 
         logger.debug("TypeScriptParser configured: internal patterns = %s", self.internal_patterns)
 
-    def scan(self, filepath: Path) -> dict[str, Any]:
+    def scan(self, filepath: Path, data: bytes | None = None) -> dict[str, Any]:
         """
         Scan a TypeScript/React file.
 
         Args:
             filepath: Path to the TypeScript file.
+            data: File contents, if already read (read from filepath if None).
 
         Returns:
             Dictionary with components, hooks, functions, types, interfaces, imports.
@@ -78,17 +245,49 @@ class TypeScriptParser(BaseParser):
         }
 
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                lines = f.readlines()
+            if data is None:
+                with open(filepath, "rb") as f:
+                    data = f.read()
         except (OSError, IOError) as e:
             logger.warning("Could not read %s: %s", filepath, e)
             return {"error": str(e)}
 
+        # Same lines as reading the file in text mode (universal newlines)
+        lines = io.StringIO(data.decode("utf-8"), newline=None).readlines()
         for i, line in enumerate(lines, 1):
             self._process_line(line, i, result)
 
+        self._add_spans(data, lines, result)
+
         return result
 
+    def _add_spans(
+        self,
+        data: bytes,
+        lines: list[str],
+        result: dict[str, Any],
+    ) -> None:
+        """Record end_line, start_byte and end_byte for each declaration."""
+        source = "".join(lines)
+        # Character offset of each line in the decoded source
+        char_offsets = [0]
+        for line in lines[:-1]:
+            char_offsets.append(char_offsets[-1] + len(line))
+        byte_offsets = line_offsets(data)
+        top_level = [i for i, line in enumerate(lines, 1) if _TOP_LEVEL.match(line)]
+
+        for key in SPAN_KEYS:
+            for entry in result[key]:
+                line = entry["line"]
+                end = _declaration_end(source, char_offsets[line - 1])
+                end_line = max(line, bisect.bisect_right(char_offsets, max(end - 1, 0)))
+                # Never run into the next top-level declaration
+                following = bisect.bisect_right(top_level, line)
+                if following < len(top_level):
+                    end_line = min(end_line, max(line, top_level[following] - 1))
+                start_byte, end_byte = line_span(data, byte_offsets, line, end_line)
+                entry.update({"end_line": end_line, "start_byte": start_byte, "end_byte": end_byte})
+
     def _process_line(self, line: str, line_num: int, result: dict[str, Any]) -> None:
         """Process a single line of code."""
         # Exported functions/components
@@ -0,0 +1,484 @@
+"""
+Staged scan pipeline for codebase_index.
+
+A serial scan stats, reads and parses one file at a time, so a slow
+filesystem (e.g. NFS serving metadata) stalls parsing and parsing stalls
+I/O. The pipeline overlaps the stages:
+
+    walker thread --paths--> I/O threads --contents--> parse processes
+        --> aggregator (the calling thread)
+
+- the walker lists files and picks each one's parser;
+- I/O threads stat (through the walk's DirEntry) and read files, counting lines and hashing the bytes
+  they read (one read per file instead of three; files of MMAP_MIN_SIZE
+  or more are memory-mapped instead, and huge, minified or generated
+  files are not parsed, see CodebaseScanner._skip_reason);
+- a process pool parses, receiving the bytes for parsers that accept
+  them (BaseParser.accepts_data);
+- the aggregator attaches parse results and restores walk order, so the
+  output matches a serial scan.
+
+Queues between stages are bounded, as is the number of parse tasks in
+flight, so a fast stage blocks (backpressure) instead of buffering the
+tree in memory. Each stage records busy time and time spent waiting for
+input (starved) or for room downstream (blocked); the stage with the
+highest utilization is the bottleneck.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from codebase_index.utils import (
+    MMAP_MIN_SIZE,
+    count_data_lines,
+    count_lines,
+    get_data_hash,
+    get_file_hash,
+)
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Iterable
+    from typing import Any
+
+    from codebase_index.parsers.base import BaseParser
+    from codebase_index.scanner import CodebaseScanner
+
+logger = logging.getLogger(__name__)
+
+# Default I/O threads; enough outstanding reads to hide network filesystem latency
+DEFAULT_IO_THREADS = 8
+
+# Items buffered in each queue between stages
+QUEUE_SIZE = 256
+
+# Parse tasks in flight per worker process (keeps workers fed between results)
+TASKS_PER_WORKER = 4
+
+# Pipeline stages, in data flow order
+STAGES = ("walk", "read", "parse", "aggregate")
+
+# End-of-stream marker passed down the queues
+_DONE = object()
+
+# Scanner config, set once per worker process by _init_worker
+_worker_config: dict[str, Any] | None = None
+
+
+def _init_worker(config: dict[str, Any]) -> None:
+    """Worker process setup: keep the config, silence scanned files' warnings."""
+    global _worker_config
+    _worker_config = config
+    # Suppress SyntaxWarnings from scanned files (e.g., invalid escape sequences)
+    warnings.filterwarnings("ignore", category=SyntaxWarning)
+
+
+def _ready() -> None:
+    """No-op task used to start the worker processes."""
+
+
+def _parse_task(filepath: str, language: str, data: bytes | None) -> tuple[dict[str, Any], float]:
+    """
+    Parse one file (runs in a worker process).
+
+    Args:
+        filepath: Absolute path of the file.
+        language: Language picked by the scanner ("docker" for compose files).
+        data: File contents, or None to let the parser read the file.
+
+    Returns:
+        Tuple of (parser output, seconds spent parsing).
+    """
+    from codebase_index.parsers import ParserRegistry
+    from codebase_index.parsers.docker import DockerParser
+
+    start = time.perf_counter()
+    path = Path(filepath)
+    parser: BaseParser | None
+    if language == "docker":
+        parser, _ = DockerParser.get_for_file(path)
+    else:
+        parser = ParserRegistry.get_parser_for_language(language, _worker_config)
+    if parser is None:
+        return {}, time.perf_counter() - start
+    if data is not None:
+        # Only handed to parsers that set accepts_data (see _read_file)
+        exports = parser.scan(path, data=data)  # type: ignore[call-arg]
+    else:
+        exports = parser.scan(path)
+    return exports, time.perf_counter() - start
+
+
+class StageStats:
+    """Accumulated timings of one pipeline stage (all its workers)."""
+
+    __slots__ = ("name", "workers", "items", "busy", "starved", "blocked", "_lock")
+
+    def __init__(self, name: str, workers: int) -> None:
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.busy = 0.0
+        self.starved = 0.0
+        self.blocked = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, items: int = 0, busy: float = 0.0, starved: float = 0.0, blocked: float = 0.0) -> None:
+        """Add one worker's totals (thread-safe)."""
+        with self._lock:
+            self.items += items
+            self.busy += busy
+            self.starved += starved
+            self.blocked += blocked
+
+    def as_dict(self, run_time: float) -> dict[str, Any]:
+        """
+        Summary of the stage.
+
+        Args:
+            run_time: Time the stages ran (excluding worker startup).
+
+        Returns:
+            Dictionary with items, workers, busy/starved/blocked seconds and
+            utilization (busy share of the stage's worker time).
+        """
+        capacity = run_time * self.workers
+        return {
+            "items": self.items,
+            "workers": self.workers,
+            "busy_s": round(self.busy, 3),
+            "starved_s": round(self.starved, 3),
+            "blocked_s": round(self.blocked, 3),
+            "utilization": round(self.busy / capacity, 3) if capacity else 0.0,
+        }
+
+
+class ScanPipeline:
+    """Walks, reads and parses files concurrently for a CodebaseScanner."""
+
+    def __init__(
+        self,
+        scanner: CodebaseScanner,
+        workers: int = 1,
+        io_threads: int = DEFAULT_IO_THREADS,
+        queue_size: int = QUEUE_SIZE,
+    ) -> None:
+        """
+        Set up a pipeline.
+
+        Args:
+            scanner: CodebaseScanner supplying root, config, hashing option
+                and per-file classification.
+            workers: Parse worker processes.
+            io_threads: Threads statting and reading files.
+            queue_size: Capacity of each queue between stages.
+        """
+        self.scanner = scanner
+        self.workers = max(1, workers)
+        self.io_threads = max(1, io_threads)
+        self.queue_size = max(1, queue_size)
+        self.wall_time = 0.0
+        self.startup_time = 0.0
+        self._stages = {
+            "walk": StageStats("walk", 1),
+            "read": StageStats("read", self.io_threads),
+            "parse": StageStats("parse", self.workers),
+            "aggregate": StageStats("aggregate", 1),
+        }
+        self._errors: list[BaseException] = []
+
+    def run(self, entries: Iterable[tuple[str, os.DirEntry]]) -> list[tuple[dict[str, Any], list[Any]]]:
+        """
+        Scan files through the pipeline.
+
+        Args:
+            entries: (relative path, DirEntry) of the files to scan, in
+                output order (consumed on the walker thread).
+
+        Returns:
+            (file info, manifest entry) for each file a parser handles, in
+            the order of entries.
+
+        Raises:
+            Exception: The first error raised in any stage, after the
+                pipeline has drained.
+        """
+        path_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        read_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        # Unbounded, but holds at most the parse tasks in flight
+        result_queue: queue.Queue = queue.Queue()
+
+        start = time.perf_counter()
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.scanner.config,),
+        ) as pool:
+            # Start the worker processes before any pipeline thread exists
+            # (forking a multi-threaded process can deadlock in the child)
+            for future in [pool.submit(_ready) for _ in range(self.workers)]:
+                future.result()
+            self.startup_time = time.perf_counter() - start
+
+            threads = [threading.Thread(target=self._walk, args=(entries, path_queue), name="scan-walk")]
+            threads += [
+                threading.Thread(target=self._read, args=(path_queue, read_queue), name=f"scan-read-{i}")
+                for i in range(self.io_threads)
+            ]
+            threads.append(
+                threading.Thread(target=self._dispatch, args=(read_queue, pool, result_queue), name="scan-dispatch")
+            )
+            for thread in threads:
+                thread.daemon = True
+                thread.start()
+            scanned = self._aggregate(result_queue)
+            for thread in threads:
+                thread.join()
+        self.wall_time = time.perf_counter() - start
+
+        if self._errors:
+            raise self._errors[0]
+        return scanned
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Per-stage utilization of the last run.
+
+        Returns:
+            Dictionary with wall and worker startup seconds, a dict per
+            stage (see StageStats.as_dict) and the bottleneck stage.
+        """
+        run_time = self.wall_time - self.startup_time
+        stages = {name: stage.as_dict(run_time) for name, stage in self._stages.items()}
+        return {
+            "wall_s": round(self.wall_time, 3),
+            "startup_s": round(self.startup_time, 3),
+            "stages": stages,
+            "bottleneck": max(STAGES, key=lambda name: stages[name]["utilization"]),
+        }
+
+    def _fail(self, error: BaseException) -> None:
+        """Record a stage error; stages then drain their input without working."""
+        logger.debug("Scan pipeline stage failed: %s", error)
+        self._errors.append(error)
+
+    def _walk(self, entries: Iterable[tuple[str, os.DirEntry]], out: queue.Queue) -> None:
+        """Walker thread: classify files and queue the indexed ones."""
+        busy = blocked = 0.0
+        items = 0
+        try:
+            mark = time.perf_counter()
+            for rel_path, entry in entries:
+                if self._errors:
+                    break
+                filepath = Path(entry.path)
+                classified = self.scanner._classify_file(filepath, rel_path)
+                if classified is None:
+                    continue
+                now = time.perf_counter()
+                busy += now - mark
+                out.put((items, filepath, entry, classified))
+                mark = time.perf_counter()
+                blocked += mark - now
+                items += 1
+            busy += time.perf_counter() - mark
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            self._stages["walk"].add(items=items, busy=busy, blocked=blocked)
+            for _ in range(self.io_threads):
+                out.put(_DONE)
+
+    def _read(self, inbox: queue.Queue, out: queue.Queue) -> None:
+        """I/O thread: stat and read files, count lines, hash contents."""
+        busy = starved = blocked = 0.0
+        items = 0
+        try:
+            while True:
+                mark = time.perf_counter()
+                item = inbox.get()
+                now = time.perf_counter()
+                starved += now - mark
+                if item is _DONE:
+                    break
+                if self._errors:
+                    continue
+                try:
+                    task = self._read_file(*item)
+                except BaseException as e:
+                    self._fail(e)
+                    continue
+                mark = time.perf_counter()
+                busy += mark - now
+                out.put(task)
+                blocked += time.perf_counter() - mark
+                items += 1
+        finally:
+            self._stages["read"].add(items=items, busy=busy, starved=starved, blocked=blocked)
+            out.put(_DONE)
+
+    def _read_file(
+        self,
+        seq: int,
+        filepath: Path,
+        entry: os.DirEntry,
+        classified: tuple[str, str, str, Any],
+    ) -> tuple[Any, ...]:
+        """
+        Build a file's info from one read (same fields as a serial scan).
+
+        Returns:
+            Tuple of (seq, file info, manifest entry, path, language, data
+            for the parser or None, whether to parse).
+        """
+        rel_path, language, category, parser = classified
+        # Stat before reading so a concurrent edit shows up as stale, not missed
+        stat = entry.stat()
+        data: bytes | None = None
+        file_hash: str | None = None
+        if stat.st_size < MMAP_MIN_SIZE:
+            try:
+                with open(filepath, "rb") as f:
+                    data = f.read()
+            except OSError as e:
+                logger.debug("Could not read %s: %s", filepath, e)
+            skip_reason = self.scanner._skip_reason(filepath, stat.st_size, head=data)
+            lines = count_data_lines(data) if data is not None else 0
+            if self.scanner.include_hash and data is not None:
+                file_hash = get_data_hash(data)
+        else:
+            # Large files are memory-mapped for counting and hashing, not read whole
+            skip_reason = self.scanner._skip_reason(filepath, stat.st_size)
+            lines = count_lines(filepath)
+            if self.scanner.include_hash:
+                try:
+                    file_hash = get_file_hash(filepath)
+                except OSError:
+                    pass
+
+        file_info: dict[str, Any] = {
+            "path": rel_path,
+            "language": language,
+            "category": category,
+            "size_bytes": stat.st_size,
+            "lines": lines,
+        }
+        if file_hash is not None:
+            file_info["hash"] = file_hash
+        manifest_entry = [stat.st_size, stat.st_mtime_ns, file_info.get("hash", "")]
+
+        if skip_reason:
+            file_info["skipped"] = skip_reason
+        if not parser.accepts_data:
+            # The parser reads the file itself; don't ship the bytes
+            data = None
+        return seq, file_info, manifest_entry, str(filepath), language, data, not skip_reason
+
+    def _dispatch(self, inbox: queue.Queue, pool: ProcessPoolExecutor, results: queue.Queue) -> None:
+        """Dispatcher thread: submit parse tasks, at most TASKS_PER_WORKER per worker."""
+        limit = self.workers * TASKS_PER_WORKER
+        slots = threading.Semaphore(limit)
+        starved = 0.0
+        remaining = self.io_threads
+
+        def finished(future: Any, seq: int, file_info: dict[str, Any], entry: list[Any]) -> None:
+            results.put((seq, file_info, entry, future))
+            slots.release()
+
+        try:
+            while remaining:
+                mark = time.perf_counter()
+                item = inbox.get()
+                starved += time.perf_counter() - mark
+                if item is _DONE:
+                    remaining -= 1
+                    continue
+                if self._errors:
+                    continue
+                seq, file_info, entry, filepath, language, data, parse = item
+                if not parse:
+                    # Metadata-only file: straight to the aggregator
+                    results.put((seq, file_info, entry, None))
+                    continue
+                slots.acquire()
+                try:
+                    future = pool.submit(_parse_task, filepath, language, data)
+                except BaseException as e:
+                    slots.release()
+                    self._fail(e)
+                    continue
+                future.add_done_callback(
+                    partial(finished, seq=seq, file_info=file_info, entry=entry)
+                )
+        finally:
+            # Wait until every submitted task has handed in its result
+            for _ in range(limit):
+                slots.acquire()
+            self._stages["parse"].add(starved=starved)
+            results.put(_DONE)
+
+    def _aggregate(self, inbox: queue.Queue) -> list[tuple[dict[str, Any], list[Any]]]:
+        """Aggregator (calling thread): attach parse results, restore walk order."""
+        busy = starved = 0.0
+        parse_busy = 0.0
+        parsed = 0
+        scanned: dict[int, tuple[dict[str, Any], list[Any]]] = {}
+        while True:
+            mark = time.perf_counter()
+            item = inbox.get()
+            now = time.perf_counter()
+            starved += now - mark
+            if item is _DONE:
+                break
+            seq, file_info, entry, future = item
+            if future is not None:
+                try:
+                    exports, elapsed = future.result()
+                except BaseException as e:
+                    self._fail(e)
+                    continue
+                parse_busy += elapsed
+                parsed += 1
+                if exports and not exports.get("error"):
+                    file_info["exports"] = exports
+            scanned[seq] = (file_info, entry)
+            busy += time.perf_counter() - now
+
+        self._stages["parse"].add(items=parsed, busy=parse_busy)
+        mark = time.perf_counter()
+        ordered = [scanned[seq] for seq in sorted(scanned)]
+        busy += time.perf_counter() - mark
+        self._stages["aggregate"].add(items=len(ordered), busy=busy, starved=starved)
+        return ordered
+
+
+def format_stats(stats: dict[str, Any]) -> str:
+    """
+    Render pipeline stats as a small table for stderr.
+
+    Args:
+        stats: Output of ScanPipeline.stats().
+
+    Returns:
+        Multi-line text.
+    """
+    lines = [
+        f"Scan pipeline: {stats['wall_s']:.2f}s (worker startup {stats['startup_s']:.2f}s)",
+        f"  {'stage':<10} {'workers':>7} {'items':>7} {'busy':>6} {'starved':>8} {'blocked':>8} {'util':>6}",
+    ]
+    for name, stage in stats["stages"].items():
+        lines.append(
+            f"  {name:<10} {stage['workers']:>7} {stage['items']:>7} {stage['busy_s']:>5.2f}s"
+            f" {stage['starved_s']:>7.2f}s {stage['blocked_s']:>7.2f}s {stage['utilization']:>6.0%}"
+        )
+    lines.append(f"  bottleneck: {stats['bottleneck']}")
+    return "\n".join(lines)
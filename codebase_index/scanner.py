@@ -6,6 +6,8 @@ Coordinates all parsers, scanners, and analyzers to produce a complete codebase
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
 import os
 from datetime import datetime, timezone
@@ -13,14 +15,20 @@ from pathlib import Path
 from typing import TYPE_CHECKING
 
 from codebase_index.config import DEFAULT_CONFIG, DEFAULT_EXCLUDE
+from codebase_index.manifest import build_manifest
+from codebase_index.pipeline import DEFAULT_IO_THREADS, ScanPipeline
 from codebase_index.utils import (
+    SNIFF_SIZE,
     categorize_file,
+    compile_exclude,
     count_lines,
+    detect_generated,
     get_file_hash,
     get_git_info,
-    should_exclude,
+    symbol_span,
     truncate_string,
 )
+from codebase_index.walker import walk_tree
 from codebase_index.parsers import ParserRegistry, PythonParser, TypeScriptParser, SQLParser, DockerParser
 from codebase_index.parsers.docker import DockerParser as DockerParserClass
 from codebase_index.scanners import (
@@ -44,13 +52,134 @@ from codebase_index.analyzers import (
 )
 
 if TYPE_CHECKING:
-    from typing import Any, Iterator
+    from collections.abc import Iterable, Iterator
+    from typing import Any
 
 logger = logging.getLogger(__name__)
 
 # Tool version - import from package
 from codebase_index import __version__ as VERSION
 
+# Whole-tree scans independent of parsed files (run once per scan; spread
+# round-robin over partitions by --partition)
+DOMAIN_SCANS = (
+    "route_prefixes",
+    "test_files",
+    "dependencies",
+    "environment_variables",
+    "todos",
+    "middleware",
+    "websockets",
+    "migrations",
+    "external_http_calls",
+)
+
+# Bump when the partial index layout changes
+PARTIAL_FORMAT_VERSION = 1
+
+# Selectable index sections -> what they need computed first. Names that
+# are not index sections ("route_prefixes", "test_files") are domain scans
+# feeding other sections. Sections built directly from parsed files
+# (files, symbol_index, schemas, database, docker, manifest) are always
+# produced, since parsing is the base every section needs.
+SECTION_DEPENDENCIES: dict[str, tuple[str, ...]] = {
+    "api_endpoints": ("route_prefixes",),
+    "call_graph": (),
+    "potential_duplicates": ("call_graph",),
+    "execution_flow": ("call_graph",),
+    "centrality": ("call_graph",),
+    "dependencies": (),
+    "environment_variables": (),
+    "todos": (),
+    "middleware": (),
+    "websockets": (),
+    "migrations": (),
+    "external_http_calls": (),
+    "import_analysis": ("dependencies",),
+    "test_coverage": ("test_files",),
+    "complexity_warnings": (),
+    "orphaned_files": (),
+    "route_prefixes": (),
+    "test_files": (),
+}
+
+# Analyses --lazy leaves out of the scan; computed on first use after
+# loading and cached beside the index (see lazy_index.py)
+LAZY_SECTIONS = ("execution_flow", "centrality", "potential_duplicates", "test_coverage")
+
+# Summary counts that only make sense when their source section was computed
+_SUMMARY_SOURCES = {
+    "todos_count": "todos",
+    "env_vars_count": "environment_variables",
+    "api_endpoints_count": "api_endpoints",
+    "auth_required_endpoints": "api_endpoints",
+    "test_coverage_percent": "test_coverage",
+    "external_http_calls": "external_http_calls",
+    "complexity_issues": "complexity_warnings",
+    "middleware_count": "middleware",
+    "websocket_endpoints": "websockets",
+    "migrations_count": "migrations",
+    "orphaned_files_count": "orphaned_files",
+    "orphaned_lines": "orphaned_files",
+    "call_graph_entries": "call_graph",
+    "potential_duplicate_groups": "potential_duplicates",
+    "total_duplicated_functions": "potential_duplicates",
+}
+
+
+def index_sections() -> list[str]:
+    """Names accepted by --sections (index sections with a dependency entry)."""
+    return [name for name in SECTION_DEPENDENCIES if name not in ("route_prefixes", "test_files")]
+
+
+def resolve_sections(requested: Iterable[str] | None) -> frozenset[str] | None:
+    """
+    Expand requested sections with everything they depend on.
+
+    Args:
+        requested: Section names, or None for a full scan.
+
+    Returns:
+        The requested sections plus their prerequisites (transitively), or
+        None when every section should be computed.
+
+    Raises:
+        ValueError: If a name is not a selectable section.
+    """
+    if requested is None:
+        return None
+    selected: set[str] = set()
+    pending = list(requested)
+    while pending:
+        name = pending.pop()
+        if name in selected:
+            continue
+        if name not in SECTION_DEPENDENCIES:
+            raise ValueError(
+                f"Unknown section '{name}' (choose from: {', '.join(index_sections())})"
+            )
+        selected.add(name)
+        pending.extend(SECTION_DEPENDENCIES[name])
+    return frozenset(selected)
+
+
+def partition_of(rel_path: str, count: int) -> int:
+    """
+    Partition a file belongs to in an N-way distributed scan.
+
+    Uses a hash of the POSIX-style relative path, so the split is the same
+    on every machine and operating system.
+
+    Args:
+        rel_path: Path relative to the scan root.
+        count: Number of partitions.
+
+    Returns:
+        Partition index in range(count).
+    """
+    digest = hashlib.sha1(rel_path.replace(os.sep, "/").encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
 
 class CodebaseScanner:
     """Main scanner that orchestrates all language-specific scanners and analyzers."""
@@ -62,6 +191,12 @@ class CodebaseScanner:
         exclude_extensions: set[str] | None = None,
         include_hash: bool = True,
         config: dict[str, Any] | None = None,
+        git_status: bool = False,
+        sections: Iterable[str] | None = None,
+        lazy: bool = False,
+        pipeline_workers: int = 0,
+        io_threads: int = DEFAULT_IO_THREADS,
+        gitignore: bool = False,
     ):
         """
         Initialize the codebase scanner.
@@ -72,17 +207,51 @@ class CodebaseScanner:
             exclude_extensions: File extensions to exclude.
             include_hash: Whether to include file hashes.
             config: Configuration dictionary (merged with defaults).
+            git_status: Run ``git status`` for an exact dirty flag instead of
+                approximating it from the git index mtime.
+            sections: Index sections to compute (plus their prerequisites,
+                see SECTION_DEPENDENCIES); None computes everything.
+            lazy: Defer the LAZY_SECTIONS analyses to load time.
+            pipeline_workers: Parse files in this many worker processes,
+                with reading overlapped on io_threads threads (see
+                pipeline.py); 0 scans file by file in this process.
+            io_threads: Threads statting and reading files in the pipeline.
+            gitignore: Also skip files ignored by .gitignore (see walker.py).
+
+        Raises:
+            ValueError: If sections names an unknown section.
         """
         self.root = root.resolve()
         self.exclude = exclude or DEFAULT_EXCLUDE.copy()
         self.exclude_extensions = exclude_extensions or set()
+        self.exclude_rules = compile_exclude(tuple(self.exclude))
+        self.gitignore = gitignore
         self.include_hash = include_hash
         self.config = config or DEFAULT_CONFIG
+        self.git_status = git_status
+        self.sections = resolve_sections(sections)
+        self.lazy = lazy
+        self.pipeline_workers = pipeline_workers
+        self.io_threads = io_threads
+        # Per-stage timings of the last pipelined scan
+        self.pipeline_stats: dict[str, Any] | None = None
+        # Relative path -> [size, mtime_ns, hash], collected during the walk
+        self._manifest_entries: dict[str, list[Any]] = {}
+
+        # Huge, minified and generated files are indexed as metadata only
+        large_files = self.config.get("large_files", DEFAULT_CONFIG["large_files"])
+        self.max_file_size = large_files.get("max_size_bytes") or 0
+        self.max_line_length = large_files.get("max_line_length") or 0
+        self.generated_markers = [
+            marker.encode("utf-8") for marker in large_files.get("generated_markers") or []
+        ]
 
         # Initialize domain scanners
         self.deps_scanner = DependenciesScanner()
         self.env_scanner = EnvScanner()
-        self.todo_scanner = TodoScanner()
+        self.todo_scanner = TodoScanner(
+            max_file_size=self.max_file_size, max_line_length=self.max_line_length
+        )
         self.route_prefix_scanner = RoutePrefixScanner()
         self.http_calls_scanner = HttpCallsScanner()
         self.middleware_scanner = MiddlewareScanner()
@@ -116,56 +285,266 @@ class CodebaseScanner:
         Returns:
             Complete codebase index dictionary.
         """
-        result = self._init_result()
+        domain = {name: self._run_domain_scan(name) for name in self._domain_scans()}
 
-        # Get route prefixes first for full path resolution
-        route_prefixes = self.route_prefix_scanner.scan(self.root, self.exclude)
+        # Scan all files
+        file_infos = self._scan_paths(self._walk_entries())
 
-        # Collect test files for coverage mapping
-        self.test_mapper.collect_test_files(self.exclude)
+        return self._assemble(file_infos, domain)
 
-        # Scan all files
-        for filepath in self._walk_files():
-            file_info = self._scan_file(filepath)
+    def scan_partition(self, index: int, count: int) -> dict[str, Any]:
+        """
+        Scan one deterministic slice of the codebase (for distributed scans).
+
+        Files are assigned by a hash of their relative path, so every node
+        agrees on the split regardless of directory listing order. The
+        whole-tree domain scans are spread round-robin over the partitions.
+
+        Args:
+            index: Partition number, 0-based.
+            count: Total number of partitions.
+
+        Returns:
+            Partial index: parsed files, their manifest entries and the
+            domain scan results assigned to this partition.
+
+        Raises:
+            ValueError: If index is not in range(count).
+        """
+        if count < 1 or not 0 <= index < count:
+            raise ValueError(f"Invalid partition {index + 1}/{count}")
+
+        files = self._scan_paths(
+            (rel_path, entry) for rel_path, entry in self._walk_entries()
+            if partition_of(rel_path, count) == index
+        )
+
+        return {
+            "partial": {
+                "version": PARTIAL_FORMAT_VERSION,
+                "index": index,
+                "count": count,
+                "tool_version": VERSION,
+                "options_hash": self._options_hash(),
+            },
+            "files": files,
+            "manifest_entries": self._manifest_entries,
+            "domain": {
+                name: self._run_domain_scan(name)
+                for position, name in enumerate(self._domain_scans())
+                if position % count == index
+            },
+        }
+
+    def merge_partials(self, partials: list[dict[str, Any]]) -> dict[str, Any]:
+        """
+        Combine partial indexes into the index a single scan would produce.
+
+        Parsed files are put back in this machine's walk order, then the
+        global analyzers (call graph, duplicates, execution flow,
+        centrality, coverage, orphans) run once over all of them.
+
+        Args:
+            partials: Outputs of scan_partition for every partition.
+
+        Returns:
+            Complete codebase index dictionary.
+
+        Raises:
+            ValueError: If partitions are missing, duplicated, or were
+                produced with different options or tool versions.
+        """
+        if not partials:
+            raise ValueError("No partial indexes to merge")
+        headers = [p.get("partial", {}) for p in partials]
+        count = headers[0].get("count")
+        if any(h.get("version") != PARTIAL_FORMAT_VERSION for h in headers):
+            raise ValueError("Unsupported partial index format")
+        if any(h.get("count") != count for h in headers):
+            raise ValueError("Partials come from different partition counts")
+        indexes = sorted(h.get("index") for h in headers)
+        if indexes != list(range(count)):
+            raise ValueError(f"Expected partitions 1..{count}, got {[i + 1 for i in indexes]}")
+        if any(h.get("tool_version") != VERSION for h in headers):
+            raise ValueError(f"Partials were produced by a different tool version (this is {VERSION})")
+        if any(h.get("options_hash") != self._options_hash() for h in headers):
+            raise ValueError("Partials were scanned with different exclusions, hashing, config or sections")
+
+        by_path: dict[str, dict[str, Any]] = {}
+        domain: dict[str, Any] = {}
+        self._manifest_entries = {}
+        for partial in partials:
+            for file_info in partial.get("files", []):
+                by_path[file_info["path"]] = file_info
+            self._manifest_entries.update(partial.get("manifest_entries", {}))
+            domain.update(partial.get("domain", {}))
+
+        file_infos = []
+        for rel_path, _entry in self._walk_entries():
+            file_info = by_path.pop(rel_path, None)
             if file_info:
-                result["files"].append(file_info)
-                self._update_summary(result["summary"], file_info)
-                self._process_file_data(file_info, result, route_prefixes)
+                file_infos.append(file_info)
+        if by_path:
+            # Files another node saw but this checkout lacks: keep them, last
+            logger.warning("%d partial file(s) not found under %s", len(by_path), self.root)
+            file_infos.extend(by_path[path] for path in sorted(by_path))
+
+        return self._assemble(file_infos, domain)
+
+    def _wants(self, name: str) -> bool:
+        """Check whether a section or domain scan is computed by this scan."""
+        if self.lazy and name in LAZY_SECTIONS:
+            return False
+        return self.sections is None or name in self.sections
+
+    def _deferred(self) -> list[str]:
+        """Lazy sections this scan would otherwise have computed."""
+        if not self.lazy:
+            return []
+        return [name for name in LAZY_SECTIONS if self.sections is None or name in self.sections]
+
+    def _domain_scans(self) -> list[str]:
+        """Domain scans this scan needs, in DOMAIN_SCANS order."""
+        return [name for name in DOMAIN_SCANS if self._wants(name)]
+
+    def _options_hash(self) -> str:
+        """Fingerprint of the options that change per-file scan output."""
+        options = [
+            sorted(self.exclude), sorted(self.exclude_extensions), self.include_hash, self.config,
+            sorted(self.sections) if self.sections is not None else None,
+            self.lazy, self.gitignore,
+        ]
+        encoded = json.dumps(options, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()[:16]
+
+    def _run_domain_scan(self, name: str) -> Any:
+        """Run one whole-tree scan that does not depend on parsed files."""
+        if name == "route_prefixes":
+            return self.route_prefix_scanner.scan(self.root, self.exclude)
+        if name == "test_files":
+            self.test_mapper.collect_test_files(self.exclude)
+            return sorted(self.test_mapper.test_files)
+        if name == "dependencies":
+            return self.deps_scanner.scan(self.root)
+        if name == "environment_variables":
+            return self.env_scanner.scan(self.root, self.exclude)
+        if name == "todos":
+            return self.todo_scanner.scan(self.root, self.exclude)
+        if name == "middleware":
+            return self.middleware_scanner.scan(self.root, self.exclude)
+        if name == "websockets":
+            return self.websocket_scanner.scan(self.root, self.exclude)
+        if name == "migrations":
+            return self.alembic_scanner.scan(self.root)
+        if name == "external_http_calls":
+            return self.http_calls_scanner.scan(self.root, self.exclude)
+        raise ValueError(f"Unknown domain scan: {name}")
+
+    def _assemble(self, file_infos: list[dict[str, Any]], domain: dict[str, Any]) -> dict[str, Any]:
+        """
+        Build the full index from parsed files and domain scan results.
+
+        Only the selected sections (see SECTION_DEPENDENCIES) are computed;
+        the others keep their empty value and are left out of
+        meta.sections and the summary counts.
+
+        Args:
+            file_infos: Parsed files, in walk order.
+            domain: Results of the domain scans this scan needs.
+
+        Returns:
+            Codebase index dictionary.
+        """
+        result = self._init_result()
+
+        # Route prefixes give endpoints their full paths
+        route_prefixes = domain.get("route_prefixes", {})
+
+        # Test files for coverage mapping
+        self.test_mapper.test_files = set(domain.get("test_files", []))
+
+        for file_info in file_infos:
+            result["files"].append(file_info)
+            self._update_summary(result["summary"], file_info)
+            self._process_file_data(file_info, result, route_prefixes)
+            if file_info.get("skipped"):
+                result["skipped_files"].append(self.skipped_entry(file_info))
+
+        result["manifest"] = build_manifest(
+            self._manifest_entries, self.exclude, self.exclude_extensions, self.gitignore
+        )
+        self._approximate_git_dirty(result["meta"])
 
         # Build call graph and detect duplicates
-        self._build_call_graph(result)
+        if self.sections is None or "call_graph" in self.sections:
+            self._build_call_graph(result)
+            if not self._wants("potential_duplicates"):
+                result["potential_duplicates"] = []
 
         # Run architectural analyzers (need call graph)
-        result["execution_flow"] = ExecutionFlowAnalyzer(result).analyze()
-        result["centrality"] = CentralityAnalyzer(result).analyze()
-
-        # Run domain scanners
-        result["dependencies"] = self.deps_scanner.scan(self.root)
-        result["environment_variables"] = self.env_scanner.scan(self.root, self.exclude)
-        result["todos"] = self.todo_scanner.scan(self.root, self.exclude)
-        result["middleware"] = self.middleware_scanner.scan(self.root, self.exclude)
-        result["websockets"] = self.websocket_scanner.scan(self.root, self.exclude)
-        result["migrations"] = self.alembic_scanner.scan(self.root)
-        result["external_http_calls"] = self.http_calls_scanner.scan(self.root, self.exclude)
+        if self._wants("execution_flow"):
+            result["execution_flow"] = ExecutionFlowAnalyzer(result).analyze()
+        if self._wants("centrality"):
+            result["centrality"] = CentralityAnalyzer(result).analyze()
+
+        # Domain scanner results
+        for name in DOMAIN_SCANS:
+            if name in result and name in domain:
+                result[name] = domain[name]
 
         # Run analyzers
-        python_deps = result["dependencies"].get("python", [])
-        result["import_analysis"] = self.import_aggregator.analyze(python_deps)
-        result["test_coverage"] = self.test_mapper.map_source_to_test(result["files"])
-        result["complexity_warnings"] = self.complexity_analyzer.analyze(result["files"])
-        result["orphaned_files"] = self.orphaned_scanner.scan(
-            self.root, result["files"], self.exclude
-        )
+        if self._wants("import_analysis"):
+            python_deps = result["dependencies"].get("python", [])
+            result["import_analysis"] = self.import_aggregator.analyze(python_deps)
+        if self._wants("test_coverage"):
+            result["test_coverage"] = self.test_mapper.map_source_to_test(result["files"])
+        if self._wants("complexity_warnings"):
+            result["complexity_warnings"] = self.complexity_analyzer.analyze(result["files"])
+        if self._wants("orphaned_files"):
+            result["orphaned_files"] = self.orphaned_scanner.scan(
+                self.root, result["files"], self.exclude
+            )
+
+        if self.sections is not None:
+            # Byproducts of a shared pass (e.g. endpoints without their route
+            # prefixes) are reset so meta.sections is exactly what is present
+            empty = self._empty_result()
+            for name in index_sections():
+                if name not in self.sections:
+                    result[name] = empty[name]
+            result["meta"]["sections"] = [name for name in index_sections() if name in self.sections]
+        deferred = self._deferred()
+        if deferred:
+            result["meta"]["lazy"] = {
+                "sections": deferred,
+                # Coverage is mapped against the tests present at scan time
+                "test_files": sorted(self.test_mapper.test_files),
+            }
 
         # Update summary with analysis results
-        self._finalize_summary(result)
+        self.finalize_summary(result)
+        if self.sections is not None:
+            for key, source in _SUMMARY_SOURCES.items():
+                if source not in self.sections:
+                    result["summary"].pop(key, None)
+        for key, source in _SUMMARY_SOURCES.items():
+            # Filled in when the lazy section is computed
+            if source in deferred and key in result["summary"]:
+                result["summary"][key] = None
 
         return result
 
     def _init_result(self) -> dict[str, Any]:
         """Initialize the result structure."""
+        result = self._empty_result()
+        result["meta"] = self._build_meta()
+        return result
+
+    @staticmethod
+    def _empty_result() -> dict[str, Any]:
+        """Result structure with every section empty (meta left blank)."""
         return {
-            "meta": self._build_meta(),
+            "meta": {},
             "summary": {
                 "total_files": 0,
                 "total_lines": 0,
@@ -173,6 +552,7 @@ class CodebaseScanner:
                 "by_category": {},
             },
             "files": [],
+            "skipped_files": [],
             "api_endpoints": [],
             "schemas": [],
             "database": {"tables": []},
@@ -198,6 +578,7 @@ class CodebaseScanner:
             "potential_duplicates": [],
             "execution_flow": {},
             "centrality": {},
+            "manifest": {},
         }
 
     def _build_meta(self) -> dict[str, Any]:
@@ -208,29 +589,92 @@ class CodebaseScanner:
             "root": str(self.root),
         }
 
-        git_info = get_git_info(self.root)
+        git_info = get_git_info(self.root, exact_status=self.git_status)
         if git_info:
             meta["git"] = git_info
 
         return meta
 
+    def _approximate_git_dirty(self, meta: dict[str, Any]) -> None:
+        """Flag the tree dirty if any scanned file is newer than the git index."""
+        git_info = meta.get("git")
+        if not git_info or "index_mtime_ns" not in git_info:
+            return
+        index_mtime_ns = git_info.pop("index_mtime_ns")
+        if index_mtime_ns is None:
+            git_info["dirty"] = None
+            return
+        git_info["dirty"] = any(
+            entry[1] > index_mtime_ns for entry in self._manifest_entries.values()
+        )
+        git_info["dirty_approximate"] = True
+
+    def _walk_entries(self) -> Iterator[tuple[str, os.DirEntry]]:
+        """Walk directory and yield (relative path, DirEntry) of files to scan."""
+        return walk_tree(self.root, self.exclude_rules, self.gitignore)
+
     def _walk_files(self) -> Iterator[Path]:
         """Walk directory and yield files to scan."""
-        for root, dirs, files in os.walk(self.root):
-            # Filter out excluded directories
-            dirs[:] = [
-                d for d in dirs
-                if not should_exclude(Path(root) / d, self.exclude)
-            ]
-
-            for filename in files:
-                filepath = Path(root) / filename
-                if not should_exclude(filepath, self.exclude):
-                    yield filepath
-
-    def _scan_file(self, filepath: Path) -> dict[str, Any] | None:
-        """Scan a single file."""
-        rel_path = str(filepath.relative_to(self.root))
+        for _rel_path, entry in self._walk_entries():
+            yield Path(entry.path)
+
+    def _scan_paths(self, entries: Iterable[tuple[str, os.DirEntry]]) -> list[dict[str, Any]]:
+        """
+        Scan files (in the given order) and collect their manifest entries.
+
+        Args:
+            entries: (relative path, DirEntry) of the files to scan,
+                typically from _walk_entries.
+
+        Returns:
+            File infos of the files a parser handles, in path order.
+        """
+        self._manifest_entries = {}
+        if self.pipeline_workers > 0:
+            pipeline = ScanPipeline(self, self.pipeline_workers, self.io_threads)
+            file_infos = []
+            for file_info, manifest_entry in pipeline.run(entries):
+                file_infos.append(file_info)
+                self._manifest_entries[file_info["path"]] = manifest_entry
+            self.pipeline_stats = pipeline.stats()
+            return file_infos
+
+        file_infos = []
+        for rel_path, entry in entries:
+            scanned = self._scan_file(Path(entry.path), rel_path, entry)
+            if scanned:
+                file_infos.append(scanned)
+        return file_infos
+
+    def _scan_file(
+        self,
+        filepath: Path,
+        rel_path: str | None = None,
+        entry: os.DirEntry | None = None,
+    ) -> dict[str, Any] | None:
+        """Scan a single file (stat through its DirEntry when the walk provides one)."""
+        classified = self._classify_file(filepath, rel_path)
+        if classified is None:
+            return None
+        rel_path, language, category, parser = classified
+        return self._build_file_info(filepath, rel_path, language, parser, category, entry)
+
+    def _classify_file(
+        self, filepath: Path, rel_path: str | None = None
+    ) -> tuple[str, str, str, Any] | None:
+        """
+        Work out how a file is indexed.
+
+        Args:
+            filepath: File to classify.
+            rel_path: Its path relative to root, if already known.
+
+        Returns:
+            Tuple of (relative path, language, category, parser), or None
+            if the file is excluded by extension or no parser handles it.
+        """
+        if rel_path is None:
+            rel_path = str(filepath.relative_to(self.root))
         suffix = filepath.suffix.lower()
 
         # Check extension exclusions
@@ -240,11 +684,11 @@ class CodebaseScanner:
         # Check for Docker files by name
         docker_parser, docker_lang = DockerParserClass.get_for_file(filepath)
         if docker_parser and docker_lang:
-            return self._build_file_info(filepath, rel_path, docker_lang, docker_parser)
+            return rel_path, docker_lang, "other", docker_parser
 
         # Get parser from registry (pass config for framework-specific patterns)
         parser, language = ParserRegistry.get_parser(filepath, self.config)
-        if not parser:
+        if not parser or not language:
             return None
 
         # Determine category
@@ -255,7 +699,7 @@ class CodebaseScanner:
         else:
             category = "other"
 
-        return self._build_file_info(filepath, rel_path, language, parser, category)
+        return rel_path, language, category, parser
 
     def _build_file_info(
         self,
@@ -264,13 +708,17 @@ class CodebaseScanner:
         language: str,
         parser: Any,
         category: str = "other",
+        entry: os.DirEntry | None = None,
     ) -> dict[str, Any]:
         """Build file info dictionary."""
+        # Stat before reading so a concurrent edit shows up as stale, not missed
+        stat = entry.stat() if entry is not None else filepath.stat()
+        skip_reason = self._skip_reason(filepath, stat.st_size)
         file_info: dict[str, Any] = {
             "path": rel_path,
             "language": language,
             "category": category,
-            "size_bytes": filepath.stat().st_size,
+            "size_bytes": stat.st_size,
             "lines": count_lines(filepath),
         }
 
@@ -280,6 +728,14 @@ class CodebaseScanner:
             except (OSError, IOError):
                 pass
 
+        self._manifest_entries[rel_path] = [
+            stat.st_size, stat.st_mtime_ns, file_info.get("hash", "")
+        ]
+
+        if skip_reason:
+            file_info["skipped"] = skip_reason
+            return file_info
+
         # Scan file contents
         exports = parser.scan(filepath)
         if exports and not exports.get("error"):
@@ -287,6 +743,41 @@ class CodebaseScanner:
 
         return file_info
 
+    def _skip_reason(self, filepath: Path, size: int, head: bytes | None = None) -> str | None:
+        """
+        Decide whether a file is indexed as metadata only.
+
+        Args:
+            filepath: File to check.
+            size: Its size in bytes.
+            head: Its leading bytes, if already read (read here if None).
+
+        Returns:
+            "size", "long_lines" or "generated", or None to parse the file.
+        """
+        if self.max_file_size and size > self.max_file_size:
+            return "size"
+        if not (self.max_line_length or self.generated_markers):
+            return None
+        sniff_size = max(SNIFF_SIZE, self.max_line_length + 1)
+        if head is None:
+            try:
+                with open(filepath, "rb") as f:
+                    head = f.read(sniff_size)
+            except OSError:
+                return None
+        return detect_generated(head[:sniff_size], self.max_line_length, self.generated_markers)
+
+    @staticmethod
+    def skipped_entry(file_info: dict[str, Any]) -> dict[str, Any]:
+        """skipped_files entry for a file indexed as metadata only."""
+        return {
+            "path": file_info["path"],
+            "reason": file_info["skipped"],
+            "size_bytes": file_info.get("size_bytes", file_info.get("size", 0)),
+            "lines": file_info.get("lines", 0),
+        }
+
     def _process_file_data(
         self,
         file_info: dict[str, Any],
@@ -385,8 +876,8 @@ class CodebaseScanner:
         result["docker"]["networks"].extend(exports.get("networks", []))
         result["docker"]["volumes"].extend(exports.get("volumes", []))
 
+    @staticmethod
     def _index_python_symbols(
-        self,
         file_info: dict[str, Any],
         result: dict[str, Any],
     ) -> None:
@@ -401,6 +892,7 @@ class CodebaseScanner:
                     "name": func.get("name"),
                     "file": file_path,
                     "line": func.get("line"),
+                    **symbol_span(func),
                     "async": func.get("async", False),
                     "signature": func.get("signature"),
                     "docstring": truncate_string(func.get("docstring")),
@@ -413,6 +905,7 @@ class CodebaseScanner:
                     "name": cls.get("name"),
                     "file": file_path,
                     "line": cls.get("line"),
+                    **symbol_span(cls),
                     "bases": cls.get("bases", []),
                     "docstring": truncate_string(cls.get("docstring")),
                     "method_count": len(cls.get("methods", [])),
@@ -425,12 +918,14 @@ class CodebaseScanner:
                             "class": cls.get("name"),
                             "file": file_path,
                             "line": method.get("line"),
+                            **symbol_span(method),
                             "async": method.get("async", False),
                             "signature": method.get("signature"),
                             "docstring": truncate_string(method.get("docstring")),
                         })
 
-    def _build_call_graph(self, result: dict[str, Any]) -> None:
+    @staticmethod
+    def _build_call_graph(result: dict[str, Any]) -> None:
         """Build call graph and detect code duplicates."""
         body_hash_index: dict[str, list[dict[str, Any]]] = {}
 
@@ -444,7 +939,9 @@ class CodebaseScanner:
             # Process functions
             for func in exports.get("functions", []):
                 if isinstance(func, dict):
-                    self._add_to_call_graph(func, file_path, None, result, body_hash_index)
+                    CodebaseScanner._add_to_call_graph(
+                        func, file_path, None, result, body_hash_index
+                    )
 
             # Process methods
             for cls in exports.get("classes", []):
@@ -452,7 +949,7 @@ class CodebaseScanner:
                     class_name = cls.get("name")
                     for method in cls.get("methods", []):
                         if isinstance(method, dict):
-                            self._add_to_call_graph(
+                            CodebaseScanner._add_to_call_graph(
                                 method, file_path, class_name, result, body_hash_index
                             )
 
@@ -468,8 +965,8 @@ class CodebaseScanner:
         # Sort duplicates by count
         result["potential_duplicates"].sort(key=lambda x: x["count"], reverse=True)
 
+    @staticmethod
     def _add_to_call_graph(
-        self,
         func_info: dict[str, Any],
         file_path: str,
         class_name: str | None,
@@ -520,7 +1017,32 @@ class CodebaseScanner:
         cat = file_info.get("category", "other")
         summary["by_category"][cat] = summary["by_category"].get(cat, 0) + 1
 
-    def _finalize_summary(self, result: dict[str, Any]) -> None:
+    @staticmethod
+    def derive_symbol_sections(files: list[dict[str, Any]]) -> dict[str, Any]:
+        """
+        Rebuild the sections that are pure functions of files[].exports.
+
+        Args:
+            files: File info dictionaries (in index order).
+
+        Returns:
+            Dictionary with symbol_index, call_graph and potential_duplicates.
+        """
+        result: dict[str, Any] = {
+            "symbol_index": {"functions": [], "classes": [], "methods": []},
+            "call_graph": {},
+            "potential_duplicates": [],
+        }
+        for file_info in files:
+            if file_info.get("language") == "python":
+                CodebaseScanner._index_python_symbols(file_info, result)
+        result["files"] = files
+        CodebaseScanner._build_call_graph(result)
+        del result["files"]
+        return result
+
+    @staticmethod
+    def finalize_summary(result: dict[str, Any]) -> None:
         """Add final summary counts from analysis results."""
         summary = result["summary"]
 
@@ -534,6 +1056,7 @@ class CodebaseScanner:
             1 for ep in result["api_endpoints"] if ep.get("auth_required")
         )
         summary["schemas_count"] = len(result["schemas"])
+        summary["skipped_files_count"] = len(result.get("skipped_files", []))
         summary["database_tables_count"] = len(result["database"]["tables"])
         summary["test_coverage_percent"] = result["test_coverage"].get(
             "coverage_percentage", 0
@@ -582,9 +1105,10 @@ class CodebaseScanner:
             summary["isolated_functions"] = c_summary.get("isolated_count", 0)
 
         # Generate README badges
-        result["badges"] = self._generate_badges(summary)
+        result["badges"] = CodebaseScanner._generate_badges(summary)
 
-    def _generate_badges(self, summary: dict[str, Any]) -> dict[str, Any]:
+    @staticmethod
+    def _generate_badges(summary: dict[str, Any]) -> dict[str, Any]:
         """
         Generate shields.io badge URLs for README.
 
@@ -49,7 +49,7 @@ class DependenciesScanner:
             result["python"].extend(deps)
 
         # Remove duplicates
-        result["python"] = list(set(result["python"]))
+        result["python"] = sorted(set(result["python"]))
 
         # Node: package.json
         package_json = root / "package.json"
@@ -38,6 +38,18 @@ class TodoScanner:
         "**/*.jsx",
     ]
 
+    def __init__(self, max_file_size: int = 0, max_line_length: int = 0) -> None:
+        """
+        Initialize the scanner.
+
+        Args:
+            max_file_size: Skip files larger than this many bytes (0 = no limit).
+            max_line_length: Skip lines longer than this (minified code,
+                embedded data); 0 = no limit.
+        """
+        self.max_file_size = max_file_size
+        self.max_line_length = max_line_length
+
     def scan(self, root: Path, exclude: list[str]) -> list[dict[str, Any]]:
         """
         Scan all files for TODO/FIXME comments.
@@ -55,6 +67,12 @@ class TodoScanner:
             for filepath in root.glob(pattern):
                 if should_exclude(filepath, exclude):
                     continue
+                if self.max_file_size:
+                    try:
+                        if filepath.stat().st_size > self.max_file_size:
+                            continue
+                    except OSError:
+                        continue
                 file_todos = self._scan_file(filepath, root)
                 todos.extend(file_todos)
 
@@ -73,22 +91,23 @@ class TodoScanner:
         """
         todos: list[dict[str, Any]] = []
         try:
-            with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-                lines = f.readlines()
-
             rel_path = str(filepath.relative_to(root))
 
-            for i, line in enumerate(lines, 1):
-                for pattern, _ in self.PATTERNS:
-                    match = re.search(pattern, line, re.IGNORECASE)
-                    if match:
-                        todos.append({
-                            "type": match.group(1).upper(),
-                            "message": match.group(2).strip(),
-                            "file": rel_path,
-                            "line": i,
-                        })
-                        break  # Only match once per line
+            # Stream lines rather than readlines(): bundles can be huge
+            with open(filepath, encoding="utf-8", errors="ignore") as f:
+                for i, line in enumerate(f, 1):
+                    if self.max_line_length and len(line) > self.max_line_length:
+                        continue
+                    for pattern, _ in self.PATTERNS:
+                        match = re.search(pattern, line, re.IGNORECASE)
+                        if match:
+                            todos.append({
+                                "type": match.group(1).upper(),
+                                "message": match.group(2).strip(),
+                                "file": rel_path,
+                                "line": i,
+                            })
+                            break  # Only match once per line
 
         except (OSError, IOError) as e:
             logger.debug("Could not scan %s for TODOs: %s", filepath, e)
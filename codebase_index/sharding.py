@@ -0,0 +1,673 @@
+"""
+Sharded indexes for codebase_index.
+
+Scans each configured package root as its own index shard, rebased onto
+repository-relative paths, and writes a small shard manifest plus a global
+symbol table next to the shards. Unchanged shards are reused on re-scan,
+changed ones are re-scanned in parallel, and queries load only the shards
+the symbol table says they touch, merged into one index dictionary.
+
+Layout of a sharded index directory:
+
+    shards.json          shard list (name, path, file, counts, root hash)
+    symbols.json         per-shard defined names, called names and imports
+    shards/<name>.json   one index per shard
+    shards/<name>.manifest.json   file manifest used for reuse and --check
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING
+
+from codebase_index.manifest import MANIFEST_VERSION, compare_manifest
+from codebase_index.utils import compile_exclude, get_git_info
+
+if TYPE_CHECKING:
+    from typing import Any
+
+logger = logging.getLogger(__name__)
+
+SHARD_MANIFEST_NAME = "shards.json"
+SYMBOL_TABLE_NAME = "symbols.json"
+SHARD_DIR_NAME = "shards"
+
+# Bump when the shard layout changes; older shards are re-scanned
+SHARD_FORMAT_VERSION = 1
+
+# Sections computed over the whole call graph; recomputed after a full merge
+GLOBAL_SECTIONS = ("execution_flow", "centrality")
+
+# Summary fields derived from the whole-graph sections
+_GLOBAL_SUMMARY_KEYS = (
+    "entry_points_count", "max_call_depth", "core_functions",
+    "hub_functions", "utility_functions", "isolated_functions",
+)
+
+# Subtrees whose strings are file contents, never paths to rebase
+_NO_REBASE_KEYS = frozenset({"exports", "meta", "manifest"})
+
+
+def is_sharded_index(path: Path) -> bool:
+    """Check whether a path is a sharded index directory."""
+    return path.is_dir() and (path / SHARD_MANIFEST_NAME).is_file()
+
+
+def discover_shards(root: Path, patterns: list[str], exclude: list[str]) -> dict[str, str]:
+    """
+    Expand package root globs into shard directories.
+
+    Args:
+        root: Repository root.
+        patterns: Globs relative to root (e.g. "packages/*", "services/api").
+        exclude: Exclude patterns; matching directories are not shards.
+
+    Returns:
+        Mapping of shard name (its relative path) to relative path, with
+        nested matches dropped in favour of the outermost root.
+    """
+    rules = compile_exclude(tuple(exclude))
+    found: set[str] = set()
+    for pattern in patterns:
+        for directory in root.glob(pattern):
+            if not directory.is_dir():
+                continue
+            rel = directory.relative_to(root).as_posix()
+            parts = PurePosixPath(rel).parts
+            if any(rules.match(p) for p in parts):
+                continue
+            found.add(rel)
+
+    shards: dict[str, str] = {}
+    for rel in sorted(found):
+        if not any(rel.startswith(outer + "/") for outer in shards):
+            shards[rel] = rel
+    return shards
+
+
+def _shard_file_stem(name: str) -> str:
+    """File-system safe stem for a shard name."""
+    return name.replace("/", "__") or "_root"
+
+
+def _list_paths(directory: Path, exclude: list[str]) -> set[str]:
+    """Every non-excluded file under a directory, as relative paths."""
+    rules = compile_exclude(tuple(exclude))
+    paths: set[str] = set()
+    for current, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if not rules.match(d)]
+        rel_dir = os.path.relpath(current, directory)
+        for filename in files:
+            if rules.match(filename):
+                continue
+            paths.add(filename if rel_dir == "." else os.path.join(rel_dir, filename))
+    return paths
+
+
+def rebase_paths(value: Any, prefix: str, known: set[str]) -> Any:
+    """
+    Prefix shard-relative file paths with the shard directory.
+
+    Strings (and dict keys) that name a file in the shard, or a
+    "path:symbol" key of one, are rewritten; everything else is kept.
+
+    Args:
+        value: Index data (or a part of it).
+        prefix: Shard directory relative to the repository root, with a
+            trailing separator.
+        known: Shard-relative paths of all files in the shard.
+
+    Returns:
+        The rebased data (rebuilt containers, shared leaves).
+    """
+    def rebase_str(text: str) -> str:
+        if text in known or text.partition(":")[0] in known:
+            return prefix + text
+        return text
+
+    def walk(node: Any) -> Any:
+        if isinstance(node, str):
+            return rebase_str(node)
+        if isinstance(node, list):
+            return [walk(item) for item in node]
+        if isinstance(node, dict):
+            return {
+                (rebase_str(k) if isinstance(k, str) else k): (v if k in _NO_REBASE_KEYS else walk(v))
+                for k, v in node.items()
+            }
+        return node
+
+    return walk(value)
+
+
+def symbol_table_entry(index_data: dict[str, Any]) -> dict[str, list[str]]:
+    """
+    Names a shard defines, calls and imports, for routing queries.
+
+    Args:
+        index_data: One shard's index.
+
+    Returns:
+        Dictionary with sorted 'defines', 'calls' and 'imports' lists.
+    """
+    defines: set[str] = set()
+    for kind in ("functions", "classes", "methods"):
+        for symbol in index_data.get("symbol_index", {}).get(kind, []):
+            name = symbol.get("name")
+            if name:
+                defines.add(name.rsplit(".", 1)[-1])
+
+    calls: set[str] = set()
+    for info in index_data.get("call_graph", {}).values():
+        for call in info.get("calls", []):
+            calls.add(call.rsplit(".", 1)[-1])
+
+    imports: set[str] = set()
+    for file_info in index_data.get("files", []):
+        modules = file_info.get("exports", {}).get("imports", {}).get("modules", [])
+        imports.update(module for module in modules if isinstance(module, str))
+
+    return {"defines": sorted(defines), "calls": sorted(calls), "imports": sorted(imports)}
+
+
+def _scan_shard_task(task: dict[str, Any]) -> dict[str, Any]:
+    """
+    Scan one shard and write it to disk (runs in a worker process).
+
+    Args:
+        task: Shard name, paths and scanner options.
+
+    Returns:
+        Shard manifest entry plus its symbol table entry.
+    """
+    from codebase_index.scanner import CodebaseScanner
+
+    root = Path(task["root"])
+    shard_root = root / task["path"]
+    scanner = CodebaseScanner(
+        root=shard_root,
+        exclude=list(task["exclude"]),
+        exclude_extensions=set(task["exclude_extensions"]),
+        include_hash=task["include_hash"],
+        config=task["config"],
+        gitignore=task["gitignore"],
+    )
+    # Suppress SyntaxWarnings from scanned files (e.g., invalid escape sequences)
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=SyntaxWarning)
+        index_data = scanner.scan()
+
+    manifest = index_data.pop("manifest")
+    known = _list_paths(shard_root, task["exclude"])
+    index_data = rebase_paths(index_data, task["path"] + os.sep, known)
+    index_data["meta"]["root"] = str(root)
+    index_data["meta"]["shard"] = {"name": task["name"], "path": task["path"]}
+
+    output_dir = Path(task["output_dir"])
+    stem = _shard_file_stem(task["name"])
+    with open(output_dir / f"{stem}.json", "w", encoding="utf-8") as f:
+        json.dump(index_data, f, default=str)
+    with open(output_dir / f"{stem}.manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+    return {
+        "shard": {
+            "name": task["name"],
+            "path": task["path"],
+            "file": f"{SHARD_DIR_NAME}/{stem}.json",
+            "manifest": f"{SHARD_DIR_NAME}/{stem}.manifest.json",
+            "generated_at": index_data["meta"]["generated_at"],
+            "files": index_data["summary"].get("total_files", 0),
+            "lines": index_data["summary"].get("total_lines", 0),
+        },
+        "symbols": symbol_table_entry(index_data),
+    }
+
+
+def _options_hash(options: dict[str, Any]) -> str:
+    """Fingerprint of the scan options; shards scanned differently are not reused."""
+    encoded = json.dumps(options, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def _read_json(path: Path) -> dict[str, Any] | None:
+    """Read a JSON file, or None if it is missing or unreadable."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data: dict[str, Any] = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data
+
+
+def build_shards(
+    root: Path,
+    patterns: list[str],
+    output_dir: Path,
+    exclude: list[str],
+    exclude_extensions: set[str] | None = None,
+    include_hash: bool = True,
+    config: dict[str, Any] | None = None,
+    workers: int = 1,
+    gitignore: bool = False,
+) -> dict[str, Any]:
+    """
+    Write (or refresh) a sharded index.
+
+    Shards whose files are unchanged since the previous run (same stat
+    manifest, same scan options) are kept as they are; the rest are
+    re-scanned, in parallel when workers > 1.
+
+    Args:
+        root: Repository root.
+        patterns: Package root globs, one shard per matching directory.
+        output_dir: Sharded index directory to create or update.
+        exclude: Exclude patterns.
+        exclude_extensions: File extensions to exclude.
+        include_hash: Whether to hash files.
+        config: Scanner configuration.
+        workers: Worker processes for scanning shards.
+        gitignore: Also skip files ignored by .gitignore.
+
+    Returns:
+        Dictionary with scanned, reused and removed shard names.
+
+    Raises:
+        ValueError: If no directory matches the patterns.
+    """
+    from codebase_index import __version__
+
+    root = root.resolve()
+    shards = discover_shards(root, patterns, exclude)
+    if not shards:
+        raise ValueError(f"No package roots match {patterns} under {root}")
+    shard_dir = output_dir / SHARD_DIR_NAME
+    shard_dir.mkdir(parents=True, exist_ok=True)
+
+    options = {
+        "tool_version": __version__,
+        "format": SHARD_FORMAT_VERSION,
+        "exclude": exclude,
+        "exclude_extensions": sorted(exclude_extensions or ()),
+        "include_hash": include_hash,
+        "config": config,
+        "gitignore": gitignore,
+    }
+    options_hash = _options_hash(options)
+
+    previous = _read_json(output_dir / SHARD_MANIFEST_NAME) or {}
+    previous_symbols = (_read_json(output_dir / SYMBOL_TABLE_NAME) or {}).get("shards", {})
+    previous_shards = {
+        entry["name"]: entry for entry in previous.get("shards", [])
+    } if previous.get("options_hash") == options_hash else {}
+
+    entries: dict[str, dict[str, Any]] = {}
+    symbols: dict[str, dict[str, list[str]]] = {}
+    tasks: list[dict[str, Any]] = []
+    for name, path in shards.items():
+        entry = previous_shards.get(name)
+        if entry and name in previous_symbols and (output_dir / entry["file"]).is_file():
+            manifest = _read_json(output_dir / entry["manifest"]) or {}
+            if manifest.get("version") == MANIFEST_VERSION:
+                diff = compare_manifest(root / path, manifest)
+                if not (diff["changed"] or diff["new"] or diff["deleted"]):
+                    entries[name] = entry
+                    symbols[name] = previous_symbols[name]
+                    continue
+        tasks.append({
+            "name": name,
+            "path": path,
+            "root": str(root),
+            "output_dir": str(shard_dir),
+            "exclude": exclude,
+            "exclude_extensions": sorted(exclude_extensions or ()),
+            "include_hash": include_hash,
+            "config": config,
+            "gitignore": gitignore,
+        })
+
+    reused = sorted(entries)
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            results = list(pool.map(_scan_shard_task, tasks))
+    else:
+        results = [_scan_shard_task(task) for task in tasks]
+
+    for scanned in results:
+        name = scanned["shard"]["name"]
+        entries[name] = scanned["shard"]
+        symbols[name] = scanned["symbols"]
+
+    # Drop files of shards that no longer exist
+    removed = sorted(set(previous_shards) - set(shards))
+    for name in removed:
+        for key in ("file", "manifest"):
+            try:
+                (output_dir / previous_shards[name][key]).unlink()
+            except (OSError, KeyError):
+                pass
+
+    shard_manifest = {
+        "version": SHARD_FORMAT_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "tool_version": __version__,
+        "root": str(root),
+        "patterns": list(patterns),
+        "options_hash": options_hash,
+        "shards": [entries[name] for name in sorted(entries)],
+    }
+    git_info = get_git_info(root)
+    if git_info:
+        git_info.pop("index_mtime_ns", None)
+        shard_manifest["git"] = git_info
+
+    with open(output_dir / SHARD_MANIFEST_NAME, "w", encoding="utf-8") as f:
+        json.dump(shard_manifest, f, indent=2)
+    with open(output_dir / SYMBOL_TABLE_NAME, "w", encoding="utf-8") as f:
+        json.dump({"version": SHARD_FORMAT_VERSION, "shards": symbols}, f)
+
+    return {
+        "output": str(output_dir),
+        "shards": len(entries),
+        "scanned": sorted(task["name"] for task in tasks),
+        "reused": reused,
+        "removed": removed,
+    }
+
+
+def _merge_into(target: dict[str, Any], source: dict[str, Any]) -> None:
+    """Deep-merge one shard section into another: concat lists, sum numbers."""
+    for key, value in source.items():
+        current = target.get(key)
+        if key not in target:
+            target[key] = (
+                json.loads(json.dumps(value)) if isinstance(value, (dict, list)) else value
+            )
+        elif isinstance(current, dict) and isinstance(value, dict):
+            _merge_into(current, value)
+        elif isinstance(current, list) and isinstance(value, list):
+            current.extend(value)
+        elif isinstance(current, (int, float)) and isinstance(value, (int, float)) \
+                and not isinstance(current, bool):
+            target[key] = current + value
+
+
+def _resolve_cross_shard_imports(merged: dict[str, Any]) -> None:
+    """
+    Re-resolve imports over the merged file list.
+
+    Inside a shard, an import of a sibling package looks third-party and
+    the files it targets look orphaned; across the merged files both
+    resolve, so those findings are dropped.
+    """
+    from codebase_index.analyzers.module_index import ModuleIndex
+
+    modules = ModuleIndex(merged.get("files", []))
+
+    orphans = merged.get("orphaned_files", {})
+    if orphans.get("orphaned_files"):
+        kept = [o for o in orphans["orphaned_files"] if not modules.is_imported(o.get("path", ""))]
+        kept.sort(key=lambda o: o.get("lines", 0), reverse=True)
+        orphans["orphaned_files"] = kept
+        orphans["orphaned_count"] = len(kept)
+        orphans["orphaned_lines"] = sum(o.get("lines", 0) for o in kept)
+
+    imports = merged.get("import_analysis", {})
+    if imports.get("missing_deps") or imports.get("third_party_imports"):
+        internal = {
+            name for name in imports.get("third_party_imports", [])
+            if modules.resolve(name)
+        } | {
+            dep.get("module") for dep in imports.get("missing_deps", [])
+            if modules.resolve(dep.get("module", ""))
+        }
+        imports["third_party_imports"] = sorted(
+            set(imports.get("third_party_imports", [])) - internal
+        )
+        imports["missing_deps"] = [
+            dep for dep in imports.get("missing_deps", []) if dep.get("module") not in internal
+        ]
+
+
+def merge_shards(
+    shards: list[dict[str, Any]],
+    meta: dict[str, Any],
+    recompute_global: bool = True,
+) -> dict[str, Any]:
+    """
+    Merge shard indexes into one index dictionary.
+
+    Per-file sections are concatenated (paths are already repository
+    relative), duplicate groups are regrouped across shards, imports are
+    re-resolved across shards, summary counts are recomputed, and with
+    recompute_global the whole-graph
+    sections (execution flow, centrality) are re-run on the merged call
+    graph so cross-shard edges count.
+
+    Args:
+        shards: Loaded shard indexes.
+        meta: Metadata for the merged view.
+        recompute_global: Re-run whole-graph analyzers on the merged data.
+
+    Returns:
+        Merged index dictionary.
+    """
+    from codebase_index.scanner import CodebaseScanner
+
+    merged: dict[str, Any] = {"meta": meta}
+    for shard in shards:
+        for key, value in shard.items():
+            if key in ("meta", "badges", *GLOBAL_SECTIONS):
+                continue
+            if key not in merged:
+                merged[key] = type(value)() if isinstance(value, (dict, list)) else value
+            if isinstance(value, dict):
+                _merge_into(merged[key], value)
+            elif isinstance(value, list):
+                merged[key].extend(value)
+
+    # Regroup duplicate bodies so copies in different shards land together
+    groups: dict[str, list[dict[str, Any]]] = {}
+    for group in merged.get("potential_duplicates", []):
+        groups.setdefault(group.get("hash", ""), []).extend(group.get("functions", []))
+    merged["potential_duplicates"] = sorted(
+        (
+            {"hash": body_hash, "count": len(functions), "functions": functions}
+            for body_hash, functions in groups.items()
+            if len(functions) > 1
+        ),
+        key=lambda group: group["count"],
+        reverse=True,
+    )
+
+    _resolve_cross_shard_imports(merged)
+
+    coverage = merged.setdefault("test_coverage", {})
+    testable = len(coverage.get("covered", [])) + len(coverage.get("uncovered", []))
+    coverage["coverage_percentage"] = (
+        round(len(coverage.get("covered", [])) / testable * 100, 1) if testable else 0.0
+    )
+
+    for section in GLOBAL_SECTIONS:
+        merged[section] = {}
+    if recompute_global:
+        from codebase_index.analyzers import CentralityAnalyzer, ExecutionFlowAnalyzer
+
+        merged["execution_flow"] = ExecutionFlowAnalyzer(merged).analyze()
+        merged["centrality"] = CentralityAnalyzer(merged).analyze()
+    else:
+        # Summed per-shard graph figures would be meaningless
+        for key in _GLOBAL_SUMMARY_KEYS:
+            merged["summary"].pop(key, None)
+
+    CodebaseScanner.finalize_summary(merged)
+    return merged
+
+
+class ShardedIndex:
+    """A sharded index directory, loaded shard by shard on demand."""
+
+    def __init__(self, path: Path) -> None:
+        """
+        Open a sharded index.
+
+        Args:
+            path: Sharded index directory (contains shards.json).
+        """
+        self.path = path
+        with open(path / SHARD_MANIFEST_NAME, encoding="utf-8") as f:
+            self.manifest: dict[str, Any] = json.load(f)
+        self.shards: dict[str, dict[str, Any]] = {
+            entry["name"]: entry for entry in self.manifest.get("shards", [])
+        }
+        self._loaded: dict[str, dict[str, Any]] = {}
+        self._defines: dict[str, set[str]] | None = None
+        self._calls: dict[str, set[str]] = {}
+        self._imports: dict[str, set[str]] = {}
+
+    def _load_symbol_table(self) -> None:
+        """Invert symbols.json into name -> shards maps."""
+        if self._defines is not None:
+            return
+        table = (_read_json(self.path / SYMBOL_TABLE_NAME) or {}).get("shards", {})
+        self._defines = {}
+        for name, entry in table.items():
+            for symbol in entry.get("defines", []):
+                self._defines.setdefault(symbol, set()).add(name)
+            for call in entry.get("calls", []):
+                self._calls.setdefault(call, set()).add(name)
+            for module in entry.get("imports", []):
+                self._imports.setdefault(module, set()).add(name)
+
+    def shards_for_symbol(self, query: str) -> set[str] | None:
+        """
+        Shards that define or call a symbol.
+
+        Args:
+            query: Symbol name, optionally qualified ("Class.method").
+
+        Returns:
+            Shard names, or None if the name is unknown (callers should
+            then fall back to loading every shard, e.g. for partial names).
+        """
+        self._load_symbol_table()
+        assert self._defines is not None
+        name = query.rsplit(".", 1)[-1].split(":")[-1]
+        found = self._defines.get(name, set()) | self._calls.get(name, set())
+        return found or None
+
+    def shard_for_path(self, path: str) -> str | None:
+        """Shard owning a repository-relative file path."""
+        posix = path.replace(os.sep, "/")
+        best = None
+        for name, entry in self.shards.items():
+            shard_path = entry["path"]
+            if posix.startswith(shard_path + "/") and (best is None or len(shard_path) > len(self.shards[best]["path"])):
+                best = name
+        return best
+
+    def shards_for_paths(self, paths: list[str]) -> set[str]:
+        """
+        Shards needed to analyze changes to files: their owners, shards
+        calling symbols they define, and shards importing them.
+
+        Args:
+            paths: Repository-relative file paths.
+
+        Returns:
+            Shard names.
+        """
+        self._load_symbol_table()
+        owners = {shard for shard in map(self.shard_for_path, paths) if shard}
+        needed = set(owners)
+        wanted = set(paths)
+        for owner in owners:
+            for kind in ("functions", "classes", "methods"):
+                for symbol in self._load_shard(owner).get("symbol_index", {}).get(kind, []):
+                    if symbol.get("file") in wanted and symbol.get("name"):
+                        needed |= self._calls.get(symbol["name"].rsplit(".", 1)[-1], set())
+        for path in paths:
+            parts = PurePosixPath(path.replace(os.sep, "/")).with_suffix("").parts
+            if parts and parts[-1] == "__init__":
+                parts = parts[:-1]
+            for start in range(len(parts)):
+                needed |= self._imports.get(".".join(parts[start:]), set())
+        return needed
+
+    def _load_shard(self, name: str) -> dict[str, Any]:
+        """Load (and cache) one shard's index."""
+        if name not in self._loaded:
+            with open(self.path / self.shards[name]["file"], encoding="utf-8") as f:
+                self._loaded[name] = json.load(f)
+        return self._loaded[name]
+
+    def load(self, names: set[str] | list[str] | None = None) -> dict[str, Any]:
+        """
+        Merged view over some or all shards.
+
+        Args:
+            names: Shards to load (all if None). Whole-graph sections are
+                only recomputed when every shard is loaded.
+
+        Returns:
+            Merged index dictionary.
+        """
+        selected = sorted(self.shards) if names is None else sorted(set(names) & set(self.shards))
+        meta = {
+            "generated_at": self.manifest.get("generated_at"),
+            "tool_version": self.manifest.get("tool_version"),
+            "root": self.manifest.get("root"),
+            "sharded": True,
+            "shards": selected,
+            "total_shards": len(self.shards),
+        }
+        if self.manifest.get("git"):
+            meta["git"] = self.manifest["git"]
+        return merge_shards(
+            [self._load_shard(name) for name in selected],
+            meta,
+            recompute_global=len(selected) == len(self.shards),
+        )
+
+    def check(self, root: Path) -> dict[str, Any]:
+        """
+        Staleness of every shard against the working tree.
+
+        Args:
+            root: Repository root.
+
+        Returns:
+            Dictionary with is_stale, per-shard changes and stale shard names.
+        """
+        stale: dict[str, Any] = {}
+        for name, entry in sorted(self.shards.items()):
+            manifest = _read_json(self.path / entry["manifest"]) or {}
+            if manifest.get("version") != MANIFEST_VERSION:
+                stale[name] = {"reason": "no manifest"}
+                continue
+            diff = compare_manifest(root / entry["path"], manifest)
+            changes = len(diff["changed"]) + len(diff["new"]) + len(diff["deleted"])
+            if changes:
+                prefix = entry["path"] + os.sep
+                stale[name] = {
+                    key: [prefix + path for path in diff[key]]
+                    for key in ("changed", "new", "deleted")
+                }
+        return {
+            "is_stale": bool(stale),
+            "method": "manifest",
+            "total_shards": len(self.shards),
+            "stale_shards": sorted(stale),
+            "changes": stale,
+            "summary": (
+                f"{len(stale)} of {len(self.shards)} shards changed; re-run the sharded scan"
+                if stale else f"All {len(self.shards)} shards up to date"
+            ),
+        }
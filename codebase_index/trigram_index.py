@@ -0,0 +1,835 @@
+"""
+Trigram index for fast substring and fuzzy lookup in codebase_index.
+
+Symbol names, qualified names (Class.method), call graph keys and file
+paths are split into lowercase trigrams with a posting list of key ids
+per trigram. Substring queries intersect the rarest posting lists and
+verify the few remaining candidates; fuzzy queries rank keys by the
+share of trigrams they have in common with the query. Results are
+ranked by match quality (exact > name > prefix > substring > fuzzy).
+
+A lookup reflects its section as it was when built. Code that queries
+the same index repeatedly builds one lookup and keeps it next to the
+index data it was built from (e.g. DocumentationGenerator.symbol_lookup).
+One-shot queries on an index file pass a TrigramCache instead: the posting
+lists are stored in a sidecar next to the index the first time, and later
+queries read them back rather than recomputing every key's trigrams.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import os
+import re
+import sys
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping, Sequence
+from itertools import accumulate
+from pathlib import Path
+from typing import TYPE_CHECKING, overload
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Above this many candidates, intersect with the next rarest trigram
+# instead of verifying every candidate with a substring test.
+VERIFY_LIMIT = 2048
+
+# In fuzzy mode, candidates come from the query's rarest trigrams, reading
+# at most this many posting entries (common trigrams carry little signal).
+FUZZY_POSTING_BUDGET = 20_000
+
+# Candidates re-scored exactly per requested fuzzy result
+FUZZY_CANDIDATES_PER_RESULT = 10
+
+# Minimum trigram similarity (0-1) for a fuzzy match
+DEFAULT_MIN_SIMILARITY = 0.3
+
+# Every substring match scores at least this; fuzzy matches are scaled
+# by FUZZY_SCALE so they always rank below substring matches.
+SUBSTRING_MIN_SCORE = 0.5
+FUZZY_SCALE = 0.4
+
+# Symbols matched only through their class name (e.g. "parse" in
+# "ParserRegistry.clear") rank below symbols whose own name matches.
+QUALIFIED_ONLY_WEIGHT = 0.9
+
+# Characters that start a new segment of a qualified name or path
+SEGMENT_BOUNDARY = re.compile(r"[./:_\-]")
+
+# Sidecar file name suffix (appended to the index file name), and its format
+SIDECAR_SUFFIX = ".trigram"
+SIDECAR_VERSION = 1
+
+
+def trigrams(text: str) -> set[str]:
+    """Distinct trigrams of a (lowercased) string."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def match_score(query: str, key: str) -> float:
+    """
+    Score how well a lowercase query matches a lowercase key.
+
+    Args:
+        query: Lowercased query.
+        key: Lowercased key that contains the query.
+
+    Returns:
+        Score in (0, 1]; 0 if the key does not contain the query.
+    """
+    if query == key:
+        return 1.0
+
+    position = key.find(query)
+    if position < 0:
+        return 0.0
+
+    # Share of the key covered by the query breaks ties within a tier
+    coverage = len(query) / len(key)
+
+    # Whole last segment, e.g. "method" in "Class.method"
+    if key.endswith(query) and SEGMENT_BOUNDARY.match(key[-len(query) - 1]):
+        if not SEGMENT_BOUNDARY.search(query):
+            return 0.95
+    if position == 0:
+        return 0.8 + 0.1 * coverage
+    if SEGMENT_BOUNDARY.match(key[position - 1]):
+        return 0.7 + 0.1 * coverage
+    return SUBSTRING_MIN_SCORE + 0.2 * coverage
+
+
+class TrigramIndex:
+    """
+    Trigram posting lists over a sequence of string keys.
+
+    Keys are identified by their position in the sequence.
+    """
+
+    def __init__(self, keys: Sequence[str] = ()) -> None:
+        """
+        Build the index.
+
+        Args:
+            keys: Keys to index.
+        """
+        self.keys = keys
+        self._lower: Sequence[str] = [key.lower() for key in keys]
+        self._gram_counts = array("I")
+        postings: dict[str, array] = {}
+        for key_id, lower in enumerate(self._lower):
+            grams = trigrams(lower)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                posting = postings.get(gram)
+                if posting is None:
+                    posting = postings[gram] = array("I")
+                posting.append(key_id)
+        self._postings: Mapping[str, array] = postings
+
+    @classmethod
+    def restore(
+        cls,
+        keys: Sequence[str],
+        postings: Mapping[str, array],
+        gram_counts: array,
+    ) -> TrigramIndex:
+        """
+        Rebuild an index from posting lists computed earlier (see TrigramCache).
+
+        Keys are lowercased and posting lists decoded as queries reach them,
+        so restoring costs nothing per key.
+
+        Args:
+            keys: The keys, in the order they were indexed.
+            postings: Posting list per trigram.
+            gram_counts: Number of distinct trigrams per key.
+
+        Returns:
+            The index, without recomputing any trigrams.
+        """
+        index = cls()
+        index.keys = keys
+        index._lower = _LowerKeys(keys)
+        index._gram_counts = gram_counts
+        index._postings = postings
+        return index
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def substring(self, query: str) -> list[int]:
+        """
+        Ids of keys containing the query (case-insensitive).
+
+        Args:
+            query: Substring to look for.
+
+        Returns:
+            Matching key ids in index order.
+        """
+        query = query.lower()
+        if not query:
+            return list(range(len(self.keys)))
+
+        lower = self._lower
+        if len(query) < 3:
+            # Too short for a trigram: union the trigrams that contain it
+            candidates: set[int] = set()
+            for gram in self._postings:
+                if query in gram:
+                    candidates.update(self._postings[gram])
+            # Keys shorter than three characters have no trigrams
+            candidates.update(i for i, key in enumerate(lower) if len(key) < 3)
+        else:
+            postings = []
+            for gram in trigrams(query):
+                posting = self._postings.get(gram)
+                if posting is None:
+                    return []
+                postings.append(posting)
+            postings.sort(key=len)
+
+            if len(query) == 3:
+                # The query is its own trigram: the posting list is the answer
+                return list(postings[0])
+            if len(postings[0]) <= VERIFY_LIMIT:
+                # Rare trigram: verifying its keys directly is cheapest
+                return [i for i in postings[0] if query in lower[i]]
+
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                if len(candidates) <= VERIFY_LIMIT:
+                    break
+                candidates.intersection_update(posting)
+
+        return sorted(i for i in candidates if query in lower[i])
+
+    def fuzzy(
+        self,
+        query: str,
+        limit: int = 20,
+        min_similarity: float = DEFAULT_MIN_SIMILARITY,
+    ) -> list[tuple[int, float]]:
+        """
+        Keys sharing the most trigrams with the query.
+
+        Args:
+            query: Approximate key (typos, missing characters).
+            limit: Maximum number of results.
+            min_similarity: Minimum Jaccard similarity of trigram sets.
+
+        Returns:
+            (key id, similarity) pairs, best first.
+        """
+        grams = trigrams(query.lower())
+        if not grams:
+            return []
+
+        postings = sorted((self._postings[g] for g in grams if g in self._postings), key=len)
+        if not postings:
+            return []
+
+        selective = postings[:1]
+        budget = FUZZY_POSTING_BUDGET - len(postings[0])
+        for posting in postings[1:]:
+            budget -= len(posting)
+            if budget < 0:
+                break
+            selective.append(posting)
+
+        shared: dict[int, int] = {}
+        for posting in selective:
+            for key_id in posting:
+                shared[key_id] = shared.get(key_id, 0) + 1
+
+        # Rare-trigram hits pick candidates; exact similarity ranks them
+        candidates = heapq.nlargest(
+            limit * FUZZY_CANDIDATES_PER_RESULT, shared.items(), key=lambda item: item[1]
+        )
+        scored = []
+        for key_id, _ in candidates:
+            common = len(grams & trigrams(self._lower[key_id]))
+            similarity = common / (len(grams) + self._gram_counts[key_id] - common)
+            if similarity >= min_similarity:
+                scored.append((key_id, similarity))
+        return heapq.nlargest(limit, scored, key=lambda item: item[1])
+
+    def search(
+        self,
+        query: str,
+        limit: int | None = None,
+        fuzzy: bool = True,
+    ) -> list[tuple[int, float]]:
+        """
+        Ranked substring matches, falling back to fuzzy matches.
+
+        Args:
+            query: Search string.
+            limit: Maximum number of results (None = all substring matches).
+            fuzzy: Use trigram similarity when nothing contains the query.
+
+        Returns:
+            (key id, score) pairs, best first. Fuzzy scores are scaled below
+            every substring score.
+        """
+        query_lower = query.lower()
+        matches = self.substring(query_lower)
+        if matches:
+            scored = ((i, match_score(query_lower, self._lower[i])) for i in matches)
+            if limit is None:
+                return sorted(scored, key=lambda item: (-item[1], item[0]))
+            return heapq.nlargest(limit, scored, key=lambda item: (item[1], -item[0]))
+
+        if not fuzzy:
+            return []
+        return [(i, FUZZY_SCALE * sim) for i, sim in self.fuzzy(query, limit=limit or 20)]
+
+
+class SymbolLookup:
+    """
+    Trigram lookup over symbol_index (functions, classes, methods).
+
+    Each symbol is indexed by its qualified name (``Class.method`` for
+    methods), which also covers plain-name substrings.
+    """
+
+    def __init__(self, symbol_index: dict[str, Any], cache: TrigramCache | None = None) -> None:
+        """
+        Build the lookup.
+
+        Args:
+            symbol_index: The index's "symbol_index" section.
+            cache: Sidecar cache of the index file the section was loaded from.
+        """
+        # Symbol ids number the sections' records one after another
+        self._sections = [
+            (kind, symbol_index.get(section, []))
+            for kind, section in (("function", "functions"), ("class", "classes"), ("method", "methods"))
+        ]
+        self._ends = list(accumulate(len(records) for _, records in self._sections))
+        self.names = _trigram_index("symbols", _SymbolNames(self), cache)
+
+    def __len__(self) -> int:
+        return self._ends[-1]
+
+    def entry(self, symbol_id: int) -> tuple[str, dict[str, Any]]:
+        """
+        Kind and record of a symbol.
+
+        Args:
+            symbol_id: Position of the symbol in the lookup.
+
+        Returns:
+            (kind, symbol record) tuple.
+        """
+        section = bisect_right(self._ends, symbol_id)
+        kind, records = self._sections[section]
+        return kind, records[symbol_id - (self._ends[section - 1] if section else 0)]
+
+    def search(
+        self,
+        query: str,
+        limit: int | None = None,
+        fuzzy: bool = True,
+    ) -> list[tuple[str, dict[str, Any], float]]:
+        """
+        Find symbols by (partial or approximate) name.
+
+        Args:
+            query: Name, qualified name, or part of one.
+            limit: Maximum number of results.
+            fuzzy: Fall back to fuzzy matches when nothing contains the query.
+
+        Returns:
+            (kind, symbol record, score) tuples, best first.
+        """
+        query_lower = query.lower()
+        matches = self.names.substring(query_lower)
+
+        if matches:
+            # A hit in the symbol's own name beats one only in its class name
+            scored = []
+            for i in matches:
+                score = match_score(query_lower, self.entry(i)[1].get("name", "").lower())
+                if not score:
+                    score = QUALIFIED_ONLY_WEIGHT * match_score(query_lower, self.names._lower[i])
+                scored.append((i, score))
+            if limit is None:
+                ranked = sorted(scored, key=lambda item: (-item[1], item[0]))
+            else:
+                ranked = heapq.nlargest(limit, scored, key=lambda item: (item[1], -item[0]))
+        elif fuzzy:
+            ranked = [
+                (i, FUZZY_SCALE * sim) for i, sim in self.names.fuzzy(query, limit=limit or 20)
+            ]
+        else:
+            ranked = []
+
+        return [(*self.entry(i), score) for i, score in ranked]
+
+
+class _SymbolNames(Sequence[str]):
+    """Qualified names of a SymbolLookup's symbols, computed on access."""
+
+    def __init__(self, lookup: SymbolLookup) -> None:
+        self._lookup = lookup
+
+    def __len__(self) -> int:
+        return len(self._lookup)
+
+    @overload
+    def __getitem__(self, symbol_id: int) -> str: ...
+
+    @overload
+    def __getitem__(self, symbol_id: slice) -> Sequence[str]: ...
+
+    def __getitem__(self, symbol_id: int | slice) -> str | Sequence[str]:
+        if isinstance(symbol_id, slice):
+            return [self[i] for i in range(len(self))[symbol_id]]
+        if not 0 <= symbol_id < len(self):
+            raise IndexError(symbol_id)
+        kind, record = self._lookup.entry(symbol_id)
+        return _symbol_name(kind, record)
+
+    def __iter__(self) -> Iterator[str]:
+        for kind, records in self._lookup._sections:
+            for record in records:
+                yield _symbol_name(kind, record)
+
+
+def _symbol_name(kind: str, record: dict[str, Any]) -> str:
+    """Name a symbol is indexed by (``Class.method`` for methods)."""
+    name: str = record.get("name", "")
+    if kind == "method":
+        return f"{record.get('class', '')}.{name}"
+    return name
+
+
+class CallGraphLookup:
+    """
+    Trigram lookup over call graph keys, files, and callee names.
+
+    Each of the three indexes is built the first time a query needs it.
+    """
+
+    def __init__(self, call_graph: dict[str, Any], cache: TrigramCache | None = None) -> None:
+        """
+        Set up the lookup.
+
+        Args:
+            call_graph: The index's "call_graph" section.
+            cache: Sidecar cache of the index file the section was loaded from.
+        """
+        self._call_graph = call_graph
+        self._cache = cache
+        # Key ids are positions in call graph order
+        self.call_graph_keys = list(call_graph)
+        self._keys: TrigramIndex | None = None
+        self._files: tuple[TrigramIndex, Sequence[Sequence[int]]] | None = None
+        self._callees: tuple[TrigramIndex, Sequence[Sequence[int]]] | None = None
+
+    @property
+    def keys(self) -> TrigramIndex:
+        """Index of call graph keys."""
+        if self._keys is None:
+            self._keys = _trigram_index("call_graph_keys", self.call_graph_keys, self._cache)
+        return self._keys
+
+    @property
+    def files(self) -> tuple[TrigramIndex, Sequence[Sequence[int]]]:
+        """Index of distinct file paths, and the key ids in each file."""
+        if self._files is None:
+            self._files = _grouped_index(
+                "call_graph_files", len(self._call_graph), self._group_files, self._cache
+            )
+        return self._files
+
+    @property
+    def callees(self) -> tuple[TrigramIndex, Sequence[Sequence[int]]]:
+        """Index of distinct callee names, and the ids of the keys calling each."""
+        if self._callees is None:
+            self._callees = _grouped_index(
+                "call_graph_callees", len(self._call_graph), self._group_callees, self._cache
+            )
+        return self._callees
+
+    def _group_files(self) -> dict[str, list[int]]:
+        """Key ids per file path; files repeat a lot, so each is indexed once."""
+        groups: dict[str, list[int]] = {}
+        for key_id, info in enumerate(self._call_graph.values()):
+            groups.setdefault(info.get("file", ""), []).append(key_id)
+        return groups
+
+    def _group_callees(self) -> dict[str, list[int]]:
+        """Caller key ids per callee name."""
+        groups: dict[str, list[int]] = {}
+        for key_id, info in enumerate(self._call_graph.values()):
+            for call in info.get("calls", []):
+                callers = groups.setdefault(call, [])
+                if not callers or callers[-1] != key_id:
+                    callers.append(key_id)
+        return groups
+
+    def find_functions(self, query: str) -> list[tuple[str, float]]:
+        """Call graph keys containing the query, best match first."""
+        return [(self.keys.keys[i], score) for i, score in self.keys.search(query, fuzzy=False)]
+
+    def find_in_files(self, query: str) -> list[str]:
+        """Call graph keys whose file path contains the query, in call graph order."""
+        files, file_keys = self.files
+        key_ids: list[int] = []
+        for file_id in files.substring(query):
+            key_ids.extend(file_keys[file_id])
+        return [self.call_graph_keys[i] for i in sorted(key_ids)]
+
+    def find_callers(self, query: str) -> dict[str, set[str]]:
+        """
+        Callers of any callee whose name contains the query.
+
+        Returns:
+            Mapping of caller key -> matching call names, in call graph order.
+        """
+        callees, callee_keys = self.callees
+        callers: dict[int, set[str]] = {}
+        for callee_id in callees.substring(query):
+            call = callees.keys[callee_id]
+            for key_id in callee_keys[callee_id]:
+                callers.setdefault(key_id, set()).add(call)
+        return {self.call_graph_keys[i]: callers[i] for i in sorted(callers)}
+
+
+def _trigram_index(name: str, keys: Sequence[str], cache: TrigramCache | None) -> TrigramIndex:
+    """Index keys, reusing the cached posting lists of table ``name`` if present."""
+    if cache is None:
+        return TrigramIndex(keys)
+    return cache.index(name, keys)
+
+
+def _grouped_index(
+    name: str,
+    rows: int,
+    build: Callable[[], dict[str, list[int]]],
+    cache: TrigramCache | None,
+) -> tuple[TrigramIndex, Sequence[Sequence[int]]]:
+    """Index the strings of build()'s mapping, reusing table ``name`` if cached."""
+    if cache is None:
+        groups = build()
+        return TrigramIndex(list(groups)), list(groups.values())
+    return cache.grouped(name, rows, build)
+
+
+class _LowerKeys(Sequence[str]):
+    """Lowercased view of a restored index's keys."""
+
+    def __init__(self, keys: Sequence[str]) -> None:
+        self._keys = keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @overload
+    def __getitem__(self, key_id: int) -> str: ...
+
+    @overload
+    def __getitem__(self, key_id: slice) -> Sequence[str]: ...
+
+    def __getitem__(self, key_id: int | slice) -> str | Sequence[str]:
+        if isinstance(key_id, slice):
+            return [key.lower() for key in self._keys[key_id]]
+        return self._keys[key_id].lower()
+
+    def __iter__(self) -> Iterator[str]:
+        return (key.lower() for key in self._keys)
+
+
+class _Slices(Sequence[array]):
+    """Lists of uint32 stored back to back, decoded as they are read."""
+
+    def __init__(self, bounds: array, data: memoryview) -> None:
+        """
+        Args:
+            bounds: Start of every list in data (in items), plus the end.
+            data: The concatenated lists.
+        """
+        self._bounds = bounds
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._bounds) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> array: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[array]: ...
+
+    def __getitem__(self, index: int | slice) -> array | Sequence[array]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        values = array("I")
+        start, end = self._bounds[index], self._bounds[index + 1]
+        values.frombytes(self._data[start * values.itemsize:end * values.itemsize])
+        return values
+
+
+class _StoredPostings(Mapping[str, array]):
+    """Posting lists of a cached table, keyed by trigram."""
+
+    def __init__(self, grams: str, postings: _Slices) -> None:
+        self._ids = {grams[i:i + 3]: i // 3 for i in range(0, len(grams), 3)}
+        self._postings = postings
+
+    def __getitem__(self, gram: str) -> array:
+        return self._postings[self._ids[gram]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class TrigramCache:
+    """
+    Posting lists of an index file's lookups, cached in a sidecar next to it.
+
+    The sidecar (``<index>.trigram``) is keyed by the index file's size and
+    modification time. A table that is missing or stale is built from its
+    keys and the sidecar rewritten. Key lists taken straight from the index
+    are not stored; derived ones (distinct files and callee names) are,
+    with the key ids grouped under each. Only the tables a query uses are
+    read, and their posting lists are decoded per trigram on demand.
+
+    Layout: one JSON header line, then per table the posting bounds
+    (uint64), the concatenated posting lists (uint32), the trigram count of
+    every key (uint32) and, for derived tables, the NUL-separated keys
+    (UTF-8), the group bounds (uint64) and the grouped key ids (uint32), in
+    native byte order.
+    """
+
+    def __init__(self, index_file: Path) -> None:
+        """
+        Open the cache for an index file.
+
+        Args:
+            index_file: File the index was loaded from.
+        """
+        self.sidecar = Path(f"{index_file}{SIDECAR_SUFFIX}")
+        stat = index_file.stat()
+        self._stamp = [stat.st_size, stat.st_mtime_ns]
+        self._header: dict[str, dict[str, Any]] | None = None
+        self._data_start = 0
+        self._tables: dict[str, bytes] = {}
+
+    def index(self, name: str, keys: Sequence[str]) -> TrigramIndex:
+        """
+        Trigram index over keys, read from the sidecar or built and stored.
+
+        Args:
+            name: Table name (one per indexed key list).
+            keys: Keys to index, in index order.
+
+        Returns:
+            The trigram index.
+        """
+        meta = self._load().get(name)
+        if meta is not None:
+            try:
+                if meta.get("keys") != len(keys):
+                    raise ValueError(f"{meta.get('keys')} keys cached, {len(keys)} loaded")
+                postings, gram_counts, _, _ = _decode_table(meta, self._read(name))
+                return TrigramIndex.restore(keys, postings, gram_counts)
+            except ValueError as e:
+                logger.debug("Rebuilding stale trigram table %s: %s", name, e)
+
+        index = TrigramIndex(keys)
+        self._store(name, _encode_table(index))
+        return index
+
+    def grouped(
+        self, name: str, rows: int, build: Callable[[], dict[str, list[int]]]
+    ) -> tuple[TrigramIndex, Sequence[Sequence[int]]]:
+        """
+        Trigram index over derived keys, with a group of row ids per key.
+
+        Args:
+            name: Table name.
+            rows: Number of rows the groups refer to (checked on restore).
+            build: Computes the key -> row ids mapping when not cached.
+
+        Returns:
+            The trigram index and the row ids of each of its keys.
+        """
+        meta = self._load().get(name)
+        if meta is not None:
+            try:
+                if meta.get("rows") != rows:
+                    raise ValueError(f"{meta.get('rows')} rows cached, {rows} loaded")
+                postings, gram_counts, keys, groups = _decode_table(meta, self._read(name))
+                if keys is None or groups is None:
+                    raise ValueError("table has no groups")
+                return TrigramIndex.restore(keys, postings, gram_counts), groups
+            except ValueError as e:
+                logger.debug("Rebuilding stale trigram table %s: %s", name, e)
+
+        mapping = build()
+        index = TrigramIndex(list(mapping))
+        groups_list = list(mapping.values())
+        if not any("\0" in key for key in index.keys):
+            meta, data = _encode_table(index, groups_list)
+            self._store(name, (meta | {"rows": rows}, data))
+        return index, groups_list
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        """Metadata of the tables cached for this exact index file."""
+        if self._header is not None:
+            return self._header
+        self._header = {}
+        if not self.sidecar.is_file():
+            return self._header
+        try:
+            with open(self.sidecar, "rb") as f:
+                header = json.loads(f.readline())
+                self._data_start = f.tell()
+        except (OSError, ValueError) as e:
+            logger.debug("Ignoring unreadable trigram cache %s: %s", self.sidecar, e)
+            return self._header
+        if (
+            header.get("version") == SIDECAR_VERSION
+            and header.get("stamp") == self._stamp
+            and header.get("byteorder") == sys.byteorder
+        ):
+            self._header = header.get("tables", {})
+        return self._header
+
+    def _read(self, name: str) -> bytes:
+        """Data of a cached table."""
+        if name not in self._tables:
+            meta = self._load()[name]
+            try:
+                with open(self.sidecar, "rb") as f:
+                    f.seek(self._data_start + meta["offset"])
+                    data = f.read(meta["size"])
+            except OSError as e:
+                raise ValueError(f"unreadable: {e}") from e
+            if len(data) != meta["size"]:
+                raise ValueError("truncated table")
+            self._tables[name] = data
+        return self._tables[name]
+
+    def _store(self, name: str, table: tuple[dict[str, Any], bytes]) -> None:
+        """Add or replace a table and rewrite the sidecar; failures only cost a rebuild."""
+        tables: dict[str, tuple[dict[str, Any], bytes]] = {}
+        for other, meta in self._load().items():
+            if other != name:
+                try:
+                    tables[other] = (meta, self._read(other))
+                except ValueError:
+                    continue
+        tables[name] = table
+
+        header: dict[str, Any] = {
+            "version": SIDECAR_VERSION,
+            "stamp": self._stamp,
+            "byteorder": sys.byteorder,
+            "tables": {},
+        }
+        offset = 0
+        for table_name, (meta, data) in tables.items():
+            header["tables"][table_name] = {**meta, "offset": offset, "size": len(data)}
+            offset += len(data)
+
+        temp = self.sidecar.with_name(self.sidecar.name + ".tmp")
+        try:
+            with open(temp, "wb") as f:
+                f.write(json.dumps(header).encode() + b"\n")
+                data_start = f.tell()
+                for _, data in tables.values():
+                    f.write(data)
+            os.replace(temp, self.sidecar)
+        except OSError as e:
+            logger.debug("Could not write trigram cache %s: %s", self.sidecar, e)
+            return
+        self._header = header["tables"]
+        self._data_start = data_start
+        self._tables = {table_name: data for table_name, (_, data) in tables.items()}
+
+
+def _encode_table(
+    index: TrigramIndex, groups: list[list[int]] | None = None
+) -> tuple[dict[str, Any], bytes]:
+    """Serialize an index's posting lists (see TrigramCache for the layout)."""
+    grams = list(index._postings)
+    bounds = array("Q", [0])
+    postings = array("I")
+    for gram in grams:
+        postings.extend(index._postings[gram])
+        bounds.append(len(postings))
+    segments = [bounds.tobytes(), postings.tobytes(), index._gram_counts.tobytes()]
+
+    if groups is not None:
+        group_bounds = array("Q", [0])
+        group_ids = array("I")
+        for group in groups:
+            group_ids.extend(group)
+            group_bounds.append(len(group_ids))
+        segments += ["\0".join(index.keys).encode(), group_bounds.tobytes(), group_ids.tobytes()]
+
+    meta = {"grams": "".join(grams), "keys": len(index.keys), "sizes": [len(s) for s in segments]}
+    return meta, b"".join(segments)
+
+
+def _decode_table(
+    meta: dict[str, Any], data: bytes
+) -> tuple[Mapping[str, array], array, list[str] | None, Sequence[array] | None]:
+    """
+    Deserialize a table written by _encode_table().
+
+    Returns:
+        Posting lists, trigram counts, and for derived tables the keys and
+        their groups (else None).
+
+    Raises:
+        ValueError: If the table is malformed or truncated.
+    """
+    sizes = meta.get("sizes", [])
+    if len(sizes) not in (3, 6) or sum(sizes) != len(data):
+        raise ValueError("truncated table")
+    view = memoryview(data)
+    segments = []
+    start = 0
+    for size in sizes:
+        segments.append(view[start:start + size])
+        start += size
+
+    bounds = array("Q")
+    bounds.frombytes(segments[0])
+    postings = _Slices(bounds, segments[1])
+    gram_count = len(meta["grams"]) // 3
+    if len(postings) != gram_count or bounds[-1] * 4 != len(segments[1]):
+        raise ValueError("truncated table")
+    gram_counts = array("I")
+    gram_counts.frombytes(segments[2])
+    if len(gram_counts) != meta["keys"]:
+        raise ValueError("truncated table")
+    if len(sizes) == 3:
+        return _StoredPostings(meta["grams"], postings), gram_counts, None, None
+
+    keys = bytes(segments[3]).decode().split("\0") if meta["keys"] else []
+    group_bounds = array("Q")
+    group_bounds.frombytes(segments[4])
+    groups = _Slices(group_bounds, segments[5])
+    if len(keys) != meta["keys"] or len(groups) != len(keys):
+        raise ValueError("truncated table")
+    if group_bounds[-1] * 4 != len(segments[5]):
+        raise ValueError("truncated table")
+    return _StoredPostings(meta["grams"], postings), gram_counts, keys, groups
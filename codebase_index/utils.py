@@ -4,8 +4,11 @@ Utility functions for codebase_index.
 
 from __future__ import annotations
 
+import fnmatch
+import functools
 import hashlib
 import logging
+import mmap
 import os
 import re
 import subprocess
@@ -13,10 +16,30 @@ from pathlib import Path
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
     from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Source files at least this large are memory-mapped rather than read
+# whole when hashing, counting lines or slicing symbol bodies
+MMAP_MIN_SIZE = 1 << 20
+
+# Slice of a memory-mapped file counted at a time (bounds memory use)
+LINE_COUNT_CHUNK = 16 << 20
+
+# Leading bytes inspected for minified lines and generated-code markers
+SNIFF_SIZE = 64 << 10
+
+# Characters that make an exclude pattern a glob rather than a plain name
+GLOB_CHARS = frozenset("*?[")
+
+# Symbolic refs are followed at most this deep (git itself stops at 5)
+GIT_MAX_SYMREF_DEPTH = 5
+
+# Abbreviated commit length reported in index metadata
+GIT_SHORT_SHA = 7
+
 
 def get_file_hash(filepath: Path) -> str:
     """
@@ -34,8 +57,13 @@ def get_file_hash(filepath: Path) -> str:
     """
     sha256 = hashlib.sha256()
     with open(filepath, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            sha256.update(chunk)
+        if os.fstat(f.fileno()).st_size >= MMAP_MIN_SIZE:
+            # Hash the mapping in one call instead of copying it out in chunks
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                sha256.update(data)
+        else:
+            for chunk in iter(lambda: f.read(8192), b""):
+                sha256.update(chunk)
     return f"sha256:{sha256.hexdigest()[:16]}"
 
 
@@ -46,10 +74,17 @@ def count_lines(filepath: Path) -> int:
     Args:
         filepath: Path to the file.
 
+    Files of MMAP_MIN_SIZE bytes or more are memory-mapped and their line
+    breaks counted on the raw bytes (see count_data_lines).
+
     Returns:
         Number of lines in the file, or 0 if the file can't be read.
     """
     try:
+        with open(filepath, "rb") as raw:
+            if os.fstat(raw.fileno()).st_size >= MMAP_MIN_SIZE:
+                with mmap.mmap(raw.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    return _count_line_breaks(data)
         with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
             return sum(1 for _ in f)
     except (OSError, IOError) as e:
@@ -57,17 +92,254 @@ def count_lines(filepath: Path) -> int:
         return 0
 
 
-def get_git_info(root: Path) -> dict[str, Any] | None:
+def get_data_hash(data: bytes) -> str:
+    """
+    Hash file contents already in memory, in the same format as get_file_hash.
+
+    Args:
+        data: File contents.
+
+    Returns:
+        Hash string in format "sha256:<first 16 chars of hex>".
+    """
+    return f"sha256:{hashlib.sha256(data).hexdigest()[:16]}"
+
+
+def count_data_lines(data: bytes) -> int:
+    """
+    Count lines in file contents already in memory, as count_lines would.
+
+    Text-mode reading drops undecodable bytes, then ends a line at "\\n",
+    "\\r" or "\\r\\n". Contents of MMAP_MIN_SIZE bytes or more are counted
+    on the raw bytes instead, without decoding a copy (undecodable bytes
+    next to a line break can then change the count by one).
+
+    Args:
+        data: File contents.
+
+    Returns:
+        Number of lines.
+    """
+    if len(data) >= MMAP_MIN_SIZE:
+        return _count_line_breaks(data)
+    text = data.decode("utf-8", errors="ignore")
+    breaks = text.count("\n") + text.count("\r") - text.count("\r\n")
+    if text and text[-1] not in "\r\n":
+        breaks += 1
+    return breaks
+
+
+def _count_line_breaks(data: Any) -> int:
+    """Count text-mode lines on a bytes-like buffer, LINE_COUNT_CHUNK at a time."""
+    size = len(data)
+    breaks = 0
+    previous = b""
+    for start in range(0, size, LINE_COUNT_CHUNK):
+        chunk = data[start:start + LINE_COUNT_CHUNK]
+        breaks += chunk.count(b"\n") + chunk.count(b"\r") - chunk.count(b"\r\n")
+        if previous == b"\r" and chunk[:1] == b"\n":
+            # "\r\n" split across chunks ends one line, not two
+            breaks -= 1
+        previous = chunk[-1:]
+    if previous not in (b"", b"\n", b"\r"):
+        breaks += 1
+    return breaks
+
+
+def detect_generated(
+    head: bytes,
+    max_line_length: int = 0,
+    markers: list[bytes] | None = None,
+) -> str | None:
+    """
+    Tell minified or generated files from the start of their contents.
+
+    Args:
+        head: Leading bytes of the file (SNIFF_SIZE is enough).
+        max_line_length: Longest line (in bytes) of hand-written code; 0
+            disables the check.
+        markers: Byte strings that mark generated code (e.g. b"@generated").
+
+    Returns:
+        "long_lines", "generated", or None for an ordinary file.
+    """
+    if max_line_length:
+        if max(map(len, head.replace(b"\r", b"\n").split(b"\n"))) > max_line_length:
+            return "long_lines"
+    for marker in markers or ():
+        if marker in head:
+            return "generated"
+    return None
+
+
+def find_git_dir(root: Path) -> tuple[Path, Path] | None:
+    """
+    Locate the git directory for a working tree without running git.
+
+    Handles plain repositories, ``.git`` files (worktrees, submodules) and
+    the ``commondir`` indirection linked worktrees use for shared refs.
+
+    Args:
+        root: Directory inside the working tree.
+
+    Returns:
+        Tuple of (git dir, common dir), or None if no repository was found.
+    """
+    for directory in (root, *root.parents):
+        dotgit = directory / ".git"
+        if dotgit.is_dir():
+            git_dir = dotgit
+        elif dotgit.is_file():
+            try:
+                content = dotgit.read_text(encoding="utf-8").strip()
+            except OSError:
+                return None
+            if not content.startswith("gitdir:"):
+                return None
+            git_dir = (directory / content[len("gitdir:"):].strip()).resolve()
+        else:
+            continue
+
+        common_dir = git_dir
+        try:
+            common = (git_dir / "commondir").read_text(encoding="utf-8").strip()
+            common_dir = (git_dir / common).resolve()
+        except OSError:
+            pass
+        return git_dir, common_dir
+    return None
+
+
+def _read_packed_ref(common_dir: Path, ref: str) -> str | None:
+    """Look up a ref in packed-refs."""
+    try:
+        with open(common_dir / "packed-refs", encoding="utf-8") as f:
+            for line in f:
+                # Skip the header and peeled-tag lines
+                if line.startswith(("#", "^")):
+                    continue
+                sha, _, name = line.rstrip("\n").partition(" ")
+                if name == ref:
+                    return sha
+    except OSError:
+        pass
+    return None
+
+
+def read_git_head(root: Path) -> dict[str, Any] | None:
+    """
+    Resolve HEAD, branch and commit by reading ``.git`` directly.
+
+    Args:
+        root: Directory inside the working tree.
+
+    Returns:
+        Dictionary with 'commit', 'branch' ("HEAD" when detached) and
+        'index_mtime_ns' (None without an index), or None if there is no
+        repository or its layout is not understood (e.g. reftable,
+        unborn branch), in which case callers should ask git itself.
+    """
+    found = find_git_dir(root)
+    if not found:
+        return None
+    git_dir, common_dir = found
+    if (common_dir / "reftable").is_dir():
+        return None
+
+    ref = "HEAD"
+    branch = "HEAD"
+    for _ in range(GIT_MAX_SYMREF_DEPTH):
+        # Per-worktree refs (HEAD, refs/bisect, ...) live in the git dir,
+        # shared ones in the common dir
+        value = None
+        for base in (git_dir, common_dir):
+            try:
+                value = (base / ref).read_text(encoding="utf-8").strip()
+                break
+            except OSError:
+                continue
+        if value is None:
+            value = _read_packed_ref(common_dir, ref)
+        if value is None:
+            return None
+        if not value.startswith("ref:"):
+            break
+        ref = value[len("ref:"):].strip()
+        if branch == "HEAD":
+            branch = ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else ref
+    else:
+        return None
+
+    if len(value) < GIT_SHORT_SHA or not all(c in "0123456789abcdef" for c in value):
+        return None
+
+    try:
+        index_mtime_ns: int | None = os.stat(git_dir / "index").st_mtime_ns
+    except OSError:
+        index_mtime_ns = None
+
+    return {
+        "commit": value[:GIT_SHORT_SHA],
+        "branch": branch,
+        "index_mtime_ns": index_mtime_ns,
+    }
+
+
+def get_git_status_dirty(root: Path) -> bool | None:
+    """
+    Run ``git status --porcelain`` for an exact dirty flag.
+
+    Args:
+        root: Root directory of the git repository.
+
+    Returns:
+        True if the working tree has changes, or None if git failed.
+    """
+    try:
+        status = subprocess.check_output(
+            ["git", "status", "--porcelain"],
+            cwd=root,
+            stderr=subprocess.DEVNULL,
+            timeout=10,
+        ).decode().strip()
+    except subprocess.TimeoutExpired:
+        logger.warning("Git status timed out in %s", root)
+        return None
+    except (subprocess.CalledProcessError, OSError):
+        return None
+    return len(status) > 0
+
+
+def get_git_info(root: Path, exact_status: bool = False) -> dict[str, Any] | None:
     """
     Get git metadata for a repository.
 
+    HEAD, branch and commit are read straight from ``.git``; the git
+    subprocess path is only used when that fails. Without exact_status,
+    'dirty' is left to the caller to approximate from 'index_mtime_ns'
+    (a file modified after git last wrote its index is probably dirty).
+
     Args:
         root: Root directory of the git repository.
+        exact_status: Run ``git status`` for an exact 'dirty' flag
+            (slow on large working copies).
 
     Returns:
-        Dictionary with 'commit', 'branch', and 'dirty' keys,
-        or None if not a git repository or git is unavailable.
+        Dictionary with 'commit', 'branch', and 'dirty' (or
+        'index_mtime_ns') keys, or None if not a git repository or git
+        is unavailable.
     """
+    info = read_git_head(root)
+    if info is None:
+        return _get_git_info_subprocess(root)
+    if exact_status:
+        info.pop("index_mtime_ns")
+        info["dirty"] = get_git_status_dirty(root)
+    return info
+
+
+def _get_git_info_subprocess(root: Path) -> dict[str, Any] | None:
+    """Get git metadata by running git (fallback for read_git_head)."""
     try:
         commit = subprocess.check_output(
             ["git", "rev-parse", "--short", "HEAD"],
@@ -130,21 +402,83 @@ def should_exclude(path: Path, exclude_patterns: list[str]) -> bool:
     Args:
         path: Path to check.
         exclude_patterns: List of patterns. Patterns starting with '*'
-            match suffixes, others match directory names.
+            (and no other wildcard) match suffixes, other patterns with
+            wildcards are globs matched against each path component, and
+            the rest match directory names.
 
     Returns:
         True if the path should be excluded.
     """
-    path_str = str(path)
-    for pattern in exclude_patterns:
-        if pattern.startswith("*"):
-            # Suffix match (e.g., "*.pyc")
-            if path_str.endswith(pattern[1:]):
-                return True
-        elif pattern in path_str.split(os.sep):
-            # Directory name match
+    return compile_exclude(tuple(exclude_patterns)).match_path(path)
+
+
+class ExcludeRules:
+    """
+    Exclude patterns compiled once for per-entry name matching.
+
+    Patterns are split into a set of plain names, a tuple of suffixes
+    (``str.endswith`` takes it in one call) and a single regex joining the
+    remaining globs, so checking a name costs one lookup and at most two
+    calls regardless of how many patterns there are.
+    """
+
+    __slots__ = ("names", "suffixes", "_glob")
+
+    def __init__(self, exclude_patterns: Iterable[str]) -> None:
+        """
+        Compile exclude patterns.
+
+        Args:
+            exclude_patterns: Patterns as accepted by should_exclude().
+        """
+        names: set[str] = set()
+        suffixes: list[str] = []
+        globs: list[str] = []
+        for pattern in exclude_patterns:
+            if pattern.startswith("*") and not GLOB_CHARS.intersection(pattern[1:]):
+                suffixes.append(pattern[1:])
+            elif GLOB_CHARS.intersection(pattern):
+                globs.append(fnmatch.translate(pattern))
+            else:
+                names.add(pattern)
+        self.names = frozenset(names)
+        self.suffixes = tuple(suffixes)
+        self._glob = re.compile("|".join(globs)).match if globs else None
+
+    def match(self, name: str) -> bool:
+        """Check a single file or directory name."""
+        return (
+            name in self.names
+            or (bool(self.suffixes) and name.endswith(self.suffixes))
+            or (self._glob is not None and self._glob(name) is not None)
+        )
+
+    def match_path(self, path: Path | str) -> bool:
+        """Check every component of a path (what should_exclude() does)."""
+        path_str = str(path)
+        if self.suffixes and path_str.endswith(self.suffixes):
+            return True
+        parts = path_str.split(os.sep)
+        if not self.names.isdisjoint(parts):
             return True
-    return False
+        return self._glob is not None and any(self._glob(part) for part in parts)
+
+
+@functools.lru_cache(maxsize=32)
+def compile_exclude(exclude_patterns: tuple[str, ...]) -> ExcludeRules:
+    """
+    Compile exclude patterns, reusing the rules for repeated pattern lists.
+
+    Applying the rules to each name as a directory walk descends is
+    equivalent to should_exclude() on the full paths.
+
+    Args:
+        exclude_patterns: Patterns as accepted by should_exclude().
+
+    Returns:
+        Compiled ExcludeRules.
+    """
+    return ExcludeRules(exclude_patterns)
 
 
 def normalize_module_name(name: str) -> str:
@@ -202,3 +536,145 @@ def truncate_string(text: str | None, max_length: int = 200) -> str | None:
     if len(first_line) > max_length:
         return first_line[:max_length] + "..."
     return first_line
+
+
+def line_offsets(data: bytes) -> list[int]:
+    """
+    Byte offset of the start of every line.
+
+    Args:
+        data: Raw file contents.
+
+    Returns:
+        List where entry i is the offset of line i + 1.
+    """
+    offsets = [0]
+    position = data.find(b"\n")
+    while position >= 0:
+        offsets.append(position + 1)
+        position = data.find(b"\n", position + 1)
+    return offsets
+
+
+def line_span(
+    data: bytes, offsets: list[int], start_line: int, end_line: int
+) -> tuple[int, int]:
+    """
+    Byte range covering whole lines start_line..end_line (1-based, inclusive).
+
+    The range starts at column 0 and ends before the last line's newline.
+
+    Args:
+        data: Raw file contents.
+        offsets: line_offsets(data).
+        start_line: First line.
+        end_line: Last line.
+
+    Returns:
+        (start_byte, end_byte) for slicing ``data``.
+    """
+    start = offsets[min(max(start_line, 1), len(offsets)) - 1]
+    end = offsets[end_line] - 1 if end_line < len(offsets) else len(data)
+    if end > start and data[end - 1:end] == b"\r":
+        end -= 1
+    return start, max(start, end)
+
+
+# Span fields recorded by the parsers for functions, methods and classes
+SPAN_FIELDS = ("end_line", "start_byte", "end_byte")
+
+
+def symbol_span(symbol: dict[str, Any]) -> dict[str, Any]:
+    """The span fields present on a parsed symbol (empty for old indexes)."""
+    return {key: symbol[key] for key in SPAN_FIELDS if symbol.get(key) is not None}
+
+
+class SourceFile:
+    """
+    Read-only source file for slicing symbol bodies by byte offset.
+
+    Files of MMAP_MIN_SIZE bytes or more are memory-mapped so only the
+    pages holding the requested symbols are read.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Open a source file.
+
+        Args:
+            path: File to open.
+
+        Raises:
+            OSError: If the file can't be read.
+        """
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size >= MMAP_MIN_SIZE:
+                self._data: bytes | mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self._data = f.read()
+        self._lines: list[str] | None = None
+
+    def __enter__(self) -> SourceFile:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the mapping (if any)."""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    def slice(self, start_byte: int, end_byte: int, limit: int | None = None) -> str:
+        """
+        Decode a byte range.
+
+        Args:
+            start_byte: Range start.
+            end_byte: Range end (exclusive).
+            limit: Read at most this many bytes.
+
+        Returns:
+            The decoded text (invalid UTF-8 replaced).
+        """
+        if limit is not None:
+            end_byte = min(end_byte, start_byte + limit)
+        return self._data[start_byte:end_byte].decode("utf-8", errors="replace")
+
+    def symbol_text(self, symbol: dict[str, Any], limit: int | None = None) -> str | None:
+        """
+        Source of a symbol from its recorded byte range.
+
+        Args:
+            symbol: Parsed symbol with start_byte/end_byte.
+            limit: Read at most this many bytes.
+
+        Returns:
+            The symbol's source, or None if it has no recorded span or the
+            span no longer fits the file.
+        """
+        start_byte = symbol.get("start_byte")
+        end_byte = symbol.get("end_byte")
+        if start_byte is None or end_byte is None or end_byte > len(self._data):
+            return None
+        return self.slice(start_byte, end_byte, limit)
+
+    def lines(self) -> list[str]:
+        """All lines with line endings, for symbols without recorded spans."""
+        if self._lines is None:
+            self._lines = self.slice(0, len(self._data)).splitlines(keepends=True)
+        return self._lines
+
+    def head(self, count: int) -> list[str]:
+        """The first ``count`` lines."""
+        if self._lines is not None:
+            return self._lines[:count]
+        end = 0
+        for _ in range(count):
+            position = self._data.find(b"\n", end)
+            if position < 0:
+                end = len(self._data)
+                break
+            end = position + 1
+        return self.slice(0, end).splitlines(keepends=True)
@@ -0,0 +1,265 @@
+"""
+Directory walking for codebase_index.
+
+The scan used to run os.walk, build a Path for every file and directory,
+and call should_exclude() on it, which re-split the full path once per
+pattern. Each indexed file was then statted again through its Path.
+walk_tree() runs on os.scandir instead:
+
+- each entry name is checked against ExcludeRules compiled once;
+- .gitignore files (and .git/info/exclude) can be applied as the walk
+  descends;
+- the DirEntry is handed on, so the scanner stats a file through it
+  (free on Windows, where the listing already carries the stat).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from codebase_index.utils import ExcludeRules
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Per-directory ignore file
+GITIGNORE_FILE = ".gitignore"
+
+# Repository-wide ignore rules, relative to the repository top
+GIT_INFO_EXCLUDE = os.path.join(".git", "info", "exclude")
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob (without anchoring) into a regex body."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            # "**" as a whole path segment spans directories
+            if (
+                pattern.startswith("**", i)
+                and (i == 0 or pattern[i - 1] == "/")
+                and (i + 2 == n or pattern[i + 2] == "/")
+            ):
+                if i + 2 == n:
+                    out.append(".*")
+                    i += 2
+                else:
+                    out.append("(?:.*/)?")
+                    i += 3
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = i + 1
+            if j < n and pattern[j] == "!":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            j = pattern.find("]", j)
+            if j < 0:
+                out.append("\\[")
+            else:
+                body = pattern[i + 1:j].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                elif body.startswith("^"):
+                    body = "\\" + body
+                out.append(f"[{body}]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def _parse_line(line: str) -> tuple[Any, bool, bool] | None:
+    """
+    Compile one .gitignore line.
+
+    Returns:
+        Tuple of (regex match function, negated, directory only), or None
+        for blank lines and comments.
+    """
+    line = line.rstrip("\r\n")
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    line = stripped
+    if not line or line.startswith("#"):
+        return None
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith(("\\#", "\\!")):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    # A slash anywhere but the end anchors the pattern to the file's directory
+    anchored = "/" in line
+    regex = ("" if anchored else "(?:.*/)?") + _translate(line.lstrip("/")) + r"\Z"
+    return re.compile(regex, re.DOTALL).match, negate, dir_only
+
+
+class GitignoreRules:
+    """The patterns of one ignore file, relative to the directory it applies to."""
+
+    __slots__ = ("base", "rules")
+
+    def __init__(self, base: str, lines: Iterable[str]) -> None:
+        """
+        Compile ignore patterns.
+
+        Args:
+            base: Directory the patterns are relative to, as a "/"-separated
+                path from the repository top with a trailing "/" ("" for the top).
+            lines: Lines of the ignore file.
+        """
+        self.base = base
+        self.rules = [rule for rule in map(_parse_line, lines) if rule is not None]
+
+    @classmethod
+    def load(cls, path: str | Path, base: str) -> GitignoreRules | None:
+        """Read an ignore file; None if it is missing, unreadable or has no patterns."""
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                rules = cls(base, f)
+        except OSError:
+            return None
+        return rules if rules.rules else None
+
+    def match(self, path: str, is_dir: bool) -> bool | None:
+        """
+        Decide whether these patterns ignore a path.
+
+        Args:
+            path: "/"-separated path relative to base.
+            is_dir: Whether the path is a directory.
+
+        Returns:
+            True if ignored, False if re-included by a "!" pattern, None if
+            no pattern matches (the last matching pattern wins).
+        """
+        for regex, negate, dir_only in reversed(self.rules):
+            if dir_only and not is_dir:
+                continue
+            if regex(path):
+                return not negate
+        return None
+
+
+def _is_ignored(ignores: tuple[GitignoreRules, ...], path: str, is_dir: bool) -> bool:
+    """Apply ignore files from the deepest up; the first that decides wins."""
+    if os.sep != "/":
+        path = path.replace(os.sep, "/")
+    for rules in reversed(ignores):
+        ignored = rules.match(path[len(rules.base):], is_dir)
+        if ignored is not None:
+            return ignored
+    return False
+
+
+def _repository_top(root: Path) -> Path:
+    """Nearest directory at or above root holding .git (root itself if none)."""
+    for directory in (root, *root.parents):
+        if (directory / ".git").exists():
+            return directory
+    return root
+
+
+def _ancestor_ignores(root: Path, top: Path) -> tuple[GitignoreRules, ...]:
+    """Ignore files that apply to root from the repository top down to root's parent."""
+    ignores = []
+    info_exclude = GitignoreRules.load(top / GIT_INFO_EXCLUDE, "")
+    if info_exclude:
+        ignores.append(info_exclude)
+    directory, base = top, ""
+    for part in root.relative_to(top).parts:
+        rules = GitignoreRules.load(directory / GITIGNORE_FILE, base)
+        if rules:
+            ignores.append(rules)
+        directory, base = directory / part, f"{base}{part}/"
+    return tuple(ignores)
+
+
+def walk_tree(
+    root: Path,
+    rules: ExcludeRules,
+    gitignore: bool = False,
+) -> Iterator[tuple[str, os.DirEntry]]:
+    """
+    Yield every file under root that the exclude rules keep, in os.walk order.
+
+    A directory's files come before its subdirectories, each in listing
+    order. Symlinked directories are not followed. Directories that cannot
+    be listed are skipped.
+
+    Args:
+        root: Directory to walk.
+        rules: Compiled exclude patterns, checked against each entry name.
+        gitignore: Also skip what .gitignore files, and .git/info/exclude of
+            the enclosing repository, ignore (including ignore files above
+            root, as git would apply them).
+
+    Yields:
+        Tuple of (path relative to root, DirEntry) for each file, i.e. each
+        entry that is not a directory.
+    """
+    ignores: tuple[GitignoreRules, ...] = ()
+    top_prefix = ""
+    if gitignore:
+        top = _repository_top(root)
+        ignores = _ancestor_ignores(root, top)
+        if top != root:
+            top_prefix = root.relative_to(top).as_posix() + "/"
+
+    stack = [(os.fspath(root), "", ignores)]
+    while stack:
+        directory, prefix, ignores = stack.pop()
+        try:
+            with os.scandir(directory) as iterator:
+                entries = list(iterator)
+        except OSError as e:
+            logger.debug("Could not scan %s: %s", directory, e)
+            continue
+
+        if gitignore and any(entry.name == GITIGNORE_FILE for entry in entries):
+            rules_here = GitignoreRules.load(
+                os.path.join(directory, GITIGNORE_FILE), top_prefix + prefix.replace(os.sep, "/")
+            )
+            if rules_here:
+                ignores = (*ignores, rules_here)
+
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            if rules.match(name):
+                continue
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if ignores and _is_ignored(ignores, top_prefix + prefix + name, is_dir):
+                continue
+            if is_dir:
+                if not entry.is_symlink():
+                    subdirs.append(entry)
+                continue
+            yield prefix + name, entry
+
+        for entry in reversed(subdirs):
+            stack.append((entry.path, prefix + entry.name + os.sep, ignores))
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark embedding backends: cold start and throughput.
+
+Each model runs in a fresh interpreter so cold start includes importing
+the backend's dependencies and loading the model, exactly what a CLI
+invocation pays. Texts are ~40-line chunks of the Python files under PATH.
+
+Usage:
+    python scripts/benchmarks/embedding_backends.py [PATH] [--models hashing minilm-onnx minilm]
+                                                    [--texts 500] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Run from a source checkout without installing
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+CHUNK_LINES = 40
+
+
+def load_texts(path: Path, limit: int) -> list[str]:
+    """Split Python sources under path into chunks of CHUNK_LINES lines."""
+    texts: list[str] = []
+    for source in sorted(path.rglob("*.py")):
+        try:
+            lines = source.read_text(encoding="utf-8", errors="replace").splitlines()
+        except OSError:
+            continue
+        for start in range(0, len(lines), CHUNK_LINES):
+            chunk = "\n".join(lines[start:start + CHUNK_LINES]).strip()
+            if chunk:
+                texts.append(chunk)
+            if len(texts) >= limit:
+                return texts
+    return texts
+
+
+def run_worker(model: str, path: Path, limit: int) -> dict:
+    """Measure one model in this (fresh) process."""
+    start = time.perf_counter()
+    from codebase_index.analyzers.semantic import SemanticSearcher, check_semantic_available
+
+    if not check_semantic_available(model):
+        return {"model": model, "error": "backend not installed"}
+
+    searcher = SemanticSearcher(model_key=model)
+    backend = searcher.model
+    backend.encode(["warm up"])
+    cold_start = time.perf_counter() - start
+
+    texts = load_texts(path, limit)
+    start = time.perf_counter()
+    embeddings = backend.encode(texts, batch_size=32)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "model": model,
+        "backend": searcher.backend_name,
+        "cold_start_s": round(cold_start, 3),
+        "texts": len(texts),
+        "dim": int(embeddings.shape[1]) if len(texts) else 0,
+        "encode_s": round(elapsed, 3),
+        "texts_per_s": round(len(texts) / elapsed, 1) if elapsed else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("path", nargs="?", default=".", help="Source tree for sample texts")
+    parser.add_argument(
+        "--models", nargs="+", default=["hashing", "minilm-onnx", "minilm"],
+        help="Model keys to benchmark",
+    )
+    parser.add_argument("--texts", type=int, default=500, help="Number of texts to encode")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    parser.add_argument("--worker", metavar="MODEL", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    path = Path(args.path).resolve()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, path, args.texts)))
+        return
+
+    results = []
+    for model in args.models:
+        proc = subprocess.run(
+            [sys.executable, __file__, str(path), "--texts", str(args.texts), "--worker", model],
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            results.append({"model": model, "error": proc.stderr.strip().splitlines()[-1:]})
+            continue
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'model':<14} {'backend':<22} {'cold start':>11} {'texts/s':>9} {'dim':>5}")
+    for row in results:
+        if "error" in row:
+            print(f"{row['model']:<14} error: {row['error']}")
+            continue
+        print(
+            f"{row['model']:<14} {row['backend']:<22} {row['cold_start_s']:>10.2f}s "
+            f"{row['texts_per_s']:>9} {row['dim']:>5}"
+        )
+
+
+if __name__ == "__main__":
+    main()
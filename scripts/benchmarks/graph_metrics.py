@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark call graph metrics (CSR build, PageRank, betweenness, k-core).
+
+Builds a synthetic directed graph whose in-degrees follow a power law
+(a few heavily called utilities, many leaf functions), like a call graph,
+and times each metric with numpy and, optionally, the pure-Python fallback.
+
+Usage:
+    python scripts/benchmarks/graph_metrics.py [--nodes 200000] [--edges 1000000]
+                                               [--samples 64] [--python]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Run from a source checkout without installing
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from codebase_index.analyzers.graph_metrics import (  # noqa: E402
+    HAS_NUMPY,
+    CSRGraph,
+    betweenness,
+    core_numbers,
+    pagerank,
+)
+
+
+def synthetic_edges(nodes: int, edges: int, seed: int) -> list[tuple[int, int]]:
+    """Random call edges with power-law distributed callees."""
+    rng = random.Random(seed)
+    return [
+        (rng.randrange(nodes), min(int(rng.paretovariate(1.2)) - 1, nodes - 1))
+        if rng.random() < 0.3
+        else (rng.randrange(nodes), rng.randrange(nodes))
+        for _ in range(edges)
+    ]
+
+
+def run(label: str, nodes: int, edges: list[tuple[int, int]], samples: int, use_numpy: bool) -> None:
+    """Time every metric on one representation."""
+    timings = []
+
+    start = time.perf_counter()
+    graph = CSRGraph(nodes, edges, use_numpy=use_numpy)
+    timings.append(("CSR build", time.perf_counter() - start))
+
+    start = time.perf_counter()
+    pagerank(graph)
+    timings.append(("PageRank", time.perf_counter() - start))
+
+    start = time.perf_counter()
+    betweenness(graph, samples=samples)
+    timings.append((f"betweenness ({samples} sources)", time.perf_counter() - start))
+
+    start = time.perf_counter()
+    core_numbers(graph)
+    timings.append(("k-core", time.perf_counter() - start))
+
+    print(f"{label}: {nodes:,} nodes, {graph.edge_count:,} distinct edges")
+    for name, seconds in timings:
+        print(f"  {name:<28} {seconds:>8.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--nodes", type=int, default=200_000, help="Number of functions")
+    parser.add_argument("--edges", type=int, default=1_000_000, help="Number of calls")
+    parser.add_argument("--samples", type=int, default=64, help="Betweenness sources")
+    parser.add_argument("--python", action="store_true", help="Also time the pure-Python fallback")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    edges = synthetic_edges(args.nodes, args.edges, args.seed)
+
+    if HAS_NUMPY:
+        run("numpy", args.nodes, edges, args.samples, use_numpy=True)
+    else:
+        print("numpy not installed; timing the pure-Python fallback only")
+    if args.python or not HAS_NUMPY:
+        run("pure Python", args.nodes, edges, args.samples, use_numpy=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark memory use of a loaded index, plain JSON versus compact model.
+
+Writes a synthetic index (default 200k functions in 5k files, with a
+call graph) to a temporary file, then loads it twice: once with plain
+json.load and once followed by compact_index. Reports live heap size
+(tracemalloc) and load time for each, plus the time to export the
+compact index back to JSON.
+
+Usage:
+    python scripts/benchmarks/index_memory.py [--functions 200000] [--files 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Run from a source checkout without installing
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from codebase_index.model import compact_index, json_default  # noqa: E402
+
+
+def make_index(functions: int, files: int, seed: int = 0) -> dict:
+    """Build a synthetic index shaped like the scanner's output."""
+    rng = random.Random(seed)
+    paths = [f"src/pkg{i // 100}/module_{i}.py" for i in range(files)]
+    names = [f"handle_request_{i}" for i in range(functions)]
+    symbol_functions, methods, call_graph = [], [], {}
+    for i, name in enumerate(names):
+        path = paths[i % files]
+        entry = {
+            "name": name,
+            "file": path,
+            "line": i % 500 + 1,
+            "end_line": i % 500 + 12,
+            "start_byte": i * 40,
+            "end_byte": i * 40 + 400,
+            "async": False,
+            "signature": "(self, request: Request) -> Response",
+            "docstring": f"Handle request variant {i}.",
+        }
+        if i % 2:
+            entry = {"name": name, "class": f"Handler{i % 300}", **entry}
+            methods.append(entry)
+            key = f"{path}:Handler{i % 300}.{name}"
+        else:
+            symbol_functions.append(entry)
+            key = f"{path}:{name}"
+        call_graph[key] = {
+            "file": path,
+            "line": entry["line"],
+            "calls": [rng.choice(names) for _ in range(6)] + ["logger.debug", "len"],
+        }
+    return {
+        "meta": {"tool": "codebase_index"},
+        "files": [{"path": path, "language": "python", "hash": f"sha256:{i:016x}"} for i, path in enumerate(paths)],
+        "symbol_index": {"functions": symbol_functions, "classes": [], "methods": methods},
+        "call_graph": call_graph,
+    }
+
+
+def load(path: str, compact: bool) -> dict:
+    """Load the index, optionally compacting it."""
+    with open(path, encoding="utf-8") as f:
+        index_data = json.load(f)
+    if compact:
+        compact_index(index_data)
+    return index_data
+
+
+def measure(path: str, compact: bool) -> tuple[dict, int, float]:
+    """
+    Load the index and return it with its live heap size and load time.
+
+    Timing and memory come from separate loads, since tracemalloc slows
+    allocation-heavy code several-fold.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    load(path, compact)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    index_data = load(path, compact)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return index_data, size, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--functions", type=int, default=200_000, help="Number of functions/methods")
+    parser.add_argument("--files", type=int, default=5_000, help="Number of files")
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".json", prefix="index-memory-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(make_index(args.functions, args.files), f)
+        print(f"Index file: {os.path.getsize(path) / 2**20:.1f} MiB ({args.functions:,} functions)")
+
+        plain, plain_size, plain_time = measure(path, compact=False)
+        del plain
+        compact, compact_size, compact_time = measure(path, compact=True)
+
+        print(f"  plain json.load  {plain_size / 2**20:>8.1f} MiB  {plain_time:>6.2f}s")
+        print(f"  compact          {compact_size / 2**20:>8.1f} MiB  {compact_time:>6.2f}s"
+              f"  ({compact_size / plain_size:.0%} of plain)")
+
+        start = time.perf_counter()
+        exported = json.dumps(compact, default=json_default)
+        print(f"  compact export   {len(exported) / 2**20:>8.1f} MiB  {time.perf_counter() - start:>6.2f}s")
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
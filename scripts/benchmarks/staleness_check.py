@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark the manifest-based staleness check.
+
+Creates a synthetic tree (default 50k Python files spread over nested
+packages) in a temporary directory, builds its manifest, then times
+--check style comparisons for an unchanged tree, a tree with touched
+files (mtime only), and a tree with edits, additions and deletions.
+
+Usage:
+    python scripts/benchmarks/staleness_check.py [--files 50000] [--per-dir 40]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Run from a source checkout without installing
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from codebase_index.config import DEFAULT_EXCLUDE  # noqa: E402
+from codebase_index.manifest import build_manifest, compare_manifest  # noqa: E402
+from codebase_index.utils import get_file_hash  # noqa: E402
+
+
+def make_tree(root: Path, files: int, per_dir: int) -> dict[str, list]:
+    """Write the synthetic tree and return its manifest entries."""
+    entries = {}
+    for i in range(files):
+        directory = root / f"pkg{i // (per_dir * per_dir)}" / f"sub{i // per_dir}"
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"mod{i}.py"
+        path.write_text(f"def func_{i}():\n    return {i}\n")
+        st = path.stat()
+        entries[str(path.relative_to(root))] = [st.st_size, st.st_mtime_ns, get_file_hash(path)]
+    return entries
+
+
+def timed(label: str, root: Path, manifest: dict, repeat: int) -> None:
+    """Run compare_manifest a few times and report the best run."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        diff = compare_manifest(root, manifest)
+        best = min(best, time.perf_counter() - start)
+    changes = len(diff["changed"]) + len(diff["new"]) + len(diff["deleted"])
+    print(f"  {label:<24} {best * 1000:>8.1f} ms  ({changes} changes, {diff['rehashed']} re-hashed)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--files", type=int, default=50_000, help="Number of files")
+    parser.add_argument("--per-dir", type=int, default=40, help="Files per directory")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario (best is reported)")
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="staleness-bench-"))
+    try:
+        start = time.perf_counter()
+        entries = make_tree(root, args.files, args.per_dir)
+        print(f"Created {args.files:,} files in {time.perf_counter() - start:.1f}s")
+
+        start = time.perf_counter()
+        manifest = build_manifest(entries, DEFAULT_EXCLUDE)
+        print(f"Built manifest ({len(manifest['dirs']):,} dirs) in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        timed("unchanged", root, manifest, args.repeat)
+
+        paths = sorted(entries)
+        for path in paths[::1000]:
+            os.utime(root / path)
+        timed("touched (mtime only)", root, manifest, args.repeat)
+
+        for path in paths[1::1000]:
+            with open(root / path, "a") as f:
+                f.write("# edited\n")
+        for path in paths[2::1000]:
+            (root / path).unlink()
+        (root / "pkg0" / "added.py").write_text("x = 1\n")
+        timed("edited/added/deleted", root, manifest, args.repeat)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark trigram symbol lookup against a linear substring scan.
+
+Builds a synthetic symbol_index (default 1M symbols with realistic
+snake_case/CamelCase names), then times build cost and per-query latency
+for substring, qualified-name and fuzzy lookups, and the cost of a
+one-shot query that restores the lookup from an index's sidecar cache.
+
+Usage:
+    python scripts/benchmarks/trigram_lookup.py [--symbols 1000000] [--queries 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Run from a source checkout without installing
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from codebase_index.trigram_index import SymbolLookup, TrigramCache  # noqa: E402
+
+# Common identifier words, followed by a long tail of project-specific ones
+COMMON_WORDS = (
+    "get set user account order payment invoice cache retry client server request "
+    "response handler parse build load save update delete create validate token auth "
+    "session config index search query graph node edge file path module import export"
+).split()
+SYLLABLES = "ka lo mi nu pe ra si to vu xe zo bri cla dro fen gus hal jor".split()
+VOCABULARY_SIZE = 20_000
+
+
+def build_vocabulary(rng: random.Random) -> tuple[list[str], list[float]]:
+    """Word list with Zipf-like cumulative weights (a few common words, a long tail)."""
+    words = list(COMMON_WORDS)
+    seen = set(words)
+    while len(words) < VOCABULARY_SIZE:
+        word = "".join(rng.choices(SYLLABLES, k=rng.randint(2, 4)))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(words))))
+    return words, cum_weights
+
+
+def synthetic_symbol_index(count: int, rng: random.Random) -> dict:
+    """Generate a symbol_index with functions, classes and methods."""
+    words, cum_weights = build_vocabulary(rng)
+    functions, classes, methods = [], [], []
+    class_names = [
+        "".join(w.capitalize() for w in rng.choices(words, cum_weights=cum_weights, k=2)) + str(i)
+        for i in range(max(1, count // 20))
+    ]
+    for cls in class_names:
+        classes.append({"name": cls, "file": f"pkg/{cls.lower()}.py", "line": 1})
+
+    while len(functions) + len(classes) + len(methods) < count:
+        name = "_".join(rng.choices(words, cum_weights=cum_weights, k=rng.randint(2, 4)))
+        if rng.random() < 0.5:
+            functions.append({"name": name, "file": f"pkg/mod{len(functions) % 5000}.py", "line": 1})
+        else:
+            cls = rng.choice(class_names)
+            methods.append({"name": name, "class": cls, "file": f"pkg/{cls.lower()}.py", "line": 1})
+
+    return {"functions": functions, "classes": classes, "methods": methods}
+
+
+def time_queries(fn, queries: list[str]) -> tuple[float, float]:
+    """Median and p95 latency in milliseconds."""
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--symbols", type=int, default=1_000_000, help="Number of symbols")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per workload")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    symbol_index = synthetic_symbol_index(args.symbols, rng)
+    all_symbols = symbol_index["functions"] + symbol_index["classes"] + symbol_index["methods"]
+
+    start = time.perf_counter()
+    lookup = SymbolLookup(symbol_index)
+    build_s = time.perf_counter() - start
+    print(f"symbols: {len(all_symbols):,}  build: {build_s:.1f}s")
+
+    picks = [rng.choice(all_symbols) for _ in range(args.queries)]
+    workloads = {
+        # Selective: a real name (exact / near-exact identifier lookups)
+        "exact name": [s["name"] for s in picks],
+        # Qualified Class.method names
+        "qualified": [
+            f"{s['class']}.{s['name']}" if "class" in s else s["name"] for s in picks
+        ],
+        # Typos: drop one character from the middle
+        "fuzzy": [
+            s["name"][: len(s["name"]) // 2] + s["name"][len(s["name"]) // 2 + 1:] + "q"
+            for s in picks
+        ],
+        # Broad: a single common word matches a large share of the index,
+        # so latency is dominated by ranking the matches, not by the lookup
+        "broad word": [rng.choice(COMMON_WORDS[:5]) for _ in range(max(1, args.queries // 10))],
+    }
+
+    def linear(query: str) -> list:
+        q = query.lower()
+        return [s for s in all_symbols if q in s["name"].lower()]
+
+    print(f"{'workload':<12} {'trigram p50':>12} {'p95':>9} {'linear p50':>11}")
+    for label, queries in workloads.items():
+        p50, p95 = time_queries(lambda q: lookup.search(q, limit=20), queries)
+        linear_p50, _ = time_queries(linear, queries[:10])
+        print(f"{label:<12} {p50:>10.3f}ms {p95:>7.3f}ms {linear_p50:>9.1f}ms")
+
+    # One-shot CLI queries (--load ... --get) restore the lookup from the
+    # <index>.trigram sidecar instead of building it
+    with tempfile.TemporaryDirectory() as tmp:
+        index_file = Path(tmp) / "index.json"
+        index_file.write_text("{}")
+        SymbolLookup(symbol_index, TrigramCache(index_file))
+        queries = workloads["exact name"][:10]
+        p50, _ = time_queries(
+            lambda q: SymbolLookup(symbol_index, TrigramCache(index_file)).search(q), queries
+        )
+        linear_p50, _ = time_queries(linear, queries)
+        print(f"one-shot exact name: sidecar restore + query {p50:.1f}ms, linear {linear_p50:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
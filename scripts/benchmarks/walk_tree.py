@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark the scandir walker against the previous os.walk walk.
+
+The previous walk ran os.walk, built a Path for every entry and checked
+it with should_exclude() (re-splitting the full path once per pattern),
+then statted each file through its Path. The new one runs walk_tree()
+with compiled ExcludeRules and stats through the DirEntry. Both walks
+must yield the same files. --create builds a synthetic tree of about
+that many entries (files plus directories, some of them excluded) under
+PATH first.
+
+Usage:
+    python scripts/benchmarks/walk_tree.py PATH [--create 500000] [--gitignore]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Run from a source checkout without installing
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from codebase_index.config import DEFAULT_EXCLUDE  # noqa: E402
+from codebase_index.utils import compile_exclude  # noqa: E402
+from codebase_index.walker import walk_tree  # noqa: E402
+
+# Files per synthetic directory, and the file names cycled through
+FILES_PER_DIR = 40
+FILE_NAMES = ("mod_{}.py", "view_{}.tsx", "util_{}.ts", "cache_{}.pyc", "notes_{}.md")
+
+
+def create_tree(root: Path, entries: int) -> None:
+    """Create about `entries` files and directories under root."""
+    dirs = max(1, entries // (FILES_PER_DIR + 1))
+    for d in range(dirs):
+        # Three levels deep, with every 20th top-level package a build/ dir
+        top = "build" if d % 400 < 20 else f"pkg{d // 400}"
+        directory = root / top / f"sub{d // 20 % 20}" / f"leaf{d % 20}"
+        directory.mkdir(parents=True, exist_ok=True)
+        for i in range(FILES_PER_DIR):
+            (directory / FILE_NAMES[i % len(FILE_NAMES)].format(i)).touch()
+    (root / ".gitignore").write_text("*.md\nsub3/\n", encoding="utf-8")
+
+
+def legacy_should_exclude(path: Path, exclude_patterns: list[str]) -> bool:
+    """should_exclude() as it was before patterns were compiled."""
+    path_str = str(path)
+    for pattern in exclude_patterns:
+        if pattern.startswith("*"):
+            if path_str.endswith(pattern[1:]):
+                return True
+        elif pattern in path_str.split(os.sep):
+            return True
+    return False
+
+
+def legacy_walk(root: Path, exclude: list[str]) -> list[str]:
+    """os.walk + should_exclude + Path.stat, as the scanner used to walk."""
+    files = []
+    for current, dirs, names in os.walk(root):
+        dirs[:] = [d for d in dirs if not legacy_should_exclude(Path(current) / d, exclude)]
+        for name in names:
+            filepath = Path(current) / name
+            if not legacy_should_exclude(filepath, exclude):
+                filepath.stat()
+                files.append(str(filepath.relative_to(root)))
+    return files
+
+
+def scandir_walk(root: Path, exclude: list[str], gitignore: bool) -> list[str]:
+    """walk_tree + DirEntry.stat, as the scanner walks now."""
+    files = []
+    for rel_path, entry in walk_tree(root, compile_exclude(tuple(exclude)), gitignore):
+        entry.stat()
+        files.append(rel_path)
+    return files
+
+
+def timed(func, *args) -> tuple[list[str], float]:
+    """Best of three runs (the first one warms the dentry cache)."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("path", type=Path, help="Directory to walk")
+    parser.add_argument("--create", type=int, metavar="N", help="First create a tree of about N entries")
+    parser.add_argument("--gitignore", action="store_true", help="Also time walk_tree with .gitignore rules")
+    args = parser.parse_args()
+
+    root = args.path.resolve()
+    if args.create:
+        start = time.perf_counter()
+        create_tree(root, args.create)
+        print(f"Created tree in {time.perf_counter() - start:.1f}s")
+
+    exclude = DEFAULT_EXCLUDE.copy()
+    legacy_files, legacy_time = timed(legacy_walk, root, exclude)
+    new_files, new_time = timed(scandir_walk, root, exclude, False)
+    if legacy_files != new_files:
+        sys.exit("walk_tree yields different files than the os.walk walk")
+
+    print(f"{len(new_files)} files under {root} ({len(exclude)} exclude patterns)")
+    print(f"  os.walk + should_exclude  {legacy_time:>7.2f}s")
+    print(f"  walk_tree                 {new_time:>7.2f}s  ({legacy_time / new_time:.1f}x)")
+    if args.gitignore:
+        ignored_files, ignored_time = timed(scandir_walk, root, exclude, True)
+        print(f"  walk_tree --gitignore     {ignored_time:>7.2f}s  ({len(ignored_files)} files)")
+
+
+if __name__ == "__main__":
+    main()